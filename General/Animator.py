@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+This module defines the Animator class, the single frame scheduler for all
+canvas animations.
+
+Animations run on the Tk main loop: one root.after() callback per frame
+advances every animation in flight, so no worker thread ever touches Tk.
+Animations are time based, so frames are dropped rather than queued when the
+simulation steps faster than the frame rate. Starting an animation under a key
+that is already animating coalesces both into the running one.
+
+An animation is any object providing:
+- advance(now): move to the state at time.perf_counter() value now, return False when done
+- restart(animation): absorb a newer animation started under the same key
+- stop(): remove temporary canvas items and restore the original look
+"""
+import time
+from General.Configuration import Configuration
+
+
+class Animator:
+    """A class scheduling all canvas animations on the Tk main loop."""
+
+    # Animations in flight, STRUCTURE: {key: animation}
+    animations = {}
+
+    # Identifier of the pending root.after() callback
+    frame_job = None
+
+    @staticmethod
+    def start(key, animation):
+        """
+        Start an animation or coalesce it into the one already running under the same key.
+
+        If Configuration.max_animations animations are already in flight, the new
+        one is dropped and only its final state is shown.
+
+        Args:
+            key: Identifies what is animated, e.g. the connector.
+            animation: The animation to start.
+        """
+        running_animation = Animator.animations.get(key)
+        if running_animation is not None:
+            running_animation.restart(animation)
+            return
+
+        if len(Animator.animations) >= Configuration.max_animations:
+            animation.stop()
+            return
+
+        Animator.animations[key] = animation
+        if Animator.frame_job is None:
+            Animator.frame_job = Configuration.root.after(Configuration.animation_frame_interval, Animator._frame)
+
+    @staticmethod
+    def cancel(key):
+        """
+        Stop the animation running under a key, if any.
+
+        Args:
+            key: Identifies what is animated.
+        """
+        animation = Animator.animations.pop(key, None)
+        if animation is not None:
+            animation.stop()
+
+    @staticmethod
+    def cancel_all():
+        """Stop all animations, e.g. before the canvas is cleared."""
+        for key in list(Animator.animations):
+            Animator.cancel(key)
+
+        if Animator.frame_job is not None:
+            Configuration.root.after_cancel(Animator.frame_job)
+            Animator.frame_job = None
+
+    @staticmethod
+    def _frame():
+        """Advance all animations in flight by one frame and schedule the next frame."""
+        now = time.perf_counter()
+        for key, animation in list(Animator.animations.items()):
+            if not animation.advance(now):
+                animation.stop()
+                Animator.animations.pop(key, None)
+
+        if Animator.animations:
+            Animator.frame_job = Configuration.root.after(Configuration.animation_frame_interval, Animator._frame)
+        else:
+            Animator.frame_job = None
+
+        if Configuration.step_profiler is not None:
+            Configuration.step_profiler.add("animations", time.perf_counter() - now)
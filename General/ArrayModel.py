@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""
+This module defines the ArrayModel class, an optional NumPy representation of
+a SimulationEngine for large flowcharts.
+
+Task state (current cycle, maximum cycles, priority) and connector state
+(semaphore value, last change) are held in vectors, and the "start", "end" and
+"or" links between tasks and connectors are held as sparse incidence matrices
+in coordinate form (one task index array and one connector index array per
+link kind). A step of the firing rule is then a handful of NumPy operations
+over all tasks at once, while giving the same results as SimulationEngine.step:
+
+- A task whose input was incremented in the same step by a task earlier in
+  chart order must wait for the next step. Whether a task ends in a step only
+  depends on being blocked for ready tasks without mutexes and with at most
+  one cycle, which start and end at once. These are resolved in one sweep in
+  chart order, after which the blocked set of all tasks is a single
+  vectorised pass. The sweep is a Python loop, so a step over many such tasks
+  (e.g. a ring of one-cycle tasks with a token on every connector) costs
+  about as much as SimulationEngine.step; other charts are fully vectorised.
+- Mutexes are kept as the regular mutex objects operating on small task
+  handles; attend and release events are replayed in chart order after the
+  vectorised part, followed by the usual evaluate pass.
+
+Charts using the Ticket Lock protocol are not supported, because its release
+hands the lock to the next task in the middle of a step. Connectors consumed
+by more than one task are not supported either.
+"""
+import numpy as np
+from Objects.Mutex.MutexTicketLock import MutexTicketLock
+
+
+class _MutexTaskHandle:
+    """Stands in for a TaskModel towards the mutex objects of an ArrayModel."""
+
+    __slots__ = ("array_model", "index", "task_name", "activity_name", "priority", "original_priority",
+                 "ticket", "elevated_priority", "granted_mutexes", "mutexes")
+
+    def __init__(self, array_model, index, task):
+        self.array_model = array_model
+        self.index = index
+        self.task_name = task.task_name
+        self.activity_name = task.activity_name
+        self.priority = task.priority
+        self.original_priority = task.original_priority
+        self.ticket = task.ticket
+        self.elevated_priority = task.elevated_priority
+        self.granted_mutexes = task.granted_mutexes
+        self.mutexes = []
+
+    def grant_access(self):
+        """Count a granted mutex and start the task once all are granted."""
+        self.granted_mutexes += 1
+        if len(self.mutexes) == self.granted_mutexes:
+            self.array_model._start_granted(self)
+
+
+class ArrayModel:
+    """
+    A class holding the simulation state of a chart in NumPy arrays.
+    """
+
+    def __init__(self, task_count, connection_count):
+        """
+        Initialize an empty array model. Use ArrayModel.from_engine to build one.
+
+        Args:
+            task_count (int): The number of tasks.
+            connection_count (int): The number of connectors.
+        """
+        self.step_number = 0
+
+        # Task vectors
+        self.task_current_cycle = np.zeros(task_count, dtype=np.int64)
+        self.task_max_cycles = np.zeros(task_count, dtype=np.int64)
+        self.priority = np.zeros(task_count, dtype=np.int64)
+        self.has_mutex = np.zeros(task_count, dtype=bool)
+
+        # Connector vectors
+        self.semaphore_value = np.zeros(connection_count, dtype=np.int64)
+        self.last_change = np.zeros(connection_count, dtype=np.int64)
+
+        # Incidence matrices in coordinate form: inputs ("end") and outputs ("start" and "or")
+        self.input_task = np.zeros(0, dtype=np.int64)
+        self.input_connection = np.zeros(0, dtype=np.int64)
+        self.output_task = np.zeros(0, dtype=np.int64)
+        self.output_connection = np.zeros(0, dtype=np.int64)
+        self.needed_inputs = np.zeros(task_count, dtype=np.int64)
+
+        # The same links per task, STRUCTURE: [[connector index, ...] for every task]
+        self.task_inputs = [[] for _ in range(task_count)]
+        self.task_outputs = [[] for _ in range(task_count)]
+
+        self.mutexes = []
+        self.handles = {}  # STRUCTURE: {task index: _MutexTaskHandle}
+
+    @classmethod
+    def from_engine(cls, engine):
+        """
+        Build an array model from the current state of a SimulationEngine.
+
+        Args:
+            engine (SimulationEngine): The engine to convert.
+
+        Returns:
+            ArrayModel: The array model.
+
+        Raises:
+            ValueError: If the chart uses the Ticket Lock protocol or a connector
+                is consumed by more than one task.
+        """
+        model = cls(len(engine.tasks), len(engine.connections))
+        model.step_number = engine.step_number
+
+        task_index = {task: index for index, task in enumerate(engine.tasks)}
+
+        for index, task in enumerate(engine.tasks):
+            model.task_current_cycle[index] = task.task_current_cycle
+            model.task_max_cycles[index] = task.task_max_cycles
+            model.priority[index] = task.priority
+
+        input_task, input_connection, output_task, output_connection = [], [], [], []
+        for index, connection in enumerate(engine.connections):
+            model.semaphore_value[index] = connection.semaphore_value
+            model.last_change[index] = connection.last_change
+            for task, position in connection.tasks.items():
+                if position == "end":
+                    input_task.append(task_index[task])
+                    input_connection.append(index)
+                else:
+                    output_task.append(task_index[task])
+                    output_connection.append(index)
+
+        model.input_task = np.array(input_task, dtype=np.int64)
+        model.input_connection = np.array(input_connection, dtype=np.int64)
+        model.output_task = np.array(output_task, dtype=np.int64)
+        model.output_connection = np.array(output_connection, dtype=np.int64)
+        model.needed_inputs = np.bincount(model.input_task, minlength=len(engine.tasks))
+        for task, connection in zip(input_task, input_connection):
+            model.task_inputs[task].append(connection)
+        for task, connection in zip(output_task, output_connection):
+            model.task_outputs[task].append(connection)
+
+        if len(np.unique(model.input_connection)) != len(model.input_connection):
+            raise ValueError("Connectors consumed by more than one task are not supported by the array model")
+
+        # Mutexes keep their regular objects, operating on task handles
+        mutex_copies = {}
+        for mutex in engine.mutexes:
+            if isinstance(mutex, MutexTicketLock):
+                raise ValueError("The Ticket Lock protocol is not supported by the array model")
+            mutex_copies[mutex] = type(mutex)()
+
+        for task in engine.tasks:
+            if task.mutexes:
+                index = task_index[task]
+                model.handles[index] = _MutexTaskHandle(model, index, task)
+                model.has_mutex[index] = True
+
+        def handle(task):
+            return model.handles.get(task_index[task]) if task is not None else None
+
+        for mutex, mutex_copy in mutex_copies.items():
+            mutex_copy.name = mutex.name
+            for task in mutex.connected_tasks:
+                mutex_copy.add_task(handle(task))
+            mutex_copy.attendees = [handle(task) for task in mutex.attendees]
+            mutex_copy.holder = handle(mutex.holder)
+            mutex_copy.lock = mutex.lock
+            if hasattr(mutex, "ceiling_priority"):
+                mutex_copy.ceiling_priority = mutex.ceiling_priority
+            model.mutexes.append(mutex_copy)
+
+        for task in engine.tasks:
+            if task.mutexes:
+                model.handles[task_index[task]].mutexes = [mutex_copies[mutex] for mutex in task.mutexes]
+
+        return model
+
+    def write_back(self, engine):
+        """
+        Copy the array state back into the engine the model was built from.
+
+        Args:
+            engine (SimulationEngine): The engine passed to from_engine.
+        """
+        engine.step_number = self.step_number
+        for index, task in enumerate(engine.tasks):
+            task.task_current_cycle = int(self.task_current_cycle[index])
+            handle = self.handles.get(index)
+            task.priority = handle.priority if handle is not None else int(self.priority[index])
+            if handle is not None:
+                task.granted_mutexes = handle.granted_mutexes
+
+        for index, connection in enumerate(engine.connections):
+            connection.semaphore_value = int(self.semaphore_value[index])
+            connection.last_change = int(self.last_change[index])
+
+        def task_of(handle):
+            return engine.tasks[handle.index] if handle is not None else None
+
+        for mutex, mutex_copy in zip(engine.mutexes, self.mutexes):
+            mutex.attendees = [task_of(handle) for handle in mutex_copy.attendees]
+            mutex.holder = task_of(mutex_copy.holder)
+            mutex.lock = mutex_copy.lock
+            if hasattr(mutex_copy, "ceiling_priority"):
+                mutex.ceiling_priority = mutex_copy.ceiling_priority
+
+        engine.invalidate_ready()
+
+    def _start_granted(self, handle):
+        """
+        Start a task whose mutexes were all granted, like TaskModel._start_cycle.
+
+        Args:
+            handle (_MutexTaskHandle): The granted task.
+        """
+        inputs = self.input_connection[self.input_task == handle.index]
+        inputs = inputs[self.semaphore_value[inputs] > 0]
+        if len(inputs) > 0:
+            self.task_current_cycle[handle.index] = 1
+            self.semaphore_value[inputs] -= 1
+            self.last_change[inputs] = self.step_number
+        handle.granted_mutexes = 0
+
+    def step(self):
+        """Perform a single step in the simulation."""
+        self.step_number += 1
+        task_count = len(self.task_current_cycle)
+        cycles = self.task_current_cycle
+        max_cycles = self.task_max_cycles
+
+        # Running tasks advance by one cycle
+        running = (cycles > 0) & (max_cycles > cycles)
+        cycles[running] += 1
+
+        # Idle tasks whose inputs all carry a token at the start of the step
+        satisfied = np.bincount(self.input_task, weights=self.semaphore_value[self.input_connection] > 0,
+                                minlength=task_count)
+        candidates = (cycles == 0) & (self.needed_inputs > 0) & (satisfied == self.needed_inputs)
+
+        # Tasks fed by a task earlier in chart order that ends in this step have to wait. Only
+        # candidates without mutexes and with at most one cycle end depending on being blocked.
+        undecided = candidates & ~self.has_mutex & (max_cycles <= 1)
+        ending = (cycles == max_cycles) & ~undecided
+        produced = ending[self.output_task]
+        first_producer = np.full(len(self.semaphore_value), task_count, dtype=np.int64)
+        np.minimum.at(first_producer, self.output_connection[produced], self.output_task[produced])
+
+        # Decide them in chart order, each one only depends on the tasks before it
+        if undecided.any():
+            first = first_producer.tolist()
+            for index in np.flatnonzero(undecided).tolist():
+                is_blocked = any(first[connection] < index for connection in self.task_inputs[index])
+                if max_cycles[index] == (0 if is_blocked else 1):
+                    for connection in self.task_outputs[index]:
+                        if index < first[connection]:
+                            first[connection] = index
+            first_producer = np.array(first, dtype=np.int64)
+
+        blocked = np.zeros(task_count, dtype=bool)
+        blocked[self.input_task[first_producer[self.input_connection] < self.input_task]] = True
+        ready = candidates & ~blocked
+        starting = ready & ~self.has_mutex
+        ending = np.where(starting, 1, cycles) == max_cycles
+        produced = ending[self.output_task]
+
+        # Start the ready tasks without mutexes
+        consumed = starting[self.input_task]
+        self.semaphore_value[self.input_connection[consumed]] -= 1
+        self.last_change[self.input_connection[consumed]] = self.step_number
+        cycles[starting] = 1
+
+        # End the tasks that reached their maximum cycle
+        np.add.at(self.semaphore_value, self.output_connection[produced], 1)
+        self.last_change[self.output_connection[produced]] = self.step_number
+        cycles[ending] = 0
+
+        # Replay the mutex attend and release events in chart order
+        if self.mutexes:
+            events = [(index, 0) for index in np.flatnonzero(ready & self.has_mutex)]
+            events += [(index, 1) for index in np.flatnonzero(ending & self.has_mutex)]
+            for index, is_release in sorted(events):
+                handle = self.handles[index]
+                for mutex in handle.mutexes:
+                    if is_release:
+                        mutex.release(handle)
+                    else:
+                        mutex.attend(handle)
+
+            for mutex in self.mutexes:
+                mutex.evaluate()
+
+    def run(self, steps):
+        """
+        Advance the simulation by a number of steps.
+
+        Args:
+            steps (int): The number of steps to perform.
+        """
+        for _ in range(steps):
+            self.step()
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+Module for analysing the liveness of a chart.
+
+The step semantics of SimulationEngine are deterministic, so the behaviour of
+a chart is a single sequence of states. The analyser simulates a copy of the
+chart and hashes every state (task cycles, semaphore values and mutex queues,
+with ticket numbers taken relative to the ticket being served), until one of
+the following is found:
+
+- deadlock: a step changed nothing while tasks still wait for tokens or mutexes.
+- terminated: a step changed nothing and no task waits.
+- periodic: a state repeats, so the chart runs forever with bounded semaphores.
+- unbounded: the same state up to the semaphore values recurs with a constant
+  period, and the semaphores grow by the same amount every period.
+
+For periodic and unbounded charts, tasks that are ready but never start
+within the repeating part are reported as starving. If none of the above
+happens within max_steps, the verdict is "undecided".
+
+The main function is:
+
+analyze_chart(engine, max_steps):
+    Analyses a copy of the engine and returns an AnalysisReport.
+
+Usage from the command line (exits with 1 if a problem was found):
+    python -m General.ChartAnalyzer data2.xlsx --mutex-type "Ticket Lock"
+"""
+
+# Import necessary modules
+import argparse
+import sys
+from collections import deque
+from General.ChartLoader import read_chart
+from General.Log import quiet
+from General.ProjectFile import PROJECT_EXTENSION, copy_engine, read_project
+
+
+class AnalysisReport:
+    """
+    A class holding the result of a chart analysis.
+    """
+
+    def __init__(self):
+        """Initialize an empty report."""
+        self.verdict = "undecided"
+        self.steps = 0
+
+        # First step of the repeating part and its length (periodic and unbounded charts)
+        self.cycle_start = None
+        self.period = None
+
+        self.blocked_tasks = {}  # STRUCTURE: {task identifier: reason}
+        self.unbounded_connections = {}  # STRUCTURE: {connector name: growth per period}
+        self.starving_tasks = []
+        self.never_started = []
+
+    @property
+    def has_problems(self):
+        """
+        Check whether the chart deadlocks, grows without bound or starves a task.
+
+        Returns:
+            bool: True if a problem was found.
+        """
+        return self.verdict in ("deadlock", "unbounded") or bool(self.starving_tasks)
+
+    def summary(self):
+        """
+        Describe the result in readable lines.
+
+        Returns:
+            list: The lines of the summary.
+        """
+        lines = [f"Verdict: {self.verdict} after {self.steps} steps"]
+        if self.period is not None:
+            lines.append(f"Repeats every {self.period} steps from step {self.cycle_start}")
+        for task_name, reason in self.blocked_tasks.items():
+            lines.append(f"Blocked: {task_name} {reason}")
+        for connection_name, growth in self.unbounded_connections.items():
+            lines.append(f"Unbounded: {connection_name} grows by {growth} every {self.period} steps")
+        if self.starving_tasks:
+            lines.append("Starving: " + _name_list(self.starving_tasks))
+        if self.never_started:
+            lines.append("Never started: " + _name_list(self.never_started))
+        return lines
+
+
+def _name_list(names, limit=20):
+    """
+    Join task names, shortening long lists.
+
+    Args:
+        names (list): The names.
+        limit (int, optional): The number of names to show. Defaults to 20.
+
+    Returns:
+        str: The joined names.
+    """
+    if len(names) <= limit:
+        return ", ".join(names)
+    return ", ".join(names[:limit]) + f" and {len(names) - limit} more"
+
+
+class _StartRecorder:
+    """Observes the analysed engine and remembers the last step every task started in."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.last_start = {}  # STRUCTURE: {TaskModel: step}
+
+    def model_changed(self, subject, kind, old_value, new_value):
+        if kind == "started":
+            self.last_start[subject] = self.engine.step_number
+
+
+def state_keys(engine, task_indices):
+    """
+    Describe the current state of an engine for hashing.
+
+    Args:
+        engine (SimulationEngine): The engine.
+        task_indices (dict): STRUCTURE: {TaskModel: index}
+
+    Returns:
+        tuple: The control state (cycles, non-zero semaphores, mutex state) and
+        the semaphore values.
+    """
+    values = tuple(connection.semaphore_value for connection in engine.connections)
+
+    mutex_states = []
+    for mutex in engine.mutexes:
+        # Ticket numbers only matter relative to the ticket being served
+        current_ticket = getattr(mutex, "current_ticket", 0)
+        mutex_states.append((
+            task_indices.get(mutex.holder),
+            tuple((task_indices[task],
+                   (task.ticket if task.ticket is not None else current_ticket) - current_ticket)
+                  for task in mutex.attendees),
+            getattr(mutex, "ticket_counter", current_ticket) - current_ticket,
+            getattr(mutex, "ceiling_priority", None),
+            tuple((task.priority, task.granted_mutexes, task.elevated_priority)
+                  for task in mutex.connected_tasks),
+        ))
+
+    control = (tuple(task.task_current_cycle for task in engine.tasks), tuple(value > 0 for value in values),
+               tuple(mutex_states))
+    return control, values
+
+
+def _blocked_reason(engine, task):
+    """
+    Describe why an idle task holding some of its input tokens cannot start.
+
+    Args:
+        engine (SimulationEngine): The engine.
+        task (TaskModel): The task.
+
+    Returns:
+        str: The reason.
+    """
+    if task.satisfied_inputs < task.needed_inputs:
+        missing = [connection.name for connection, position in task.connectors.items()
+                   if position == "end" and connection.semaphore_value == 0]
+        return "waits for tokens on " + ", ".join(missing)
+
+    held = [f"{mutex.name} (held by {mutex.holder.full_name})" if mutex.holder is not None else mutex.name
+            for mutex in task.mutexes]
+    return "waits for mutex " + ", ".join(held)
+
+
+def analyze_chart(engine, max_steps=20000):
+    """
+    Analyse the liveness of a chart from the current state of an engine.
+
+    The engine itself is not modified; a copy is simulated.
+
+    Args:
+        engine (SimulationEngine): The engine holding the chart.
+        max_steps (int, optional): Upper bound of steps to explore. Defaults to 20000.
+
+    Returns:
+        AnalysisReport: The result.
+    """
+    report = AnalysisReport()
+    engine = copy_engine(engine)
+    task_indices = {task: index for index, task in enumerate(engine.tasks)}
+
+    recorder = _StartRecorder(engine)
+    engine.add_observer(recorder)
+    last_ready = {}  # STRUCTURE: {TaskModel: last step the task was ready to start}
+
+    seen_states = {}  # STRUCTURE: {state hash: step}
+    seen_controls = {}  # STRUCTURE: {control state hash: deque([(step, semaphore values), ...])}
+    first_step = engine.step_number
+
+    # The debug output of the models is of no use here
+    with quiet():
+        for _ in range(max_steps + 1):
+            step_number = engine.step_number
+            # Only a step of the copy itself tells whether the chart is quiescent
+            if step_number > first_step and engine.is_quiescent():
+                waiting = [task for task in engine.tasks if task.task_current_cycle == 0 and task.satisfied_inputs > 0]
+                report.verdict = "deadlock" if waiting else "terminated"
+                report.blocked_tasks = {task.full_name: _blocked_reason(engine, task) for task in waiting}
+                break
+
+            control, values = state_keys(engine, task_indices)
+
+            # An exact repetition means the chart runs forever with bounded semaphores
+            state_hash = hash((control, values))
+            if state_hash in seen_states:
+                report.verdict = "periodic"
+                report.cycle_start = seen_states[state_hash]
+                report.period = step_number - report.cycle_start
+                break
+            seen_states[state_hash] = step_number
+
+            # A recurring control state with a constant growth per period means unbounded semaphores
+            occurrences = seen_controls.setdefault(hash(control), deque(maxlen=8))
+            growth = _find_growth(occurrences, step_number, values)
+            if growth is not None:
+                report.verdict = "unbounded"
+                report.period, report.cycle_start, deltas = growth
+                report.unbounded_connections = {connection.name: delta
+                                                for connection, delta in zip(engine.connections, deltas) if delta > 0}
+                break
+            occurrences.append((step_number, values))
+
+            if step_number - first_step == max_steps:
+                break
+
+            engine.step()
+            for task in engine.active_tasks:
+                if task.task_current_cycle == 0:
+                    last_ready[task] = engine.step_number
+
+    report.steps = engine.step_number - first_step
+    if report.cycle_start is not None:
+        report.starving_tasks = [task.full_name for task, step in last_ready.items()
+                                 if step >= report.cycle_start and recorder.last_start.get(task, -1) < report.cycle_start]
+    report.never_started = [task.full_name for task in engine.tasks if task not in recorder.last_start]
+    return report
+
+
+def _find_growth(occurrences, step_number, values):
+    """
+    Check whether a control state recurs with a constant period and constant semaphore growth.
+
+    Args:
+        occurrences (deque): Earlier (step, semaphore values) of the same control state.
+        step_number (int): The current step.
+        values (tuple): The current semaphore values.
+
+    Returns:
+        tuple: (period, first step of the repeating part, growth per connector), or None.
+    """
+    for middle_step, middle_values in reversed(occurrences):
+        period = step_number - middle_step
+        for first_step, first_values in occurrences:
+            if first_step != middle_step - period:
+                continue
+
+            deltas = [value - middle_value for value, middle_value in zip(values, middle_values)]
+            if (any(deltas) and min(deltas) >= 0
+                    and all(middle_value - first_value == delta
+                            for middle_value, first_value, delta in zip(middle_values, first_values, deltas))):
+                return period, first_step, deltas
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check a chart for deadlocks, unbounded semaphores and starving tasks.")
+    parser.add_argument("file_path", help="Path of the .xlsx chart or project file")
+    parser.add_argument("--mutex-type", default="First Come First Serve", help="Mutex protocol of .xlsx charts")
+    parser.add_argument("--max-steps", type=int, default=20000, help="Upper bound of steps to explore")
+    arguments = parser.parse_args()
+
+    if arguments.file_path.endswith(PROJECT_EXTENSION):
+        chart = read_project(arguments.file_path)
+    else:
+        with quiet():
+            chart = read_chart(arguments.file_path, arguments.mutex_type)
+
+    result = analyze_chart(chart, arguments.max_steps)
+    print("\n".join(result.summary()))
+    sys.exit(1 if result.has_problems else 0)
@@ -0,0 +1,832 @@
+# -*- coding: utf-8 -*-
+"""
+Module for placing the tasks of a chart automatically.
+
+The layouts work on the task graph of a SimulationEngine: one node per task
+model and one edge from every "start" and "or" task of a connector to its
+"end" task. Activities of the same task are linked more strongly than other
+tasks (ACTIVITY_WEIGHT), through their activity connectors and in file order,
+so they stay next to each other. The results are written to the x and y of
+the task models, which is what the views draw and save_file saves.
+
+The main functions are:
+
+layered_layout(engine, node_spacing, layer_spacing):
+    A Sugiyama-style layout from top to bottom. Cycles are broken by reversing
+    the back edges of a depth-first search, tasks are put into layers by their
+    longest path from a source, the order within the layers is improved by
+    barycenter sweeps and the tasks are then moved towards their neighbours
+    as far as the order and spacing allow. Apart from sorting the layers, the
+    time grows linearly with the size of the chart.
+
+force_layout(engine, iterations, node_spacing):
+    A Fruchterman-Reingold layout computed with NumPy, starting from the
+    layered layout. Connectors pull their tasks together like springs, and
+    tasks push each other apart within twice the node spacing, found through
+    grid cells as in the grid variant of the algorithm, so every iteration
+    takes time linear in the size of the chart. Tasks left overlapping are
+    pushed apart at the end.
+
+IncrementalLayout(engine, tasks, new_tasks, hops, iterations, node_spacing, nearby):
+    Settles the tasks of an edit without touching the rest of the chart. Only
+    the tasks within hops connectors of the edited tasks move, under the same
+    forces as in force_layout; all other tasks stay pinned, and the tasks
+    that were placed before move at most node_spacing. The
+    relaxation runs in slices of limited time (step()), so an editor can
+    spread it over several frames.
+
+Unconnected parts of the chart are laid out on their own and placed next to
+each other in rows. A part with far more layers than tasks per layer, e.g. a
+long ring, is cut into bands of layers placed side by side.
+
+Usage from the command line (writes a project file):
+    python -m General.ChartLayout chart.xlsx chart.fcproj --method force
+"""
+
+# Import necessary modules
+import argparse
+import math
+import time
+import numpy as np
+from General.ProjectFile import write_project
+from General.Log import quiet
+
+# Distance between neighbouring tasks of a layer and between layers
+NODE_SPACING = 200
+LAYER_SPACING = 200
+
+# Distance of the laid out chart from the canvas origin, at least the task radius
+MARGIN = 100
+
+# Edge weight between activities of the same task, compared to 1 for other edges
+ACTIVITY_WEIGHT = 4
+
+# Number of alternating barycenter sweeps and coordinate passes of the layered layout
+ORDER_SWEEPS = 8
+COORDINATE_PASSES = 4
+
+# Smallest distance between task centres the force layout leaves, and the
+# largest number of passes pushing closer tasks apart at the end
+TASK_DISTANCE = 120
+SEPARATION_PASSES = 50
+
+# Pull of their old position on the tasks moved by the incremental layout,
+# compared to 1 for a connector, and the weaker pull on new tasks keeping
+# them near the point where they were added
+ANCHOR_WEIGHT = 1.0
+NEW_TASK_ANCHOR_WEIGHT = 0.5
+
+
+def _task_graph(engine):
+    """
+    Build the task graph of a chart.
+
+    Args:
+        engine (SimulationEngine): The chart.
+
+    Returns:
+        tuple: The directed edges, STRUCTURE: {(source index, target index): weight}, and the
+        undirected links including those between activities of one task,
+        STRUCTURE: [[(neighbour index, weight), ...] per task].
+    """
+    index_of = {task: i for i, task in enumerate(engine.tasks)}
+    edges = {}
+    for connection in engine.connections:
+        weight = ACTIVITY_WEIGHT if connection.is_activity_connection else 1
+        sources = [index_of[task] for task, position in connection.tasks.items()
+                   if position != "end" and task in index_of]
+        targets = [index_of[task] for task, position in connection.tasks.items()
+                   if position == "end" and task in index_of]
+        for source in sources:
+            for target in targets:
+                if source != target:
+                    edges[(source, target)] = max(edges.get((source, target), 0), weight)
+
+    link_weights = {}
+    for (source, target), weight in edges.items():
+        pair = (min(source, target), max(source, target))
+        link_weights[pair] = max(link_weights.get(pair, 0), weight)
+
+    # Activities of one task are linked in file order even without an activity connector
+    last_activity = {}
+    for i, task in enumerate(engine.tasks):
+        if task.task_name in last_activity:
+            link_weights[(last_activity[task.task_name], i)] = ACTIVITY_WEIGHT
+        last_activity[task.task_name] = i
+
+    links = [[] for _ in engine.tasks]
+    for (first, second), weight in link_weights.items():
+        links[first].append((second, weight))
+        links[second].append((first, weight))
+
+    return edges, links
+
+
+def _components(links):
+    """
+    Split a graph into its connected parts.
+
+    Args:
+        links (list): The undirected links of every node.
+
+    Returns:
+        list: The node indices of every part, largest part first.
+    """
+    component_of = [-1] * len(links)
+    components = []
+    for start in range(len(links)):
+        if component_of[start] != -1:
+            continue
+
+        component_of[start] = len(components)
+        members = [start]
+        for node in members:
+            for neighbour, weight in links[node]:
+                if component_of[neighbour] == -1:
+                    component_of[neighbour] = len(components)
+                    members.append(neighbour)
+        components.append(members)
+
+    components.sort(key=len, reverse=True)
+    return components
+
+
+def _layers(members, successors):
+    """
+    Put the nodes of a connected part into layers by their longest path from a source,
+    then move nodes with at least as many successors as predecessors down to their first successor.
+
+    Cycles are broken first by reversing the edges a depth-first search finds back to a
+    node on its current path.
+
+    Args:
+        members (list): The node indices of the part.
+        successors (dict): The targets of the edges of every node, STRUCTURE: {index: {index: None}}.
+
+    Returns:
+        dict: The layer of every node, STRUCTURE: {index: layer}.
+    """
+    # Depth-first search keeping the nodes on the current path
+    state = {}  # STRUCTURE: {index: 1 while on the path, 2 when done}
+    acyclic = {node: [] for node in members}
+    for root in members:
+        if root in state:
+            continue
+
+        state[root] = 1
+        stack = [(root, iter(successors.get(root, ())))]
+        while stack:
+            node, targets = stack[-1]
+            for target in targets:
+                if state.get(target) == 1:
+                    acyclic[target].append(node)
+                else:
+                    acyclic[node].append(target)
+                    if target not in state:
+                        state[target] = 1
+                        stack.append((target, iter(successors.get(target, ()))))
+                        break
+            else:
+                state[node] = 2
+                stack.pop()
+
+    # Longest path layering in topological order
+    incoming = {node: 0 for node in members}
+    for node in members:
+        for target in acyclic[node]:
+            incoming[target] += 1
+
+    layer = {node: 0 for node in members}
+    ready = [node for node in members if incoming[node] == 0]
+    for node in ready:
+        for target in acyclic[node]:
+            layer[target] = max(layer[target], layer[node] + 1)
+            incoming[target] -= 1
+            if incoming[target] == 0:
+                ready.append(target)
+
+    # Nodes with few predecessors, above all the sources, would crowd the top layers. Moving a
+    # node with at least as many outgoing as incoming edges down to its first successor does not
+    # lengthen the edges, and lets its predecessors follow it.
+    predecessor_count = {node: 0 for node in members}
+    for node in members:
+        for target in acyclic[node]:
+            predecessor_count[target] += 1
+    for node in reversed(ready):
+        if acyclic[node] and predecessor_count[node] <= len(acyclic[node]):
+            layer[node] = min(layer[target] for target in acyclic[node]) - 1
+
+    return layer
+
+
+def _spread(desired, widths):
+    """
+    Place the nodes of a layer as close to their desired x-coordinates as
+    possible while keeping their order and without overlapping.
+
+    Subtracting the smallest offset from the first node from every coordinate
+    turns this into an isotonic regression, solved by pooling adjacent violators.
+
+    Args:
+        desired (list): The desired x-coordinates of the node centres in layer order.
+        widths (list): The widths of the nodes in layer order.
+
+    Returns:
+        list: The x-coordinates of the node centres.
+    """
+    offsets = [0]
+    for left_width, right_width in zip(widths, widths[1:]):
+        offsets.append(offsets[-1] + (left_width + right_width) / 2)
+
+    blocks = []  # STRUCTURE: [[sum of shifted coordinates, count], ...]
+    for x, offset in zip(desired, offsets):
+        blocks.append([x - offset, 1])
+        while len(blocks) > 1 and blocks[-2][0] / blocks[-2][1] > blocks[-1][0] / blocks[-1][1]:
+            total, count = blocks.pop()
+            blocks[-1][0] += total
+            blocks[-1][1] += count
+
+    result = []
+    for total, count in blocks:
+        result.extend([total / count] * count)
+    return [x + offset for x, offset in zip(result, offsets)]
+
+
+def _layered_component(members, successors, links, groups, node_spacing, layer_spacing):
+    """
+    Lay out a connected part of the task graph in layers.
+
+    Every node stands for the activities of one task, which are placed side by side.
+
+    Args:
+        members (list): The node indices of the part.
+        successors (dict): The targets of the edges of every node.
+        links (list): The undirected links of every node.
+        groups (list): The task indices of every node.
+        node_spacing (float): The distance between neighbouring tasks of a layer.
+        layer_spacing (float): The distance between layers.
+
+    Returns:
+        dict: The position of every task relative to the part, STRUCTURE: {task index: (x, y)}.
+    """
+    layer = _layers(members, successors)
+    layers = [[] for _ in range(max(layer.values()) + 1)]
+    for node in members:
+        layers[layer[node]].append(node)
+
+    # Order within the layers: weighted barycenter of the neighbours in the previous layers,
+    # alternating downwards and upwards, with positions centred on every layer
+    slot = {}
+    for nodes in layers:
+        for i, node in enumerate(nodes):
+            slot[node] = i - (len(nodes) - 1) / 2
+
+    for sweep in range(ORDER_SWEEPS):
+        downwards = sweep % 2 == 0
+        for current in (range(1, len(layers)) if downwards else range(len(layers) - 2, -1, -1)):
+            keys = {}
+            for node in layers[current]:
+                total = 0
+                weights = 0
+                for neighbour, weight in links[node]:
+                    if (layer[neighbour] < current) if downwards else (layer[neighbour] > current):
+                        total += weight * slot[neighbour]
+                        weights += weight
+                keys[node] = total / weights if weights else slot[node]
+
+            nodes = layers[current]
+            nodes.sort(key=keys.__getitem__)
+            for i, node in enumerate(nodes):
+                slot[node] = i - (len(nodes) - 1) / 2
+
+    # Coordinates: move every node towards the mean of its neighbours in other layers
+    width = {node: len(groups[node]) * node_spacing for node in members}
+    x = {}
+    for nodes in layers:
+        for node, new_x in zip(nodes, _spread([0] * len(nodes), [width[node] for node in nodes])):
+            x[node] = new_x
+
+    for coordinate_pass in range(COORDINATE_PASSES):
+        order = layers if coordinate_pass % 2 == 0 else layers[::-1]
+        for nodes in order:
+            desired = []
+            for node in nodes:
+                total = 0
+                weights = 0
+                for neighbour, weight in links[node]:
+                    if layer[neighbour] != layer[node]:
+                        total += weight * x[neighbour]
+                        weights += weight
+                desired.append(total / weights if weights else x[node])
+
+            for node, new_x in zip(nodes, _spread(desired, [width[node] for node in nodes])):
+                x[node] = new_x
+
+    # Long chains, e.g. a large ring, give far more layers than tasks per layer. Such layouts
+    # are cut into bands of layers placed next to each other, like the columns of a newspaper.
+    left = min(x[node] - width[node] / 2 for node in members)
+    part_width = max(x[node] + width[node] / 2 for node in members) - left
+    bands = round(math.sqrt(len(layers) * layer_spacing / part_width))
+    band_length = math.ceil(len(layers) / bands) if bands > 1 else len(layers)
+
+    positions = {}
+    for node in members:
+        first_x = x[node] - left - (width[node] - node_spacing) / 2 + layer[node] // band_length * part_width
+        for i, task_index in enumerate(groups[node]):
+            positions[task_index] = (first_x + i * node_spacing, layer[node] % band_length * layer_spacing)
+    return positions
+
+
+def _pack(parts, spacing):
+    """
+    Place laid out parts next to each other in rows of about equal width and height.
+
+    Args:
+        parts (list): The positions of every part, STRUCTURE: [{index: (x, y)}, ...].
+        spacing (float): The gap between parts.
+
+    Returns:
+        dict: The position of every task with the top left task centre at (MARGIN, MARGIN),
+        STRUCTURE: {index: (x, y)}.
+    """
+    boxes = []
+    for positions in parts:
+        xs = [point[0] for point in positions.values()]
+        ys = [point[1] for point in positions.values()]
+        boxes.append((min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys)))
+
+    total_area = sum((width + spacing) * (height + spacing) for left, top, width, height in boxes)
+    row_width = max(max(width for left, top, width, height in boxes), math.sqrt(total_area))
+
+    placed = {}
+    cursor_x = 0
+    cursor_y = 0
+    row_height = 0
+    for positions, (left, top, width, height) in zip(parts, boxes):
+        if cursor_x > 0 and cursor_x + width > row_width:
+            cursor_x = 0
+            cursor_y += row_height + spacing
+            row_height = 0
+
+        for node, (x, y) in positions.items():
+            placed[node] = (x - left + cursor_x + MARGIN, y - top + cursor_y + MARGIN)
+        cursor_x += width + spacing
+        row_height = max(row_height, height)
+
+    return placed
+
+
+def _write_positions(engine, positions):
+    """
+    Write positions to the task models, rounded to whole pixels.
+
+    Args:
+        engine (SimulationEngine): The chart.
+        positions: The position of every task by index, a dict or an (n, 2) array.
+    """
+    for i, task in enumerate(engine.tasks):
+        task.x = int(round(positions[i][0]))
+        task.y = int(round(positions[i][1]))
+
+
+def layered_layout(engine, node_spacing=NODE_SPACING, layer_spacing=LAYER_SPACING):
+    """
+    Place the tasks of a chart in layers from top to bottom along the connectors.
+
+    The activities of a task form one node of the layers and are placed side by side.
+
+    Args:
+        engine (SimulationEngine): The chart, whose task models get the new positions.
+        node_spacing (float, optional): The distance between neighbouring tasks of a layer.
+        layer_spacing (float, optional): The distance between layers.
+    """
+    if not engine.tasks:
+        return
+
+    groups = []
+    group_of = []
+    group_by_name = {}
+    for i, task in enumerate(engine.tasks):
+        if task.task_name not in group_by_name:
+            group_by_name[task.task_name] = len(groups)
+            groups.append([])
+        group_of.append(group_by_name[task.task_name])
+        groups[group_of[i]].append(i)
+
+    # Edges between tasks become edges between their nodes, counted for the links
+    edges = _task_graph(engine)[0]
+    successors = {}
+    link_weights = {}
+    for source, target in edges:
+        source, target = group_of[source], group_of[target]
+        if source != target:
+            successors.setdefault(source, {})[target] = None
+            pair = (min(source, target), max(source, target))
+            link_weights[pair] = link_weights.get(pair, 0) + 1
+
+    group_links = [[] for _ in groups]
+    for (first, second), weight in link_weights.items():
+        group_links[first].append((second, weight))
+        group_links[second].append((first, weight))
+
+    parts = [_layered_component(members, successors, group_links, groups, node_spacing, layer_spacing)
+             for members in _components(group_links)]
+    _write_positions(engine, _pack(parts, node_spacing))
+
+
+def _close_pairs(positions, radius):
+    """
+    Find all ordered pairs of different tasks closer than a radius.
+
+    The tasks are sorted into grid cells of the radius, and every cell is
+    compared with itself and its eight neighbours.
+
+    Args:
+        positions (ndarray): The task positions, shape (n, 2).
+        radius (float): The largest distance of a pair.
+
+    Returns:
+        tuple: The first and second task indices and the vectors from the second
+        to the first task, with every pair in both orders. Tasks at the same
+        point get a tiny horizontal vector instead of a zero one.
+    """
+    count = len(positions)
+    cells = np.floor(positions / radius).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    row_length = int(cells[:, 0].max()) + 2
+    keys = cells[:, 1] * row_length + cells[:, 0]
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    firsts = []
+    seconds = []
+    for offset_x in (-1, 0, 1):
+        for offset_y in (-1, 0, 1):
+            neighbour_keys = keys + offset_y * row_length + offset_x
+            starts = np.searchsorted(sorted_keys, neighbour_keys, "left")
+            counts = np.searchsorted(sorted_keys, neighbour_keys, "right") - starts
+            total = int(counts.sum())
+            if total == 0:
+                continue
+
+            # All pairs (task, task in the neighbour cell) as two flat index arrays
+            firsts.append(np.repeat(np.arange(count), counts))
+            seconds.append(order[np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)])
+
+    first = np.concatenate(firsts)
+    second = np.concatenate(seconds)
+    delta = positions[first] - positions[second]
+    close = (first != second) & (delta[:, 0] ** 2 + delta[:, 1] ** 2 < radius * radius)
+    first, second, delta = first[close], second[close], delta[close]
+
+    # Tasks at the same point are told apart by their index, so they can be pushed apart
+    coincident = (delta[:, 0] == 0) & (delta[:, 1] == 0)
+    delta[coincident, 0] = np.sign(first[coincident] - second[coincident]) * 1e-3
+    return first, second, delta
+
+
+def _repulsion(positions, spacing):
+    """
+    Compute the repulsive forces between tasks closer than 2 * spacing, spacing^2 / distance each.
+
+    Args:
+        positions (ndarray): The task positions, shape (n, 2).
+        spacing (float): The ideal edge length.
+
+    Returns:
+        ndarray: The summed force on every task, shape (n, 2).
+    """
+    first, second, delta = _close_pairs(positions, 2 * spacing)
+    scale = spacing * spacing / np.maximum(delta[:, 0] ** 2 + delta[:, 1] ** 2, 1.0)
+
+    forces = np.zeros_like(positions)
+    for axis in (0, 1):
+        forces[:, axis] = np.bincount(first, delta[:, axis] * scale, minlength=len(positions))
+    return forces
+
+
+def _separate(positions, distance, passes=SEPARATION_PASSES, movable=None):
+    """
+    Push tasks closer than a distance apart, each by half of the missing distance.
+
+    Args:
+        positions (ndarray): The task positions, shape (n, 2), changed in place.
+        distance (float): The smallest distance between task centres.
+        passes (int, optional): The largest number of passes.
+        movable (ndarray, optional): Which tasks may move, shape (n,). A movable task
+            close to a pinned one is pushed by the whole missing distance. Defaults to all.
+    """
+    for separation_pass in range(passes):
+        first, second, delta = _close_pairs(positions, distance)
+        share = np.full(len(first), 0.5)
+        if movable is not None:
+            share = np.where(movable[second], 0.5, 1.0) * movable[first]
+            first, second, delta, share = first[share > 0], second[share > 0], delta[share > 0], share[share > 0]
+        if len(first) == 0:
+            return
+
+        length = np.maximum(np.hypot(delta[:, 0], delta[:, 1]), 1e-9)
+        push = delta * ((distance - length) * share / length)[:, None]
+        for axis in (0, 1):
+            positions[:, axis] += np.bincount(first, push[:, axis], minlength=len(positions))
+
+
+def force_layout(engine, iterations=100, node_spacing=NODE_SPACING):
+    """
+    Place the tasks of a chart by simulating connectors as springs between repelling tasks,
+    starting from the layered layout.
+
+    Args:
+        engine (SimulationEngine): The chart, whose task models get the new positions.
+        iterations (int, optional): The number of simulation steps. Defaults to 100.
+        node_spacing (float, optional): The ideal length of a connector.
+    """
+    if not engine.tasks:
+        return
+
+    layered_layout(engine, node_spacing, node_spacing)
+    positions = np.array([(task.x, task.y) for task in engine.tasks], dtype=float)
+
+    edges, links = _task_graph(engine)
+    springs = [(first, second, weight) for first, neighbours in enumerate(links)
+               for second, weight in neighbours if first < second]
+    if not springs:
+        return
+    springs = np.array(springs, dtype=float)
+    sources = springs[:, 0].astype(np.int64)
+    targets = springs[:, 1].astype(np.int64)
+    weights = springs[:, 2]
+
+    count = len(positions)
+    temperature = node_spacing
+    cooling = temperature / max(iterations, 1)
+
+    for iteration in range(iterations):
+        forces = _repulsion(positions, node_spacing)
+
+        # Springs pull with distance^2 / node_spacing, scaled by the link weight
+        delta = positions[sources] - positions[targets]
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        pull = delta * (distance * weights / node_spacing)[:, None]
+        for axis in (0, 1):
+            forces[:, axis] += (np.bincount(targets, pull[:, axis], minlength=count)
+                                - np.bincount(sources, pull[:, axis], minlength=count))
+
+        # Move every task at most temperature far
+        length = np.hypot(forces[:, 0], forces[:, 1])
+        positions += forces * (np.minimum(length, temperature) / np.maximum(length, 1e-9))[:, None]
+        temperature -= cooling
+
+    _separate(positions, TASK_DISTANCE)
+    positions -= positions.min(axis=0) - MARGIN
+    _write_positions(engine, positions)
+
+
+class IncrementalLayout:
+    """
+    A force-directed relaxation of the neighbourhood of an edit, leaving the rest of the chart pinned.
+
+    The tasks within hops connectors of the edited tasks are free. Their
+    other neighbours and the tasks around them (see nearby) take part as
+    pinned tasks, which pull through their connectors and push but do not
+    move. The layout before the edit counts as settled: the forces on the
+    free tasks that were placed before are measured first and subtracted, so
+    only the edit moves them, and they are held near their old position by
+    ANCHOR_WEIGHT and moved at most node_spacing away from it. New tasks are held more loosely near the point where they
+    were added. The task models are only changed by apply().
+    """
+
+    def __init__(self, engine, tasks, new_tasks=(), hops=2, iterations=100, node_spacing=NODE_SPACING,
+                 nearby=None):
+        """
+        Collect the neighbourhood of the edited tasks.
+
+        Args:
+            engine (SimulationEngine): The chart.
+            tasks (list): The edited task models, e.g. the tasks of a new connector.
+            new_tasks (list, optional): The edited task models without a chosen position yet.
+            hops (int, optional): The number of connectors from an edited task within which
+                tasks move. Defaults to 2.
+            iterations (int, optional): The number of relaxation steps. Defaults to 100.
+            node_spacing (float, optional): The ideal length of a connector.
+            nearby (callable, optional): Finds the task models in a rectangle, called with
+                (x1, y1, x2, y2). Defaults to a scan of all tasks of the engine.
+        """
+        self.engine = engine
+        self.iterations = iterations
+        self.iteration = 0
+        self.node_spacing = node_spacing
+        self.nearby = nearby if nearby is not None else self._scan
+
+        # Breadth-first search along the connectors, STRUCTURE: {TaskModel: hops from an edited task}
+        hop_of = {task: 0 for task in tasks}
+        frontier = list(hop_of)
+        for hop in range(1, hops + 1):
+            next_frontier = []
+            for task in frontier:
+                for neighbour, weight in self._neighbours(task):
+                    if neighbour not in hop_of:
+                        hop_of[neighbour] = hop
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+
+        # The free tasks come first, then the pinned ones
+        self.tasks = list(hop_of)
+        nodes = list(self.tasks)
+        index_of = {task: i for i, task in enumerate(nodes)}
+        springs = {}
+        for task in self.tasks:
+            for neighbour, weight in self._neighbours(task):
+                if neighbour not in index_of:
+                    index_of[neighbour] = len(nodes)
+                    nodes.append(neighbour)
+                pair = (min(index_of[task], index_of[neighbour]), max(index_of[task], index_of[neighbour]))
+                springs[pair] = max(springs.get(pair, 0), weight)
+
+        # Pinned tasks within reach of the free tasks push them away
+        if self.tasks:
+            xs = [task.x for task in self.tasks]
+            ys = [task.y for task in self.tasks]
+            reach = 2 * node_spacing + hops * node_spacing
+            for task in self.nearby(min(xs) - reach, min(ys) - reach, max(xs) + reach, max(ys) + reach):
+                if task not in index_of:
+                    index_of[task] = len(nodes)
+                    nodes.append(task)
+
+        self.positions = np.array([(task.x, task.y) for task in nodes], dtype=float).reshape(-1, 2)
+        self.origins = self.positions[:len(self.tasks)].copy()
+        self.movable = np.arange(len(nodes)) < len(self.tasks)
+
+        new_tasks = set(new_tasks)
+        self.anchors = np.array([NEW_TASK_ANCHOR_WEIGHT if task in new_tasks else ANCHOR_WEIGHT
+                                 for task in self.tasks], dtype=float)
+        self.max_shifts = np.array([math.inf if task in new_tasks else node_spacing
+                                    for task in self.tasks], dtype=float)
+
+        springs = np.array([(first, second, weight) for (first, second), weight in springs.items()],
+                           dtype=float).reshape(-1, 3)
+        self.sources = springs[:, 0].astype(np.int64)
+        self.targets = springs[:, 1].astype(np.int64)
+        self.weights = springs[:, 2]
+
+        # The chart around the edit is taken as settled: the forces on the placed
+        # tasks before the edit, without the new tasks and the springs between
+        # edited tasks, are subtracted, so only the edit moves them
+        present = np.array([task not in new_tasks for task in nodes], dtype=bool)
+        edited = ~present
+        edited[[index_of[task] for task in tasks]] = True
+        unedited_weights = np.where(edited[self.sources] & edited[self.targets]
+                                    | ~present[self.sources] | ~present[self.targets], 0.0, self.weights)
+        self.rest_forces = self._forces(unedited_weights, present)[:len(self.tasks)] \
+            * present[:len(self.tasks), None]
+
+        self.temperature = node_spacing / 2
+        self.cooling = self.temperature / max(iterations, 1)
+        self.done = not self.tasks
+
+    @staticmethod
+    def _neighbours(task):
+        """
+        Get the tasks sharing a connector with a task.
+
+        Args:
+            task (TaskModel): The task.
+
+        Returns:
+            list: The neighbours with the link weight, STRUCTURE: [(TaskModel, weight), ...].
+        """
+        neighbours = []
+        for connection in task.connectors:
+            weight = ACTIVITY_WEIGHT if connection.is_activity_connection else 1
+            for neighbour in connection.tasks:
+                if neighbour is not task:
+                    neighbours.append((neighbour, weight))
+        return neighbours
+
+    def _scan(self, x1, y1, x2, y2):
+        """
+        Find the task models in a rectangle by looking at every task of the chart.
+
+        Args:
+            x1 (float): The left edge.
+            y1 (float): The top edge.
+            x2 (float): The right edge.
+            y2 (float): The bottom edge.
+
+        Returns:
+            list: The task models.
+        """
+        return [task for task in self.engine.tasks if x1 <= task.x <= x2 and y1 <= task.y <= y2]
+
+    def _forces(self, weights, present=None):
+        """
+        Compute the repulsive and spring forces on all tasks at their current positions.
+
+        Args:
+            weights (ndarray): The weight of every spring.
+            present (ndarray, optional): Which tasks repel, shape (n,). Defaults to all.
+
+        Returns:
+            ndarray: The summed force on every task, shape (n, 2).
+        """
+        count = len(self.positions)
+        if present is None:
+            forces = _repulsion(self.positions, self.node_spacing)
+        else:
+            forces = np.zeros_like(self.positions)
+            if present.any():
+                forces[present] = _repulsion(self.positions[present], self.node_spacing)
+
+        # Springs pull with distance^2 / node_spacing, scaled by the link weight
+        delta = self.positions[self.sources] - self.positions[self.targets]
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        pull = delta * (distance * weights / self.node_spacing)[:, None]
+        for axis in (0, 1):
+            forces[:, axis] += (np.bincount(self.targets, pull[:, axis], minlength=count)
+                                - np.bincount(self.sources, pull[:, axis], minlength=count))
+        return forces
+
+    def step(self, deadline=None):
+        """
+        Relax the free tasks until all iterations are done or the time is up, at least one iteration.
+
+        Args:
+            deadline (float, optional): The time.perf_counter() value to stop at. Defaults to no limit.
+
+        Returns:
+            bool: True once the layout is finished.
+        """
+        if self.done:
+            return True
+
+        free = len(self.tasks)
+        while self.iteration < self.iterations:
+            forces = self._forces(self.weights)[:free] - self.rest_forces
+            forces += (self.origins - self.positions[:free]) * self.anchors[:, None]
+
+            # Move every free task at most temperature far
+            length = np.hypot(forces[:, 0], forces[:, 1])
+            self.positions[:free] += forces * (np.minimum(length, self.temperature)
+                                               / np.maximum(length, 1e-9))[:, None]
+
+            # Placed tasks stay within their largest shift from the old position
+            shift = self.positions[:free] - self.origins
+            shift_length = np.hypot(shift[:, 0], shift[:, 1])
+            self.positions[:free] = self.origins + shift * (np.minimum(shift_length, self.max_shifts)
+                                                            / np.maximum(shift_length, 1e-9))[:, None]
+            self.temperature -= self.cooling
+            self.iteration += 1
+
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        if self.iteration >= self.iterations:
+            _separate(self.positions, TASK_DISTANCE, movable=self.movable)
+            self.done = True
+        return self.done
+
+    def run(self):
+        """Relax the free tasks until the layout is finished."""
+        self.step()
+
+    def position(self, index):
+        """
+        Get the current position of a free task, rounded to whole pixels once the layout is finished.
+
+        Args:
+            index (int): The index of the task in tasks.
+
+        Returns:
+            tuple: The point (x, y).
+        """
+        x, y = self.positions[index]
+        if self.done:
+            return int(round(x)), int(round(y))
+        return float(x), float(y)
+
+    def apply(self):
+        """Finish the layout and write the positions of the free tasks to their models."""
+        self.run()
+        for i, task in enumerate(self.tasks):
+            task.x, task.y = self.position(i)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Place the tasks of a chart automatically.")
+    parser.add_argument("file_path", help="Path of the .xlsx chart")
+    parser.add_argument("output_path", help="Path of the project file to write")
+    parser.add_argument("--method", choices=["layered", "force"], default="layered", help="Layout method")
+    parser.add_argument("--iterations", type=int, default=100, help="Iterations of the force layout")
+    arguments = parser.parse_args()
+
+    # Imported here, since the chart loader uses this module for charts without positions
+    from General.ChartLoader import read_chart
+
+    with quiet():
+        chart = read_chart(arguments.file_path)
+
+    if arguments.method == "force":
+        force_layout(chart, arguments.iterations)
+    else:
+        layered_layout(chart)
+    write_project(chart, arguments.output_path)
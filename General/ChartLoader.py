@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Module for reading flowchart files into a headless SimulationEngine.
+
+read_chart(file_path, mutex_type_name):
+    Reads the TASK and connection column blocks of an Excel file and builds
+    the task, connector and mutex models. No Tk objects are created, so the
+    result can be stepped in batch jobs; FileOperations.load_files builds the
+    canvas views on top of it. Charts without any task position are placed
+    by ChartLayout.layered_layout.
+
+The sheet is streamed once and split into columns, tasks are looked up in a
+dictionary by their identifier and reverse connector pairs are found with a
+dictionary of (start, end) pairs, so the load time grows linearly with the
+number of rows.
+"""
+
+# Import necessary modules
+import itertools
+import math
+import re
+import openpyxl
+from General.SimulationEngine import SimulationEngine
+from General.ChartLayout import layered_layout
+from General.Log import LOADER_LOG, Debug
+
+# Columns of the task block and of the connection block
+TASK_COLUMNS = ["TASK", "ACTIVITY", "CYCLES", "PRIORITY", "MUTEX_LIST", "POSX", "POSY"]
+CONNECTION_COLUMNS = ["START", "CON_NAME", "END", "INITIAL_VALUE"]
+
+
+def _is_empty(cell_value):
+    """
+    Check whether a cell is empty.
+
+    Args:
+        cell_value: The cell value read by pandas.
+
+    Returns:
+        bool: True if the cell holds no value.
+    """
+    return cell_value is None or (isinstance(cell_value, float) and math.isnan(cell_value))
+
+
+def _cell_text(cell_value, default):
+    """
+    Convert a cell to text, writing whole numbers without a decimal point.
+
+    Args:
+        cell_value: The cell value read by pandas.
+        default (str): The text of an empty cell.
+
+    Returns:
+        str: The text of the cell.
+    """
+    if _is_empty(cell_value):
+        return default
+    if isinstance(cell_value, float) and cell_value.is_integer():
+        return str(int(cell_value))
+    return str(cell_value)
+
+
+def _read_columns(file_path):
+    """
+    Stream the first sheet of an Excel file into columns.
+
+    The rows are streamed by openpyxl in read-only mode and transposed once,
+    so no per-cell DataFrame access is needed.
+
+    Args:
+        file_path (str): Path of the .xlsx file.
+
+    Returns:
+        tuple: The cell values below the header, STRUCTURE: {column name: [cell value, ...]},
+        and the number of rows.
+    """
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, ())
+        # Sheets written without a dimension (e.g. by streaming writers) leave out trailing empty cells
+        columns = list(itertools.zip_longest(*rows))
+    finally:
+        workbook.close()
+
+    table = {}
+    for name, values in zip(header, columns):
+        if name is not None and str(name) not in table:
+            table[str(name)] = values
+
+    return table, len(columns[0]) if columns else 0
+
+
+def read_chart(file_path, mutex_type_name='First Come First Serve'):
+    """
+    Read a flowchart from an Excel file into a new SimulationEngine.
+
+    Args:
+        file_path (str): Path of the .xlsx file.
+        mutex_type_name (str, optional): The mutex protocol used for all mutexes of the chart.
+
+    Returns:
+        SimulationEngine: The engine holding the chart models.
+    """
+    # Read the first sheet of the Excel file column-wise
+    table_of_content, row_count = _read_columns(file_path)
+
+    # Missing columns read as empty cells
+    empty_column = [None] * row_count
+
+    engine = SimulationEngine()
+    mutexes_by_name = {}
+    tasks_by_name = {}  # STRUCTURE: {task identifier: [TaskModel, ...]}
+    has_positions = False
+
+    # Walk the task block row by row until the first row without a task
+    for task_cell, activity_cell, cycles_cell, priority_cell, mutex_cell, pos_x_cell, pos_y_cell in zip(
+            *[table_of_content.get(name, empty_column) for name in TASK_COLUMNS]):
+        if _is_empty(task_cell):
+            break
+
+        task_name = str(int(task_cell))
+        activity_name = _cell_text(activity_cell, "")
+        cycles = 1 if _is_empty(cycles_cell) else int(cycles_cell)
+        priority = 0 if _is_empty(priority_cell) else int(priority_cell)
+        pos_x = 50 if _is_empty(pos_x_cell) else pos_x_cell
+        pos_y = 50 if _is_empty(pos_y_cell) else pos_y_cell
+        has_positions = has_positions or not (_is_empty(pos_x_cell) and _is_empty(pos_y_cell))
+
+        # Create a new task model with the extracted values
+        task = engine.create_task(task_name, activity_name, cycles, priority, pos_x, pos_y)
+        tasks_by_name.setdefault(task.full_name, []).append(task)
+
+        # Add mutexes to the task and task to the mutexes
+        if not _is_empty(mutex_cell):
+            for mutex_name in _cell_text(mutex_cell, "").split(","):
+                if mutex_name not in mutexes_by_name:
+                    mutexes_by_name[mutex_name] = engine.create_mutex(mutex_type_name, mutex_name)
+
+                mutex = mutexes_by_name[mutex_name]
+                task.add_mutex(mutex)
+                mutex.add_task(task)
+
+    # Semaphore information of every row, STRUCTURE: [start, name, end, initial value, offset]
+    semaphores = [
+        [_cell_text(start_cell, "Undefined"), _cell_text(name_cell, "Undefined"), _cell_text(end_cell, "Undefined"),
+         0 if _is_empty(value_cell) else int(value_cell), 0]
+        for start_cell, name_cell, end_cell, value_cell in zip(
+            *[table_of_content.get(name, empty_column) for name in CONNECTION_COLUMNS])
+    ]
+
+    if Debug.loader:
+        LOADER_LOG.debug("Connectors of %s: %s", file_path, semaphores)
+
+    # Rows by their (start, end) pair to find connectors running in both directions
+    rows_by_pair = {}
+    for i, semaphore in enumerate(semaphores):
+        rows_by_pair.setdefault((semaphore[0], semaphore[2]), []).append(i)
+
+    # Set of row indices already paired with their reverse connector
+    duplicates = set()
+    connectors_by_name = {}
+
+    # OR rows naming a connector defined further down, bound once all connectors exist
+    or_rows = []  # STRUCTURE: [row index, ...]
+
+    # Iterate over semaphores and handle connections
+    for i, semaphore in enumerate(semaphores):
+        start_task_name, connector_name, end_task_name, initial_value, offset = semaphore
+
+        # If end_task_name is "Undefined", handle OR connection to an already created connector
+        if end_task_name == "Undefined":
+            needed_connector = connectors_by_name.get(connector_name)
+            start_tasks = tasks_by_name.get(start_task_name)
+            if start_tasks and needed_connector is not None:
+                start_tasks[0].add_connector(needed_connector, "or")
+            else:
+                or_rows.append(i)
+            continue
+
+        # Handle duplicate semaphores: the first unpaired reverse row gets the opposite offset
+        if i not in duplicates:
+            for j in rows_by_pair.get((end_task_name, start_task_name), []):
+                if j not in duplicates:
+                    duplicates.add(i)
+                    duplicates.add(j)
+                    if Debug.loader:
+                        LOADER_LOG.debug("Connectors %s and %s run both ways between %s and %s", semaphores[i][1],
+                                         semaphores[j][1], start_task_name, end_task_name)
+                    semaphores[j][4] = 50
+                    offset = -50
+                    break
+
+        # Skip if connector_name is "Undefined"
+        if connector_name == "Undefined":
+            continue
+
+        start_task_id = re.findall(r'\d+', start_task_name)
+        end_task_id = re.findall(r'\d+', end_task_name)
+
+        # Check if start and end tasks have the same ID
+        is_activity_connection = len(end_task_id) > 0 and start_task_id[0] == end_task_id[0]
+
+        # Create a new connector model
+        connector = engine.create_connection(connector_name, initial_value, offset, is_activity_connection)
+        connectors_by_name.setdefault(connector_name, connector)
+
+        # Add connector to start and end tasks
+        for task in tasks_by_name.get(start_task_name, []):
+            task.add_connector(connector, "start")
+        for task in tasks_by_name.get(end_task_name, []):
+            task.add_connector(connector, "end")
+
+    for i in or_rows:
+        start_task_name, connector_name = semaphores[i][:2]
+        needed_connector = connectors_by_name.get(connector_name)
+        start_tasks = tasks_by_name.get(start_task_name)
+        if start_tasks and needed_connector is not None:
+            start_tasks[0].add_connector(needed_connector, "or")
+        elif start_task_name != "Undefined" or connector_name != "Undefined":
+            # The sheet row, counting the header as row 1
+            LOADER_LOG.warning("%s: OR row %d (%s, %s) ignored, %s", file_path, i + 2, start_task_name,
+                               connector_name, "no such connector" if start_tasks else "no such task")
+
+    # Charts without any POSX/POSY would show all tasks on top of each other
+    if not has_positions:
+        layered_layout(engine)
+
+    return engine
@@ -1,661 +1,1188 @@
-"""
-This module defines the Configuration class, which manages the configuration
-settings and state of the application. It includes methods for handling task
-selection, updating the sidebar, and deleting selected tasks.
-"""
-from tkinter import *
-import customtkinter
-
-
-class Configuration:
-    """
-    A class to manage the configuration settings and state of the application.
-    """
-
-    # Class variables to store task, connector, and mutex objects
-    task_objects = []
-    connector_objects = []
-    mutex_objects = {}
-
-    # Variable to keep track of the current step number
-    step_number = 0
-
-    # Variables to store references to the canvas and root window
-    canvas = None
-    root = None
-
-    # Variables to store references to sidebar elements
-    sidebar = None
-    sidebar_edit_task_container = None
-    sidebar_add_connection_container = None
-    sidebar_add_mutex_container = None
-    sidebar_add_or_connection_container = None
-    sidebar_edit_connection_container = None
-    sidebar_connection_input = None
-    sidebar_task_input = None
-    sidebar_activity_input = None
-    sidebar_cycles_input = None
-    sidebar_priority_input = None
-    sidebar_simulation = None
-
-    # Variable to store reference to the simulation sidebar
-    simulation_sidebar = None
-    dynamic_value_label = None
-
-    # Dictionaries to store selected tasks and connection
-    selected_tasks = {}
-    selected_connection = None
-
-    # Variable to indicate edit mode
-    edit_mode = False
-
-    # Variables to store font styles
-    font_black = None
-    font_light = None
-
-    # Variables to store arrow colors
-    arrow_color = "#767676"
-    arrow_color_selected = "#464646"
-    activity_arrow_color = "#029cff"
-    activity_arrow_color_selected = "#0065a6"
-    mutex_color = "#464646"
-
-    # Variables to store task colors
-    task_color = "#029cff"
-    task_color_selected = "#00335c"
-    task_color_running = "red"
-
-    # Variable to store the last import file path
-    last_import_file_path = ""
-
-    # Variables to store the available mutex types
-    available_mutex_types = ['Priority Ceiling', 'Priority Inversion', 'Ticket Lock', 'First Come First Serve']
-    selected_mutex_type = 'First Come First Serve'
-
-    # Variables to store auto run settings
-    current_delay = 1000
-    auto_run = False
-    show_simulation_container = False
-
-
-class SystemFunctions:
-    @staticmethod
-    def set_mutex_type(new_type_name):
-        Configuration.selected_mutex_type = new_type_name
-
-    @staticmethod
-    def clear_general_variables():
-        """
-        Clear the general variables, including task objects, connector objects,
-        mutex objects, step number, selected tasks, and selected connection.
-        """
-        Configuration.task_objects.clear()
-        Configuration.connector_objects.clear()
-        Configuration.mutex_objects.clear()
-        Configuration.step_number = 0
-        Configuration.selected_tasks.clear()
-        Configuration.selected_connection = None
-
-    @staticmethod
-    def clear_canvas():
-        """Clear the canvas and reset general variables."""
-        SystemFunctions.clear_general_variables()
-        Configuration.canvas.delete("all")
-
-    @staticmethod
-    def add_task():
-        """Add a new task to the canvas."""
-        from Objects.DraggableTask import DraggableTask
-
-        task_name = str(len(Configuration.task_objects) + 1)
-        activity_name = "a"
-
-        print("Add task")
-        new_task = DraggableTask(task_name, activity_name, Configuration.root.winfo_width() / 2, Configuration.root.winfo_height() / 2,
-                                 50, 1, 0)
-        Configuration.task_objects.append(new_task)
-
-    @staticmethod
-    def add_connection():
-        """Add a new connection to the canvas."""
-        from Objects.Connection.ConnectionActivity import ConnectionActivity
-        from Objects.Connection.ConnectionTask import ConnectionTask
-
-        name = "Connection" + str(len(Configuration.connector_objects) + 1)
-
-        print("Add connection")
-        origin_task = \
-        [task_object for task_object, position in Configuration.selected_tasks.items() if str(position) == str(1)][0]
-        target_task = \
-        [task_object for task_object, position in Configuration.selected_tasks.items() if str(position) == str(2)][0]
-
-        new_offset = 0
-        for connection in origin_task.connectors:
-            if connection in target_task.connectors:
-                connection.offset = 50
-                new_offset = -50
-
-        is_activity_connection = origin_task.task_name == target_task.task_name
-        if is_activity_connection:
-            new_connection = ConnectionActivity(name, 0, new_offset)
-        else:
-            new_connection = ConnectionTask(name, 0, new_offset)
-
-        origin_task.add_connector(new_connection, "start")
-        target_task.add_connector(new_connection, "end")
-
-        origin_task.update_connections()
-        target_task.update_connections()
-
-        start_task_name = origin_task.task_name + origin_task.activity_name
-        connector_name = new_connection.name
-        end_task_name = target_task.task_name + target_task.activity_name
-        initial_value = 0
-
-        Configuration.connector_objects.append([start_task_name, connector_name, end_task_name, initial_value, new_connection])
-
-    @staticmethod
-    def add_or_connection():
-        """Add an OR connection to the canvas."""
-        sel_task = \
-        [task_object for task_object, position in Configuration.selected_tasks.items() if str(position) == str(1)][0]
-
-        Configuration.selected_connection.add_or_connection(sel_task)
-        sel_task.add_connector(Configuration.selected_connection, "or")
-        sel_task.update_connections()
-
-        Configuration.connector_objects.append([sel_task.task_name + sel_task.activity_name,
-                                                Configuration.selected_connection.name,
-                                                "",
-                                                0,
-                                                Configuration.selected_connection])
-
-    @staticmethod
-    def add_new_mutex():
-        selected_mutex_class_name = "Mutex" + Configuration.selected_mutex_type.replace(' ', '')
-        selected_mutex_class = globals()[selected_mutex_class_name]
-
-        new_mutex = selected_mutex_class()
-
-        Configuration.mutex_objects.update({
-            new_mutex.name: new_mutex
-        })
-
-        for task in Configuration.selected_tasks:
-            task.add_mutex(new_mutex)
-            new_mutex.add_task(task)
-
-        new_mutex.update_visuals()
-
-    @staticmethod
-    def select_new_task(new_task):
-        """
-        Select a new task and assign it a unique number.
-
-        Args:
-            new_task: The new task to be selected.
-
-        Returns:
-            int: The assigned unique number for the new task.
-        """
-        new_number = 1
-        while True:
-            contains = False
-            for task in Configuration.selected_tasks:
-                task_number = Configuration.selected_tasks[task]
-                if task_number == new_number:
-                    contains = True
-
-            if not contains:
-                break
-            new_number += 1
-
-        Configuration.selected_tasks[new_task] = new_number
-        SystemFunctions._update_sidebar()
-
-        return new_number
-
-    @staticmethod
-    def remove_selected_task(task):
-        """
-        Remove a selected task from the selected_tasks dictionary.
-
-        Args:
-            task: The task to be removed from the selection.
-        """
-        Configuration.selected_tasks.pop(task)
-        SystemFunctions._update_sidebar()
-
-    @staticmethod
-    def confirm_task_change():
-        """
-        Confirm the changes made to a task by updating its properties based on
-        the sidebar inputs and update the task's visuals.
-        """
-        task = list(Configuration.selected_tasks.keys())[0]
-
-        task_input = Configuration.sidebar_task_input.get()
-        activity_input = Configuration.sidebar_activity_input.get()
-        cycle_input = Configuration.sidebar_cycles_input.get()
-        priority_input = Configuration.sidebar_priority_input.get()
-
-        task.task_name = task_input
-        task.activity_name = activity_input
-        task.task_max_cycles = cycle_input
-        task.original_priority = priority_input
-
-        task.update_visuals()
-
-    @staticmethod
-    def _update_sidebar():
-        """
-        Update the sidebar based on the currently selected tasks and connection.
-        Show/hide the appropriate sidebar containers based on the selection.
-        """
-        SystemFunctions.toggle_sidebar(True)
-        if Configuration.selected_connection is not None and len(Configuration.selected_tasks) == 0:
-
-            for list_entry in Configuration.connector_objects:
-                if list_entry[4] == Configuration.selected_connection:
-                    Configuration.sidebar_connection_input.set(list_entry[3])
-                    break
-
-            Configuration.sidebar_edit_connection_container.pack(
-                fill="both", expand=True
-            )
-            Configuration.sidebar_add_or_connection_container.pack_forget()
-            Configuration.sidebar_add_connection_container.pack_forget()
-            Configuration.sidebar_edit_task_container.pack_forget()
-            Configuration.sidebar_add_mutex_container.pack_forget()
-            Configuration.sidebar_simulation.pack_forget()
-        elif len(Configuration.selected_tasks) > 0:
-            Configuration.sidebar_edit_connection_container.pack_forget()
-
-            if Configuration.selected_connection is not None:
-                Configuration.sidebar_add_or_connection_container.pack(
-                    fill="both", expand=True
-                )
-                Configuration.sidebar_add_connection_container.pack_forget()
-                Configuration.sidebar_edit_task_container.pack_forget()
-                Configuration.sidebar_add_mutex_container.pack_forget()
-                Configuration.sidebar_simulation.pack_forget()
-            elif len(Configuration.selected_tasks) == 2:
-                Configuration.sidebar_add_connection_container.pack(
-                    fill="both", expand=True
-                )
-                Configuration.sidebar_edit_task_container.pack_forget()
-                Configuration.sidebar_add_mutex_container.pack_forget()
-                Configuration.sidebar_add_or_connection_container.pack_forget()
-                Configuration.sidebar_simulation.pack_forget()
-            elif len(Configuration.selected_tasks) == 1:
-                Configuration.sidebar_priority_input.set(list(Configuration.selected_tasks.keys())[0].original_priority)
-                Configuration.sidebar_edit_task_container.pack(
-                    fill="both", expand=True
-                )
-                Configuration.sidebar_add_connection_container.pack_forget()
-                Configuration.sidebar_add_mutex_container.pack_forget()
-                Configuration.sidebar_add_or_connection_container.pack_forget()
-                Configuration.sidebar_simulation.pack_forget()
-            else:
-                Configuration.sidebar_add_mutex_container.pack(
-                    fill="both", expand=True
-                )
-                Configuration.sidebar_edit_task_container.pack_forget()
-                Configuration.sidebar_add_connection_container.pack_forget()
-                Configuration.sidebar_add_or_connection_container.pack_forget()
-                Configuration.sidebar_simulation.pack_forget()
-
-            Configuration.sidebar_task_input.set(
-                list(Configuration.selected_tasks.keys())[0].task_name
-            )
-            Configuration.sidebar_activity_input.set(
-                list(Configuration.selected_tasks.keys())[0].activity_name
-            )
-            Configuration.sidebar_cycles_input.set(
-                list(Configuration.selected_tasks.keys())[0].task_max_cycles
-            )
-        elif Configuration.show_simulation_container:
-            Configuration.sidebar_simulation.pack(
-                fill="both", expand=True
-            )
-            Configuration.sidebar_add_connection_container.pack_forget()
-            Configuration.sidebar_edit_task_container.pack_forget()
-            Configuration.sidebar_add_mutex_container.pack_forget()
-            Configuration.sidebar_add_or_connection_container.pack_forget()
-            Configuration.sidebar_edit_connection_container.pack_forget()
-        else:
-            SystemFunctions.toggle_sidebar(False)
-
-    @staticmethod
-    def toggle_sidebar(show=True):
-        """
-        Toggle the visibility of the sidebar with an animation effect.
-
-        Args:
-            show (bool): Whether to show or hide the sidebar. Defaults to True.
-        """
-        from threading import Thread
-        t = Thread(target=SystemFunctions._sidebar_animation, args=(show,))
-        t.start()
-
-    @staticmethod
-    def _sidebar_animation(show):
-        """
-        Animate the sidebar to show or hide based on the show parameter.
-
-        :param show: Whether to show or hide the sidebar.
-        :return:
-        """
-        import time
-
-        if Configuration.sidebar.winfo_x() == -300 and show:
-            for i in range(0, 301, 10):
-                Configuration.canvas.place(x=i, relwidth=1.0, relheight=1.0)
-                Configuration.sidebar.place(relx=0, rely=0, relheight=1, x=-300 + i)
-                Configuration.sidebar.update()
-                time.sleep(0.001)
-        elif Configuration.sidebar.winfo_x() == 0 and not show:
-            for i in range(0, 301, 10):
-                Configuration.canvas.place(x=300 - i)
-                Configuration.sidebar.place(relx=0, rely=0, relheight=1, x=-i)
-                Configuration.sidebar.update()
-                time.sleep(0.001)
-
-    @staticmethod
-    def delete_selection():
-        """
-        Delete the selected tasks and their associated connectors.
-        Update the task objects, connector objects, and selected tasks accordingly.
-        """
-        for task in Configuration.selected_tasks:
-            con_cpy = task.connectors.copy()
-            for connector in con_cpy:
-                for task2 in Configuration.task_objects:
-                    if connector in task2.connectors:
-                        task2.connectors.pop(connector)
-                        task2.update_connections()
-                        connector.delete()
-
-            to_del_cons = []
-            for con_obj in Configuration.connector_objects:
-                if task.task_name + task.activity_name in con_obj:
-                    to_del_cons.append(con_obj)
-
-            for con_obj in to_del_cons:
-                Configuration.connector_objects.remove(con_obj)
-
-            Configuration.task_objects.remove(task)
-            task.delete()
-
-        Configuration.selected_tasks.clear()
-
-    # Simulation sidebar methods
-    @staticmethod
-    def toggle_simulation_sidebar():
-        """Toggle visibility of the simulation sidebar."""
-        if Configuration.edit_mode:
-            return
-
-        Configuration.show_simulation_container = not Configuration.show_simulation_container
-        SystemFunctions.toggle_sidebar(Configuration.show_simulation_container)
-        SystemFunctions._update_sidebar()
-
-    @staticmethod
-    def update_speed_value():
-        """Update the displayed speed value."""
-        Configuration.dynamic_value_label.configure(text=f"Period per Cycle: {Configuration.current_delay}ms")
-
-    @staticmethod
-    def update_simulation_speed(value):
-        """Update the simulation speed based on the slider value."""
-        # Convert slider value to a delay (in milliseconds)
-        Configuration.current_delay = int(3000 + 1 - value)
-        print(f"Speed set to {value}, delay {Configuration.current_delay} ms")
-        SystemFunctions.update_speed_value()
-
-    @staticmethod
-    def step():
-        """Perform a single step in the simulation."""
-        print("Step")
-        Configuration.step_number += 1
-        for task in Configuration.task_objects:
-            task.try_step()
-
-        for mutex in Configuration.mutex_objects:
-            Configuration.mutex_objects[mutex].evaluate()
-            Configuration.mutex_objects[mutex].update_visuals()
-
-    @staticmethod
-    def stop_simulation():
-        """Stop the simulation."""
-        Configuration.auto_run = False
-
-    @staticmethod
-    def run_periodically():
-        """Run the simulation periodically based on the current delay."""
-        if Configuration.auto_run:
-            SystemFunctions.step()
-            # Schedule the next call
-            Configuration.root.after(Configuration.current_delay, SystemFunctions.run_periodically)
-
-    @staticmethod
-    def start_simulation():
-        """Start the simulation."""
-        if not Configuration.auto_run:
-            SystemFunctions.update_simulation_speed(value=1)
-            Configuration.auto_run = True
-            SystemFunctions.run_periodically()
-
-    # Create sidebar containers
-    @staticmethod
-    def create_sidebar():
-        """Create the main sidebar."""
-        Configuration.sidebar = Frame(Configuration.root, width=300, bd=0, bg="#303030")
-        Configuration.sidebar.place(relx=0, rely=0, relheight=1, x=-300)
-
-        Configuration.sidebar_task_input = StringVar()
-        Configuration.sidebar_activity_input = StringVar()
-        Configuration.sidebar_cycles_input = IntVar()
-        Configuration.sidebar_connection_input = IntVar()
-        Configuration.sidebar_priority_input = IntVar()
-
-        sidebar_title = Label(Configuration.sidebar, text="Editor", font=("Montserrat Light", 20), bg="#2A2A2A", fg="white",
-                              width=15)
-        sidebar_title.pack(side=TOP, anchor=N, padx=0, pady=10)
-        SystemFunctions.create_edit_task_container()
-        SystemFunctions.create_connection_container()
-        SystemFunctions.create_mutex_container()
-        SystemFunctions.create_or_connection_container()
-        SystemFunctions.create_run_container()
-        SystemFunctions.create_edit_connection_container()
-
-    @staticmethod
-    def create_run_container():
-        """Create the simulation sidebar."""
-        Configuration.sidebar_simulation = Frame(Configuration.sidebar, bd=0, bg="#303030")
-
-        sidebar_title = Label(Configuration.sidebar_simulation, text="Simulation", font=("Montserrat Light", 20), bg="#2A2A2A", fg="white", width=15)
-        sidebar_title.pack(side=TOP, anchor=N, padx=0, pady=10)
-
-        sim_start_button = customtkinter.CTkButton(Configuration.sidebar_simulation, text="Start", command=SystemFunctions.start_simulation)
-        sim_start_button.pack(pady=10, padx=10)
-
-        sim_end_button = customtkinter.CTkButton(Configuration.sidebar_simulation, text="Stop", command=SystemFunctions.stop_simulation)
-        sim_end_button.pack(pady=10, padx=10)
-
-        speed_slider = customtkinter.CTkSlider(Configuration.sidebar_simulation, from_=1, to=3000, number_of_steps=3000)
-        speed_slider.pack(side=customtkinter.TOP, fill=customtkinter.X, padx=10, pady=10)
-        speed_slider.set(1000)  # Set default speed value
-        speed_slider.configure(command=SystemFunctions.update_simulation_speed)
-
-        Configuration.dynamic_value_label = customtkinter.CTkLabel(Configuration.sidebar_simulation, text="Period per Cycle: 1000ms", bg_color=Configuration.root['bg'], fg_color="#303030")
-        Configuration.dynamic_value_label.pack(pady=10)
-
-    @staticmethod
-    def create_edit_task_container():
-        """Create the edit task container in the sidebar."""
-        Configuration.sidebar_edit_task_container = Frame(Configuration.sidebar, bd=0, bg="#303030")
-
-        task_name_frame = Frame(Configuration.sidebar_edit_task_container, bd=0, bg="#2A2A2A", height=30)
-        task_name_frame.place(relx=0, rely=0, x=15, y=100)
-        task_name_title = Label(task_name_frame, text="Task name", font=("Montserrat Light", 10), bg="#2A2A2A",
-                                fg="white", width=15)
-        task_name_title.pack(side=TOP, anchor=N, padx=0, pady=5)
-        task_name_input = Entry(task_name_frame, font=("Montserrat Light", 10), bd=0, bg="#303030", fg="white",
-                                insertbackground="white", width=20, textvariable=Configuration.sidebar_task_input,
-                                borderwidth=10, relief="flat")
-        task_name_input.pack(side=TOP, anchor=N, padx=15, pady=15)
-
-        activity_name_frame = Frame(Configuration.sidebar_edit_task_container, bd=0, bg="#2A2A2A", height=30)
-        activity_name_frame.place(relx=0, rely=0, x=15, y=210)
-        activity_name_title = Label(activity_name_frame, text="Activity name", font=("Montserrat Light", 10),
-                                    bg="#2A2A2A",
-                                    fg="white", width=15)
-        activity_name_title.pack(side=TOP, anchor=N, padx=0, pady=5)
-        activity_name_input = Entry(activity_name_frame, font=("Montserrat Light", 10), bd=0, bg="#303030", fg="white",
-                                    insertbackground="white", width=20,
-                                    textvariable=Configuration.sidebar_activity_input, borderwidth=10, relief="flat")
-        activity_name_input.pack(side=TOP, anchor=N, padx=15, pady=15)
-
-        cycles_frame = Frame(Configuration.sidebar_edit_task_container, bd=0, bg="#2A2A2A", height=30)
-        cycles_frame.place(relx=0, rely=0, x=15, y=320)
-        cycles_title = Label(cycles_frame, text="Amount of cycles", font=("Montserrat Light", 10),
-                             bg="#2A2A2A",
-                             fg="white", width=15)
-        cycles_title.pack(side=TOP, anchor=N, padx=0, pady=5)
-        cycles_input = Entry(cycles_frame, font=("Montserrat Light", 10), bd=0, bg="#303030", fg="white",
-                             insertbackground="white", width=20, textvariable=Configuration.sidebar_cycles_input,
-                             borderwidth=10,
-                             relief="flat")
-        cycles_input.pack(side=TOP, anchor=N, padx=15, pady=15)
-
-        priority_frame = Frame(Configuration.sidebar_edit_task_container, bd=0, bg="#2A2A2A", height=30)
-        priority_frame.place(relx=0, rely=0, x=15, y=430)
-        priority_title = Label(priority_frame, text="Priority", font=("Montserrat Light", 10),
-                             bg="#2A2A2A",
-                             fg="white", width=15)
-        priority_title.pack(side=TOP, anchor=N, padx=0, pady=5)
-        priority_input = Entry(priority_frame, font=("Montserrat Light", 10), bd=0, bg="#303030", fg="white",
-                             insertbackground="white", width=20, textvariable=Configuration.sidebar_priority_input,
-                             borderwidth=10,
-                             relief="flat")
-        priority_input.pack(side=TOP, anchor=N, padx=15, pady=15)
-
-        # Create a frame to simulate the button appearance
-        button_confirm_task_frame = Frame(Configuration.sidebar_edit_task_container, bg="#303030", bd=1, relief="solid",
-                                          highlightbackground=Configuration.task_color,
-                                          highlightthickness=1)
-        button_confirm_task_frame.pack(side=BOTTOM, anchor=N, padx=10, pady=10)
-
-        # Create a label inside the frame to display button text
-        button_label = Button(button_confirm_task_frame, text="CONFIRM SETTINGS", fg="white", bg="#303030", bd=0,
-                              font=("Montserrat Light", 12), command=lambda: SystemFunctions.confirm_task_change(),
-                              width=20)
-        button_label.pack()
-
-    @staticmethod
-    def create_connection_container():
-        """Create the connection container in the sidebar."""
-        Configuration.sidebar_add_connection_container = Frame(Configuration.sidebar, bd=0, bg="#303030")
-
-        # Create a frame to simulate the button appearance
-        button_add_mutex_frame = Frame(Configuration.sidebar_add_connection_container, bg="#303030", bd=1,
-                                       relief="solid",
-                                       highlightbackground=Configuration.task_color,
-                                       highlightthickness=1)
-        button_add_mutex_frame.pack(side=BOTTOM, anchor=N, padx=10, pady=10)
-
-        # Create a label inside the frame to display button text
-        button_label = Button(button_add_mutex_frame, text="ADD MUTEX", fg="white", bg="#303030", bd=0,
-                              font=("Montserrat Light", 12), command=lambda: SystemFunctions.add_new_mutex(),
-                              width=20)
-        button_label.pack()
-
-        # Create a frame to simulate the button appearance
-        button_add_connection_frame = Frame(Configuration.sidebar_add_connection_container, bg="#303030", bd=1,
-                                            relief="solid",
-                                            highlightbackground=Configuration.task_color,
-                                            highlightthickness=1)
-        button_add_connection_frame.pack(side=BOTTOM, anchor=N, padx=10, pady=10)
-
-        # Create a label inside the frame to display button text
-        button_label = Button(button_add_connection_frame, text="ADD CONNECTION", fg="white", bg="#303030", bd=0,
-                              font=("Montserrat Light", 12), command=lambda: SystemFunctions.add_connection(),
-                              width=20)
-        button_label.pack()
-
-    @staticmethod
-    def create_mutex_container():
-        """Create the mutex container in the sidebar."""
-        Configuration.sidebar_add_mutex_container = Frame(Configuration.sidebar, bd=0, bg="#303030")
-
-        # Create a frame to simulate the button appearance
-        button_add_mutex_frame = Frame(Configuration.sidebar_add_mutex_container, bg="#303030", bd=1,
-                                       relief="solid",
-                                       highlightbackground=Configuration.task_color,
-                                       highlightthickness=1)
-        button_add_mutex_frame.pack(side=BOTTOM, anchor=N, padx=10, pady=10)
-
-        # Create a label inside the frame to display button text
-        button_label = Button(button_add_mutex_frame, text="ADD MUTEX", fg="white", bg="#303030", bd=0,
-                              font=("Montserrat Light", 12), command=lambda: SystemFunctions.add_new_mutex(),
-                              width=20)
-        button_label.pack()
-
-    @staticmethod
-    def create_or_connection_container():
-        """Create the OR connection container in the sidebar."""
-        Configuration.sidebar_add_or_connection_container = Frame(Configuration.sidebar, bd=0, bg="#303030")
-
-        # Create a frame to simulate the button appearance
-        button_add_or_connection_frame = Frame(Configuration.sidebar_add_or_connection_container, bg="#303030", bd=1,
-                                               relief="solid",
-                                               highlightbackground=Configuration.task_color,
-                                               highlightthickness=1)
-        button_add_or_connection_frame.pack(side=BOTTOM, anchor=N, padx=10, pady=10)
-
-        # Create a label inside the frame to display button text
-        button_label = Button(button_add_or_connection_frame, text="ADD OR CONNECTION", fg="white", bg="#303030", bd=0,
-                              font=("Montserrat Light", 12), command=lambda: SystemFunctions.add_or_connection(),
-                              width=20)
-        button_label.pack()
-
-    @staticmethod
-    def create_edit_connection_container():
-        """Edit connection container in the sidebar."""
-        Configuration.sidebar_edit_connection_container = Frame(Configuration.sidebar, bd=0, bg="#303030")
-
-        connection_name_frame = Frame(Configuration.sidebar_edit_connection_container, bd=0, bg="#2A2A2A", height=30)
-        connection_name_frame.place(relx=0, rely=0, x=15, y=100)
-        connection_name_title = Label(connection_name_frame, text="Initial semaphore value", font=("Montserrat Light", 10), bg="#2A2A2A",
-                                fg="white", width=15)
-        connection_name_title.pack(side=TOP, anchor=N, padx=0, pady=5)
-        connection_name_input = Entry(connection_name_frame, font=("Montserrat Light", 10), bd=0, bg="#303030", fg="white",
-                                insertbackground="white", width=20, textvariable=Configuration.sidebar_connection_input,
-                                borderwidth=10, relief="flat")
-        connection_name_input.pack(side=TOP, anchor=N, padx=15, pady=15)
-
-        # Create a frame to simulate the button appearance
-        button_add_or_connection_frame = Frame(Configuration.sidebar_edit_connection_container, bg="#303030", bd=1,
-                                               relief="solid",
-                                               highlightbackground=Configuration.task_color,
-                                               highlightthickness=1)
-        button_add_or_connection_frame.pack(side=BOTTOM, anchor=N, padx=10, pady=10)
-
-        # Create a label inside the frame to display button text
-        button_label = Button(button_add_or_connection_frame, text="CONFIRM SETTINGS", fg="white", bg="#303030", bd=0,
-                              font=("Montserrat Light", 12), command=lambda: SystemFunctions.set_semaphore_value(),
-                              width=20)
-        button_label.pack()
-
-    @staticmethod
-    def set_semaphore_value():
-        """Set the semaphore value for the selected connection."""
-        Configuration.selected_connection.semaphore_value = int(Configuration.sidebar_connection_input.get())
-
-        for list_entry in Configuration.connector_objects:
-            if list_entry[4] == Configuration.selected_connection:
-                list_entry[3] = Configuration.selected_connection.semaphore_value
-                break
-
-        Configuration.selected_connection.update_visuals()
+"""
+This module defines the Configuration class, which manages the configuration
+settings and state of the application. It includes methods for handling task
+selection, updating the sidebar, and deleting selected tasks.
+"""
+import time
+from collections import deque
+from tkinter import *
+import customtkinter
+from General.SimulationEngine import SimulationEngine
+from General.Log import GUI_LOG, Debug
+
+
+class Configuration:
+    """
+    A class to manage the configuration settings and state of the application.
+    """
+
+    # Class variables to store task, connector, and mutex objects
+    task_objects = []
+    connector_objects = []
+    mutex_objects = {}
+
+    # Headless simulation core holding the models and the step number
+    engine = SimulationEngine()
+
+    # Variables to store references to the canvas and root window
+    canvas = None
+    root = None
+
+    # Variables to store references to sidebar elements
+    sidebar = None
+    sidebar_edit_task_container = None
+    sidebar_add_connection_container = None
+    sidebar_add_mutex_container = None
+    sidebar_add_or_connection_container = None
+    sidebar_edit_connection_container = None
+    sidebar_connection_input = None
+    sidebar_task_input = None
+    sidebar_activity_input = None
+    sidebar_cycles_input = None
+    sidebar_priority_input = None
+    sidebar_simulation = None
+
+    # Variable to store reference to the simulation sidebar
+    simulation_sidebar = None
+    dynamic_value_label = None
+
+    # Dictionaries to store selected tasks and connection
+    selected_tasks = {}
+    selected_connection = None
+
+    # Variable to indicate edit mode
+    edit_mode = False
+
+    # Variables to store font styles
+    font_black = None
+    font_light = None
+
+    # Variables to store arrow colors
+    arrow_color = "#767676"
+    arrow_color_selected = "#464646"
+    activity_arrow_color = "#029cff"
+    activity_arrow_color_selected = "#0065a6"
+    mutex_color = "#464646"
+
+    # Variables to store task colors
+    task_color = "#029cff"
+    task_color_selected = "#00335c"
+    task_color_running = "red"
+
+    # Variable to store the last import file path
+    last_import_file_path = ""
+
+    # Variables to store the available mutex types
+    available_mutex_types = ['Priority Ceiling', 'Priority Inversion', 'Ticket Lock', 'First Come First Serve']
+    selected_mutex_type = 'First Come First Serve'
+
+    # Variables to store auto run settings
+    current_delay = 1000
+    auto_run = False
+    show_simulation_container = False
+
+    # Batch run settings: while render_suspended is set the views ignore model
+    # changes and are refreshed every batch_refresh_steps steps (0 = only at the end)
+    render_suspended = False
+    batch_run_steps = 10000
+    batch_refresh_steps = 0
+
+    # Animation settings: frame period in ms and the maximum number of
+    # animations in flight (further ones are dropped)
+    animation_frame_interval = 16
+    max_animations = 200
+
+    # Viewport settings: the current zoom factor (1 draws the full views,
+    # smaller factors simplified glyphs), the factor of one zoom step, the
+    # smallest zoom factor and the margin in pixels around the window within
+    # which views keep their canvas items
+    zoom = 1.0
+    zoom_step = 1.25
+    min_zoom = 0.02
+    viewport_margin = 100
+
+    # Checkpoint settings: the engine keeps a snapshot every checkpoint_interval
+    # steps (0 = never), at most max_checkpoints of them; "Rewind" goes back
+    # rewind_steps steps. snapshot holds the state saved by "Take snapshot".
+    checkpoint_interval = 1000
+    max_checkpoints = 50
+    rewind_steps = 100
+    snapshot = None
+
+    # Memory cap of the undo log behind "Previous step", in recorded changes (0 = no undo)
+    max_delta_log_changes = 1000000
+
+    # Upper bound of steps "Analyze chart" explores before giving up
+    analysis_max_steps = 20000
+
+    # Limits of "Explore schedules", the last exploration report and the
+    # visiting orders still to replay from a counterexample trace
+    exploration_max_states = 100000
+    exploration_report = None
+    replay_orders = None
+
+    # Number of iterations of the force-directed layout ("Arrange by forces")
+    layout_iterations = 100
+
+    # Settling of the tasks around an edit: tasks within layout_hops connectors
+    # of the new task or connector move, relaxed for at most layout_frame_budget
+    # ms per frame and animated for at least layout_animation_time ms
+    # (auto_layout = False leaves new tasks where they are added)
+    auto_layout = True
+    layout_hops = 2
+    layout_frame_budget = 8
+    layout_animation_time = 300
+
+    # Recorder of the events of the running simulation ("Record event trace"),
+    # None while nothing was recorded
+    event_trace = None
+
+    # Level of the messages written to stderr ("DEBUG", "INFO", "WARNING", ...)
+    # and levels of single subsystems, e.g. {"mutex": "DEBUG"} (see General.Log)
+    log_level = "INFO"
+    log_levels = {}
+
+    # Step profiler ("Profile steps", see General.StepProfiler): the running
+    # profiler, the number of steps per phase histogram, how often the sidebar
+    # summary is updated (in steps) and the file the summary is written to
+    step_profiler = None
+    profile_window = 1000
+    profile_refresh_steps = 10
+    profile_output = "step_profile.json"
+    profile_label = None
+
+
+class SystemFunctions:
+    @staticmethod
+    def set_mutex_type(new_type_name):
+        Configuration.selected_mutex_type = new_type_name
+
+    @staticmethod
+    def clear_general_variables():
+        """
+        Clear the general variables, including task objects, connector objects,
+        mutex objects, step number, selected tasks, and selected connection.
+        """
+        from General.Animator import Animator
+        from General.Viewport import Viewport
+        Animator.cancel_all()
+        Viewport.clear()
+
+        # The recording keeps the events of the replaced engine, so they can still be saved
+        if Configuration.event_trace is not None and Configuration.event_trace.engine is Configuration.engine:
+            Configuration.event_trace.detach()
+
+        Configuration.task_objects.clear()
+        Configuration.connector_objects.clear()
+        Configuration.mutex_objects.clear()
+        Configuration.engine = SimulationEngine()
+        if Configuration.step_profiler is not None:
+            Configuration.step_profiler.attach(Configuration.engine)
+        Configuration.engine.set_checkpoints(Configuration.checkpoint_interval, Configuration.max_checkpoints)
+        Configuration.engine.set_delta_log(Configuration.max_delta_log_changes)
+        Configuration.snapshot = None
+        Configuration.replay_orders = None
+        Configuration.selected_tasks.clear()
+        Configuration.selected_connection = None
+
+    @staticmethod
+    def clear_canvas():
+        """Clear the canvas and reset general variables."""
+        SystemFunctions.clear_general_variables()
+        Configuration.canvas.delete("all")
+
+    @staticmethod
+    def add_task():
+        """Add a new task to the canvas."""
+        from Objects.DraggableTask import DraggableTask
+        from General.Viewport import Viewport
+
+        task_name = str(len(Configuration.task_objects) + 1)
+        activity_name = "a"
+
+        if Debug.gui:
+            GUI_LOG.debug("Add task")
+        x, y = Viewport.center()
+        model = Configuration.engine.create_task(task_name, activity_name, 1, 0, x, y)
+        new_task = DraggableTask(model, 50)
+        Configuration.task_objects.append(new_task)
+
+        SystemFunctions.settle_tasks([new_task], [new_task])
+
+    @staticmethod
+    def arrange_tasks(method="layered"):
+        """
+        Place all tasks automatically and show the whole chart.
+
+        Args:
+            method (str, optional): "layered" for layers from top to bottom along the
+                connectors, "force" for a force-directed layout. Defaults to "layered".
+        """
+        from General.ChartLayout import force_layout, layered_layout
+        from General.Viewport import Viewport
+
+        if method == "force":
+            force_layout(Configuration.engine, Configuration.layout_iterations)
+        else:
+            layered_layout(Configuration.engine)
+
+        Viewport.tasks_moved()
+        Viewport.show_chart()
+
+    @staticmethod
+    def collapse_activities():
+        """
+        Show all activities of a task as one compound node: of the tasks of the selected
+        activities or, without a selection, of every task with more than one activity.
+        """
+        from Objects.TaskGroup import TaskGroup
+        from General.Viewport import Viewport
+
+        task_names = {task.task_name for task in Configuration.selected_tasks}
+        members_by_name = {}
+        for task in Configuration.task_objects:
+            if task not in Viewport.group_of and (not task_names or task.task_name in task_names):
+                members_by_name.setdefault(task.task_name, []).append(task)
+
+        # The collapsed activities cannot be clicked, so they are deselected
+        for task in Configuration.selected_tasks:
+            task.selected = False
+            task.refresh()
+        Configuration.selected_tasks.clear()
+        SystemFunctions._update_sidebar()
+
+        for members in members_by_name.values():
+            if len(members) > 1:
+                Viewport.add_group(TaskGroup(members))
+        SystemFunctions.update_group_connections()
+
+    @staticmethod
+    def expand_activities(group=None):
+        """
+        Show the activities of collapsed tasks again.
+
+        Args:
+            group (TaskGroup, optional): The compound node to expand. Defaults to all of them.
+        """
+        from General.Viewport import Viewport
+
+        for expanded_group in [group] if group is not None else list(Viewport.groups):
+            Viewport.remove_group(expanded_group)
+        SystemFunctions.update_group_connections()
+
+    @staticmethod
+    def update_group_connections():
+        """Draw the connectors touching collapsed tasks as one line per pair of nodes."""
+        from Objects.Connection.GroupConnection import GroupConnection
+        from General.Viewport import Viewport
+
+        connectors_by_nodes = {}  # STRUCTURE: {(source node, target node): [ConnectionBase]}
+        grouped_connectors = []
+        for connector in dict.fromkeys(entry[4] for entry in Configuration.connector_objects):
+            sources = []
+            targets = []
+            for model, position in connector.model.tasks.items():
+                task = Viewport.views_by_model.get(model)
+                if task is None:
+                    continue
+                node = Viewport.group_of.get(task, task)
+                (targets if position == "end" else sources).append(node)
+
+            if not any(node in Viewport.groups for node in sources + targets):
+                continue
+
+            grouped_connectors.append(connector)
+            for source in sources:
+                for target in targets:
+                    # Connectors between activities of one collapsed task are left out
+                    if source is not target:
+                        connectors_by_nodes.setdefault((source, target), []).append(connector)
+
+        Viewport.set_group_connections([GroupConnection(source, target, connectors)
+                                        for (source, target), connectors in connectors_by_nodes.items()],
+                                       grouped_connectors)
+
+    @staticmethod
+    def settle_tasks(tasks, new_tasks=()):
+        """
+        Move the tasks around an edit to better places, animated over the next frames.
+
+        Only the tasks within Configuration.layout_hops connectors of the edited
+        tasks move; the rest of the chart stays where it is.
+
+        Args:
+            tasks (list): The edited task views, e.g. the tasks of a new connector.
+            new_tasks (list, optional): The edited task views that were just added.
+        """
+        from General.Animator import Animator
+        from General.ChartLayout import IncrementalLayout
+        from General.LayoutAnimation import LayoutAnimation
+        from General.Viewport import Viewport
+
+        if not Configuration.auto_layout:
+            return
+
+        layout = IncrementalLayout(Configuration.engine, [task.model for task in tasks],
+                                   [task.model for task in new_tasks], Configuration.layout_hops,
+                                   Configuration.layout_iterations, nearby=Viewport.models_in)
+        Animator.start(LayoutAnimation, LayoutAnimation(layout))
+
+    @staticmethod
+    def add_connection():
+        """Add a new connection to the canvas."""
+        from Objects.Connection.ConnectionActivity import ConnectionActivity
+        from Objects.Connection.ConnectionTask import ConnectionTask
+
+        name = "Connection" + str(len(Configuration.connector_objects) + 1)
+
+        if Debug.gui:
+            GUI_LOG.debug("Add connection")
+        origin_task = \
+        [task_object for task_object, position in Configuration.selected_tasks.items() if str(position) == str(1)][0]
+        target_task = \
+        [task_object for task_object, position in Configuration.selected_tasks.items() if str(position) == str(2)][0]
+
+        new_offset = 0
+        for connection in origin_task.connectors:
+            if connection in target_task.connectors:
+                connection.offset = 50
+                new_offset = -50
+
+        is_activity_connection = origin_task.task_name == target_task.task_name
+        model = Configuration.engine.create_connection(name, 0, new_offset, is_activity_connection)
+        if is_activity_connection:
+            new_connection = ConnectionActivity(model)
+        else:
+            new_connection = ConnectionTask(model)
+
+        origin_task.add_connector(new_connection, "start")
+        target_task.add_connector(new_connection, "end")
+
+        origin_task.update_connections()
+        target_task.update_connections()
+
+        start_task_name = origin_task.task_name + origin_task.activity_name
+        connector_name = new_connection.name
+        end_task_name = target_task.task_name + target_task.activity_name
+        initial_value = 0
+
+        Configuration.connector_objects.append([start_task_name, connector_name, end_task_name, initial_value, new_connection])
+
+        SystemFunctions.settle_tasks([origin_task, target_task])
+
+    @staticmethod
+    def add_or_connection():
+        """Add an OR connection to the canvas."""
+        from General.Viewport import Viewport
+
+        sel_task = \
+        [task_object for task_object, position in Configuration.selected_tasks.items() if str(position) == str(1)][0]
+
+        Configuration.selected_connection.add_or_connection(sel_task)
+        sel_task.add_connector(Configuration.selected_connection, "or")
+        sel_task.update_connections()
+
+        Configuration.connector_objects.append([sel_task.task_name + sel_task.activity_name,
+                                                Configuration.selected_connection.name,
+                                                "",
+                                                0,
+                                                Configuration.selected_connection])
+
+        end_tasks = [task for task, position in Configuration.selected_connection.model.tasks.items()
+                     if position == "end"]
+        SystemFunctions.settle_tasks([sel_task] + [Viewport.views_by_model[task] for task in end_tasks
+                                                   if task in Viewport.views_by_model])
+
+    @staticmethod
+    def add_new_mutex():
+        from Objects.Mutex.MutexView import MutexView
+        from General.Viewport import Viewport
+
+        new_mutex = MutexView(Configuration.engine.create_mutex(Configuration.selected_mutex_type))
+
+        Configuration.mutex_objects.update({
+            new_mutex.name: new_mutex
+        })
+
+        for task in Configuration.selected_tasks:
+            task.add_mutex(new_mutex)
+            new_mutex.add_task(task)
+
+        # The selected tasks are shown, so the mutex is in the visible area as well
+        Viewport.show(new_mutex)
+        new_mutex.update_visuals()
+
+    @staticmethod
+    def select_new_task(new_task):
+        """
+        Select a new task and assign it a unique number.
+
+        Args:
+            new_task: The new task to be selected.
+
+        Returns:
+            int: The assigned unique number for the new task.
+        """
+        SystemFunctions.select_tasks([new_task])
+
+        return Configuration.selected_tasks[new_task]
+
+    @staticmethod
+    def select_tasks(new_tasks):
+        """
+        Select several tasks at once, e.g. from a selection rectangle, and
+        assign them the lowest unused numbers in the given order.
+
+        Args:
+            new_tasks (list): The tasks to be selected. Tasks selected already keep their number.
+        """
+        used_numbers = set(Configuration.selected_tasks.values())
+        new_number = 0
+        for task in new_tasks:
+            if task in Configuration.selected_tasks:
+                continue
+
+            new_number += 1
+            while new_number in used_numbers:
+                new_number += 1
+            Configuration.selected_tasks[task] = new_number
+
+        SystemFunctions._update_sidebar()
+
+    @staticmethod
+    def remove_selected_task(task):
+        """
+        Remove a selected task from the selected_tasks dictionary.
+
+        Args:
+            task: The task to be removed from the selection.
+        """
+        Configuration.selected_tasks.pop(task)
+        SystemFunctions._update_sidebar()
+
+    @staticmethod
+    def confirm_task_change():
+        """
+        Confirm the changes made to a task by updating its properties based on
+        the sidebar inputs and update the task's visuals.
+        """
+        task = list(Configuration.selected_tasks.keys())[0]
+
+        task_input = Configuration.sidebar_task_input.get()
+        activity_input = Configuration.sidebar_activity_input.get()
+        cycle_input = Configuration.sidebar_cycles_input.get()
+        priority_input = Configuration.sidebar_priority_input.get()
+
+        task.task_name = task_input
+        task.activity_name = activity_input
+        task.task_max_cycles = cycle_input
+        task.original_priority = priority_input
+        Configuration.engine.invalidate_ready()
+
+        task.update_visuals()
+
+        # The mutex names are built from the task names
+        for mutex in task.mutexes:
+            mutex.invalidate()
+            mutex.update_visuals()
+
+    @staticmethod
+    def _update_sidebar():
+        """
+        Update the sidebar based on the currently selected tasks and connection.
+        Show/hide the appropriate sidebar containers based on the selection.
+        """
+        SystemFunctions.toggle_sidebar(True)
+        if Configuration.selected_connection is not None and len(Configuration.selected_tasks) == 0:
+
+            for list_entry in Configuration.connector_objects:
+                if list_entry[4] == Configuration.selected_connection:
+                    Configuration.sidebar_connection_input.set(list_entry[3])
+                    break
+
+            Configuration.sidebar_edit_connection_container.pack(
+                fill="both", expand=True
+            )
+            Configuration.sidebar_add_or_connection_container.pack_forget()
+            Configuration.sidebar_add_connection_container.pack_forget()
+            Configuration.sidebar_edit_task_container.pack_forget()
+            Configuration.sidebar_add_mutex_container.pack_forget()
+            Configuration.sidebar_simulation.pack_forget()
+        elif len(Configuration.selected_tasks) > 0:
+            Configuration.sidebar_edit_connection_container.pack_forget()
+
+            if Configuration.selected_connection is not None:
+                Configuration.sidebar_add_or_connection_container.pack(
+                    fill="both", expand=True
+                )
+                Configuration.sidebar_add_connection_container.pack_forget()
+                Configuration.sidebar_edit_task_container.pack_forget()
+                Configuration.sidebar_add_mutex_container.pack_forget()
+                Configuration.sidebar_simulation.pack_forget()
+            elif len(Configuration.selected_tasks) == 2:
+                Configuration.sidebar_add_connection_container.pack(
+                    fill="both", expand=True
+                )
+                Configuration.sidebar_edit_task_container.pack_forget()
+                Configuration.sidebar_add_mutex_container.pack_forget()
+                Configuration.sidebar_add_or_connection_container.pack_forget()
+                Configuration.sidebar_simulation.pack_forget()
+            elif len(Configuration.selected_tasks) == 1:
+                Configuration.sidebar_priority_input.set(list(Configuration.selected_tasks.keys())[0].original_priority)
+                Configuration.sidebar_edit_task_container.pack(
+                    fill="both", expand=True
+                )
+                Configuration.sidebar_add_connection_container.pack_forget()
+                Configuration.sidebar_add_mutex_container.pack_forget()
+                Configuration.sidebar_add_or_connection_container.pack_forget()
+                Configuration.sidebar_simulation.pack_forget()
+            else:
+                Configuration.sidebar_add_mutex_container.pack(
+                    fill="both", expand=True
+                )
+                Configuration.sidebar_edit_task_container.pack_forget()
+                Configuration.sidebar_add_connection_container.pack_forget()
+                Configuration.sidebar_add_or_connection_container.pack_forget()
+                Configuration.sidebar_simulation.pack_forget()
+
+            Configuration.sidebar_task_input.set(
+                list(Configuration.selected_tasks.keys())[0].task_name
+            )
+            Configuration.sidebar_activity_input.set(
+                list(Configuration.selected_tasks.keys())[0].activity_name
+            )
+            Configuration.sidebar_cycles_input.set(
+                list(Configuration.selected_tasks.keys())[0].task_max_cycles
+            )
+        elif Configuration.show_simulation_container:
+            Configuration.sidebar_simulation.pack(
+                fill="both", expand=True
+            )
+            Configuration.sidebar_add_connection_container.pack_forget()
+            Configuration.sidebar_edit_task_container.pack_forget()
+            Configuration.sidebar_add_mutex_container.pack_forget()
+            Configuration.sidebar_add_or_connection_container.pack_forget()
+            Configuration.sidebar_edit_connection_container.pack_forget()
+        else:
+            SystemFunctions.toggle_sidebar(False)
+
+    @staticmethod
+    def toggle_sidebar(show=True):
+        """
+        Toggle the visibility of the sidebar with an animation effect.
+
+        Args:
+            show (bool): Whether to show or hide the sidebar. Defaults to True.
+        """
+        from threading import Thread
+        t = Thread(target=SystemFunctions._sidebar_animation, args=(show,))
+        t.start()
+
+    @staticmethod
+    def _sidebar_animation(show):
+        """
+        Animate the sidebar to show or hide based on the show parameter.
+
+        :param show: Whether to show or hide the sidebar.
+        :return:
+        """
+
+        if Configuration.sidebar.winfo_x() == -300 and show:
+            for i in range(0, 301, 10):
+                Configuration.canvas.place(x=i, relwidth=1.0, relheight=1.0)
+                Configuration.sidebar.place(relx=0, rely=0, relheight=1, x=-300 + i)
+                Configuration.sidebar.update()
+                time.sleep(0.001)
+        elif Configuration.sidebar.winfo_x() == 0 and not show:
+            for i in range(0, 301, 10):
+                Configuration.canvas.place(x=300 - i)
+                Configuration.sidebar.place(relx=0, rely=0, relheight=1, x=-i)
+                Configuration.sidebar.update()
+                time.sleep(0.001)
+
+    @staticmethod
+    def delete_selection():
+        """
+        Delete the selected tasks and their associated connectors.
+        Update the task objects, connector objects, and selected tasks accordingly.
+        """
+        from General.Viewport import Viewport
+
+        for task in Configuration.selected_tasks:
+            con_cpy = task.connectors.copy()
+            for connector in con_cpy:
+                for task2 in Configuration.task_objects:
+                    if connector in task2.connectors:
+                        task2.remove_connector(connector)
+                        task2.update_connections()
+                        connector.delete()
+                Configuration.engine.remove_connection(connector.model)
+
+            to_del_cons = []
+            for con_obj in Configuration.connector_objects:
+                if task.task_name + task.activity_name in con_obj:
+                    to_del_cons.append(con_obj)
+
+            for con_obj in to_del_cons:
+                Configuration.connector_objects.remove(con_obj)
+
+            Configuration.task_objects.remove(task)
+            Configuration.engine.remove_task(task.model)
+            task.delete()
+
+        Configuration.selected_tasks.clear()
+
+        # Lines of collapsed tasks may stand for deleted connectors
+        if Viewport.groups:
+            SystemFunctions.update_group_connections()
+
+    # Simulation sidebar methods
+    @staticmethod
+    def toggle_simulation_sidebar():
+        """Toggle visibility of the simulation sidebar."""
+        if Configuration.edit_mode:
+            return
+
+        Configuration.show_simulation_container = not Configuration.show_simulation_container
+        SystemFunctions.toggle_sidebar(Configuration.show_simulation_container)
+        SystemFunctions._update_sidebar()
+
+    @staticmethod
+    def update_speed_value():
+        """Update the displayed speed value."""
+        Configuration.dynamic_value_label.configure(text=f"Period per Cycle: {Configuration.current_delay}ms")
+
+    @staticmethod
+    def update_simulation_speed(value):
+        """Update the simulation speed based on the slider value."""
+        # Convert slider value to a delay (in milliseconds)
+        Configuration.current_delay = int(3000 + 1 - value)
+        if Debug.gui:
+            GUI_LOG.debug("Speed set to %s, delay %d ms", value, Configuration.current_delay)
+        SystemFunctions.update_speed_value()
+
+    @staticmethod
+    def step():
+        """Perform a single step in the simulation."""
+        if Debug.gui:
+            GUI_LOG.debug("Step %d", Configuration.engine.step_number + 1)
+        if Configuration.replay_orders:
+            # Follow the schedule of the counterexample being replayed
+            order = Configuration.replay_orders.popleft()
+            Configuration.engine.step([Configuration.engine.tasks[index] for index in order])
+            if not Configuration.replay_orders:
+                GUI_LOG.info("End of trace")
+        else:
+            Configuration.engine.step()
+
+        profiler = Configuration.step_profiler
+        if profiler is not None:
+            # Let Tk draw now instead of when idle, so drawing is timed as part of the step
+            start = time.perf_counter()
+            Configuration.root.update_idletasks()
+            profiler.add("redraw", time.perf_counter() - start)
+            if Configuration.engine.step_number % Configuration.profile_refresh_steps == 0:
+                SystemFunctions.update_profile_label()
+
+    @staticmethod
+    def toggle_profiler():
+        """Start timing the phases of every step, or stop and write the summary to Configuration.profile_output."""
+        if Configuration.step_profiler is not None:
+            SystemFunctions.stop_profiler()
+            return
+
+        from General.StepProfiler import StepProfiler
+        from Objects.DraggableTask import DraggableTask
+        from Objects.TaskGroup import TaskGroup
+        from Objects.Connection.ConnectionBase import ConnectionBase
+        from Objects.Connection.GroupConnection import GroupConnection
+        from Objects.Mutex.MutexView import MutexView
+
+        profiler = StepProfiler(Configuration.engine, Configuration.profile_window)
+        for view_class in (DraggableTask, TaskGroup, ConnectionBase, GroupConnection, MutexView):
+            profiler.instrument(view_class)
+        Configuration.step_profiler = profiler
+        GUI_LOG.info("Profiling steps")
+
+    @staticmethod
+    def stop_profiler():
+        """Stop timing the steps and write the summary to Configuration.profile_output."""
+        profiler = Configuration.step_profiler
+        if profiler is None:
+            return
+
+        profiler.detach()
+        Configuration.step_profiler = None
+        if Configuration.profile_label is not None:
+            Configuration.profile_label.configure(text="")
+        if profiler.summary():
+            profiler.write(Configuration.profile_output)
+            GUI_LOG.info("Step profile written to %s", Configuration.profile_output)
+
+    @staticmethod
+    def update_profile_label():
+        """Show the median and 95th percentile of every phase and its histogram in the simulation sidebar."""
+        if Configuration.profile_label is None:
+            return
+
+        header = f"{'phase':<10} {'p50 ms':>7} {'p95 ms':>7}"
+        Configuration.profile_label.configure(text="\n".join([header] + Configuration.step_profiler.summary_lines()))
+
+    @staticmethod
+    def step_back():
+        """Undo the last step of the simulation."""
+        if not Configuration.engine.step_back():
+            GUI_LOG.warning("No step to undo")
+
+    @staticmethod
+    def analyze_chart():
+        """Check the loaded chart for deadlocks, unbounded semaphores and starving tasks."""
+        from General.ChartAnalyzer import analyze_chart
+
+        report = analyze_chart(Configuration.engine, Configuration.analysis_max_steps)
+        GUI_LOG.info("\n".join(report.summary()))
+
+    @staticmethod
+    def explore_schedules():
+        """Explore every schedule of the loaded chart for deadlocks, races and unbounded semaphores."""
+        from General.StateExplorer import explore_chart
+
+        report = explore_chart(Configuration.engine, Configuration.exploration_max_states)
+        Configuration.exploration_report = report
+        GUI_LOG.info("\n".join(report.summary()))
+
+    @staticmethod
+    def replay_counterexample():
+        """Show the start state of the first counterexample found by explore_schedules() for replay."""
+        from General.FileOperations import show_engine
+        from General.ProjectFile import engine_from_lines
+
+        report = Configuration.exploration_report
+        if report is None or not report.counterexamples:
+            GUI_LOG.warning("No counterexample to replay")
+            return
+
+        counterexample = report.counterexamples[0]
+        show_engine(engine_from_lines(report.start_lines))
+        SystemFunctions.start_replay(counterexample.orders, f"{counterexample.kind}: {counterexample.description}")
+
+    @staticmethod
+    def start_replay(orders, description):
+        """
+        Let the next steps follow the visiting orders of a counterexample.
+
+        Args:
+            orders (list): The visiting order of every step, as lists of task indices.
+            description (str): The problem the orders lead to.
+        """
+        Configuration.replay_orders = deque(orders)
+        GUI_LOG.info("Replaying %d steps leading to %s", len(orders), description)
+
+    @staticmethod
+    def record_event_trace():
+        """Start recording the events of the simulation, discarding the previous recording."""
+        from General.EventTrace import EventTrace
+
+        if Configuration.event_trace is not None and Configuration.event_trace.engine is Configuration.engine:
+            Configuration.event_trace.detach()
+
+        Configuration.event_trace = EventTrace(Configuration.engine)
+        GUI_LOG.info("Recording events from step %d", Configuration.engine.step_number)
+
+    @staticmethod
+    def show_timeline(events=None):
+        """
+        Show a Gantt chart of the task cycles and mutex holdings in a new window.
+
+        Args:
+            events (DataFrame, optional): The events to show. Defaults to the recording of record_event_trace().
+        """
+        from General.EventTrace import draw_timeline, timeline
+
+        if events is None:
+            if Configuration.event_trace is None:
+                GUI_LOG.warning("No event trace recorded")
+                return
+            events = Configuration.event_trace.to_frame()
+
+        window = customtkinter.CTkToplevel(Configuration.root)
+        window.title("Timeline")
+        window.geometry("900x500")
+
+        canvas = Canvas(window, bd=0, highlightthickness=0, background=Configuration.root['bg'])
+        horizontal_scrollbar = customtkinter.CTkScrollbar(window, orientation="horizontal", command=canvas.xview)
+        vertical_scrollbar = customtkinter.CTkScrollbar(window, orientation="vertical", command=canvas.yview)
+        canvas.configure(xscrollcommand=horizontal_scrollbar.set, yscrollcommand=vertical_scrollbar.set)
+        horizontal_scrollbar.pack(side=BOTTOM, fill=X)
+        vertical_scrollbar.pack(side=RIGHT, fill=Y)
+        canvas.pack(fill=BOTH, expand=True)
+
+        draw_timeline(canvas, timeline(events))
+
+    @staticmethod
+    def refresh_views():
+        """Redraw all task, connector and mutex views from the current model state."""
+        from General.Viewport import Viewport
+
+        for task in Configuration.task_objects:
+            task.refresh()
+
+        for group in Viewport.groups:
+            group.refresh()
+
+        for connection in Viewport.group_connections:
+            connection.refresh()
+
+        for connector in Configuration.connector_objects:
+            connector[4].update_visuals()
+
+        for mutex in list(Configuration.mutex_objects.values()):
+            mutex.update_visuals()
+
+    @staticmethod
+    def _refresh_during_batch(engine):
+        """Refresh the views in the middle of a batch run and let Tk paint them."""
+        SystemFunctions.refresh_views()
+        Configuration.canvas.update_idletasks()
+
+    @staticmethod
+    def run(steps=None, refresh_every=None):
+        """
+        Advance the simulation by a number of steps without redrawing every step.
+
+        Args:
+            steps (int, optional): The number of steps. Defaults to Configuration.batch_run_steps.
+            refresh_every (int, optional): Redraw every K steps. Defaults to
+                Configuration.batch_refresh_steps, 0 redraws only at the end.
+        """
+        steps = Configuration.batch_run_steps if steps is None else steps
+        refresh_every = Configuration.batch_refresh_steps if refresh_every is None else refresh_every
+
+        Configuration.render_suspended = True
+        try:
+            Configuration.engine.run(steps, SystemFunctions._refresh_during_batch, refresh_every)
+        finally:
+            Configuration.render_suspended = False
+            SystemFunctions.refresh_views()
+
+    @staticmethod
+    def run_until(predicate, max_steps=None, refresh_every=None):
+        """
+        Advance the simulation until predicate(engine) is true, without redrawing every step.
+
+        Args:
+            predicate (callable): Checked with the engine after every step.
+            max_steps (int, optional): Upper bound of steps. Defaults to Configuration.batch_run_steps.
+            refresh_every (int, optional): Redraw every K steps. Defaults to
+                Configuration.batch_refresh_steps, 0 redraws only at the end.
+
+        Returns:
+            bool: True if the predicate was met, False if max_steps ran out first.
+        """
+        max_steps = Configuration.batch_run_steps if max_steps is None else max_steps
+        refresh_every = Configuration.batch_refresh_steps if refresh_every is None else refresh_every
+
+        Configuration.render_suspended = True
+        try:
+            reached = Configuration.engine.run_until(predicate, max_steps,
+                                                     SystemFunctions._refresh_during_batch, refresh_every)
+        finally:
+            Configuration.render_suspended = False
+            SystemFunctions.refresh_views()
+
+        GUI_LOG.info("Stopped at step %d - %s", Configuration.engine.step_number,
+                     "predicate met" if reached else "step limit reached")
+        return reached
+
+    @staticmethod
+    def run_until_quiescent():
+        """Advance the simulation until a step changes nothing (finished or deadlocked chart)."""
+        return SystemFunctions.run_until(SimulationEngine.is_quiescent)
+
+    @staticmethod
+    def take_snapshot():
+        """Save the current simulation state, to be restored by restore_snapshot()."""
+        Configuration.snapshot = Configuration.engine.snapshot()
+        GUI_LOG.info("Snapshot taken at step %d", Configuration.engine.step_number)
+
+    @staticmethod
+    def restore_snapshot():
+        """Restore the simulation state saved by take_snapshot() and redraw the views."""
+        if Configuration.snapshot is None:
+            GUI_LOG.warning("No snapshot taken")
+            return
+
+        try:
+            Configuration.engine.restore(Configuration.snapshot)
+        except ValueError as error:
+            GUI_LOG.warning(error)
+            return
+
+        SystemFunctions.refresh_views()
+        GUI_LOG.info("Restored step %d", Configuration.engine.step_number)
+
+    @staticmethod
+    def rewind(steps=None):
+        """
+        Go back a number of steps from the nearest checkpoint, without redrawing every step.
+
+        Args:
+            steps (int, optional): The number of steps. Defaults to Configuration.rewind_steps.
+        """
+        steps = Configuration.rewind_steps if steps is None else steps
+        target_step = max(Configuration.engine.step_number - steps, 0)
+
+        Configuration.render_suspended = True
+        try:
+            reached = Configuration.engine.rewind(target_step)
+        except ValueError as error:
+            GUI_LOG.warning(error)
+            reached = False
+        finally:
+            Configuration.render_suspended = False
+            SystemFunctions.refresh_views()
+
+        if not reached:
+            GUI_LOG.warning("No checkpoint before step %d", target_step)
+
+    @staticmethod
+    def stop_simulation():
+        """Stop the simulation."""
+        Configuration.auto_run = False
+
+    @staticmethod
+    def run_periodically():
+        """Run the simulation periodically based on the current delay."""
+        if Configuration.auto_run:
+            SystemFunctions.step()
+            # Schedule the next call
+            Configuration.root.after(Configuration.current_delay, SystemFunctions.run_periodically)
+
+    @staticmethod
+    def start_simulation():
+        """Start the simulation."""
+        if not Configuration.auto_run:
+            SystemFunctions.update_simulation_speed(value=1)
+            Configuration.auto_run = True
+            SystemFunctions.run_periodically()
+
+    # Create sidebar containers
+    @staticmethod
+    def create_sidebar():
+        """Create the main sidebar."""
+        Configuration.sidebar = Frame(Configuration.root, width=300, bd=0, bg="#303030")
+        Configuration.sidebar.place(relx=0, rely=0, relheight=1, x=-300)
+
+        Configuration.sidebar_task_input = StringVar()
+        Configuration.sidebar_activity_input = StringVar()
+        Configuration.sidebar_cycles_input = IntVar()
+        Configuration.sidebar_connection_input = IntVar()
+        Configuration.sidebar_priority_input = IntVar()
+
+        sidebar_title = Label(Configuration.sidebar, text="Editor", font=("Montserrat Light", 20), bg="#2A2A2A", fg="white",
+                              width=15)
+        sidebar_title.pack(side=TOP, anchor=N, padx=0, pady=10)
+        SystemFunctions.create_edit_task_container()
+        SystemFunctions.create_connection_container()
+        SystemFunctions.create_mutex_container()
+        SystemFunctions.create_or_connection_container()
+        SystemFunctions.create_run_container()
+        SystemFunctions.create_edit_connection_container()
+
+    @staticmethod
+    def create_run_container():
+        """Create the simulation sidebar."""
+        Configuration.sidebar_simulation = Frame(Configuration.sidebar, bd=0, bg="#303030")
+
+        sidebar_title = Label(Configuration.sidebar_simulation, text="Simulation", font=("Montserrat Light", 20), bg="#2A2A2A", fg="white", width=15)
+        sidebar_title.pack(side=TOP, anchor=N, padx=0, pady=10)
+
+        sim_start_button = customtkinter.CTkButton(Configuration.sidebar_simulation, text="Start", command=SystemFunctions.start_simulation)
+        sim_start_button.pack(pady=10, padx=10)
+
+        sim_end_button = customtkinter.CTkButton(Configuration.sidebar_simulation, text="Stop", command=SystemFunctions.stop_simulation)
+        sim_end_button.pack(pady=10, padx=10)
+
+        speed_slider = customtkinter.CTkSlider(Configuration.sidebar_simulation, from_=1, to=3000, number_of_steps=3000)
+        speed_slider.pack(side=customtkinter.TOP, fill=customtkinter.X, padx=10, pady=10)
+        speed_slider.set(1000)  # Set default speed value
+        speed_slider.configure(command=SystemFunctions.update_simulation_speed)
+
+        Configuration.dynamic_value_label = customtkinter.CTkLabel(Configuration.sidebar_simulation, text="Period per Cycle: 1000ms", bg_color=Configuration.root['bg'], fg_color="#303030")
+        Configuration.dynamic_value_label.pack(pady=10)
+
+        Configuration.profile_label = customtkinter.CTkLabel(Configuration.sidebar_simulation, text="", justify="left",
+                                                             font=("Courier", 11), bg_color=Configuration.root['bg'],
+                                                             fg_color="#303030")
+        Configuration.profile_label.pack(pady=10, padx=10)
+
+    @staticmethod
+    def create_edit_task_container():
+        """Create the edit task container in the sidebar."""
+        Configuration.sidebar_edit_task_container = Frame(Configuration.sidebar, bd=0, bg="#303030")
+
+        task_name_frame = Frame(Configuration.sidebar_edit_task_container, bd=0, bg="#2A2A2A", height=30)
+        task_name_frame.place(relx=0, rely=0, x=15, y=100)
+        task_name_title = Label(task_name_frame, text="Task name", font=("Montserrat Light", 10), bg="#2A2A2A",
+                                fg="white", width=15)
+        task_name_title.pack(side=TOP, anchor=N, padx=0, pady=5)
+        task_name_input = Entry(task_name_frame, font=("Montserrat Light", 10), bd=0, bg="#303030", fg="white",
+                                insertbackground="white", width=20, textvariable=Configuration.sidebar_task_input,
+                                borderwidth=10, relief="flat")
+        task_name_input.pack(side=TOP, anchor=N, padx=15, pady=15)
+
+        activity_name_frame = Frame(Configuration.sidebar_edit_task_container, bd=0, bg="#2A2A2A", height=30)
+        activity_name_frame.place(relx=0, rely=0, x=15, y=210)
+        activity_name_title = Label(activity_name_frame, text="Activity name", font=("Montserrat Light", 10),
+                                    bg="#2A2A2A",
+                                    fg="white", width=15)
+        activity_name_title.pack(side=TOP, anchor=N, padx=0, pady=5)
+        activity_name_input = Entry(activity_name_frame, font=("Montserrat Light", 10), bd=0, bg="#303030", fg="white",
+                                    insertbackground="white", width=20,
+                                    textvariable=Configuration.sidebar_activity_input, borderwidth=10, relief="flat")
+        activity_name_input.pack(side=TOP, anchor=N, padx=15, pady=15)
+
+        cycles_frame = Frame(Configuration.sidebar_edit_task_container, bd=0, bg="#2A2A2A", height=30)
+        cycles_frame.place(relx=0, rely=0, x=15, y=320)
+        cycles_title = Label(cycles_frame, text="Amount of cycles", font=("Montserrat Light", 10),
+                             bg="#2A2A2A",
+                             fg="white", width=15)
+        cycles_title.pack(side=TOP, anchor=N, padx=0, pady=5)
+        cycles_input = Entry(cycles_frame, font=("Montserrat Light", 10), bd=0, bg="#303030", fg="white",
+                             insertbackground="white", width=20, textvariable=Configuration.sidebar_cycles_input,
+                             borderwidth=10,
+                             relief="flat")
+        cycles_input.pack(side=TOP, anchor=N, padx=15, pady=15)
+
+        priority_frame = Frame(Configuration.sidebar_edit_task_container, bd=0, bg="#2A2A2A", height=30)
+        priority_frame.place(relx=0, rely=0, x=15, y=430)
+        priority_title = Label(priority_frame, text="Priority", font=("Montserrat Light", 10),
+                             bg="#2A2A2A",
+                             fg="white", width=15)
+        priority_title.pack(side=TOP, anchor=N, padx=0, pady=5)
+        priority_input = Entry(priority_frame, font=("Montserrat Light", 10), bd=0, bg="#303030", fg="white",
+                             insertbackground="white", width=20, textvariable=Configuration.sidebar_priority_input,
+                             borderwidth=10,
+                             relief="flat")
+        priority_input.pack(side=TOP, anchor=N, padx=15, pady=15)
+
+        # Create a frame to simulate the button appearance
+        button_confirm_task_frame = Frame(Configuration.sidebar_edit_task_container, bg="#303030", bd=1, relief="solid",
+                                          highlightbackground=Configuration.task_color,
+                                          highlightthickness=1)
+        button_confirm_task_frame.pack(side=BOTTOM, anchor=N, padx=10, pady=10)
+
+        # Create a label inside the frame to display button text
+        button_label = Button(button_confirm_task_frame, text="CONFIRM SETTINGS", fg="white", bg="#303030", bd=0,
+                              font=("Montserrat Light", 12), command=lambda: SystemFunctions.confirm_task_change(),
+                              width=20)
+        button_label.pack()
+
+    @staticmethod
+    def create_connection_container():
+        """Create the connection container in the sidebar."""
+        Configuration.sidebar_add_connection_container = Frame(Configuration.sidebar, bd=0, bg="#303030")
+
+        # Create a frame to simulate the button appearance
+        button_add_mutex_frame = Frame(Configuration.sidebar_add_connection_container, bg="#303030", bd=1,
+                                       relief="solid",
+                                       highlightbackground=Configuration.task_color,
+                                       highlightthickness=1)
+        button_add_mutex_frame.pack(side=BOTTOM, anchor=N, padx=10, pady=10)
+
+        # Create a label inside the frame to display button text
+        button_label = Button(button_add_mutex_frame, text="ADD MUTEX", fg="white", bg="#303030", bd=0,
+                              font=("Montserrat Light", 12), command=lambda: SystemFunctions.add_new_mutex(),
+                              width=20)
+        button_label.pack()
+
+        # Create a frame to simulate the button appearance
+        button_add_connection_frame = Frame(Configuration.sidebar_add_connection_container, bg="#303030", bd=1,
+                                            relief="solid",
+                                            highlightbackground=Configuration.task_color,
+                                            highlightthickness=1)
+        button_add_connection_frame.pack(side=BOTTOM, anchor=N, padx=10, pady=10)
+
+        # Create a label inside the frame to display button text
+        button_label = Button(button_add_connection_frame, text="ADD CONNECTION", fg="white", bg="#303030", bd=0,
+                              font=("Montserrat Light", 12), command=lambda: SystemFunctions.add_connection(),
+                              width=20)
+        button_label.pack()
+
+    @staticmethod
+    def create_mutex_container():
+        """Create the mutex container in the sidebar."""
+        Configuration.sidebar_add_mutex_container = Frame(Configuration.sidebar, bd=0, bg="#303030")
+
+        # Create a frame to simulate the button appearance
+        button_add_mutex_frame = Frame(Configuration.sidebar_add_mutex_container, bg="#303030", bd=1,
+                                       relief="solid",
+                                       highlightbackground=Configuration.task_color,
+                                       highlightthickness=1)
+        button_add_mutex_frame.pack(side=BOTTOM, anchor=N, padx=10, pady=10)
+
+        # Create a label inside the frame to display button text
+        button_label = Button(button_add_mutex_frame, text="ADD MUTEX", fg="white", bg="#303030", bd=0,
+                              font=("Montserrat Light", 12), command=lambda: SystemFunctions.add_new_mutex(),
+                              width=20)
+        button_label.pack()
+
+    @staticmethod
+    def create_or_connection_container():
+        """Create the OR connection container in the sidebar."""
+        Configuration.sidebar_add_or_connection_container = Frame(Configuration.sidebar, bd=0, bg="#303030")
+
+        # Create a frame to simulate the button appearance
+        button_add_or_connection_frame = Frame(Configuration.sidebar_add_or_connection_container, bg="#303030", bd=1,
+                                               relief="solid",
+                                               highlightbackground=Configuration.task_color,
+                                               highlightthickness=1)
+        button_add_or_connection_frame.pack(side=BOTTOM, anchor=N, padx=10, pady=10)
+
+        # Create a label inside the frame to display button text
+        button_label = Button(button_add_or_connection_frame, text="ADD OR CONNECTION", fg="white", bg="#303030", bd=0,
+                              font=("Montserrat Light", 12), command=lambda: SystemFunctions.add_or_connection(),
+                              width=20)
+        button_label.pack()
+
+    @staticmethod
+    def create_edit_connection_container():
+        """Edit connection container in the sidebar."""
+        Configuration.sidebar_edit_connection_container = Frame(Configuration.sidebar, bd=0, bg="#303030")
+
+        connection_name_frame = Frame(Configuration.sidebar_edit_connection_container, bd=0, bg="#2A2A2A", height=30)
+        connection_name_frame.place(relx=0, rely=0, x=15, y=100)
+        connection_name_title = Label(connection_name_frame, text="Initial semaphore value", font=("Montserrat Light", 10), bg="#2A2A2A",
+                                fg="white", width=15)
+        connection_name_title.pack(side=TOP, anchor=N, padx=0, pady=5)
+        connection_name_input = Entry(connection_name_frame, font=("Montserrat Light", 10), bd=0, bg="#303030", fg="white",
+                                insertbackground="white", width=20, textvariable=Configuration.sidebar_connection_input,
+                                borderwidth=10, relief="flat")
+        connection_name_input.pack(side=TOP, anchor=N, padx=15, pady=15)
+
+        # Create a frame to simulate the button appearance
+        button_add_or_connection_frame = Frame(Configuration.sidebar_edit_connection_container, bg="#303030", bd=1,
+                                               relief="solid",
+                                               highlightbackground=Configuration.task_color,
+                                               highlightthickness=1)
+        button_add_or_connection_frame.pack(side=BOTTOM, anchor=N, padx=10, pady=10)
+
+        # Create a label inside the frame to display button text
+        button_label = Button(button_add_or_connection_frame, text="CONFIRM SETTINGS", fg="white", bg="#303030", bd=0,
+                              font=("Montserrat Light", 12), command=lambda: SystemFunctions.set_semaphore_value(),
+                              width=20)
+        button_label.pack()
+
+    @staticmethod
+    def set_semaphore_value():
+        """Set the semaphore value for the selected connection."""
+        Configuration.selected_connection.semaphore_value = int(Configuration.sidebar_connection_input.get())
+        Configuration.selected_connection.model.initial_value = Configuration.selected_connection.semaphore_value
+        Configuration.engine.invalidate_ready()
+
+        for list_entry in Configuration.connector_objects:
+            if list_entry[4] == Configuration.selected_connection:
+                list_entry[3] = Configuration.selected_connection.semaphore_value
+                break
+
+        Configuration.selected_connection.update_visuals()
@@ -0,0 +1,411 @@
+# -*- coding: utf-8 -*-
+"""
+Module for recording the events of a simulation and showing them as a timeline.
+
+An EventTrace observes a SimulationEngine and records every model change as
+one row with the columns
+
+    step, kind, task, connector, mutex, old, new
+
+where kind is "started", "cycle" or "ended" for tasks, "semaphore" for
+connectors and "holder" for mutexes. task, connector and mutex name the
+models involved ("" if none); for "holder" the task is the new holder. old
+and new are the values before and after the change as text: cycle numbers,
+semaphore values or the full names of the mutex holders ("" for none).
+
+The trace is kept column-wise and written as CSV with pandas. With a path,
+the recorder appends every chunk_size events to the file, so long runs do
+not hold the whole trace in memory. A ".gz" suffix compresses the file.
+
+The main functions are:
+
+read_event_trace(path):
+    Reads a trace written by an EventTrace into a DataFrame.
+
+timeline(events):
+    Turns a trace into intervals: the cycles of every task from "started"
+    to "ended", and the holdings of every mutex from one "holder" event to
+    the next.
+
+write_timeline_svg(intervals, path):
+    Writes a Gantt chart of the intervals as an SVG image.
+
+draw_timeline(canvas, intervals):
+    Draws the same Gantt chart on a Tk canvas.
+
+Usage from the command line (simulates a chart and writes the trace and its timeline):
+    python -m General.EventTrace data2.xlsx trace.csv --steps 500 --svg timeline.svg
+"""
+
+# Import necessary modules
+import argparse
+import os
+from xml.sax.saxutils import escape
+import pandas as pd
+from General.Log import quiet
+
+# Columns of an event trace
+TRACE_COLUMNS = ["step", "kind", "task", "connector", "mutex", "old", "new"]
+
+# Default file extension of event traces
+EVENT_TRACE_EXTENSION = ".csv"
+
+# Geometry of the Gantt chart in pixels: width of a step, height of a lane
+# and width of the lane names on the left
+STEP_WIDTH = 10
+LANE_HEIGHT = 20
+LABEL_WIDTH = 120
+
+# Bar colours of task cycles and mutex holdings, as on the chart canvas
+TASK_BAR_COLOR = "#029cff"
+MUTEX_BAR_COLOR = "#464646"
+
+
+class EventTrace:
+    """
+    A class recording the model changes of a running SimulationEngine.
+    """
+
+    def __init__(self, engine, path=None, chunk_size=100000):
+        """
+        Attach the recorder to an engine.
+
+        Args:
+            engine (SimulationEngine): The engine to observe.
+            path (str, optional): A file to append the events to every chunk_size events.
+                Defaults to keeping all events in memory.
+            chunk_size (int, optional): The number of events kept in memory before they
+                are appended to path. Defaults to 100000.
+        """
+        self.engine = engine
+        self.path = path
+        self.chunk_size = chunk_size
+
+        self.columns = {name: [] for name in TRACE_COLUMNS}  # STRUCTURE: {column: [value per event]}
+        self.written_events = 0
+
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+        engine.add_observer(self)
+
+    def __len__(self):
+        return self.written_events + len(self.columns["step"])
+
+    def model_changed(self, subject, kind, old_value, new_value):
+        """
+        Observe the engine models and record the change.
+
+        Args:
+            subject: The model that changed.
+            kind (str): The kind of change.
+            old_value: The value before the change.
+            new_value: The value after the change.
+        """
+        task = ""
+        connector = ""
+        mutex = ""
+        if kind == "semaphore":
+            connector = subject.name
+        elif kind == "holder":
+            mutex = subject.name
+            old_value = old_value.full_name if old_value is not None else ""
+            new_value = new_value.full_name if new_value is not None else ""
+            task = new_value
+        else:
+            task = subject.full_name
+
+        columns = self.columns
+        columns["step"].append(self.engine.step_number)
+        columns["kind"].append(kind)
+        columns["task"].append(task)
+        columns["connector"].append(connector)
+        columns["mutex"].append(mutex)
+        columns["old"].append("" if old_value is None else old_value)
+        columns["new"].append("" if new_value is None else new_value)
+
+        if self.path is not None and len(columns["step"]) >= self.chunk_size:
+            self.flush()
+
+    def _buffer_frame(self):
+        """
+        Get the events kept in memory.
+
+        Returns:
+            DataFrame: The events, with old and new as text.
+        """
+        frame = pd.DataFrame(self.columns, columns=TRACE_COLUMNS)
+        frame["step"] = frame["step"].astype("int64")
+        frame["old"] = frame["old"].astype(str)
+        frame["new"] = frame["new"].astype(str)
+        return frame
+
+    def flush(self):
+        """Append the events kept in memory to the trace file."""
+        if self.path is None or not self.columns["step"]:
+            return
+
+        self._buffer_frame().to_csv(self.path, mode="a", header=self.written_events == 0, index=False)
+        self.written_events += len(self.columns["step"])
+        for values in self.columns.values():
+            values.clear()
+
+    def detach(self):
+        """Stop observing the engine and write the remaining events to the trace file."""
+        self.engine.remove_observer(self)
+        self.flush()
+
+    def to_frame(self):
+        """
+        Get all events recorded so far, including those already written to the trace file.
+
+        Returns:
+            DataFrame: The events.
+        """
+        frames = [self._buffer_frame()]
+        if self.written_events:
+            frames.insert(0, read_event_trace(self.path))
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    def write(self, path):
+        """
+        Write all events recorded so far to a file.
+
+        Args:
+            path (str): The path of the CSV file.
+        """
+        self.to_frame().to_csv(path, index=False)
+
+
+def read_event_trace(path):
+    """
+    Read an event trace written by an EventTrace.
+
+    Args:
+        path (str): The path of the CSV file.
+
+    Returns:
+        DataFrame: The events, with kind, task, connector and mutex as categories.
+    """
+    text_columns = {name: str for name in TRACE_COLUMNS if name != "step"}
+    events = pd.read_csv(path, dtype=text_columns, keep_default_na=False)
+    for name in ["kind", "task", "connector", "mutex"]:
+        events[name] = events[name].astype("category")
+    return events
+
+
+def timeline(events):
+    """
+    Turn an event trace into the intervals of task cycles and mutex holdings.
+
+    A task cycle lasts from its "started" event to the next "ended" event of the
+    task, a holding from a "holder" event with a holder to the next "holder"
+    event of the mutex. Intervals still open at the end of the trace end at its
+    last step.
+
+    Args:
+        events (DataFrame): The events, as returned by read_event_trace() or EventTrace.to_frame().
+
+    Returns:
+        DataFrame: One row per interval with the columns lane ("task" or "mutex"), name,
+        start and end (the first and last step), finished and holder (mutex rows only).
+    """
+    columns = ["lane", "name", "start", "end", "finished", "holder"]
+    if len(events) == 0:
+        return pd.DataFrame(columns=columns)
+    last_step = int(events["step"].max())
+
+    kinds = events["kind"].astype(str)
+    task_events = events.loc[kinds.isin(["started", "ended"]), ["step", "task"]].copy()
+    task_events["kind"] = kinds[task_events.index]
+    task_events["task"] = task_events["task"].astype(str)
+    following = task_events.groupby("task", sort=False)
+    task_events["next_kind"] = following["kind"].shift(-1)
+    task_events["next_step"] = following["step"].shift(-1)
+    cycles = task_events[task_events["kind"] == "started"]
+    finished = cycles["next_kind"] == "ended"
+    tasks = pd.DataFrame({
+        "lane": "task",
+        "name": cycles["task"],
+        "start": cycles["step"],
+        "end": cycles["next_step"].where(finished, last_step),
+        "finished": finished,
+        "holder": "",
+    })
+
+    holder_events = events.loc[kinds == "holder", ["step", "mutex", "new"]].copy()
+    holder_events["mutex"] = holder_events["mutex"].astype(str)
+    holder_events["next_step"] = holder_events.groupby("mutex", sort=False)["step"].shift(-1)
+    holdings = holder_events[holder_events["new"] != ""]
+    released = holdings["next_step"].notna()
+    mutexes = pd.DataFrame({
+        "lane": "mutex",
+        "name": holdings["mutex"],
+        "start": holdings["step"],
+        "end": holdings["next_step"].where(released, last_step),
+        "finished": released,
+        "holder": holdings["new"],
+    })
+
+    intervals = pd.concat([tasks, mutexes], ignore_index=True)[columns]
+    intervals["start"] = intervals["start"].astype("int64")
+    intervals["end"] = intervals["end"].astype("int64")
+    intervals["finished"] = intervals["finished"].astype(bool)
+    return intervals
+
+
+def timeline_bars(intervals, step_width=STEP_WIDTH, lane_height=LANE_HEIGHT):
+    """
+    Lay out the Gantt chart of a timeline: one lane per task, in the order the tasks
+    first started, followed by one lane per mutex.
+
+    Args:
+        intervals (DataFrame): The intervals, as returned by timeline().
+        step_width (float, optional): The width of a step in pixels.
+        lane_height (float, optional): The height of a lane in pixels.
+
+    Returns:
+        tuple: The lane names, the bars, STRUCTURE: [(x1, y1, x2, y2, colour, label), ...],
+        with x counted from the first step, and the first and last step.
+    """
+    if len(intervals) == 0:
+        return [], [], 0, 0
+
+    first_step = int(intervals["start"].min())
+    last_step = int(intervals["end"].max())
+    intervals = intervals.sort_values(["lane", "start"], ascending=[False, True], kind="stable")
+    lanes = list(dict.fromkeys(zip(intervals["lane"], intervals["name"])))
+    lane_of = {lane: index for index, lane in enumerate(lanes)}
+
+    bars = []
+    for lane, name, start, end, holder in zip(intervals["lane"], intervals["name"], intervals["start"],
+                                              intervals["end"], intervals["holder"]):
+        y = lane_of[(lane, name)] * lane_height
+        bars.append(((start - first_step) * step_width, y + 2, (end - first_step + 1) * step_width,
+                     y + lane_height - 2, TASK_BAR_COLOR if lane == "task" else MUTEX_BAR_COLOR,
+                     holder if lane == "mutex" else f"{name} {start}-{end}"))
+    return [name for lane, name in lanes], bars, first_step, last_step
+
+
+def _tick_interval(step_width):
+    """
+    Choose the number of steps between axis labels, so labels are at least 50 pixels apart.
+
+    Args:
+        step_width (float): The width of a step in pixels.
+
+    Returns:
+        int: The number of steps, 1, 2 or 5 times a power of ten.
+    """
+    interval = 1
+    while interval * step_width < 50:
+        for factor in (2, 5, 10):
+            if interval * factor * step_width >= 50 or factor == 10:
+                interval *= factor
+                break
+    return interval
+
+
+def write_timeline_svg(intervals, path, step_width=STEP_WIDTH, lane_height=LANE_HEIGHT):
+    """
+    Write a Gantt chart of a timeline as an SVG image.
+
+    Args:
+        intervals (DataFrame): The intervals, as returned by timeline().
+        path (str): The path of the SVG file.
+        step_width (float, optional): The width of a step in pixels.
+        lane_height (float, optional): The height of a lane in pixels.
+    """
+    lanes, bars, first_step, last_step = timeline_bars(intervals, step_width, lane_height)
+    top = lane_height
+    width = LABEL_WIDTH + (last_step - first_step + 1) * step_width + 10
+    height = top + len(lanes) * lane_height + 10
+
+    lines = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+             f'font-family="sans-serif" font-size="11">',
+             f'<rect width="{width}" height="{height}" fill="white"/>']
+
+    interval = _tick_interval(step_width)
+    for step in range(first_step - first_step % interval, last_step + 1, interval):
+        if step < first_step:
+            continue
+        x = LABEL_WIDTH + (step - first_step) * step_width
+        lines.append(f'<line x1="{x}" y1="{top - 4}" x2="{x}" y2="{height - 10}" stroke="#dddddd"/>')
+        lines.append(f'<text x="{x + 2}" y="{top - 6}">{step}</text>')
+
+    for index, name in enumerate(lanes):
+        lines.append(f'<text x="4" y="{top + index * lane_height + lane_height * 0.7}">{escape(name)}</text>')
+
+    for x1, y1, x2, y2, color, label in bars:
+        lines.append(f'<rect x="{LABEL_WIDTH + x1}" y="{top + y1}" width="{x2 - x1}" height="{y2 - y1}" '
+                     f'fill="{color}"><title>{escape(label)}</title></rect>')
+    lines.append("</svg>")
+
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines))
+
+
+def draw_timeline(canvas, intervals, step_width=STEP_WIDTH, lane_height=LANE_HEIGHT):
+    """
+    Draw a Gantt chart of a timeline on a Tk canvas and set its scroll region.
+
+    Args:
+        canvas (Canvas): The canvas to draw on.
+        intervals (DataFrame): The intervals, as returned by timeline().
+        step_width (float, optional): The width of a step in pixels.
+        lane_height (float, optional): The height of a lane in pixels.
+    """
+    lanes, bars, first_step, last_step = timeline_bars(intervals, step_width, lane_height)
+    top = lane_height
+    width = LABEL_WIDTH + (last_step - first_step + 1) * step_width + 10
+    height = top + len(lanes) * lane_height + 10
+
+    interval = _tick_interval(step_width)
+    for step in range(first_step - first_step % interval, last_step + 1, interval):
+        if step < first_step:
+            continue
+        x = LABEL_WIDTH + (step - first_step) * step_width
+        canvas.create_line(x, top - 4, x, height - 10, fill="#767676")
+        canvas.create_text(x + 2, top - 6, text=str(step), anchor="sw", fill="white", font=("Montserrat Light", 8))
+
+    for index, name in enumerate(lanes):
+        canvas.create_text(4, top + index * lane_height + lane_height / 2, text=name, anchor="w", fill="white",
+                           font=("Montserrat Light", 9))
+
+    for x1, y1, x2, y2, color, label in bars:
+        canvas.create_rectangle(LABEL_WIDTH + x1, top + y1, LABEL_WIDTH + x2, top + y2, fill=color, outline="")
+
+    canvas.configure(scrollregion=(0, 0, width, height))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate a chart and write its event trace.")
+    parser.add_argument("file_path", help="Path of the .xlsx chart or project file")
+    parser.add_argument("output_path", help="Path of the event trace to write (.csv or .csv.gz)")
+    parser.add_argument("--steps", type=int, default=1000, help="Number of steps to simulate")
+    parser.add_argument("--mutex-type", default="First Come First Serve", help="Mutex protocol of the chart")
+    parser.add_argument("--svg", help="Also write the timeline as an SVG image to this path")
+    parser.add_argument("--timeline", help="Also write the timeline intervals as CSV to this path")
+    arguments = parser.parse_args()
+
+    from General.ChartLoader import read_chart
+    from General.ProjectFile import PROJECT_EXTENSION, read_project
+
+    # The debug output of the models is of no use here
+    with quiet():
+        if arguments.file_path.endswith(PROJECT_EXTENSION):
+            chart = read_project(arguments.file_path)
+        else:
+            chart = read_chart(arguments.file_path, arguments.mutex_type)
+
+        trace = EventTrace(chart, arguments.output_path)
+        chart.run(arguments.steps)
+        trace.detach()
+
+    if arguments.svg or arguments.timeline:
+        chart_timeline = timeline(read_event_trace(arguments.output_path))
+        if arguments.svg:
+            write_timeline_svg(chart_timeline, arguments.svg)
+        if arguments.timeline:
+            chart_timeline.to_csv(arguments.timeline, index=False)
+    print(f"{len(trace)} events in {arguments.steps} steps")
@@ -17,9 +17,24 @@ save_file():
     Saves the current flowchart state, including task and connector
     information, to an Excel file selected via a file dialog.
 
-The module relies on the following classes to represent flowchart components:
+save_project():
+    Saves the chart and its simulation state in the native project format
+    (see General.ProjectFile), which load_files reads back by its extension.
+
+load_trace():
+    Shows the start state of a counterexample trace (see General.StateExplorer)
+    and lets "Next step" replay its schedule.
+
+save_event_trace():
+    Saves the events recorded by "Record event trace" (see General.EventTrace).
+
+load_event_trace():
+    Shows the timeline of a saved event trace without simulating the chart again.
+
+The chart models are read headless by General.ChartLoader.read_chart; this
+module creates the canvas views for them:
 - DraggableTask: Represents a task in the flowchart
-- MutexPriorityInversion: Represents a mutex
+- MutexView: Represents a mutex
 - TaskConnector: Represents a connector between tasks
 
 It also utilizes the pandas library to read from and write to Excel files.
@@ -31,233 +46,179 @@ import pandas as pd
 from Objects.DraggableTask import DraggableTask
 from Objects.Connection.ConnectionActivity import ConnectionActivity
 from Objects.Connection.ConnectionTask import ConnectionTask
+from Objects.Mutex.MutexView import MutexView
 from General.Configuration import Configuration, SystemFunctions
-import math
+from General.Log import GUI_LOG
+from General.Viewport import Viewport
+from General.ChartLoader import read_chart
+from General.ProjectFile import PROJECT_EXTENSION, read_project, write_project
+from General.StateExplorer import TRACE_EXTENSION, read_trace
+from General.EventTrace import EVENT_TRACE_EXTENSION, read_event_trace
 
-# Import available mutex types
-from Objects.Mutex.MutexPriorityInversion import MutexPriorityInversion
-from Objects.Mutex.MutexPriorityCeiling import MutexPriorityCeiling
-from Objects.Mutex.MutexTicketLock import MutexTicketLock
-from Objects.Mutex.MutexFirstComeFirstServe import MutexFirstComeFirstServe
+# File types offered by the file dialogs
+EXCEL_FILE_TYPES = (("Excel :)", "*.xlsx"), ("all files", "*.*"))
+PROJECT_FILE_TYPES = (("Flowchart project", "*" + PROJECT_EXTENSION), ("all files", "*.*"))
+TRACE_FILE_TYPES = (("Flowchart trace", "*" + TRACE_EXTENSION), ("all files", "*.*"))
+EVENT_TRACE_FILE_TYPES = (("Event trace", "*" + EVENT_TRACE_EXTENSION), ("Compressed event trace", "*.gz"),
+                          ("all files", "*.*"))
 
 
 # Function to load files from a file dialog or a predefined path
-def load_files(show_file_dialog=False):
+def load_files(show_file_dialog=False, file_types=EXCEL_FILE_TYPES):
     """
-    Load flowchart data from an Excel file.
+    Load flowchart data from an Excel file or a project file.
 
     If show_file_dialog is True, open a dialog to select the file.
-    Otherwise, load from a predefined file path.
+    Otherwise, load from a predefined file path. Project files are
+    recognised by their extension and restore the saved simulation state.
     """
     if show_file_dialog:
-        # Open file dialog to select Excel file
+        # Open file dialog to select the file
         Configuration.last_import_file_path = filedialog.askopenfilename(
             title="Select a File",
-            filetypes=(("Excel :)", "*.xlsx"), ("all files", "*.*"))
+            filetypes=file_types
         )
 
     # If no file path is provided, return without doing anything
     if Configuration.last_import_file_path == "":
         return
 
-    # Read the first sheet of the Excel file into a pandas DataFrame
-    table_of_content = pd.read_excel(Configuration.last_import_file_path)
+    # Build the headless models from the file
+    if Configuration.last_import_file_path.endswith(PROJECT_EXTENSION):
+        engine = read_project(Configuration.last_import_file_path)
+    else:
+        engine = read_chart(Configuration.last_import_file_path, Configuration.selected_mutex_type)
+
+    show_engine(engine)
+
 
+def show_engine(engine):
+    """
+    Replace the chart on the canvas with the models of an engine.
+
+    Args:
+        engine (SimulationEngine): The engine to show.
+    """
     # Clear general variables and canvas
     SystemFunctions.clear_general_variables()
     Configuration.canvas.delete("all")
+    Configuration.engine = engine
+    if Configuration.step_profiler is not None:
+        Configuration.step_profiler.attach(engine)
+    engine.set_checkpoints(Configuration.checkpoint_interval, Configuration.max_checkpoints)
+    engine.set_delta_log(Configuration.max_delta_log_changes)
+
+    build_views()
+
+
+def load_trace():
+    """
+    Load a counterexample trace written by General.StateExplorer.
+
+    The chart is shown in the start state of the trace; every "Next step"
+    then replays one step in the visiting order of the trace.
+    """
+    file_path = filedialog.askopenfilename(title="Select a trace", filetypes=TRACE_FILE_TYPES)
+    if file_path == "":
+        return
+
+    try:
+        engine, orders, description = read_trace(file_path)
+    except ValueError as error:
+        GUI_LOG.warning(error)
+        return
+
+    show_engine(engine)
+    SystemFunctions.start_replay(orders, description)
+
+
+def save_event_trace():
+    """Saves the events recorded so far to an event trace file."""
+    if Configuration.event_trace is None:
+        GUI_LOG.warning("No event trace recorded")
+        return
+
+    # Open a file dialog to save the event trace
+    f = filedialog.asksaveasfilename(filetypes=EVENT_TRACE_FILE_TYPES)
+    if f == "":
+        return
+
+    file_name = f
+
+    # Append the event trace extension if not present
+    if not f.endswith(EVENT_TRACE_EXTENSION) and not f.endswith(".gz"):
+        file_name += EVENT_TRACE_EXTENSION
+
+    Configuration.event_trace.write(file_name)
+
+
+def load_event_trace():
+    """Shows the timeline of an event trace file; the chart on the canvas is not changed."""
+    file_path = filedialog.askopenfilename(title="Select an event trace", filetypes=EVENT_TRACE_FILE_TYPES)
+    if file_path == "":
+        return
+
+    try:
+        events = read_event_trace(file_path)
+    except (ValueError, KeyError) as error:
+        GUI_LOG.warning(error)
+        return
+
+    SystemFunctions.show_timeline(events)
 
-    selected_mutex_class_name = "Mutex" + Configuration.selected_mutex_type.replace(' ', '')
-    selected_mutex_class = globals()[selected_mutex_class_name]
-
-    # Iterate over rows in the DataFrame
-    for index, row in table_of_content.iterrows():
-        task_name = "Undefined"
-        activity_name = ""
-        pos_x = 50
-        pos_y = 50
-        cycles = 1
-        mutexes = []
-        priority = 0
-
-        # Iterate over the first 8 columns of the row
-        for column, cell_value in row.iloc[:8].items():  # stop after index 6
-            if str(column).startswith("Unnamed: "):
-                break
-
-            # Check if the cell value is NaN (Not a Number) and skip if it is
-            if type(cell_value) is float:
-                if math.isnan(cell_value):
-                    continue
-
-            # Assign values to variables based on the column name
-            match column:
-                case "TASK":
-                    task_name = str(int(cell_value))
-
-                case "ACTIVITY":
-                    if type(cell_value) is not float:
-                        activity_name = str(cell_value)
-
-                case "CYCLES":
-                    cycles = int(cell_value)
-
-                case "PRIORITY":
-                    priority = int(cell_value)
-
-                case "MUTEX_LIST":
-                    if type(cell_value) is not float:
-                        mutex_string = str(cell_value)
-                        mutex_names = mutex_string.split(",")
-                        for mutex_name in mutex_names:
-                            if mutex_name not in Configuration.mutex_objects:
-                                new_mutex_object = selected_mutex_class()
-                                Configuration.mutex_objects.update({
-                                    mutex_name: new_mutex_object
-                                })
-                                new_mutex_object.name = mutex_name
-
-                            mutexes.append(Configuration.mutex_objects[mutex_name])
-                    else:
-                        pass
-                    print("Mutex")
-
-                case "POSX":
-                    if not math.isnan(cell_value):
-                        pos_x = cell_value
-                    print("Position X")
-
-                case "POSY":
-                    if not math.isnan(cell_value):
-                        pos_y = cell_value
-                    print("Position Y")
-
-        # If task_name is still "Undefined", break out of the loop
-        if task_name == "Undefined":
-            break
-
-        # Create a new DraggableTask object with the extracted values
-        task = DraggableTask(task_name, activity_name, pos_x, pos_y, 50, cycles, priority)
-
-        # Add mutexes to the task and task to the mutexes
-        if len(mutexes) > 0:
-            for mutex in mutexes:
-                task.add_mutex(mutex)
-                mutex.add_task(task)
-
-        # Add the task to the list of task objects
+
+def build_views():
+    """Create the canvas views for all models of Configuration.engine."""
+    engine = Configuration.engine
+    task_views = {}
+
+    # Create a DraggableTask view for every task model
+    for model in engine.tasks:
+        task = DraggableTask(model, 50)
+        task_views[model] = task
         Configuration.task_objects.append(task)
 
-    # List to store semaphore information
-    semaphores = []
-
-    # Iterate over remaining columns in the DataFrame
-    for index, row in table_of_content.iterrows():
-        start_task_name = "Undefined"
-        connector_name = "Undefined"
-        end_task_name = "Undefined"
-        initial_value = 0
-
-        # Iterate over columns starting from index 8
-        for column, cell_value in row.iloc[8:].items():  # Start from index 7
-            if type(cell_value) is float:
-                continue
-
-            # Assign values to variables based on the column name
-            match column:
-                case "START":
-                    start_task_name = str(cell_value)
-                case "CON_NAME":
-                    connector_name = str(cell_value)
-                case "END":
-                    end_task_name = str(cell_value)
-                case "INITIAL_VALUE":
-                    initial_value = int(cell_value)
-
-        # Add semaphore information to the list
-        semaphores.append([start_task_name, connector_name, end_task_name, initial_value, 0])
-
-    # List to store duplicate semaphore indices
-    duplicates = []
-
-    print(semaphores)
-
-    # Iterate over semaphores and handle connections
-    for i in range(len(semaphores)):
-        semaphore = semaphores[i]
-        start_task_name = semaphore[0]
-        connector_name = semaphore[1]
-        end_task_name = semaphore[2]
-        initial_value = semaphore[3]
-        offset = semaphore[4]
-
-        # If end_task_name is "Undefined", handle OR connection
-        if end_task_name == "Undefined":
-            needed_connector = None
-            for task in Configuration.task_objects:
-                for connector in task.connectors:
-                    if connector.name == connector_name:
-                        needed_connector = connector
-                        break
-                if needed_connector is not None:
-                    break
-
-            for task in Configuration.task_objects:
-                if start_task_name == task.task_name + task.activity_name:
-                    needed_connector.add_or_connection(task)
-                    task.add_connector(needed_connector, "or")
-                    task.update_connections()
-                    break
-            continue
-
-        # Handle duplicate semaphores
-        for j in range(len(semaphores)):
-            semaphore2 = semaphores[j]
-            if semaphore2[0] == end_task_name:
-                if semaphore2[2] == start_task_name:
-                    if i not in duplicates and j not in duplicates:
-                        duplicates.append(i)
-                        duplicates.append(j)
-                        print("duplicate")
-                        semaphore2[4] = 50
-                        offset = -50
-
-        # Skip if connector_name is "Undefined"
-        if connector_name == "Undefined":
-            continue
-
-        import re
-        start_task_id = re.findall(r'\d+', start_task_name)
-        end_task_id = re.findall(r'\d+', end_task_name)
-
-        connector = None
-
-        # Check if start and end tasks have the same ID
-        if len(end_task_id) > 0:
-            if start_task_id[0] == end_task_id[0]:
-                connector = ConnectionActivity(connector_name, initial_value, offset)
-
-        # Create a new TaskConnector object
-        if connector is None:
-            connector = ConnectionTask(connector_name, initial_value, offset)
-        Configuration.connector_objects.append([start_task_name, connector_name, end_task_name, initial_value, connector])
-
-        # Add connector to start and end tasks
-        for task in Configuration.task_objects:
-            if (task.task_name + task.activity_name) == start_task_name:
-                if end_task_name != "":
-                    task.add_connector(connector, "start")
-        for task in Configuration.task_objects:
-            if (task.task_name + task.activity_name) == end_task_name:
-                task.add_connector(connector, "end")
+    # Create a MutexView for every mutex model and add the task views to it
+    for model in engine.mutexes:
+        mutex = MutexView(model)
+        Configuration.mutex_objects.update({
+            mutex.name: mutex
+        })
+        for task_model in model.connected_tasks:
+            task = task_views[task_model]
+            task.add_mutex(mutex)
+            mutex.add_task(task)
+
+    # Create a connector view for every connector model
+    for model in engine.connections:
+        if model.is_activity_connection:
+            connector = ConnectionActivity(model)
+        else:
+            connector = ConnectionTask(model)
+
+        start_tasks = model.tasks_at("start")
+        end_tasks = model.tasks_at("end")
+        start_task_name = start_tasks[0].full_name if start_tasks else ""
+        end_task_name = end_tasks[0].full_name if end_tasks else ""
+        Configuration.connector_objects.append([start_task_name, model.name, end_task_name, model.initial_value, connector])
+
+        # Add connector to start, end and OR tasks
+        for task_model, position in model.tasks.items():
+            task = task_views[task_model]
+            if position == "or":
+                connector.add_or_connection(task)
+            task.add_connector(connector, position)
 
     # Update connections for all tasks
     for task in Configuration.task_objects:
         task.update_connections()
 
     # Update visuals for all mutexes
-    for mutex in Configuration.mutex_objects:
-        Configuration.mutex_objects[mutex].update_visuals()
+    for mutex in list(Configuration.mutex_objects.values()):
+        mutex.update_visuals()
+
+    # Show the mutexes of the shown tasks and the connectors crossing the visible area
+    Viewport.refresh()
 
 
 # Function to save the current state to a file
@@ -325,4 +286,21 @@ def save_file():
         file_name += ".xlsx"
 
     # Save the DataFrame to the selected file
-    df.to_excel(file_name, index=False)
\ No newline at end of file
+    df.to_excel(file_name, index=False)
+
+
+# Function to save the chart and simulation state in the project format
+def save_project():
+    """Saves the current chart and simulation state to a project file."""
+    # Open a file dialog to save the project file
+    f = filedialog.asksaveasfilename(filetypes=PROJECT_FILE_TYPES)
+    if f == "":
+        return
+
+    file_name = f
+
+    # Append the project extension if not present
+    if not f.endswith(PROJECT_EXTENSION):
+        file_name += PROJECT_EXTENSION
+
+    write_project(Configuration.engine, file_name)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# Import necessary modules
+from General.Configuration import Configuration
+from General.Viewport import Viewport
+import time
+
+
+class LayoutAnimation:
+    """
+    An animation settling the tasks around an edit with an IncrementalLayout.
+
+    Driven by the Animator, every frame relaxes the layout for at most
+    Configuration.layout_frame_budget ms and moves the task views a step
+    closer to the current result, so the editor stays responsive while the
+    layout is computed. The views arrive within Configuration.layout_animation_time
+    ms or once the layout is finished, whichever is later.
+    """
+
+    def __init__(self, layout):
+        """
+        Initialize a new animation. The views start where their models are.
+
+        Args:
+            layout (IncrementalLayout): The layout of the tasks to move.
+        """
+        self.layout = layout
+        self.views = [Viewport.views_by_model.get(task) for task in layout.tasks]
+        self.origins = [(task.x, task.y) for task in layout.tasks]
+        self.start_time = time.perf_counter()
+        self.duration = Configuration.layout_animation_time / 1000
+
+    def restart(self, animation):
+        """
+        Continue with a newer layout started during this one; tasks only this one moved stay where they are.
+
+        Args:
+            animation (LayoutAnimation): The newer animation.
+        """
+        self.layout = animation.layout
+        self.views = animation.views
+        self.origins = animation.origins
+        self.start_time = animation.start_time
+        self.duration = animation.duration
+
+    def advance(self, now):
+        """
+        Relax the layout within the frame budget and move the views to their position at the given time.
+
+        Args:
+            now (float): The current time.perf_counter() value.
+
+        Returns:
+            bool: False once the layout is finished and the views arrived.
+        """
+        done = self.layout.step(time.perf_counter() + Configuration.layout_frame_budget / 1000)
+        progress = min((now - self.start_time) / self.duration, 1)
+        if done and progress >= 1:
+            return False
+
+        # Ease out, so the tasks slow down as they arrive
+        eased = 1 - (1 - progress) ** 2
+        for i, view in enumerate(self.views):
+            x, y = self.layout.position(i)
+            origin_x, origin_y = self.origins[i]
+            self._move(view, origin_x + (x - origin_x) * eased, origin_y + (y - origin_y) * eased)
+
+        Viewport.restack()
+        return True
+
+    def stop(self):
+        """Finish the layout and put the views at their final positions."""
+        self.layout.run()
+        for i, view in enumerate(self.views):
+            self._move(view, *self.layout.position(i))
+
+        # Tasks may have moved into or out of the visible area
+        Viewport.restack()
+        Viewport.schedule_refresh()
+
+    @staticmethod
+    def _move(view, x, y):
+        """
+        Move a task view unless it was deleted meanwhile.
+
+        Args:
+            view (DraggableTask): The task view, None for a task without a view.
+            x (float): The x-coordinate of the new centre.
+            y (float): The y-coordinate of the new centre.
+        """
+        if view is not None and Viewport.views_by_model.get(view.model) is view:
+            view.move_to(x, y)
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Module for the diagnostic output of the application.
+
+Every subsystem logs through its own logger of the standard logging module:
+
+    flowchart.loader  reading charts (General.ChartLoader)
+    flowchart.engine  task cycles (Objects.TaskModel)
+    flowchart.mutex   locking and releasing mutexes (Objects.Mutex)
+    flowchart.render  canvas views (Objects.DraggableTask, Objects.Connection, ...)
+    flowchart.gui     menu actions and their results (General.Configuration)
+
+Debug messages are written on hot paths such as SimulationEngine.step(). To
+make them free while debug output is off, they are guarded by the flags of
+Debug, which are plain class attributes:
+
+    if Debug.mutex:
+        MUTEX_LOG.debug("Mutex locked by %s", task.full_name)
+
+The flags follow the logger levels set with configure() or set_level(). Levels
+set directly on the loggers take effect once refresh() is called.
+
+The main functions are:
+
+configure(level, levels=None):
+    Writes the messages of all subsystems to stderr, from the given level on.
+
+set_level(level, subsystem=None):
+    Changes the level of one subsystem or of all of them.
+
+quiet():
+    A context manager turning debug output off, e.g. while a copy of the chart is simulated.
+"""
+
+# Import necessary modules
+import contextlib
+import logging
+
+# Name of the parent logger of all subsystems
+ROOT_LOGGER_NAME = "flowchart"
+
+# Subsystems with their own logger
+SUBSYSTEMS = ["loader", "engine", "mutex", "render", "gui"]
+
+# Format of the messages written by configure()
+LOG_FORMAT = "%(name)s: %(message)s"
+
+LOADER_LOG = logging.getLogger(ROOT_LOGGER_NAME + ".loader")
+ENGINE_LOG = logging.getLogger(ROOT_LOGGER_NAME + ".engine")
+MUTEX_LOG = logging.getLogger(ROOT_LOGGER_NAME + ".mutex")
+RENDER_LOG = logging.getLogger(ROOT_LOGGER_NAME + ".render")
+GUI_LOG = logging.getLogger(ROOT_LOGGER_NAME + ".gui")
+
+
+class Debug:
+    """
+    Whether each subsystem logs debug messages, checked before formatting them.
+    """
+    loader = False
+    engine = False
+    mutex = False
+    render = False
+    gui = False
+
+
+def refresh():
+    """Update the Debug flags from the levels of the loggers."""
+    for subsystem in SUBSYSTEMS:
+        logger = logging.getLogger(ROOT_LOGGER_NAME + "." + subsystem)
+        setattr(Debug, subsystem, logger.isEnabledFor(logging.DEBUG))
+
+
+def set_level(level, subsystem=None):
+    """
+    Change the level of the messages logged.
+
+    Args:
+        level (int or str): The lowest level to log, e.g. logging.DEBUG or "INFO".
+        subsystem (str, optional): One of SUBSYSTEMS. Defaults to all subsystems without a level of their own.
+    """
+    name = ROOT_LOGGER_NAME if subsystem is None else ROOT_LOGGER_NAME + "." + subsystem
+    logging.getLogger(name).setLevel(level)
+    refresh()
+
+
+def configure(level, levels=None):
+    """
+    Write the messages of all subsystems to stderr.
+
+    Args:
+        level (int or str): The lowest level to log.
+        levels (dict, optional): Levels of single subsystems, STRUCTURE: {subsystem: level}.
+    """
+    logger = logging.getLogger(ROOT_LOGGER_NAME)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logger.addHandler(handler)
+        logger.propagate = False
+
+    logger.setLevel(level)
+    for subsystem, subsystem_level in (levels or {}).items():
+        logging.getLogger(ROOT_LOGGER_NAME + "." + subsystem).setLevel(subsystem_level)
+    refresh()
+
+
+@contextlib.contextmanager
+def quiet():
+    """Turn debug output off while a block runs; warnings and errors are still logged."""
+    flags = {subsystem: getattr(Debug, subsystem) for subsystem in SUBSYSTEMS}
+    for subsystem in SUBSYSTEMS:
+        setattr(Debug, subsystem, False)
+    try:
+        yield
+    finally:
+        for subsystem, flag in flags.items():
+            setattr(Debug, subsystem, flag)
+
+
+refresh()
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Module for sweeping simulation parameters over a flowchart file.
+
+Every variant overrides the mutex protocol, initial semaphore values, cycle
+counts and/or priorities of the chart and is simulated headless until it
+becomes quiescent (finished or deadlocked) or a step limit is reached. The
+variants run in a ProcessPoolExecutor, so a sweep uses all cores.
+
+The main functions are:
+
+build_variants(mutex_types, initial_values, cycles, priorities):
+    Builds the cartesian product of the given alternatives.
+
+run_sweep(file_path, variants, max_steps, max_workers):
+    Simulates all variants and returns a pandas DataFrame with one row of
+    metrics per variant.
+
+Usage from the command line:
+    python -m General.ParameterSweep ring.xlsx --output sweep.csv
+"""
+
+# Import necessary modules
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from General.ChartLoader import read_chart
+from General.Log import quiet
+from General.SimulationEngine import MUTEX_CLASSES
+from General.SimulationMetrics import SimulationMetrics
+
+
+def build_variants(mutex_types=None, initial_values=None, cycles=None, priorities=None):
+    """
+    Build the cartesian product of parameter alternatives.
+
+    Args:
+        mutex_types (list, optional): Mutex protocol names. Defaults to all available protocols.
+        initial_values (list, optional): Alternatives of {connector name: initial semaphore value}.
+        cycles (list, optional): Alternatives of {task identifier, e.g. "1a": cycle count}.
+        priorities (list, optional): Alternatives of {task identifier: priority}.
+
+    Returns:
+        list: The variants, each a dict with the keys "mutex_type", "initial_values",
+        "cycles" and "priorities".
+    """
+    mutex_types = mutex_types or list(MUTEX_CLASSES)
+    initial_values = initial_values or [{}]
+    cycles = cycles or [{}]
+    priorities = priorities or [{}]
+
+    return [
+        {"mutex_type": mutex_type, "initial_values": initial_value, "cycles": cycle, "priorities": priority}
+        for mutex_type, initial_value, cycle, priority in itertools.product(mutex_types, initial_values, cycles,
+                                                                             priorities)
+    ]
+
+
+def apply_variant(engine, variant):
+    """
+    Apply the overrides of a variant to a freshly loaded engine.
+
+    Args:
+        engine (SimulationEngine): The engine to modify.
+        variant (dict): The variant, see build_variants.
+    """
+    initial_values = variant.get("initial_values", {})
+    for connection in engine.connections:
+        if connection.name in initial_values:
+            connection.semaphore_value = int(initial_values[connection.name])
+            connection.initial_value = connection.semaphore_value
+
+    cycles = variant.get("cycles", {})
+    priorities = variant.get("priorities", {})
+    for task in engine.tasks:
+        if task.full_name in cycles:
+            task.task_max_cycles = int(cycles[task.full_name])
+        if task.full_name in priorities:
+            task.priority = int(priorities[task.full_name])
+            task.original_priority = task.priority
+
+    engine.invalidate_ready()
+
+
+def run_variant(file_path, variant, max_steps=100000):
+    """
+    Simulate one variant of a chart headless and collect its metrics.
+
+    Args:
+        file_path (str): Path of the .xlsx file.
+        variant (dict): The variant, see build_variants.
+        max_steps (int, optional): Upper bound of steps to simulate. Defaults to 100000.
+
+    Returns:
+        dict: One row of metrics: steps to completion (None if the chart never
+        became quiescent), deadlock flag, maximum wait per task and hold times
+        per mutex.
+    """
+    # The debug output of the models is of no use in a worker
+    with quiet():
+        engine = read_chart(file_path, variant["mutex_type"])
+        apply_variant(engine, variant)
+
+        metrics = SimulationMetrics(engine)
+        quiescent = engine.run_until_quiescent(max_steps)
+
+    row = {
+        "mutex_type": variant["mutex_type"],
+        "initial_values": variant.get("initial_values", {}),
+        "cycles": variant.get("cycles", {}),
+        "priorities": variant.get("priorities", {}),
+        # The last step changed nothing, so the chart settled one step earlier
+        "steps_to_completion": engine.step_number - 1 if quiescent else None,
+        "deadlock": metrics.is_deadlocked(),
+    }
+    for task in engine.tasks:
+        row["max_wait " + task.full_name] = metrics.max_wait.get(task, 0)
+    for mutex in engine.mutexes:
+        row["max_hold " + mutex.name] = metrics.max_hold.get(mutex, 0)
+        row["total_hold " + mutex.name] = metrics.total_hold.get(mutex, 0)
+    return row
+
+
+def run_sweep(file_path, variants, max_steps=100000, max_workers=None):
+    """
+    Simulate all variants of a chart in a process pool.
+
+    Args:
+        file_path (str): Path of the .xlsx file.
+        variants (list): The variants, see build_variants.
+        max_steps (int, optional): Upper bound of steps per variant. Defaults to 100000.
+        max_workers (int, optional): Number of worker processes. Defaults to the number of cores.
+
+    Returns:
+        pandas.DataFrame: One row of metrics per variant, in the order of variants.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        rows = list(executor.map(run_variant, itertools.repeat(file_path), variants, itertools.repeat(max_steps)))
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate a chart with every mutex protocol and report metrics.")
+    parser.add_argument("file_path", help="Path of the .xlsx chart")
+    parser.add_argument("--max-steps", type=int, default=100000, help="Step limit per variant")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--output", default="", help="Write the table to this CSV file instead of printing it")
+    arguments = parser.parse_args()
+
+    table = run_sweep(arguments.file_path, build_variants(), arguments.max_steps, arguments.workers)
+    if arguments.output:
+        table.to_csv(arguments.output, index=False)
+    else:
+        print(table.to_string())
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Module for the native project format, a JSON-lines file holding a chart
+together with its simulation state.
+
+Unlike the Excel layout, the project file stores every model on a line of its
+own and references tasks and mutexes by their position in the file, so no
+padded side-by-side columns are needed and it is written and read about an
+order of magnitude faster. Excel files remain the import/export format.
+
+Layout (one JSON object per line):
+- A header: {"format": "flowchart-project", "version": 1, "step_number": ...,
+  "last_step_changes": ...}
+- One line per mutex ("kind": "mutex"): NAME, TYPE and the lock state
+  (lock, holder, attendees and protocol specific counters).
+- One line per task ("kind": "task"): the Excel columns TASK, ACTIVITY, CYCLES,
+  PRIORITY, MUTEX_LIST, POSX, POSY and the state task_current_cycle, priority,
+  granted_mutexes (plus ticket and elevated_priority unless they are None).
+- One line per connector ("kind": "connector"): the Excel columns START,
+  CON_NAME, END, INITIAL_VALUE, the OR tasks and the state semaphore_value and
+  last_change.
+
+The main functions are:
+
+write_project(engine, file_path):
+    Writes all models and the simulation state of an engine.
+
+read_project(file_path):
+    Reads a project file into a new SimulationEngine.
+
+copy_engine(engine):
+    Builds an independent copy of an engine through the same line layout,
+    e.g. to analyse a chart without touching the one shown on the canvas.
+"""
+
+# Import necessary modules
+import json
+from General.SimulationEngine import SimulationEngine, TASK_STATE_ATTRIBUTES, MUTEX_STATE_ATTRIBUTES
+
+PROJECT_EXTENSION = ".fcproj"
+PROJECT_FORMAT = "flowchart-project"
+PROJECT_VERSION = 1
+
+
+def _index_or_none(indices, item):
+    """
+    Get the file index of a model, None for no model.
+
+    Args:
+        indices (dict): The file indices, STRUCTURE: {model: index}
+        item: The model or None.
+
+    Returns:
+        int: The index, or None.
+    """
+    return indices[item] if item is not None else None
+
+
+def project_lines(engine):
+    """
+    Describe the chart and the simulation state of an engine as project file lines.
+
+    Args:
+        engine (SimulationEngine): The engine to describe.
+
+    Returns:
+        list: The lines as dicts, the header first.
+    """
+    task_indices = {task: index for index, task in enumerate(engine.tasks)}
+    mutex_indices = {mutex: index for index, mutex in enumerate(engine.mutexes)}
+
+    lines = [{"format": PROJECT_FORMAT, "version": PROJECT_VERSION, "step_number": engine.step_number,
+              "last_step_changes": engine.last_step_changes}]
+
+    for mutex in engine.mutexes:
+        line = {
+            "kind": "mutex",
+            "NAME": mutex.name,
+            "TYPE": mutex.algorithm_type,
+            "lock": mutex.lock,
+            "holder": _index_or_none(task_indices, mutex.holder),
+            "attendees": [task_indices[task] for task in mutex.attendees],
+        }
+        for attribute in MUTEX_STATE_ATTRIBUTES:
+            if hasattr(mutex, attribute):
+                line[attribute] = getattr(mutex, attribute)
+        lines.append(line)
+
+    for task in engine.tasks:
+        line = {
+            "kind": "task",
+            "TASK": task.task_name,
+            "ACTIVITY": task.activity_name,
+            "CYCLES": task.task_max_cycles,
+            "PRIORITY": task.original_priority,
+            "MUTEX_LIST": [mutex_indices[mutex] for mutex in task.mutexes],
+            "POSX": task.x,
+            "POSY": task.y,
+            "task_current_cycle": task.task_current_cycle,
+            "priority": task.priority,
+            "granted_mutexes": task.granted_mutexes,
+        }
+        for attribute in TASK_STATE_ATTRIBUTES:
+            if getattr(task, attribute) is not None:
+                line[attribute] = getattr(task, attribute)
+        lines.append(line)
+
+    for connection in engine.connections:
+        lines.append({
+            "kind": "connector",
+            "START": [task_indices[task] for task in connection.tasks_at("start")],
+            "CON_NAME": connection.name,
+            "END": [task_indices[task] for task in connection.tasks_at("end")],
+            "OR": [task_indices[task] for task in connection.tasks_at("or")],
+            "INITIAL_VALUE": connection.initial_value,
+            "offset": connection.offset,
+            "is_activity_connection": connection.is_activity_connection,
+            "semaphore_value": connection.semaphore_value,
+            "last_change": connection.last_change,
+        })
+
+    return lines
+
+
+def write_project(engine, file_path):
+    """
+    Write the chart and the simulation state of an engine to a project file.
+
+    Args:
+        engine (SimulationEngine): The engine to save.
+        file_path (str): Path of the project file.
+    """
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write("\n".join(json.dumps(line, separators=(",", ":")) for line in project_lines(engine)))
+        file.write("\n")
+
+
+def read_project(file_path):
+    """
+    Read a project file into a new SimulationEngine.
+
+    Args:
+        file_path (str): Path of the project file.
+
+    Returns:
+        SimulationEngine: The engine holding the chart models and their saved state.
+
+    Raises:
+        ValueError: If the file is not a project file of a supported version.
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        lines = [json.loads(text) for text in file if text.strip()]
+
+    if not lines or lines[0].get("format") != PROJECT_FORMAT:
+        raise ValueError(f"{file_path} is not a flowchart project file")
+    if lines[0].get("version", 0) > PROJECT_VERSION:
+        raise ValueError(f"{file_path} was written by a newer version (format version {lines[0]['version']})")
+
+    return engine_from_lines(lines)
+
+
+def engine_from_lines(lines):
+    """
+    Build a new SimulationEngine from project file lines.
+
+    Args:
+        lines (list): The lines as dicts, the header first.
+
+    Returns:
+        SimulationEngine: The engine holding the chart models and their saved state.
+    """
+    engine = SimulationEngine()
+    engine.step_number = lines[0]["step_number"]
+    # Files without the count are not taken as quiescent, the next step tells
+    engine.last_step_changes = lines[0].get("last_step_changes", 1 if engine.step_number > 0 else 0)
+
+    mutex_lines = [line for line in lines if line.get("kind") == "mutex"]
+    task_lines = [line for line in lines if line.get("kind") == "task"]
+    connector_lines = [line for line in lines if line.get("kind") == "connector"]
+
+    mutexes = [engine.create_mutex(line["TYPE"], line["NAME"]) for line in mutex_lines]
+
+    tasks = []
+    for line in task_lines:
+        task = engine.create_task(line["TASK"], line["ACTIVITY"], line["CYCLES"], line["PRIORITY"],
+                                  line["POSX"], line["POSY"])
+        task.task_current_cycle = line["task_current_cycle"]
+        task.priority = line["priority"]
+        task.granted_mutexes = line["granted_mutexes"]
+        for attribute in TASK_STATE_ATTRIBUTES:
+            if attribute in line:
+                setattr(task, attribute, line[attribute])
+
+        for mutex_index in line["MUTEX_LIST"]:
+            task.add_mutex(mutexes[mutex_index])
+            mutexes[mutex_index].add_task(task)
+        tasks.append(task)
+
+    for mutex, line in zip(mutexes, mutex_lines):
+        mutex.lock = line["lock"]
+        mutex.holder = tasks[line["holder"]] if line["holder"] is not None else None
+        mutex.attendees = [tasks[index] for index in line["attendees"]]
+        for attribute in MUTEX_STATE_ATTRIBUTES:
+            if attribute in line:
+                setattr(mutex, attribute, line[attribute])
+
+    for line in connector_lines:
+        connection = engine.create_connection(line["CON_NAME"], line["INITIAL_VALUE"], line["offset"],
+                                              line["is_activity_connection"])
+        connection.semaphore_value = line["semaphore_value"]
+        connection.last_change = line["last_change"]
+        for position in ("start", "end", "or"):
+            for task_index in line[position.upper()]:
+                tasks[task_index].add_connector(connection, position)
+
+    engine.invalidate_ready()
+    return engine
+
+
+def copy_engine(engine):
+    """
+    Build an independent copy of an engine's chart and simulation state.
+
+    The copy has no observers, checkpoints or delta log.
+
+    Args:
+        engine (SimulationEngine): The engine to copy.
+
+    Returns:
+        SimulationEngine: The copy.
+    """
+    return engine_from_lines(project_lines(engine))
@@ -0,0 +1,597 @@
+# -*- coding: utf-8 -*-
+"""
+This module defines the SimulationEngine class, the headless simulation core.
+
+The engine owns the task, connector and mutex models of a chart together with
+the step counter. It never touches Tkinter, so charts can be simulated in
+batch jobs and CI. The Tk objects (DraggableTask, ConnectionBase, MutexView)
+only observe the models and redraw themselves when notified.
+
+A step only visits the active tasks: running tasks and idle tasks whose
+incoming semaphores are all non-zero. Every task counts its satisfied inputs,
+which the connectors update when their value crosses zero, so the set of
+active tasks is maintained incrementally.
+
+The runtime state can be captured with snapshot() and put back with restore()
+without rebuilding any model or view. With set_checkpoints() the engine also
+keeps a snapshot every N steps, so rewind() can go back to an earlier step by
+replaying only the steps since the nearest checkpoint.
+
+While max_delta_log_size is set, every step also records what it changed
+(semaphore values, task cycles and mutex state) in a bounded delta log, so
+step_back() undoes a step in time proportional to its changes.
+"""
+import heapq
+from collections import deque
+from Objects.TaskModel import TaskModel
+from Objects.Connection.ConnectionModel import ConnectionModel
+
+# Import available mutex types
+from Objects.Mutex.MutexPriorityInversion import MutexPriorityInversion
+from Objects.Mutex.MutexPriorityCeiling import MutexPriorityCeiling
+from Objects.Mutex.MutexTicketLock import MutexTicketLock
+from Objects.Mutex.MutexFirstComeFirstServe import MutexFirstComeFirstServe
+
+# Mutex classes by the names listed in Configuration.available_mutex_types
+MUTEX_CLASSES = {
+    'Priority Ceiling': MutexPriorityCeiling,
+    'Priority Inversion': MutexPriorityInversion,
+    'Ticket Lock': MutexTicketLock,
+    'First Come First Serve': MutexFirstComeFirstServe,
+}
+
+# Mutex protocol fields of the tasks, None while no protocol uses them
+TASK_STATE_ATTRIBUTES = ["ticket", "elevated_priority"]
+
+# Protocol counters, only present on the mutexes of that protocol: the ceiling of the
+# Priority Ceiling protocol and the next and the served ticket of the Ticket Lock
+MUTEX_STATE_ATTRIBUTES = ["ceiling_priority", "ticket_counter", "current_ticket"]
+
+
+class SimulationEngine:
+    """
+    A class holding the simulation state of a chart and advancing it step by step.
+    """
+
+    def __init__(self):
+        """Initialize an empty engine."""
+        self.tasks = []
+        self.connections = []
+        self.mutexes = []
+
+        # Variable to keep track of the current step number
+        self.step_number = 0
+
+        # Counters of semaphore, cycle and mutex holder changes
+        self.change_count = 0
+        self.last_step_changes = 0
+
+        # Listeners attached to every model, see add_observer()
+        self.observers = []
+
+        # Readiness tracking: tasks that may change in the next step, the queue
+        # of task indices of the running step and the index being processed
+        self.active_tasks = set()
+        self.step_queue = None
+        self.step_position = -1
+        self.ready_dirty = True
+
+        # Visiting ranks of the tasks while a step runs in a given order, see step()
+        self.step_ranks = None
+
+        # Snapshots taken every checkpoint_interval steps (0 disables them), oldest first
+        self.checkpoint_interval = 0
+        self.checkpoints = deque()
+
+        # Undo information of the last steps, oldest first, STRUCTURE:
+        # deque([(step number before, last_step_changes before, [change, ...]), ...])
+        # Changes: ("semaphore", connection, old value, old last change),
+        # ("cycle", task, old cycle), ("task", task, field, old value) for the mutex
+        # related fields of tasks and ("mutex", mutex, kind, values...) reverted by MutexBase.undo().
+        # The log holds at most max_delta_log_size changes (0 disables it).
+        self.delta_log = deque()
+        self.delta_log_size = 0
+        self.max_delta_log_size = 0
+        self.current_delta = None
+
+        # Timer of the step phases, see General.StepProfiler (None disables it)
+        self.profiler = None
+
+    def create_task(self, task_name, activity_name, task_max_cycles, priority, x=50, y=50):
+        """
+        Create a new task model and add it to the engine.
+
+        Args:
+            task_name (str): The name of the task.
+            activity_name (str): The name of the activity.
+            task_max_cycles (int): The maximum number of cycles for the task.
+            priority (int): The priority of the task.
+            x (int, optional): The x-coordinate of the task centre. Defaults to 50.
+            y (int, optional): The y-coordinate of the task centre. Defaults to 50.
+
+        Returns:
+            TaskModel: The new task model.
+        """
+        task = TaskModel(self, task_name, activity_name, task_max_cycles, priority, x, y)
+        task.index = len(self.tasks)
+        self.tasks.append(task)
+        self.invalidate_ready()
+        return task
+
+    def create_connection(self, name, semaphore_value=0, offset=0, is_activity_connection=False):
+        """
+        Create a new connector model and add it to the engine.
+
+        Args:
+            name (str): The name of the connector.
+            semaphore_value (int, optional): The initial semaphore value. Defaults to 0.
+            offset (int, optional): The offset value for positioning the connector. Defaults to 0.
+            is_activity_connection (bool, optional): Whether the connector links two activities
+                of the same task. Defaults to False.
+
+        Returns:
+            ConnectionModel: The new connector model.
+        """
+        connection = ConnectionModel(self, name, semaphore_value, offset, is_activity_connection)
+        self.connections.append(connection)
+        return connection
+
+    def create_mutex(self, mutex_type_name, name="unnamed"):
+        """
+        Create a new mutex model of the given type and add it to the engine.
+
+        Args:
+            mutex_type_name (str): One of Configuration.available_mutex_types.
+            name (str, optional): The name of the mutex. Defaults to "unnamed".
+
+        Returns:
+            MutexBase: The new mutex model.
+        """
+        mutex = MUTEX_CLASSES[mutex_type_name]()
+        mutex.name = name
+        mutex.engine = self
+        mutex.observers.extend(self.observers)
+        self.mutexes.append(mutex)
+        return mutex
+
+    def find_task(self, full_name):
+        """
+        Find a task by its chart identifier (task name + activity name).
+
+        Args:
+            full_name (str): The identifier, e.g. "1a".
+
+        Returns:
+            TaskModel: The task, or None if there is none.
+        """
+        for task in self.tasks:
+            if task.full_name == full_name:
+                return task
+        return None
+
+    def remove_task(self, task):
+        """
+        Remove a task and detach it from its connectors and mutexes.
+
+        Args:
+            task (TaskModel): The task to remove.
+        """
+        for connection in list(task.connectors):
+            task.remove_connector(connection)
+        for mutex in self.mutexes:
+            mutex.remove_task(task)
+        self.tasks.remove(task)
+        for index, remaining_task in enumerate(self.tasks):
+            remaining_task.index = index
+        self.invalidate_ready()
+
+    def remove_connection(self, connection):
+        """
+        Remove a connector and detach it from all tasks.
+
+        Args:
+            connection (ConnectionModel): The connector to remove.
+        """
+        for task in list(connection.tasks):
+            task.remove_connector(connection)
+        if connection in self.connections:
+            self.connections.remove(connection)
+
+    def add_observer(self, observer):
+        """
+        Attach a listener to every current and future model of the engine.
+
+        The observer must provide model_changed(subject, kind, old_value, new_value).
+
+        Args:
+            observer: The listener to attach.
+        """
+        self.observers.append(observer)
+        for model in self.tasks + self.connections + self.mutexes:
+            model.observers.append(observer)
+
+    def remove_observer(self, observer):
+        """
+        Detach a listener previously attached with add_observer().
+
+        Args:
+            observer: The listener to detach.
+        """
+        self.observers.remove(observer)
+        for model in self.tasks + self.connections + self.mutexes:
+            if observer in model.observers:
+                model.observers.remove(observer)
+
+    def invalidate_ready(self):
+        """
+        Mark the readiness tracking as stale.
+
+        Must be called after changing task or connector attributes directly
+        (e.g. task_max_cycles or semaphore_value) instead of through the model
+        methods; the next step rebuilds the input counts from scratch. The
+        delta log is cleared, as its steps can no longer be undone.
+        """
+        self.ready_dirty = True
+        self.clear_delta_log()
+
+    def _rebuild_ready(self):
+        """Recount the needed and satisfied inputs of all tasks and collect the active ones."""
+        self.active_tasks = set()
+        for index, task in enumerate(self.tasks):
+            task.index = index
+            task.needed_inputs = 0
+            task.satisfied_inputs = 0
+            for connection, position in task.connectors.items():
+                if position == "end":
+                    task.needed_inputs += 1
+                    if connection.semaphore_value > 0:
+                        task.satisfied_inputs += 1
+            if task.is_active():
+                self.active_tasks.add(task)
+        self.ready_dirty = False
+
+    def update_activity(self, task):
+        """
+        Add a task to or remove it from the active tasks after its state changed.
+
+        A task that becomes active during a step is still visited in that step
+        if it comes after the task being processed, as the full scan over all
+        tasks would do.
+
+        Args:
+            task (TaskModel): The task whose cycle or inputs changed.
+        """
+        if task.is_active():
+            if task not in self.active_tasks:
+                self.active_tasks.add(task)
+                if self.step_queue is not None:
+                    rank = self._step_rank(task)
+                    if rank > self.step_position:
+                        heapq.heappush(self.step_queue, rank)
+        else:
+            self.active_tasks.discard(task)
+
+    def input_satisfaction_changed(self, connection, satisfied):
+        """
+        Update the satisfied input counts of the tasks consuming a connector.
+
+        Args:
+            connection (ConnectionModel): The connector whose value crossed zero.
+            satisfied (bool): Whether the value became positive.
+        """
+        change = 1 if satisfied else -1
+        for task, position in connection.tasks.items():
+            if position == "end":
+                task.satisfied_inputs += change
+                self.update_activity(task)
+
+    def _step_rank(self, task):
+        """
+        Get the position of a task in the visiting order of the running step.
+
+        Args:
+            task (TaskModel): The task.
+
+        Returns:
+            int: The rank, the chart index unless the step runs in a given order.
+        """
+        if self.step_ranks is None:
+            return task.index
+        return self.step_ranks.get(task, len(self.step_ranks) + task.index)
+
+    def step(self, order=None):
+        """
+        Perform a single step in the simulation.
+
+        Args:
+            order (list, optional): The tasks to visit first, in this order. Other
+                active tasks follow in chart order. Defaults to chart order only.
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_step()
+
+        if self.ready_dirty:
+            self._rebuild_ready()
+
+        change_count_before = self.change_count
+        delta = [] if self.max_delta_log_size else None
+        self.current_delta = delta
+        self.step_number += 1
+
+        # Visit the active tasks in chart order, or in the given order followed by chart order
+        if order is None:
+            visiting_order = self.tasks
+            self.step_queue = [task.index for task in self.active_tasks]
+        else:
+            visiting_order = list(order) + self.tasks
+            self.step_ranks = {task: rank for rank, task in enumerate(order)}
+            self.step_queue = [self._step_rank(task) for task in self.active_tasks]
+        heapq.heapify(self.step_queue)
+        while self.step_queue:
+            rank = heapq.heappop(self.step_queue)
+            if rank == self.step_position:
+                continue
+            self.step_position = rank
+            visiting_order[rank].try_step()
+        self.step_queue = None
+        self.step_position = -1
+        self.step_ranks = None
+        if profiler is not None:
+            profiler.lap("tasks")
+
+        for mutex in self.mutexes:
+            mutex.evaluate()
+        if profiler is not None:
+            profiler.lap("mutexes")
+
+        self.current_delta = None
+        if delta is not None:
+            self._append_delta((self.step_number - 1, self.last_step_changes, delta))
+
+        self.last_step_changes = self.change_count - change_count_before
+
+        if self.checkpoint_interval and self.step_number % self.checkpoint_interval == 0:
+            self.checkpoints.append(self.snapshot())
+
+        if profiler is not None:
+            profiler.lap("history")
+            profiler.end_step()
+
+    def is_quiescent(self):
+        """
+        Check whether the last step changed nothing.
+
+        Returns:
+            bool: True if no semaphore, cycle or mutex holder changed in the last step.
+        """
+        return self.step_number > 0 and self.last_step_changes == 0
+
+    def run(self, steps, callback=None, callback_every=0):
+        """
+        Advance the simulation by a number of steps in a tight loop.
+
+        Args:
+            steps (int): The number of steps to perform.
+            callback (callable, optional): Called with the engine every callback_every steps.
+            callback_every (int, optional): The callback period in steps, 0 disables it.
+        """
+        for index in range(1, steps + 1):
+            self.step()
+            if callback_every and index % callback_every == 0:
+                callback(self)
+
+    def run_until(self, predicate, max_steps=100000, callback=None, callback_every=0):
+        """
+        Advance the simulation until predicate(engine) is true or max_steps were performed.
+
+        Args:
+            predicate (callable): Checked with the engine after every step.
+            max_steps (int, optional): Upper bound of steps to perform. Defaults to 100000.
+            callback (callable, optional): Called with the engine every callback_every steps.
+            callback_every (int, optional): The callback period in steps, 0 disables it.
+
+        Returns:
+            bool: True if the predicate was met, False if max_steps ran out first.
+        """
+        for index in range(1, max_steps + 1):
+            self.step()
+            if callback_every and index % callback_every == 0:
+                callback(self)
+            if predicate(self):
+                return True
+        return False
+
+    def run_until_quiescent(self, max_steps=100000, callback=None, callback_every=0):
+        """
+        Advance the simulation until a step changes nothing (finished or deadlocked chart).
+
+        Args:
+            max_steps (int, optional): Upper bound of steps to perform. Defaults to 100000.
+            callback (callable, optional): Called with the engine every callback_every steps.
+            callback_every (int, optional): The callback period in steps, 0 disables it.
+
+        Returns:
+            bool: True if the chart became quiescent, False if max_steps ran out first.
+        """
+        return self.run_until(SimulationEngine.is_quiescent, max_steps, callback, callback_every)
+
+    def snapshot(self):
+        """
+        Capture the runtime state of all models.
+
+        The snapshot covers the task cycles, priorities, granted mutexes and
+        mutex protocol attributes, the semaphore values and last changes, the
+        mutex locks, holders and queues and the step number. The chart itself
+        (tasks, connectors, cycle counts) is not copied.
+
+        Returns:
+            dict: The snapshot, to be passed to restore().
+        """
+        tasks = self.tasks
+        return {
+            "step_number": self.step_number,
+            "last_step_changes": self.last_step_changes,
+            "tasks": tuple(tasks),
+            "connections": tuple(self.connections),
+            "task_current_cycle": [task.task_current_cycle for task in tasks],
+            "priority": [task.priority for task in tasks],
+            "granted_mutexes": [task.granted_mutexes for task in tasks],
+            # STRUCTURE: {attribute: {task index: value}} for the tasks where the field is not None
+            "task_attributes": {
+                attribute: {index: getattr(task, attribute) for index, task in enumerate(tasks)
+                            if getattr(task, attribute) is not None}
+                for attribute in TASK_STATE_ATTRIBUTES
+            },
+            "semaphore_value": [connection.semaphore_value for connection in self.connections],
+            "last_change": [connection.last_change for connection in self.connections],
+            # STRUCTURE: [(mutex, lock, holder, attendees, {attribute: value}), ...]
+            "mutexes": [
+                (mutex, mutex.lock, mutex.holder, list(mutex.attendees),
+                 {attribute: getattr(mutex, attribute) for attribute in MUTEX_STATE_ATTRIBUTES
+                  if hasattr(mutex, attribute)})
+                for mutex in self.mutexes
+            ],
+        }
+
+    def restore(self, snapshot):
+        """
+        Put the models back into the state captured by snapshot().
+
+        Observers are not notified; views have to be redrawn afterwards.
+
+        Args:
+            snapshot (dict): A snapshot taken from this engine.
+
+        Raises:
+            ValueError: If tasks or connectors were added or removed since the snapshot.
+        """
+        if list(snapshot["tasks"]) != self.tasks or list(snapshot["connections"]) != self.connections:
+            raise ValueError("The chart changed since the snapshot was taken")
+
+        self.step_number = snapshot["step_number"]
+        self.last_step_changes = snapshot["last_step_changes"]
+
+        for task, cycle, priority, granted_mutexes in zip(self.tasks, snapshot["task_current_cycle"],
+                                                           snapshot["priority"], snapshot["granted_mutexes"]):
+            task.task_current_cycle = cycle
+            task.priority = priority
+            task.granted_mutexes = granted_mutexes
+
+        for attribute, values in snapshot["task_attributes"].items():
+            for index, task in enumerate(self.tasks):
+                setattr(task, attribute, values.get(index))
+
+        for connection, semaphore_value, last_change in zip(self.connections, snapshot["semaphore_value"],
+                                                            snapshot["last_change"]):
+            connection.semaphore_value = semaphore_value
+            connection.last_change = last_change
+
+        for mutex, lock, holder, attendees, attributes in snapshot["mutexes"]:
+            mutex.lock = lock
+            mutex.holder = holder
+            mutex.attendees = list(attendees)
+            for attribute, value in attributes.items():
+                setattr(mutex, attribute, value)
+
+        self._rebuild_ready()
+        self.clear_delta_log()
+
+    def set_checkpoints(self, interval, max_checkpoints):
+        """
+        Keep a snapshot every interval steps, dropping the oldest beyond max_checkpoints.
+
+        The current state is kept as the first checkpoint.
+
+        Args:
+            interval (int): The checkpoint period in steps, 0 disables checkpoints.
+            max_checkpoints (int): The number of checkpoints to keep.
+        """
+        self.checkpoint_interval = interval
+        self.checkpoints = deque(maxlen=max_checkpoints)
+        if interval:
+            self.checkpoints.append(self.snapshot())
+
+    def rewind(self, step_number):
+        """
+        Go back to an earlier step: restore the nearest checkpoint before it and replay the rest.
+
+        Checkpoints after the target step are discarded, as the replay takes new ones.
+
+        Args:
+            step_number (int): The step to go back to.
+
+        Returns:
+            bool: True if the step was reached, False if no checkpoint precedes it.
+        """
+        if not self.checkpoints or self.checkpoints[0]["step_number"] > step_number:
+            return False
+        while self.checkpoints[-1]["step_number"] > step_number:
+            self.checkpoints.pop()
+
+        self.restore(self.checkpoints[-1])
+        while self.step_number < step_number:
+            self.step()
+        return True
+
+    def set_delta_log(self, max_changes):
+        """
+        Record the changes of every step so they can be undone, keeping at most max_changes of them.
+
+        Args:
+            max_changes (int): The memory cap in recorded changes, 0 disables the log.
+        """
+        self.max_delta_log_size = max_changes
+        self.clear_delta_log()
+
+    def clear_delta_log(self):
+        """Forget all recorded steps."""
+        self.delta_log.clear()
+        self.delta_log_size = 0
+
+    def _append_delta(self, entry):
+        """
+        Add the undo information of a step, dropping the oldest steps beyond the memory cap.
+
+        Args:
+            entry (tuple): (step number before, last_step_changes before, [change, ...])
+        """
+        self.delta_log.append(entry)
+        self.delta_log_size += len(entry[2]) + 1
+        while self.delta_log_size > self.max_delta_log_size and self.delta_log:
+            self.delta_log_size -= len(self.delta_log.popleft()[2]) + 1
+
+    def step_back(self):
+        """
+        Undo the last step by reverting its recorded changes.
+
+        The models notify their observers as in a regular step.
+
+        Returns:
+            bool: True if a step was undone, False if the delta log is empty.
+        """
+        if not self.delta_log:
+            return False
+
+        step_number, last_step_changes, delta = self.delta_log.pop()
+        self.delta_log_size -= len(delta) + 1
+        if self.ready_dirty:
+            self._rebuild_ready()
+
+        for change in reversed(delta):
+            if change[0] == "semaphore":
+                change[1].restore_semaphore(change[2], change[3])
+            elif change[0] == "cycle":
+                change[1]._set_cycle(change[2])
+            elif change[0] == "task":
+                setattr(change[1], change[2], change[3])
+            else:
+                change[1].undo(*change[2:])
+
+        self.step_number = step_number
+        self.last_step_changes = last_step_changes
+
+        # Checkpoints of undone steps are retaken when the steps are replayed
+        while self.checkpoints and self.checkpoints[-1]["step_number"] > step_number:
+            self.checkpoints.pop()
+        return True
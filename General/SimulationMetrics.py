@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+This module defines the SimulationMetrics class, an engine observer that
+collects schedule metrics while a chart is simulated: how long tasks wait
+between having all input tokens and starting, and how long mutexes are held.
+"""
+
+
+class SimulationMetrics:
+    """
+    A class collecting wait and mutex hold times of a running SimulationEngine.
+    """
+
+    def __init__(self, engine):
+        """
+        Attach the metrics collector to an engine.
+
+        Args:
+            engine (SimulationEngine): The engine to observe.
+        """
+        self.engine = engine
+
+        self.ready_since = {}  # STRUCTURE: {TaskModel: step the task became ready}
+        self.max_wait = {task: 0 for task in engine.tasks}
+        self.start_count = {task: 0 for task in engine.tasks}
+
+        self.hold_since = {}  # STRUCTURE: {MutexBase: step the holder acquired it}
+        self.max_hold = {mutex: 0 for mutex in engine.mutexes}
+        self.total_hold = {mutex: 0 for mutex in engine.mutexes}
+
+        # The input counts of the tasks are recounted by the next step, so the
+        # tasks waiting now are found from their connectors
+        engine.invalidate_ready()
+        for task in engine.tasks:
+            inputs = [connection.semaphore_value > 0
+                      for connection, position in task.connectors.items() if position == "end"]
+            if task.task_current_cycle == 0 and inputs and all(inputs):
+                self.ready_since[task] = engine.step_number
+        for mutex in engine.mutexes:
+            if mutex.holder is not None:
+                self.hold_since[mutex] = engine.step_number
+
+        engine.add_observer(self)
+
+    def detach(self):
+        """Stop observing the engine."""
+        self.engine.remove_observer(self)
+
+    def _check_ready(self, task):
+        """
+        Remember the step a task got all of its input tokens.
+
+        Args:
+            task (TaskModel): The task to check.
+        """
+        if task.task_current_cycle != 0:
+            return
+
+        if 0 < task.needed_inputs == task.satisfied_inputs:
+            self.ready_since.setdefault(task, self.engine.step_number)
+        else:
+            self.ready_since.pop(task, None)
+
+    def model_changed(self, subject, kind, old_value, new_value):
+        """
+        Observe the engine models and update the metrics.
+
+        Args:
+            subject: The model that changed.
+            kind (str): The kind of change.
+            old_value: The value before the change.
+            new_value: The value after the change.
+        """
+        step_number = self.engine.step_number
+        if kind == "semaphore":
+            for task, position in subject.tasks.items():
+                if position == "end":
+                    self._check_ready(task)
+
+        elif kind == "started":
+            self.start_count[subject] = self.start_count.get(subject, 0) + 1
+            ready_step = self.ready_since.pop(subject, None)
+            if ready_step is not None:
+                self.max_wait[subject] = max(self.max_wait.get(subject, 0), step_number - ready_step)
+
+        elif kind == "ended":
+            self._check_ready(subject)
+
+        elif kind == "holder":
+            if old_value is not None and subject in self.hold_since:
+                hold_time = step_number - self.hold_since.pop(subject)
+                self.max_hold[subject] = max(self.max_hold.get(subject, 0), hold_time)
+                self.total_hold[subject] = self.total_hold.get(subject, 0) + hold_time
+            if new_value is not None:
+                self.hold_since[subject] = step_number
+
+    def is_deadlocked(self):
+        """
+        Check whether the chart is stuck: quiescent while tokens wait at some task.
+
+        Returns:
+            bool: True if the last step changed nothing and a task has input tokens.
+        """
+        if not self.engine.is_quiescent():
+            return False
+
+        return any(task.satisfied_inputs > 0 for task in self.engine.tasks)
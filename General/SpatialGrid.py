@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+This module defines the SpatialGrid class, a uniform grid over points in the
+plane for finding the items inside a rectangle without looking at the others.
+
+Every item is kept in the grid cell containing its point. A rectangle query
+only visits the cells overlapping the rectangle, or the occupied cells if
+those are fewer, e.g. when the whole chart is in view. A nearest item query
+visits rings of cells around the point until no closer item can follow.
+"""
+import math
+
+
+class SpatialGrid:
+    """A uniform grid index over item positions."""
+
+    def __init__(self, cell_size=500):
+        """
+        Initialize an empty grid.
+
+        Args:
+            cell_size (float, optional): The width and height of a cell. Defaults to 500.
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # STRUCTURE: {(column, row): {item: None}}
+        self.points = {}  # STRUCTURE: {item: (x, y)}
+
+    def __len__(self):
+        return len(self.points)
+
+    def __contains__(self, item):
+        return item in self.points
+
+    def _cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, item, x, y):
+        """
+        Add an item at a point, or move it there if it is in the grid already.
+
+        Args:
+            item: The item, any hashable object.
+            x (float): The x-coordinate of the item.
+            y (float): The y-coordinate of the item.
+        """
+        old_point = self.points.get(item)
+        cell = self._cell(x, y)
+        if old_point is not None:
+            old_cell = self._cell(*old_point)
+            if old_cell != cell:
+                self._remove_from_cell(item, old_cell)
+                self.cells.setdefault(cell, {})[item] = None
+        else:
+            self.cells.setdefault(cell, {})[item] = None
+
+        self.points[item] = (x, y)
+
+    def remove(self, item):
+        """
+        Remove an item from the grid, if it is in it.
+
+        Args:
+            item: The item to remove.
+        """
+        point = self.points.pop(item, None)
+        if point is not None:
+            self._remove_from_cell(item, self._cell(*point))
+
+    def _remove_from_cell(self, item, cell):
+        items = self.cells[cell]
+        del items[item]
+        if not items:
+            del self.cells[cell]
+
+    def clear(self):
+        """Remove all items."""
+        self.cells.clear()
+        self.points.clear()
+
+    def query(self, x1, y1, x2, y2):
+        """
+        Find the items whose point lies inside a rectangle, borders included.
+
+        Args:
+            x1 (float): The left edge of the rectangle.
+            y1 (float): The top edge of the rectangle.
+            x2 (float): The right edge of the rectangle.
+            y2 (float): The bottom edge of the rectangle.
+
+        Returns:
+            list: The items inside the rectangle.
+        """
+        column1, row1 = self._cell(x1, y1)
+        column2, row2 = self._cell(x2, y2)
+
+        if (column2 - column1 + 1) * (row2 - row1 + 1) > len(self.cells):
+            cells = [items for (column, row), items in self.cells.items()
+                     if column1 <= column <= column2 and row1 <= row <= row2]
+        else:
+            cells = [self.cells[(column, row)]
+                     for column in range(column1, column2 + 1)
+                     for row in range(row1, row2 + 1)
+                     if (column, row) in self.cells]
+
+        found = []
+        for items in cells:
+            for item in items:
+                x, y = self.points[item]
+                if x1 <= x <= x2 and y1 <= y <= y2:
+                    found.append(item)
+        return found
+
+    def nearest(self, x, y, max_distance=math.inf):
+        """
+        Find the item whose point is closest to a point.
+
+        Args:
+            x (float): The x-coordinate of the point.
+            y (float): The y-coordinate of the point.
+            max_distance (float, optional): The largest distance accepted. Defaults to no limit.
+
+        Returns:
+            The closest item, or None if no item is within max_distance.
+        """
+        if not self.cells:
+            return None
+
+        column, row = self._cell(x, y)
+        if max_distance == math.inf:
+            # Beyond this ring there are no occupied cells
+            last_ring = max(max(abs(cell[0] - column), abs(cell[1] - row)) for cell in self.cells)
+        else:
+            last_ring = int(max_distance // self.cell_size) + 1
+
+        best = None
+        best_distance = max_distance
+        for ring in range(last_ring + 1):
+            for cell in self._ring(column, row, ring):
+                for item in self.cells.get(cell, ()):
+                    item_x, item_y = self.points[item]
+                    distance = math.hypot(item_x - x, item_y - y)
+                    if distance < best_distance or (best is None and distance == best_distance):
+                        best = item
+                        best_distance = distance
+
+            # Items in the next ring are at least this far away
+            if best is not None and ring * self.cell_size >= best_distance:
+                break
+
+        return best
+
+    @staticmethod
+    def _ring(column, row, ring):
+        """Get the cells at Chebyshev distance ring from a cell."""
+        if ring == 0:
+            return [(column, row)]
+
+        cells = []
+        for offset in range(-ring, ring + 1):
+            cells.append((column + offset, row - ring))
+            cells.append((column + offset, row + ring))
+        for offset in range(-ring + 1, ring):
+            cells.append((column - ring, row + offset))
+            cells.append((column + ring, row + offset))
+        return cells
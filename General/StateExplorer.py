@@ -0,0 +1,479 @@
+# -*- coding: utf-8 -*-
+"""
+Module for exploring every schedule of a chart (explicit-state model checking).
+
+SimulationEngine.step() visits the active tasks in chart order, which is only
+one of the schedules the mutex protocols allow: the order in which tasks
+attend a mutex decides its queue and tickets, and competing consumers of a
+connector race for its tokens. The explorer runs a step once for every
+visiting order of the tasks that interact (share a mutex or a connector),
+starting from the current state of a chart, and continues breadth-first from
+every new state.
+
+States are deduplicated through an 8 byte hash of the task cycles, semaphore
+values and mutex queues (ticket numbers taken relative to the ticket being
+served, see General.ChartAnalyzer.state_keys). The frontier of every level is
+expanded in worker processes once it is large enough.
+
+The explorer reports:
+- deadlock: no schedule changes anything while tasks wait for tokens or mutexes.
+- mutual exclusion: two tasks run inside the same mutex at once.
+- unbounded: a semaphore exceeds max_tokens.
+
+Every counterexample holds the visiting orders leading to it from the start
+state, so it can be written to a trace file and replayed step by step in the
+GUI (File > Load trace, then Run > Next step).
+
+The main functions are:
+
+explore_chart(engine, max_states, max_orders, max_tokens, max_workers):
+    Explores a copy of the engine and returns an ExplorationReport.
+
+write_trace(report, counterexample, file_path):
+    Writes a counterexample together with its start state to a trace file.
+
+read_trace(file_path):
+    Reads a trace file into a new SimulationEngine and the visiting orders.
+
+Usage from the command line (exits with 1 if a problem was found):
+    python -m General.StateExplorer ring2.xlsx --mutex-type "Ticket Lock" --trace-output ring2.fctrace
+"""
+
+# Import necessary modules
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from General.ChartAnalyzer import state_keys
+from General.ChartLoader import read_chart
+from General.Log import quiet
+from General.ProjectFile import PROJECT_EXTENSION, engine_from_lines, project_lines, read_project
+
+TRACE_EXTENSION = ".fctrace"
+TRACE_FORMAT = "flowchart-trace"
+TRACE_VERSION = 1
+
+# Frontiers smaller than this are expanded in the calling process
+PARALLEL_FRONTIER_SIZE = 256
+
+# The expander of a worker process, created by _init_worker
+_worker_expander = None
+
+
+class Counterexample:
+    """
+    A class holding a problem found by the explorer and the schedule leading to it.
+    """
+
+    def __init__(self, kind, description, orders):
+        """
+        Initialize a new Counterexample instance.
+
+        Args:
+            kind (str): "deadlock", "mutual exclusion" or "unbounded".
+            description (str): What went wrong.
+            orders (list): The visiting order of every step, as lists of task indices.
+        """
+        self.kind = kind
+        self.description = description
+        self.orders = orders
+
+
+class ExplorationReport:
+    """
+    A class holding the result of a state-space exploration.
+    """
+
+    def __init__(self, start_lines):
+        """
+        Initialize an empty report.
+
+        Args:
+            start_lines (list): The project file lines of the start state.
+        """
+        self.start_lines = start_lines
+        self.states = 1
+        self.transitions = 0
+        self.depth = 0
+
+        # False if max_states, max_orders or max_counterexamples cut the exploration short
+        self.complete = True
+
+        self.counterexamples = []
+
+    @property
+    def has_problems(self):
+        """
+        Check whether any schedule leads to a problem.
+
+        Returns:
+            bool: True if a counterexample was found.
+        """
+        return bool(self.counterexamples)
+
+    def summary(self):
+        """
+        Describe the result in readable lines.
+
+        Returns:
+            list: The lines of the summary.
+        """
+        lines = [f"Explored {self.states} states and {self.transitions} transitions up to depth {self.depth}"
+                 + ("" if self.complete else " (incomplete)")]
+        for counterexample in self.counterexamples:
+            lines.append(f"{counterexample.kind} after {len(counterexample.orders)} steps: "
+                         f"{counterexample.description}")
+        if not self.counterexamples:
+            lines.append("No problems found")
+        return lines
+
+
+class _Expander:
+    """Computes the successors of states of one chart under every visiting order."""
+
+    def __init__(self, lines, max_orders, max_tokens):
+        with quiet():
+            self.engine = engine_from_lines(lines)
+        self.task_indices = {task: index for index, task in enumerate(self.engine.tasks)}
+        self.max_orders = max_orders
+        self.max_tokens = max_tokens
+
+    def portable_state(self):
+        """
+        Capture the engine state with all models replaced by their indices, so it can be pickled.
+
+        Returns:
+            dict: The state, see SimulationEngine.snapshot().
+        """
+        state = self.engine.snapshot()
+        del state["tasks"], state["connections"]
+        state["mutexes"] = [
+            (lock, self.task_indices.get(holder), [self.task_indices[task] for task in attendees], attributes)
+            for mutex, lock, holder, attendees, attributes in state["mutexes"]
+        ]
+        return state
+
+    def put_state(self, state):
+        """
+        Put the engine into a state captured by portable_state().
+
+        Args:
+            state (dict): The state.
+        """
+        tasks = self.engine.tasks
+        snapshot = dict(state)
+        snapshot["tasks"] = tuple(tasks)
+        snapshot["connections"] = tuple(self.engine.connections)
+        snapshot["mutexes"] = [
+            (mutex, lock, tasks[holder] if holder is not None else None, [tasks[index] for index in attendees],
+             attributes)
+            for mutex, (lock, holder, attendees, attributes) in zip(self.engine.mutexes, state["mutexes"])
+        ]
+        self.engine.restore(snapshot)
+
+    def digest(self):
+        """
+        Hash the current engine state.
+
+        Returns:
+            bytes: An 8 byte digest, equal for states that behave the same.
+        """
+        return hashlib.blake2b(repr(state_keys(self.engine, self.task_indices)).encode(), digest_size=8).digest()
+
+    def visiting_orders(self):
+        """
+        List the visiting orders that may lead to different successors.
+
+        Active tasks sharing a mutex or a connector form a group; only the order
+        within a group matters, so the orders are the combinations of the
+        permutations of all groups.
+
+        Returns:
+            tuple: The orders as lists of tasks (at most max_orders) and whether
+            some orders were left out.
+        """
+        owners = {}  # STRUCTURE: {mutex or connector: first active task using it}
+        parents = {task: task for task in self.engine.active_tasks}
+
+        def find(task):
+            while parents[task] is not task:
+                parents[task] = parents[parents[task]]
+                task = parents[task]
+            return task
+
+        for task in sorted(self.engine.active_tasks, key=lambda active_task: active_task.index):
+            for resource in itertools.chain(task.mutexes, task.connectors):
+                owner = owners.setdefault(resource, task)
+                parents[find(task)] = find(owner)
+
+        groups = {}
+        for task in sorted(parents, key=lambda active_task: active_task.index):
+            groups.setdefault(find(task), []).append(task)
+        groups = [group for group in groups.values() if len(group) > 1]
+
+        order_count = math.prod(math.factorial(len(group)) for group in groups)
+        orders = list(itertools.islice(_combined_permutations(groups), self.max_orders))
+        return orders, order_count > len(orders)
+
+    def problems(self):
+        """
+        Check the current engine state for broken invariants.
+
+        Returns:
+            list: The problems as (kind, description) tuples.
+        """
+        problems = []
+        for mutex in self.engine.mutexes:
+            running = [task.full_name for task in mutex.connected_tasks if task.task_current_cycle > 0]
+            if len(running) > 1:
+                problems.append(("mutual exclusion", f"{', '.join(running)} run inside mutex {mutex.name} at once"))
+        for connection in self.engine.connections:
+            if connection.semaphore_value > self.max_tokens:
+                problems.append(("unbounded", f"{connection.name} holds more than {self.max_tokens} tokens"))
+        return problems
+
+    def expand(self, state):
+        """
+        Step a state once for every visiting order.
+
+        Args:
+            state (dict): The state, see portable_state().
+
+        Returns:
+            tuple: The successors as a list of (order as task indices, digest, state, problems),
+            whether orders were left out, and the deadlock description if no order
+            changes anything while tasks wait (else None). A state no order changes
+            has no successors.
+        """
+        self.put_state(state)
+        orders, truncated = self.visiting_orders()
+
+        successors = {}  # STRUCTURE: {digest: (order, state, problems)}
+        changed = False
+        with quiet():
+            for order in orders:
+                self.put_state(state)
+                self.engine.step(order)
+                changed = changed or self.engine.last_step_changes > 0
+
+                digest = self.digest()
+                if digest not in successors:
+                    successors[digest] = ([self.task_indices[task] for task in order], self.portable_state(),
+                                          self.problems())
+
+        # A state no schedule changes is final; its successors only differ in repeated mutex requests
+        if not changed:
+            self.put_state(state)
+            waiting = [task.full_name for task in self.engine.tasks
+                       if task.task_current_cycle == 0 and task.satisfied_inputs > 0]
+            deadlock = "no schedule makes progress, waiting: " + ", ".join(waiting) if waiting else None
+            return [], truncated, deadlock
+
+        return ([(order, digest, successor, problems) for digest, (order, successor, problems) in successors.items()],
+                truncated, None)
+
+
+def _combined_permutations(groups):
+    """
+    Generate the concatenations of one permutation of every group.
+
+    Args:
+        groups (list): The groups as lists of tasks.
+
+    Yields:
+        list: A visiting order.
+    """
+    if not groups:
+        yield []
+        return
+
+    for permutation in itertools.permutations(groups[0]):
+        for rest in _combined_permutations(groups[1:]):
+            yield list(permutation) + rest
+
+
+def _init_worker(lines, max_orders, max_tokens):
+    """Create the expander of a worker process."""
+    global _worker_expander
+    _worker_expander = _Expander(lines, max_orders, max_tokens)
+
+
+def _expand_batch(states):
+    """Expand a batch of states in a worker process."""
+    return [_worker_expander.expand(state) for state in states]
+
+
+def _trace(parents, digest):
+    """
+    Collect the visiting orders leading from the start state to a state.
+
+    Args:
+        parents (dict): STRUCTURE: {digest: (parent digest, order) or None for the start state}
+        digest (bytes): The digest of the state.
+
+    Returns:
+        list: The orders, first step first.
+    """
+    orders = []
+    while parents[digest] is not None:
+        digest, order = parents[digest]
+        orders.append(order)
+    orders.reverse()
+    return orders
+
+
+def explore_chart(engine, max_states=100000, max_orders=120, max_tokens=16, max_workers=None,
+                  max_counterexamples=10):
+    """
+    Explore every schedule of a chart from the current state of an engine.
+
+    The engine itself is not modified; copies are simulated.
+
+    Args:
+        engine (SimulationEngine): The engine holding the chart.
+        max_states (int, optional): Upper bound of distinct states. Defaults to 100000.
+        max_orders (int, optional): Upper bound of visiting orders tried per state. Defaults to 120.
+        max_tokens (int, optional): Semaphore values above this count as unbounded. Defaults to 16.
+        max_workers (int, optional): Number of worker processes. Defaults to the number of cores;
+            1 explores in the calling process only.
+        max_counterexamples (int, optional): Stop after this many distinct problems. Defaults to 10.
+
+    Returns:
+        ExplorationReport: The result.
+    """
+    lines = project_lines(engine)
+    report = ExplorationReport(lines)
+    expander = _Expander(lines, max_orders, max_tokens)
+
+    start_digest = expander.digest()
+    parents = {start_digest: None}  # STRUCTURE: {digest: (parent digest, order) or None for the start state}
+    frontier = [(start_digest, expander.portable_state())]
+    reported = set()  # STRUCTURE: {(kind, description)}
+
+    def add_counterexample(kind, description, digest):
+        if (kind, description) not in reported and len(reported) < max_counterexamples:
+            reported.add((kind, description))
+            report.counterexamples.append(Counterexample(kind, description, _trace(parents, digest)))
+
+    executor = None
+    try:
+        while frontier and len(reported) < max_counterexamples:
+            states = [state for digest, state in frontier]
+            if max_workers == 1 or len(states) < PARALLEL_FRONTIER_SIZE:
+                expansions = [expander.expand(state) for state in states]
+            else:
+                if executor is None:
+                    executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                                   initargs=(lines, max_orders, max_tokens))
+                batch_size = max(1, len(states) // (4 * (max_workers or os.cpu_count() or 1)))
+                batches = [states[index:index + batch_size] for index in range(0, len(states), batch_size)]
+                expansions = list(itertools.chain.from_iterable(executor.map(_expand_batch, batches)))
+
+            next_frontier = []
+            for (digest, state), (successors, truncated, deadlock) in zip(frontier, expansions):
+                report.transitions += len(successors)
+                report.complete = report.complete and not truncated
+                if deadlock is not None:
+                    add_counterexample("deadlock", deadlock, digest)
+
+                for order, successor_digest, successor, problems in successors:
+                    if successor_digest in parents:
+                        continue
+                    if len(parents) >= max_states:
+                        report.complete = False
+                        continue
+
+                    parents[successor_digest] = (digest, order)
+                    for kind, description in problems:
+                        add_counterexample(kind, description, successor_digest)
+                    if not problems:
+                        next_frontier.append((successor_digest, successor))
+
+            frontier = next_frontier
+            if frontier:
+                report.depth += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    report.complete = report.complete and not frontier
+    report.states = len(parents)
+    return report
+
+
+def write_trace(report, counterexample, file_path):
+    """
+    Write a counterexample together with its start state to a trace file.
+
+    Args:
+        report (ExplorationReport): The report holding the start state.
+        counterexample (Counterexample): The counterexample.
+        file_path (str): Path of the trace file.
+    """
+    task_names = [line["TASK"] + line["ACTIVITY"] for line in report.start_lines if line.get("kind") == "task"]
+    trace = {
+        "format": TRACE_FORMAT,
+        "version": TRACE_VERSION,
+        "kind": counterexample.kind,
+        "description": counterexample.description,
+        "orders": counterexample.orders,
+        # Only for reading the file, the orders are replayed by task index
+        "order_names": [[task_names[index] for index in order] for order in counterexample.orders],
+        "project": report.start_lines,
+    }
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(trace, file)
+
+
+def read_trace(file_path):
+    """
+    Read a trace file.
+
+    Args:
+        file_path (str): Path of the trace file.
+
+    Returns:
+        tuple: A new SimulationEngine in the start state, the visiting orders as
+        lists of task indices and the description of the problem.
+
+    Raises:
+        ValueError: If the file is not a trace file of a supported version.
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        trace = json.load(file)
+
+    if trace.get("format") != TRACE_FORMAT:
+        raise ValueError(f"{file_path} is not a flowchart trace file")
+    if trace.get("version", 0) > TRACE_VERSION:
+        raise ValueError(f"{file_path} was written by a newer version (format version {trace['version']})")
+
+    return engine_from_lines(trace["project"]), trace["orders"], f"{trace['kind']}: {trace['description']}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Explore every schedule of a chart for deadlocks and races.")
+    parser.add_argument("file_path", help="Path of the .xlsx chart or project file")
+    parser.add_argument("--mutex-type", default="First Come First Serve", help="Mutex protocol of .xlsx charts")
+    parser.add_argument("--max-states", type=int, default=100000, help="Upper bound of distinct states")
+    parser.add_argument("--max-orders", type=int, default=120, help="Upper bound of visiting orders per state")
+    parser.add_argument("--max-tokens", type=int, default=16, help="Semaphore bound counted as unbounded")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--trace-output", default="", help="Write the first counterexample to this trace file")
+    arguments = parser.parse_args()
+
+    with quiet():
+        if arguments.file_path.endswith(PROJECT_EXTENSION):
+            chart = read_project(arguments.file_path)
+        else:
+            chart = read_chart(arguments.file_path, arguments.mutex_type)
+
+    result = explore_chart(chart, arguments.max_states, arguments.max_orders, arguments.max_tokens,
+                           arguments.workers)
+    print("\n".join(result.summary()))
+    if arguments.trace_output and result.counterexamples:
+        write_trace(result, result.counterexamples[0], arguments.trace_output)
+    sys.exit(1 if result.has_problems else 0)
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Module for timing the phases of simulation steps.
+
+A StepProfiler attached to a SimulationEngine receives a lap from every step
+and keeps the durations of the last steps per phase:
+
+    tasks       visiting the active tasks (model logic)
+    mutexes     evaluating the mutexes (model logic)
+    history     undo log and checkpoints
+    views       canvas views redrawing themselves when notified, timed
+                through the classes passed to instrument()
+    animations  frames of the Animator (GUI only)
+    redraw      Tk drawing the canvas after a step (GUI only)
+
+The tasks and mutexes phases exclude the time spent in instrumented views, so
+model logic and rendering can be told apart. Each phase keeps a rolling
+window of durations, summarised as percentiles and a histogram with four
+logarithmic bins per decade from 1 µs to 1 s.
+
+The main functions are:
+
+StepProfiler(engine):
+    Attaches a profiler to an engine; detach() removes it again.
+
+StepProfiler.summary():
+    Returns count, total, mean, percentiles and histogram of every phase.
+
+StepProfiler.write(path):
+    Writes the summary as JSON.
+
+Usage from the command line (profiles a chart without the GUI):
+    python -m General.StepProfiler data2.xlsx --steps 10000 --output profile.json
+"""
+
+# Import necessary modules
+import argparse
+import json
+import time
+from collections import deque
+import numpy as np
+from General.Log import quiet
+
+# Phases of a step, in the order they are shown
+PHASES = ["tasks", "mutexes", "history", "views", "animations", "redraw"]
+
+# Phases timed by SimulationEngine.step() itself
+ENGINE_PHASES = ["tasks", "mutexes", "history", "views"]
+
+# Bin edges of the histograms in seconds: 1 µs to 1 s, four bins per decade
+HISTOGRAM_EDGES = np.logspace(-6, 0, 25)
+
+# Characters of the histogram sparklines, from empty to full
+SPARK_CHARACTERS = " ▁▂▃▄▅▆▇█"
+
+
+class StepProfiler:
+    """
+    A class timing the phases of the steps of a SimulationEngine.
+    """
+
+    def __init__(self, engine, window=1000):
+        """
+        Attach the profiler to an engine.
+
+        Args:
+            engine (SimulationEngine): The engine to profile.
+            window (int, optional): The number of durations kept per phase. Defaults to 1000.
+        """
+        self.engine = None
+        self.window = window
+
+        self.samples = {phase: deque(maxlen=window) for phase in PHASES}  # STRUCTURE: {phase: deque([seconds, ...])}
+        self.totals = {phase: 0.0 for phase in PHASES}
+        self.counts = {phase: 0 for phase in PHASES}
+
+        # Durations of the running step and time spent in views since the last lap
+        self.current = {phase: 0.0 for phase in ENGINE_PHASES}
+        self.lap_start = 0.0
+        self.view_time = 0.0
+
+        # Replaced methods, STRUCTURE: [(class, method name, original method), ...]
+        self.instrumented = []
+
+        self.attach(engine)
+
+    def attach(self, engine):
+        """
+        Profile another engine, e.g. after a new chart was loaded.
+
+        Args:
+            engine (SimulationEngine): The engine to profile.
+        """
+        if self.engine is not None:
+            self.engine.profiler = None
+        self.engine = engine
+        engine.profiler = self
+
+    def detach(self):
+        """Stop profiling the engine and restore the instrumented methods."""
+        self.engine.profiler = None
+        for cls, method_name, method in reversed(self.instrumented):
+            setattr(cls, method_name, method)
+        self.instrumented.clear()
+
+    def instrument(self, cls, method_name="model_changed"):
+        """
+        Count the time spent in a method of a view class as the views phase.
+
+        Args:
+            cls (type): The view class, e.g. DraggableTask.
+            method_name (str, optional): The method to time. Defaults to "model_changed".
+        """
+        method = cls.__dict__[method_name]
+        profiler = self
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                profiler.view_time += time.perf_counter() - start
+
+        setattr(cls, method_name, timed)
+        self.instrumented.append((cls, method_name, method))
+
+    def begin_step(self):
+        """Start timing a step."""
+        for phase in ENGINE_PHASES:
+            self.current[phase] = 0.0
+        self.view_time = 0.0
+        self.lap_start = time.perf_counter()
+
+    def lap(self, phase):
+        """
+        Count the time since the last lap as the given phase, except the time spent in views.
+
+        Args:
+            phase (str): The phase that just ended.
+        """
+        now = time.perf_counter()
+        self.current[phase] += now - self.lap_start - self.view_time
+        self.current["views"] += self.view_time
+        self.view_time = 0.0
+        self.lap_start = now
+
+    def end_step(self):
+        """Record the durations of the step; the views phase only once views are instrumented."""
+        for phase in ENGINE_PHASES:
+            if phase != "views" or self.instrumented:
+                self.add(phase, self.current[phase])
+
+    def add(self, phase, seconds):
+        """
+        Record one duration of a phase.
+
+        Args:
+            phase (str): One of PHASES.
+            seconds (float): The duration.
+        """
+        self.samples[phase].append(seconds)
+        self.totals[phase] += seconds
+        self.counts[phase] += 1
+
+    def histogram(self, phase):
+        """
+        Count the durations in the window of a phase per bin of HISTOGRAM_EDGES.
+
+        Args:
+            phase (str): One of PHASES.
+
+        Returns:
+            ndarray: The counts; durations outside the edges fall into the first or last bin.
+        """
+        durations = np.clip(np.fromiter(self.samples[phase], float), HISTOGRAM_EDGES[0], HISTOGRAM_EDGES[-1])
+        return np.histogram(durations, HISTOGRAM_EDGES)[0]
+
+    def summary(self):
+        """
+        Summarise every phase with durations.
+
+        Returns:
+            dict: STRUCTURE: {phase: {"count", "total", "mean", "p50", "p95", "max", "histogram"}},
+            with the percentiles and maximum taken over the window and times in seconds.
+        """
+        summary = {}
+        for phase in PHASES:
+            if not self.samples[phase]:
+                continue
+
+            durations = np.fromiter(self.samples[phase], float)
+            p50, p95 = np.percentile(durations, [50, 95])
+            summary[phase] = {
+                "count": self.counts[phase],
+                "total": self.totals[phase],
+                "mean": self.totals[phase] / self.counts[phase],
+                "p50": float(p50),
+                "p95": float(p95),
+                "max": float(durations.max()),
+                "histogram": self.histogram(phase).tolist(),
+            }
+        return summary
+
+    def summary_lines(self):
+        """
+        Describe every phase in one line: median and 95th percentile in ms and a histogram sparkline.
+
+        Returns:
+            list: The lines.
+        """
+        lines = []
+        for phase, values in self.summary().items():
+            counts = np.array(values["histogram"])
+            levels = np.ceil(counts / max(counts.max(), 1) * (len(SPARK_CHARACTERS) - 1)).astype(int)
+            sparkline = "".join(SPARK_CHARACTERS[level] for level in levels[4:20])
+            lines.append(f"{phase:<10} {values['p50'] * 1000:7.3f} {values['p95'] * 1000:7.3f} {sparkline}")
+        return lines
+
+    def write(self, path):
+        """
+        Write the summary as JSON.
+
+        Args:
+            path (str): The path of the JSON file.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"window": self.window, "histogram_edges": HISTOGRAM_EDGES.tolist(),
+                       "phases": self.summary()}, file, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the phases of the simulation steps of a chart.")
+    parser.add_argument("file_path", help="Path of the .xlsx chart or project file")
+    parser.add_argument("--steps", type=int, default=1000, help="Number of steps to simulate")
+    parser.add_argument("--mutex-type", default="First Come First Serve", help="Mutex protocol of .xlsx charts")
+    parser.add_argument("--window", type=int, default=1000, help="Number of steps kept per phase")
+    parser.add_argument("--output", help="Write the summary as JSON to this path")
+    arguments = parser.parse_args()
+
+    from General.ChartLoader import read_chart
+    from General.ProjectFile import PROJECT_EXTENSION, read_project
+
+    with quiet():
+        if arguments.file_path.endswith(PROJECT_EXTENSION):
+            chart = read_project(arguments.file_path)
+        else:
+            chart = read_chart(arguments.file_path, arguments.mutex_type)
+
+    profiler = StepProfiler(chart, arguments.window)
+    chart.run(arguments.steps)
+    profiler.detach()
+
+    if arguments.output:
+        profiler.write(arguments.output)
+    print(f"{'phase':<10} {'p50 ms':>7} {'p95 ms':>7} 10 µs - 100 ms")
+    print("\n".join(profiler.summary_lines()))
@@ -0,0 +1,509 @@
+# -*- coding: utf-8 -*-
+"""
+This module defines the Viewport class, which keeps only the part of the
+chart near the visible area on the canvas.
+
+The task views are indexed by position in a SpatialGrid, which also answers
+the hit-testing and selection queries of the canvas without asking Tk for
+item coordinates. After every pan,
+zoom or resize the views entering the visible area get their canvas items
+created and the views leaving it get them deleted, so the number of canvas
+items depends on what is on screen rather than on the size of the chart.
+The simulation keeps running on the models; a view shows the current model
+state when it is created again.
+
+Panning scrolls the canvas, so at zoom factor 1 canvas coordinates are chart
+coordinates. Below zoom factor 1 the views draw simplified glyphs at scaled
+positions: tasks as plain circles and connectors as thin lines, without
+labels, semaphore bubbles or mutexes.
+
+A collapsed task (see SystemFunctions.collapse_activities()) is indexed as a
+single compound node instead of its activity views, and the connectors
+touching it are replaced by one group connection per pair of nodes.
+
+A view provides:
+- shown: whether its canvas items exist
+- show(): create the canvas items for the current zoom factor
+- hide(): delete the canvas items
+- bounds(): connectors and group connections only, the rectangle (x1, y1, x2, y2) spanned by their tasks
+"""
+from General.Configuration import Configuration
+from General.SpatialGrid import SpatialGrid
+
+
+class Viewport:
+    """A class deciding which views have canvas items, and handling pan and zoom."""
+
+    # Task views by the position of their centre
+    grid = SpatialGrid()
+
+    # Task views by their model, STRUCTURE: {TaskModel: DraggableTask}
+    views_by_model = {}
+
+    # Collapsed tasks: the compound nodes, STRUCTURE: {TaskGroup: None}, and the
+    # node of every activity view they stand for, STRUCTURE: {DraggableTask: TaskGroup}
+    groups = {}
+    group_of = {}
+
+    # Lines drawn in place of the connectors of collapsed tasks, STRUCTURE:
+    # {GroupConnection: None}, the lines at every node, STRUCTURE: {node: [GroupConnection]},
+    # and the connectors they replace, STRUCTURE: {ConnectionBase: None}
+    group_connections = {}
+    group_connections_of = {}
+    grouped_connectors = {}
+
+    # Views whose canvas items exist, STRUCTURE: {view: None}
+    shown_views = {}
+
+    # Identifier of the pending root.after() refresh callback
+    refresh_job = None
+
+    # Whether views were created since the stacking order was last fixed
+    restack_needed = False
+
+    @staticmethod
+    def install(canvas):
+        """
+        Bind panning (dragging with the middle or right mouse button), zooming
+        (mouse wheel) and resizing on the canvas.
+
+        Args:
+            canvas (Canvas): The chart canvas.
+        """
+        # Without a scroll region the view may be scrolled anywhere
+        canvas.configure(confine=False)
+
+        for button in (2, 3):
+            canvas.bind(f"<ButtonPress-{button}>", lambda event: canvas.scan_mark(event.x, event.y))
+            canvas.bind(f"<B{button}-Motion>", Viewport._pan)
+
+        canvas.bind("<MouseWheel>", lambda event: Viewport.zoom_by(
+            Configuration.zoom_step if event.delta > 0 else 1 / Configuration.zoom_step, event.x, event.y))
+        canvas.bind("<Button-4>", lambda event: Viewport.zoom_by(Configuration.zoom_step, event.x, event.y))
+        canvas.bind("<Button-5>", lambda event: Viewport.zoom_by(1 / Configuration.zoom_step, event.x, event.y))
+        canvas.bind("<Configure>", lambda event: Viewport.schedule_refresh())
+
+    @staticmethod
+    def clear():
+        """Forget all views, e.g. before the canvas is cleared."""
+        Viewport.grid.clear()
+        Viewport.views_by_model.clear()
+        Viewport.groups.clear()
+        Viewport.group_of.clear()
+        Viewport.group_connections.clear()
+        Viewport.group_connections_of.clear()
+        Viewport.grouped_connectors.clear()
+        Viewport.shown_views.clear()
+        Viewport.restack_needed = False
+
+        if Viewport.refresh_job is not None:
+            Configuration.root.after_cancel(Viewport.refresh_job)
+            Viewport.refresh_job = None
+
+    @staticmethod
+    def shows_details():
+        """
+        Check whether views are drawn in full or as glyphs.
+
+        Returns:
+            bool: True at zoom factor 1.
+        """
+        return Configuration.zoom >= 1
+
+    @staticmethod
+    def add_task(task):
+        """
+        Index a new task view and show it if it is in the visible area.
+
+        Args:
+            task (DraggableTask): The task view.
+        """
+        Viewport.grid.insert(task, task.model.x, task.model.y)
+        Viewport.views_by_model[task.model] = task
+
+        x1, y1, x2, y2 = Viewport.visible_area(task.radius)
+        if x1 <= task.model.x <= x2 and y1 <= task.model.y <= y2:
+            Viewport.show(task)
+
+    @staticmethod
+    def task_moved(task):
+        """
+        Update the index after a task view moved.
+
+        Args:
+            task (DraggableTask): The task view.
+        """
+        # A collapsed task is indexed through its compound node
+        if task in Viewport.group_of:
+            return
+
+        Viewport.grid.insert(task, task.model.x, task.model.y)
+
+    @staticmethod
+    def tasks_moved():
+        """Index all task views again after many tasks moved, e.g. by an automatic layout, and redraw them."""
+        for view in list(Viewport.shown_views):
+            Viewport.hide(view)
+
+        for task in Configuration.task_objects:
+            if task not in Viewport.group_of:
+                Viewport.grid.insert(task, task.model.x, task.model.y)
+
+        for group in Viewport.groups:
+            group.place()
+            Viewport.grid.insert(group, group.x, group.y)
+        Viewport.refresh()
+
+    @staticmethod
+    def add_group(group):
+        """
+        Collapse task views into a compound node, which takes their place in the index.
+
+        Args:
+            group (TaskGroup): The compound node.
+        """
+        for member in group.members:
+            Viewport.hide(member)
+            Viewport.grid.remove(member)
+            Viewport.group_of[member] = group
+
+            # Mutex lines now end at the compound node, so they are drawn again on the next refresh
+            for mutex in member.mutexes:
+                Viewport.hide(mutex)
+
+        Viewport.groups[group] = None
+        Viewport.grid.insert(group, group.x, group.y)
+
+    @staticmethod
+    def remove_group(group):
+        """
+        Expand a compound node into its task views again.
+
+        Args:
+            group (TaskGroup): The compound node.
+        """
+        Viewport.hide(group)
+        Viewport.grid.remove(group)
+        Viewport.groups.pop(group, None)
+        group.detach()
+
+        for member in group.members:
+            Viewport.group_of.pop(member, None)
+            Viewport.grid.insert(member, member.model.x, member.model.y)
+
+            for mutex in member.mutexes:
+                Viewport.hide(mutex)
+
+    @staticmethod
+    def set_group_connections(connections, grouped_connectors):
+        """
+        Replace the lines of collapsed tasks and show the visible part of the chart again.
+
+        Args:
+            connections (list): The new lines (GroupConnection).
+            grouped_connectors (list): The connectors the lines stand for, hidden while they are in use.
+        """
+        for connection in Viewport.group_connections:
+            Viewport.hide(connection)
+            connection.detach()
+
+        Viewport.group_connections.clear()
+        Viewport.group_connections_of.clear()
+        for connection in connections:
+            Viewport.group_connections[connection] = None
+            Viewport.group_connections_of.setdefault(connection.source, []).append(connection)
+            Viewport.group_connections_of.setdefault(connection.target, []).append(connection)
+
+        Viewport.grouped_connectors.clear()
+        for connector in grouped_connectors:
+            Viewport.hide(connector)
+            Viewport.grouped_connectors[connector] = None
+        Viewport.refresh()
+
+    @staticmethod
+    def remove_task(task):
+        """
+        Remove a deleted task view from the index.
+
+        Args:
+            task (DraggableTask): The task view.
+        """
+        Viewport.grid.remove(task)
+        Viewport.views_by_model.pop(task.model, None)
+        Viewport.forget(task)
+
+    @staticmethod
+    def position(task):
+        """
+        Get the indexed centre of a task view or compound node.
+
+        Args:
+            task: The task view (DraggableTask) or compound node (TaskGroup).
+
+        Returns:
+            tuple: The point (x, y) in chart coordinates, that of the compound node for a collapsed task.
+        """
+        return Viewport.grid.points[Viewport.group_of.get(task, task)]
+
+    @staticmethod
+    def models_in(x1, y1, x2, y2):
+        """
+        Find the task models whose view lies inside a rectangle, e.g. for an automatic layout.
+
+        Args:
+            x1 (float): The left edge.
+            y1 (float): The top edge.
+            x2 (float): The right edge.
+            y2 (float): The bottom edge.
+
+        Returns:
+            list: The task models, including the collapsed activities of compound nodes.
+        """
+        models = []
+        for task in Viewport.grid.query(x1, y1, x2, y2):
+            if task in Viewport.groups:
+                models.extend(member.model for member in task.members)
+            else:
+                models.append(task.model)
+        return models
+
+    @staticmethod
+    def task_at(x, y, radius=50):
+        """
+        Find the task view or compound node under a chart point, the one with the closest centre if tasks overlap.
+
+        Args:
+            x (float): The x-coordinate of the point.
+            y (float): The y-coordinate of the point.
+            radius (float, optional): The radius of the task ovals. Defaults to 50.
+
+        Returns:
+            The task view (DraggableTask) or compound node (TaskGroup), or None if the point is outside all tasks.
+        """
+        return Viewport.grid.nearest(x, y, radius)
+
+    @staticmethod
+    def tasks_in(x1, y1, x2, y2):
+        """
+        Find the task views whose centre lies inside a rectangle, in reading order.
+
+        Args:
+            x1 (float): The x-coordinate of one corner.
+            y1 (float): The y-coordinate of one corner.
+            x2 (float): The x-coordinate of the opposite corner.
+            y2 (float): The y-coordinate of the opposite corner.
+
+        Returns:
+            list: The task views, sorted top to bottom and left to right. Compound nodes are left out.
+        """
+        tasks = [task for task in Viewport.grid.query(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+                 if task not in Viewport.groups]
+        return sorted(tasks, key=lambda task: Viewport.grid.points[task][::-1])
+
+    @staticmethod
+    def show(view):
+        """
+        Create the canvas items of a view if they do not exist.
+
+        Args:
+            view: The task, connector or mutex view.
+        """
+        if view.shown:
+            return
+
+        view.show()
+        Viewport.shown_views[view] = None
+        Viewport.restack_needed = True
+
+    @staticmethod
+    def hide(view):
+        """
+        Delete the canvas items of a view if they exist.
+
+        Args:
+            view: The task, connector or mutex view.
+        """
+        if view.shown:
+            view.hide()
+        Viewport.shown_views.pop(view, None)
+
+    @staticmethod
+    def forget(view):
+        """
+        Stop tracking a deleted view.
+
+        Args:
+            view: The task, connector or mutex view.
+        """
+        Viewport.shown_views.pop(view, None)
+
+    @staticmethod
+    def visible_area(extent=0):
+        """
+        Get the chart area in view, widened by Configuration.viewport_margin.
+
+        Args:
+            extent (float, optional): Extra width added on every side, e.g. the
+                radius of the items looked for. Defaults to 0.
+
+        Returns:
+            tuple: The rectangle (x1, y1, x2, y2) in chart coordinates.
+        """
+        canvas = Configuration.canvas
+        margin = Configuration.viewport_margin
+        zoom = Configuration.zoom
+        return ((canvas.canvasx(0) - margin) / zoom - extent,
+                (canvas.canvasy(0) - margin) / zoom - extent,
+                (canvas.canvasx(canvas.winfo_width()) + margin) / zoom + extent,
+                (canvas.canvasy(canvas.winfo_height()) + margin) / zoom + extent)
+
+    @staticmethod
+    def center():
+        """
+        Get the chart point in the centre of the window.
+
+        Returns:
+            tuple: The point (x, y) in chart coordinates.
+        """
+        canvas = Configuration.canvas
+        return (canvas.canvasx(canvas.winfo_width() / 2) / Configuration.zoom,
+                canvas.canvasy(canvas.winfo_height() / 2) / Configuration.zoom)
+
+    @staticmethod
+    def schedule_refresh():
+        """Refresh the shown views on the next frame, once for any number of calls."""
+        if Viewport.refresh_job is None:
+            Viewport.refresh_job = Configuration.root.after(Configuration.animation_frame_interval, Viewport.refresh)
+
+    @staticmethod
+    def refresh():
+        """Show the views in or near the visible area and hide all others."""
+        Viewport.refresh_job = None
+
+        x1, y1, x2, y2 = Viewport.visible_area()
+        wanted = {}
+        for task in Viewport.grid.query(x1 - 50, y1 - 50, x2 + 50, y2 + 50):
+            wanted[task] = None
+
+        for entry in Configuration.connector_objects:
+            connector = entry[4]
+            if connector not in wanted and connector not in Viewport.grouped_connectors:
+                bx1, by1, bx2, by2 = connector.bounds()
+                if bx1 <= x2 and x1 <= bx2 and by1 <= y2 and y1 <= by2:
+                    wanted[connector] = None
+
+        for connection in Viewport.group_connections:
+            bx1, by1, bx2, by2 = connection.bounds()
+            if bx1 <= x2 and x1 <= bx2 and by1 <= y2 and y1 <= by2:
+                wanted[connection] = None
+
+        if Viewport.shows_details():
+            for mutex in Configuration.mutex_objects.values():
+                if any(task in wanted or Viewport.group_of.get(task) in wanted for task in mutex.connected_tasks):
+                    wanted[mutex] = None
+
+        for view in [view for view in Viewport.shown_views if view not in wanted]:
+            Viewport.hide(view)
+
+        for view in wanted:
+            Viewport.show(view)
+
+        Viewport.restack()
+
+    @staticmethod
+    def restack():
+        """Put the lines and mutex badges created since the last call below the tasks again."""
+        if not Viewport.restack_needed:
+            return
+
+        Configuration.canvas.tag_lower("connector")
+        Configuration.canvas.tag_lower("mutex")
+        Configuration.canvas.tag_lower("mutex_line")
+        Viewport.restack_needed = False
+
+    @staticmethod
+    def _pan(event):
+        """Scroll the canvas with the mouse and show what comes into view."""
+        Configuration.canvas.scan_dragto(event.x, event.y, gain=1)
+        Viewport.schedule_refresh()
+
+    @staticmethod
+    def zoom_by(factor, x=None, y=None):
+        """
+        Change the zoom factor, keeping a window point over the same chart point.
+
+        Args:
+            factor (float): The factor to multiply the zoom factor with.
+            x (float, optional): The x-coordinate of the window point. Defaults to the window centre.
+            y (float, optional): The y-coordinate of the window point. Defaults to the window centre.
+        """
+        Viewport.zoom_to(Configuration.zoom * factor, x, y)
+
+    @staticmethod
+    def zoom_to(zoom, x=None, y=None):
+        """
+        Set the zoom factor, keeping a window point over the same chart point.
+
+        Args:
+            zoom (float): The new zoom factor, limited to Configuration.min_zoom and 1.
+            x (float, optional): The x-coordinate of the window point. Defaults to the window centre.
+            y (float, optional): The y-coordinate of the window point. Defaults to the window centre.
+        """
+        canvas = Configuration.canvas
+        zoom = min(max(zoom, Configuration.min_zoom), 1)
+        if zoom == Configuration.zoom:
+            return
+
+        x = canvas.winfo_width() / 2 if x is None else x
+        y = canvas.winfo_height() / 2 if y is None else y
+        chart_x = canvas.canvasx(x) / Configuration.zoom
+        chart_y = canvas.canvasy(y) / Configuration.zoom
+
+        # All views are drawn for the old zoom factor
+        for view in list(Viewport.shown_views):
+            Viewport.hide(view)
+        Configuration.zoom = zoom
+
+        Viewport._scroll_to(chart_x, chart_y, x, y)
+        Viewport.refresh()
+
+    @staticmethod
+    def show_chart(radius=50):
+        """
+        Zoom and scroll so the whole chart fits into the window, at zoom factor 1 at most.
+
+        Args:
+            radius (float, optional): The radius of the task ovals. Defaults to 50.
+        """
+        if not Viewport.grid.points:
+            return
+
+        canvas = Configuration.canvas
+        xs = [point[0] for point in Viewport.grid.points.values()]
+        ys = [point[1] for point in Viewport.grid.points.values()]
+        x1, y1, x2, y2 = min(xs) - radius, min(ys) - radius, max(xs) + radius, max(ys) + radius
+
+        zoom = min(canvas.winfo_width() / (x2 - x1), canvas.winfo_height() / (y2 - y1), 1)
+        for view in list(Viewport.shown_views):
+            Viewport.hide(view)
+        Configuration.zoom = max(zoom, Configuration.min_zoom)
+
+        Viewport._scroll_to((x1 + x2) / 2, (y1 + y2) / 2, canvas.winfo_width() / 2, canvas.winfo_height() / 2)
+        Viewport.refresh()
+
+    @staticmethod
+    def _scroll_to(chart_x, chart_y, x, y):
+        """
+        Scroll the canvas so a chart point is drawn at a window point with the current zoom factor.
+
+        Args:
+            chart_x (float): The x-coordinate of the chart point.
+            chart_y (float): The y-coordinate of the chart point.
+            x (float): The x-coordinate of the window point.
+            y (float): The y-coordinate of the window point.
+        """
+        canvas = Configuration.canvas
+        zoom = Configuration.zoom
+        canvas.scan_mark(0, 0)
+        canvas.scan_dragto(int(canvas.canvasx(0) - (chart_x * zoom - x)),
+                           int(canvas.canvasy(0) - (chart_y * zoom - y)), gain=1)
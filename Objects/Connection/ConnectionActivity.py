@@ -15,18 +15,16 @@ class ConnectionActivity(ConnectionBase):
     are moved or modified.
     """
 
-    def __init__(self, name, semaphore_value=0, offset=0):
+    def __init__(self, model):
         """
         Initialize a new instance of the TaskConnector class.
 
         Args:
-            name (str): The name of the connector.
-            semaphore_value (int, optional): The initial semaphore value. Defaults to 0.
-            offset (int, optional): The offset value for positioning the connector. Defaults to 0.
+            model (ConnectionModel): The connector model to visualise.
         """
         arrow_color = Configuration.activity_arrow_color
         arrow_color_selected = Configuration.activity_arrow_color_selected
         arrow_style = (10, 25, 10)
         line_width = 2
 
-        super().__init__(name, arrow_color, arrow_color_selected, arrow_style, line_width, semaphore_value, offset)
+        super().__init__(model, arrow_color, arrow_color_selected, arrow_style, line_width)
@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 # Import necessary modules
-from General.Configuration import Configuration, SystemFunctions
-import time
 import math
+from General.Configuration import Configuration, SystemFunctions
+from General.Animator import Animator
+from General.Viewport import Viewport
+from General.Log import RENDER_LOG, Debug
+from Objects.Connection.SemaphorePulse import SemaphorePulse
 from abc import ABC
 
 
@@ -17,159 +20,160 @@ class ConnectionBase(ABC):
     are moved or modified.
     """
 
-    def __init__(self, name, arrow_color, arrow_color_selected, arrow_head_style, line_width, semaphore_value=0, offset=0):
+    def __init__(self, model, arrow_color, arrow_color_selected, arrow_head_style, line_width):
         """
         Initialize a new instance of the TaskConnector class.
 
         Args:
-            name (str): The name of the connector.
+            model (ConnectionModel): The connector model to visualise.
             arrow_color (str): The color of the connector.
             arrow_color_selected (str): The color of the connector when selected.
             arrow_head_style (tuple): The style of the arrow head.
-            semaphore_value (int, optional): The initial semaphore value. Defaults to 0.
-            offset (int, optional): The offset value for positioning the connector. Defaults to 0.
+            line_width (int): The width of the connector line.
         """
-        self.name = name
+        self.model = model
         self.circle_radius = 50
         self.line_width = line_width
         self.arrow_color = arrow_color
         self.arrow_color_selected = arrow_color_selected
         self.arrow_head_style = arrow_head_style
-        self.line = Configuration.canvas.create_line(0, 0, 0, 0,
-                                                     width=line_width,
-                                                     fill=self.arrow_color,
-                                                     arrow="last",
-                                                     arrowshape=self.arrow_head_style,
-                                                     smooth=True)
         self.end_x = 0
         self.end_y = 0
-        self.semaphore_value = semaphore_value
-        self.last_change = 0
         self.selected = False
 
-        self.or_connections = {}  # TASKS THAT ALSO INCREASE THIS SEMAPHORE (OR) // STRUCTURE: {taskObject: lineObject}
+        self.or_connections = {}  # TASKS THAT ALSO INCREASE THIS SEMAPHORE (OR) // STRUCTURE: {taskObject: lineObject or None while not shown}
+
+        # Canvas items, created by show() once the connector is near the visible area (see General.Viewport)
+        self.shown = False
+        self.line = None
+        self.semaphore_text = None
+        self.semaphore_bg = None
+        self.glyph = None
+
+        # Python-side geometry, so nothing is read back from the canvas: the line
+        # points (x1, y1, x2, y2) and the width of the semaphore text (None until measured)
+        self.line_points = (0, 0, 0, 0)
+        self.semaphore_width = None
+
+        # Observe the model for semaphore changes
+        model.observers.append(self)
+
+    def show(self):
+        """Create the canvas items of the connector, in full or as a glyph depending on the zoom factor."""
+        self.shown = True
+        if not Viewport.shows_details():
+            start_tasks = self.model.tasks_at("start")
+            end_tasks = self.model.tasks_at("end")
+            if start_tasks and end_tasks:
+                zoom = Configuration.zoom
+                self.glyph = Configuration.canvas.create_line(start_tasks[0].x * zoom, start_tasks[0].y * zoom,
+                                                              end_tasks[0].x * zoom, end_tasks[0].y * zoom,
+                                                              fill=self.arrow_color, tags="connector")
+            return
 
-        self.offset = offset
+        self.line = Configuration.canvas.create_line(0, 0, 0, 0,
+                                                     width=self.line_width,
+                                                     fill=self.arrow_color,
+                                                     arrow="last",
+                                                     arrowshape=self.arrow_head_style,
+                                                     smooth=True,
+                                                     tags="connector")
+        self.line_points = (0, 0, 0, 0)
+        self.semaphore_width = None
 
-        self.semaphore_text = Configuration.canvas.create_text(0, 0, text=str(semaphore_value), fill=Configuration.root['bg'], font=("Montserrat Light", 12, "bold"))
+        self.semaphore_text = Configuration.canvas.create_text(0, 0, text=str(self.semaphore_value), fill=Configuration.root['bg'], font=("Montserrat Light", 12, "bold"))
         self.semaphore_bg = Configuration.canvas.create_oval(0, 0, 0, 0, fill=self.arrow_color, outline="")
 
-        self.animation_running = False
-
         Configuration.canvas.tag_bind(self.line, "<Button-1>", lambda event: self.on_click())
 
-    def delete(self):
-        """Delete the connector and its associated objects from the canvas."""
-        Configuration.canvas.delete(self.line)
-        Configuration.canvas.delete(self.semaphore_text)
-        Configuration.canvas.delete(self.semaphore_bg)
-
         for task in self.or_connections:
-            Configuration.canvas.delete(self.or_connections[task])
-
-    def decrement_semaphore(self, change_time):
-        """
-        Decrement the semaphore value and update the visual representation.
+            self._create_or_line(task)
 
-        Args:
-            change_time (int): The timestamp of the change.
-        """
-        self.last_change = change_time
-
-        self.semaphore_value -= 1
-        Configuration.canvas.itemconfig(self.semaphore_text, text=str(self.semaphore_value))
+        if self.selected:
+            self.update_visuals()
+        self.redraw()
+
+    def hide(self):
+        """Delete the canvas items of the connector."""
+        self.shown = False
+        Animator.cancel(self)
+        for item in (self.line, self.semaphore_text, self.semaphore_bg, self.glyph):
+            if item is not None:
+                Configuration.canvas.delete(item)
+
+        self.line = None
+        self.semaphore_text = None
+        self.semaphore_bg = None
+        self.glyph = None
 
-        from threading import Thread
-        t = Thread(target=self.visualise_semaphore_change, args=(True,))
-        t.start()
+        for task in self.or_connections:
+            if self.or_connections[task] is not None:
+                Configuration.canvas.delete(self.or_connections[task])
+                self.or_connections[task] = None
 
-    def increment_semaphore(self, change_time):
+    def bounds(self):
         """
-        Increment the semaphore value and update the visual representation.
+        Get the rectangle spanned by the centres of the connected tasks.
 
-        Args:
-            change_time (int): The timestamp of the change.
+        Returns:
+            tuple: The rectangle (x1, y1, x2, y2) in chart coordinates.
         """
-        self.last_change = change_time
-
-        self.semaphore_value += 1
-        Configuration.canvas.itemconfig(self.semaphore_text, text=str(self.semaphore_value))
-
-        from threading import Thread
-        t = Thread(target=self.visualise_semaphore_change, args=(False,))
-        t.start()
+        xs = [task.x for task in self.model.tasks]
+        ys = [task.y for task in self.model.tasks]
+        if not xs:
+            return 0, 0, 0, 0
+        return min(xs), min(ys), max(xs), max(ys)
 
-    def visualise_semaphore_change(self, decrement=False):
-        x1, y1, x2, y2 = Configuration.canvas.coords(self.line)
-        slope = (y1 - y2) / (x1 - x2)
+    # Model attributes, forwarded so existing callers keep working
+    @property
+    def name(self):
+        return self.model.name
 
-        angle = math.atan(slope)
-        angle = math.degrees(angle)
-        c = math.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
+    @property
+    def semaphore_value(self):
+        return self.model.semaphore_value
 
-        arrow_length = 15
-        max_length = (c - self.circle_radius) / 2 - arrow_length
+    @semaphore_value.setter
+    def semaphore_value(self, value):
+        self.model.semaphore_value = value
 
-        if not self.animation_running:
-            self.animation_running = True
-            color = "red" if decrement else "green"
-        else:
-            color = "orange"
-
-        highlight_color = "#f74545" if decrement else "#61ff4a"
-
-        #if self.line.bg == "red" or self.line.bg == "green":
-        #    color = "orange"
-        print(Configuration.canvas.itemconfig(self.line))
-
-        line = Configuration.canvas.create_line(0, 0, 0, 0, width=5, fill=highlight_color, arrow="last",
-                                                arrowshape=(arrow_length, arrow_length, 1.5), smooth=True)
-        Configuration.canvas.itemconfig(self.semaphore_bg, fill=color)
-        Configuration.canvas.itemconfig(self.line, fill=color)
-
-        for task in self.or_connections:
-            Configuration.canvas.itemconfig(self.or_connections[task], fill=color)
+    @property
+    def offset(self):
+        return self.model.offset
 
-        for i in range(0, 100, 1):
-            if decrement:
-                current_length = max_length + (max_length / 100) * i + self.circle_radius + arrow_length
-            else:
-                current_length = (max_length / 100) * i + self.circle_radius + arrow_length
+    @offset.setter
+    def offset(self, value):
+        self.model.offset = value
 
-            if x1 <= x2:
-                start_x = x1 + (current_length - 10) * math.cos(math.radians(angle))
-                start_y = y1 + (current_length - 10) * math.sin(math.radians(angle))
-
-                end_x = x1 + current_length * math.cos(math.radians(angle))
-                end_y = y1 + current_length * math.sin(math.radians(angle))
-            else:
-                start_x = x1 - (current_length - 10) * math.cos(math.radians(angle))
-                start_y = y1 - (current_length - 10) * math.sin(math.radians(angle))
-
-                end_x = x1 - current_length * math.cos(math.radians(angle))
-                end_y = y1 - current_length * math.sin(math.radians(angle))
-
-            Configuration.canvas.coords(line, start_x, start_y, end_x, end_y)
-            Configuration.canvas.update()
+    def delete(self):
+        """Delete the connector and its associated objects from the canvas."""
+        self.hide()
+        Viewport.forget(self)
 
-            if Configuration.auto_run:
-                time.sleep(Configuration.current_delay / 1000 / 100 / 2)
-            else:
-                time.sleep(0.005)
+        if self in self.model.observers:
+            self.model.observers.remove(self)
 
-        Configuration.canvas.delete(line)
+    def model_changed(self, subject, kind, old_value, new_value):
+        """
+        Observe the connector model and visualise semaphore changes.
 
-        Configuration.canvas.itemconfig(self.semaphore_bg, fill=self.arrow_color)
-        Configuration.canvas.itemconfig(self.line, fill=self.arrow_color)
+        Args:
+            subject (ConnectionModel): The model that changed.
+            kind (str): The kind of change ("semaphore").
+            old_value: The value before the change.
+            new_value: The value after the change.
+        """
+        if kind != "semaphore" or Configuration.render_suspended or self.line is None:
+            return
 
-        for task in self.or_connections:
-            Configuration.canvas.itemconfig(self.or_connections[task], fill=self.arrow_color)
+        self._set_semaphore_text(new_value)
 
-        self.animation_running = False
+        Animator.start(self, SemaphorePulse(self, new_value < old_value))
 
     def on_click(self):
         """Handle the click event on the connector."""
-        print("selected")
+        if Debug.render:
+            RENDER_LOG.debug("Selected connector %s", self.model.name)
         if not Configuration.edit_mode:
             return
 
@@ -190,7 +194,10 @@ class ConnectionBase(ABC):
 
     def update_visuals(self):
         """Update the visual appearance of the connector based on its selection state."""
-        Configuration.canvas.itemconfig(self.semaphore_text, text=str(self.semaphore_value))
+        if self.line is None:
+            return
+
+        self._set_semaphore_text(self.semaphore_value)
         if self.selected:
             Configuration.canvas.itemconfig(self.line, fill=self.arrow_color_selected)
             Configuration.canvas.itemconfig(self.semaphore_bg, fill=self.arrow_color_selected, outline=self.arrow_color_selected)
@@ -198,41 +205,91 @@ class ConnectionBase(ABC):
             Configuration.canvas.itemconfig(self.line, fill=self.arrow_color)
             Configuration.canvas.itemconfig(self.semaphore_bg, fill=self.arrow_color, outline=self.arrow_color)
 
-    def update_start(self, new_x, new_y):
+    def _set_semaphore_text(self, value):
         """
-        Update the start coordinates of the connector.
+        Show a semaphore value, measuring the text again on the next placement.
 
         Args:
-            new_x (int): The new x-coordinate of the start point.
-            new_y (int): The new y-coordinate of the start point.
+            value (int): The semaphore value.
         """
-        x1, y1, x2, y2 = Configuration.canvas.coords(self.line)
-        Configuration.canvas.coords(self.line, new_x, new_y + self.offset, x2, y2 + self.offset)
+        Configuration.canvas.itemconfig(self.semaphore_text, text=str(value))
+        self.semaphore_width = None
 
-    def update_end(self, new_x, new_y, override_end=False):
+    def follow_task(self, task, position, task_x, task_y):
         """
-        Update the end coordinates of the connector.
+        Redraw the connector after one of its tasks moved, computing every
+        point once and without changing the stacking order.
 
         Args:
-            new_x (int): The new x-coordinate of the end point.
-            new_y (int): The new y-coordinate of the end point.
-            override_end (bool, optional): Indicates if the end coordinates should be overridden. Defaults to False.
+            task (DraggableTask): The task that moved.
+            position (str): The position of the task at the connector ("start", "end" or "or").
+            task_x (float): The new x-coordinate of the task centre.
+            task_y (float): The new y-coordinate of the task centre.
         """
-        x1, y1, x2, y2 = Configuration.canvas.coords(self.line)
+        if self.line is None:
+            return
+
+        x1, y1, x2, y2 = self.line_points
+
+        if position == "or":
+            self._place_or_connection(task, task_x, task_y, x1, y1, x2, y2)
+            return
 
-        if not override_end:
-            self.end_x = new_x
-            self.end_y = new_y
+        if position == "start":
+            x1, y1 = task_x, task_y + self.offset
         else:
-            new_x = self.end_x
-            new_y = self.end_y
+            self.end_x = task_x
+            self.end_y = task_y
+
+        self._draw(x1, y1)
+
+    def redraw(self):
+        """Place the line, semaphore and OR lines at the current positions of the connected tasks."""
+        if self.line is None:
+            return
+
+        start_tasks = self.model.tasks_at("start")
+        end_tasks = self.model.tasks_at("end")
+        if not start_tasks or not end_tasks:
+            return
+
+        self.end_x = end_tasks[0].x
+        self.end_y = end_tasks[0].y
+        self._draw(start_tasks[0].x, start_tasks[0].y + self.offset)
+
+    def _draw(self, x1, y1):
+        """
+        Place the line from a start point towards the end task, with its semaphore and OR lines.
+
+        Args:
+            x1 (float): The x-coordinate of the start point.
+            y1 (float): The y-coordinate of the start point.
+        """
+        self._place_semaphore(x1, y1, self.end_x, self.end_y)
+
+        x1, end_x, end_y = self._line_end(x1, y1, self.end_x, self.end_y)
+        Configuration.canvas.coords(self.line, x1, y1, end_x, end_y)
+        self.line_points = (x1, y1, end_x, end_y)
+
+        for or_task in self.or_connections:
+            self._place_or_connection(or_task, or_task.model.x, or_task.model.y, x1, y1, end_x, end_y)
+
+    def _line_end(self, x1, y1, new_x, new_y):
+        """
+        Compute where the line towards a task centre meets the task circle.
 
-        self.update_semaphore(new_x, new_y)
+        Args:
+            x1 (float): The x-coordinate of the start point.
+            y1 (float): The y-coordinate of the start point.
+            new_x (float): The x-coordinate of the target task centre.
+            new_y (float): The y-coordinate of the target task centre.
 
+        Returns:
+            tuple: The start x-coordinate (nudged for vertical lines) and the end point.
+        """
         if x1 == new_x:
             x1 = new_x + 0.000000001
 
-        import math
         slope = (y1 - new_y) / (x1 - new_x)
 
         angle = math.atan(slope)
@@ -247,22 +304,22 @@ class ConnectionBase(ABC):
             end_x = x1 - new_distance * math.cos(math.radians(angle))
             end_y = y1 - new_distance * math.sin(math.radians(angle))
 
-        Configuration.canvas.coords(self.line, x1, y1, end_x, end_y)
-
-        self.update_or_connections()
+        return x1, end_x, end_y
 
-    def update_semaphore(self, new_x, new_y):
+    def _place_semaphore(self, x1, y1, new_x, new_y):
         """
-        Update the position of the semaphore text and background.
+        Place the semaphore text and background halfway between two points.
 
         Args:
-            new_x (int): The new x-coordinate of the semaphore.
-            new_y (int): The new y-coordinate of the semaphore.
+            x1 (float): The x-coordinate of the start point.
+            y1 (float): The y-coordinate of the start point.
+            new_x (float): The x-coordinate of the end point.
+            new_y (float): The y-coordinate of the end point.
         """
-        x1, y1, x2, y2 = Configuration.canvas.coords(self.line)
-        sx1, sy1, sx2, sy2 = Configuration.canvas.bbox(self.semaphore_text)
-
-        text_width = sx2 - sx1
+        if self.semaphore_width is None:
+            sx1, sy1, sx2, sy2 = Configuration.canvas.bbox(self.semaphore_text)
+            self.semaphore_width = sx2 - sx1
+        text_width = self.semaphore_width
 
         Configuration.canvas.coords(self.semaphore_text, (x1 + new_x) / 2, (y1 + new_y) / 2)
 
@@ -271,10 +328,6 @@ class ConnectionBase(ABC):
                                     (x1 + new_x) / 2 + text_width / 2 + 5,
                                     (y1 + new_y) / 2 + text_width / 2 + 5)
 
-        Configuration.canvas.tag_raise(self.semaphore_text)
-
-        self.update_or_connections()
-
     def add_or_connection(self, task):
         """
         Add an OR connection to the specified task.
@@ -282,7 +335,19 @@ class ConnectionBase(ABC):
         Args:
             task (Task): The task to add the OR connection to.
         """
-        line_object = Configuration.canvas.create_line(0, 0, 0, 0, width=self.line_width, fill=self.arrow_color, smooth=True)
+        self.or_connections[task] = None
+        if self.line is not None:
+            self._create_or_line(task)
+
+    def _create_or_line(self, task):
+        """
+        Create the canvas line of the OR connection to a task.
+
+        Args:
+            task (Task): The task of the OR connection.
+        """
+        line_object = Configuration.canvas.create_line(0, 0, 0, 0, width=self.line_width, fill=self.arrow_color, smooth=True,
+                                                       tags="connector")
 
         self.or_connections[task] = line_object
 
@@ -293,16 +358,23 @@ class ConnectionBase(ABC):
         Args:
             task (Task): The task to update the OR connection for.
         """
-        x1, y1, x2, y2 = Configuration.canvas.coords(self.line)
+        if self.line is None:
+            return
+
+        self._place_or_connection(task, task.model.x, task.model.y, *self.line_points)
+
+    def _place_or_connection(self, task, task_x, task_y, x1, y1, x2, y2):
+        """
+        Draw the OR connection from a task centre to the middle of the connector line.
 
+        Args:
+            task (Task): The task of the OR connection.
+            task_x (float): The x-coordinate of the task centre.
+            task_y (float): The y-coordinate of the task centre.
+            x1, y1, x2, y2 (float): The coordinates of the connector line.
+        """
         x_end = x2 + (x1 - x2) / 2
         y_end = y2 + (y1 - y2) / 2
 
-        x1_task, y1_task, x2_task, y2_task = Configuration.canvas.coords(task.oval)
         connection_line = self.or_connections[task]
-        Configuration.canvas.coords(connection_line, x1_task + 50, y1_task + 50, x_end, y_end)
-
-    def update_or_connections(self):
-        """Update all OR connections associated with the connector."""
-        for task in self.or_connections:
-            self.update_single_or_connection(task)
+        Configuration.canvas.coords(connection_line, task_x, task_y, x_end, y_end)
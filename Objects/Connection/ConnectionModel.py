@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+This module defines the ConnectionModel class, which holds the semaphore state
+of a connector between two tasks. It does not reference the canvas; views
+register themselves in the observers list.
+"""
+
+
+class ConnectionModel:
+    """
+    A class representing the semaphore of a connector between tasks.
+
+    Tasks attached with position "start" or "or" increment the semaphore when
+    they finish a cycle, the task attached with position "end" decrements it
+    when it starts a cycle.
+    """
+
+    __slots__ = ("engine", "name", "semaphore_value", "initial_value", "last_change", "offset",
+                 "is_activity_connection", "tasks", "observers")
+
+    def __init__(self, engine, name, semaphore_value=0, offset=0, is_activity_connection=False):
+        """
+        Initialize a new ConnectionModel instance.
+
+        Args:
+            engine (SimulationEngine): The engine the connector belongs to.
+            name (str): The name of the connector.
+            semaphore_value (int, optional): The initial semaphore value. Defaults to 0.
+            offset (int, optional): The offset value for positioning the connector. Defaults to 0.
+            is_activity_connection (bool, optional): Whether the connector links two activities
+                of the same task. Defaults to False.
+        """
+        self.engine = engine
+        self.name = name
+        self.semaphore_value = semaphore_value
+        self.initial_value = semaphore_value
+        self.last_change = 0
+        self.offset = offset
+        self.is_activity_connection = is_activity_connection
+
+        self.tasks = {}  # STRUCTURE: {TaskModel: "start" | "end" | "or"}
+
+        # Views and other listeners, notified through model_changed()
+        self.observers = list(engine.observers) if engine is not None else []
+
+    def _notify(self, kind, old_value=None, new_value=None):
+        """
+        Notify all observers about a state change.
+
+        Args:
+            kind (str): The kind of change ("semaphore").
+            old_value: The value before the change.
+            new_value: The value after the change.
+        """
+        for observer in self.observers:
+            observer.model_changed(self, kind, old_value, new_value)
+
+    def decrement_semaphore(self, change_time):
+        """
+        Decrement the semaphore value.
+
+        Args:
+            change_time (int): The timestamp of the change.
+        """
+        if self.engine.current_delta is not None:
+            self.engine.current_delta.append(("semaphore", self, self.semaphore_value, self.last_change))
+        self.last_change = change_time
+
+        self.semaphore_value -= 1
+        self.engine.change_count += 1
+        if self.semaphore_value == 0:
+            self.engine.input_satisfaction_changed(self, False)
+        self._notify("semaphore", self.semaphore_value + 1, self.semaphore_value)
+
+    def increment_semaphore(self, change_time):
+        """
+        Increment the semaphore value.
+
+        Args:
+            change_time (int): The timestamp of the change.
+        """
+        if self.engine.current_delta is not None:
+            self.engine.current_delta.append(("semaphore", self, self.semaphore_value, self.last_change))
+        self.last_change = change_time
+
+        self.semaphore_value += 1
+        self.engine.change_count += 1
+        if self.semaphore_value == 1:
+            self.engine.input_satisfaction_changed(self, True)
+        self._notify("semaphore", self.semaphore_value - 1, self.semaphore_value)
+
+    def restore_semaphore(self, semaphore_value, last_change):
+        """
+        Set the semaphore back to an earlier value, e.g. when a step is undone.
+
+        Args:
+            semaphore_value (int): The earlier semaphore value.
+            last_change (int): The earlier timestamp of the last change.
+        """
+        old_value = self.semaphore_value
+        self.semaphore_value = semaphore_value
+        self.last_change = last_change
+        self.engine.change_count += 1
+        if (old_value > 0) != (semaphore_value > 0):
+            self.engine.input_satisfaction_changed(self, semaphore_value > 0)
+        self._notify("semaphore", old_value, semaphore_value)
+
+    def tasks_at(self, position):
+        """
+        Get the tasks attached to the connector at the given position.
+
+        Args:
+            position (str): "start", "end" or "or".
+
+        Returns:
+            list: The attached task models.
+        """
+        return [task for task, task_position in self.tasks.items() if task_position == position]
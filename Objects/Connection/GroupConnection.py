@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# Import necessary modules
+import math
+from General.Configuration import Configuration
+from General.Viewport import Viewport
+
+
+class GroupConnection:
+    """
+    A class representing all connectors from one node to another when at least
+    one of them is a collapsed task (TaskGroup).
+
+    A single line is drawn from the source node to the target node. Its
+    bubble shows the sum of the semaphore values of the connectors it stands
+    for, followed by their number if there are several. The connectors keep
+    their own views, which are hidden while the line is in use.
+    """
+
+    def __init__(self, source, target, connectors):
+        """
+        Initialize a new GroupConnection instance.
+
+        Args:
+            source: The node the connectors start at, a TaskGroup or DraggableTask.
+            target: The node the connectors end at, a TaskGroup or DraggableTask.
+            connectors (list): The connector views (ConnectionBase) drawn as this line.
+        """
+        self.source = source
+        self.target = target
+        self.connectors = connectors
+
+        # Canvas items, created by show() once the line is near the visible area (see General.Viewport)
+        self.shown = False
+        self.line = None
+        self.semaphore_text = None
+        self.semaphore_bg = None
+        self.glyph = None
+
+        # Observe the connector models for semaphore changes
+        for connector in connectors:
+            connector.model.observers.append(self)
+
+    def detach(self):
+        """Stop observing the connector models, e.g. when the line is replaced."""
+        for connector in self.connectors:
+            if self in connector.model.observers:
+                connector.model.observers.remove(self)
+
+    def bounds(self):
+        """
+        Get the rectangle spanned by the centres of the two nodes.
+
+        Returns:
+            tuple: The rectangle (x1, y1, x2, y2) in chart coordinates.
+        """
+        x1, y1 = Viewport.position(self.source)
+        x2, y2 = Viewport.position(self.target)
+        return min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+
+    def semaphore_summary(self):
+        """
+        Summarise the semaphores of the connectors.
+
+        Returns:
+            str: The sum of the semaphore values, e.g. "3", or "3 / 4" for four connectors.
+        """
+        total = sum(connector.model.semaphore_value for connector in self.connectors)
+        if len(self.connectors) == 1:
+            return str(total)
+        return str(total) + " / " + str(len(self.connectors))
+
+    def show(self):
+        """Create the canvas items of the line, in full or as a glyph depending on the zoom factor."""
+        self.shown = True
+        x1, y1 = Viewport.position(self.source)
+        x2, y2 = Viewport.position(self.target)
+
+        if not Viewport.shows_details():
+            zoom = Configuration.zoom
+            self.glyph = Configuration.canvas.create_line(x1 * zoom, y1 * zoom, x2 * zoom, y2 * zoom,
+                                                          fill=Configuration.arrow_color, width=2, tags="connector")
+            return
+
+        self.line = Configuration.canvas.create_line(0, 0, 0, 0, width=6, fill=Configuration.arrow_color,
+                                                     arrow="last", arrowshape=(20, 20, 6), tags="connector")
+        self.semaphore_text = Configuration.canvas.create_text(0, 0, text=self.semaphore_summary(),
+                                                               fill=Configuration.root['bg'],
+                                                               font=("Montserrat Light", 12, "bold"))
+        self.semaphore_bg = Configuration.canvas.create_oval(0, 0, 0, 0, fill=Configuration.arrow_color,
+                                                             outline="")
+        Configuration.canvas.tag_raise(self.semaphore_text, self.semaphore_bg)
+        self.redraw()
+
+    def hide(self):
+        """Delete the canvas items of the line."""
+        self.shown = False
+        for item in (self.line, self.semaphore_text, self.semaphore_bg, self.glyph):
+            if item is not None:
+                Configuration.canvas.delete(item)
+
+        self.line = None
+        self.semaphore_text = None
+        self.semaphore_bg = None
+        self.glyph = None
+
+    def redraw(self):
+        """Place the line between the borders of the two nodes and the bubble halfway."""
+        if self.glyph is not None:
+            x1, y1 = Viewport.position(self.source)
+            x2, y2 = Viewport.position(self.target)
+            zoom = Configuration.zoom
+            Configuration.canvas.coords(self.glyph, x1 * zoom, y1 * zoom, x2 * zoom, y2 * zoom)
+        if self.line is None:
+            return
+
+        x1, y1 = Viewport.position(self.source)
+        x2, y2 = Viewport.position(self.target)
+        length = max(math.hypot(x2 - x1, y2 - y1), 1e-9)
+        direction_x = (x2 - x1) / length
+        direction_y = (y2 - y1) / length
+        Configuration.canvas.coords(self.line,
+                                    x1 + direction_x * self.source.radius, y1 + direction_y * self.source.radius,
+                                    x2 - direction_x * self.target.radius, y2 - direction_y * self.target.radius)
+
+        sx1, sy1, sx2, sy2 = Configuration.canvas.bbox(self.semaphore_text)
+        half_size = (sx2 - sx1) / 2 + 5
+        Configuration.canvas.coords(self.semaphore_text, (x1 + x2) / 2, (y1 + y2) / 2)
+        Configuration.canvas.coords(self.semaphore_bg, (x1 + x2) / 2 - half_size, (y1 + y2) / 2 - half_size,
+                                    (x1 + x2) / 2 + half_size, (y1 + y2) / 2 + half_size)
+
+    def refresh(self):
+        """Show the current semaphore values, resizing the bubble to the text."""
+        if self.line is None:
+            return
+
+        Configuration.canvas.itemconfig(self.semaphore_text, text=self.semaphore_summary())
+        self.redraw()
+
+    def model_changed(self, subject, kind, old_value, new_value):
+        """
+        Observe the connector models and show semaphore changes.
+
+        Args:
+            subject (ConnectionModel): The model that changed.
+            kind (str): The kind of change ("semaphore").
+            old_value: The value before the change.
+            new_value: The value after the change.
+        """
+        if kind != "semaphore" or Configuration.render_suspended:
+            return
+
+        self.refresh()
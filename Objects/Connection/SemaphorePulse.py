@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# Import necessary modules
+from General.Configuration import Configuration
+import time
+import math
+
+
+class SemaphorePulse:
+    """
+    An animation of a semaphore change travelling along a connector line.
+
+    An increment travels from the start task to the semaphore bubble, a
+    decrement from the bubble to the end task. The pulse is driven by the
+    Animator; overlapping changes of the same connector are coalesced into one
+    pulse drawn in orange.
+    """
+
+    arrow_length = 15
+
+    def __init__(self, connector, decrement):
+        """
+        Initialize a new pulse. Canvas items are created on the first frame.
+
+        Args:
+            connector (ConnectionBase): The connector to animate.
+            decrement (bool): Whether the semaphore was decremented.
+        """
+        self.connector = connector
+        self.decrement = decrement
+        self.color = "red" if decrement else "green"
+        self.start_time = time.perf_counter()
+        self.duration = SemaphorePulse.get_duration()
+        self.line = None
+
+    @staticmethod
+    def get_duration():
+        """
+        Get the pulse duration in seconds, half the step period while auto running.
+
+        Returns:
+            float: The duration.
+        """
+        if Configuration.auto_run:
+            return Configuration.current_delay / 1000 / 2
+        return 0.5
+
+    def restart(self, pulse):
+        """
+        Coalesce a newer pulse of the same connector into this one.
+
+        Args:
+            pulse (SemaphorePulse): The newer pulse.
+        """
+        self.decrement = pulse.decrement
+        self.color = "orange"
+        self.start_time = pulse.start_time
+        self.duration = pulse.duration
+        if self.line is not None:
+            self._set_color(self.color)
+            Configuration.canvas.itemconfig(self.line, fill="#f74545" if self.decrement else "#61ff4a")
+
+    def _set_color(self, color):
+        """
+        Colour the connector line, semaphore bubble and OR lines.
+
+        Args:
+            color (str): The color to apply.
+        """
+        Configuration.canvas.itemconfig(self.connector.semaphore_bg, fill=color)
+        Configuration.canvas.itemconfig(self.connector.line, fill=color)
+
+        for task in self.connector.or_connections:
+            Configuration.canvas.itemconfig(self.connector.or_connections[task], fill=color)
+
+    def advance(self, now):
+        """
+        Move the pulse to its position at the given time.
+
+        Args:
+            now (float): The current time.perf_counter() value.
+
+        Returns:
+            bool: False once the pulse reached its destination.
+        """
+        progress = (now - self.start_time) / self.duration
+        if progress >= 1:
+            return False
+
+        x1, y1, x2, y2 = self.connector.line_points
+        length = math.hypot(x2 - x1, y2 - y1)
+        if length == 0:
+            return False
+
+        if self.line is None:
+            highlight_color = "#f74545" if self.decrement else "#61ff4a"
+            self.line = Configuration.canvas.create_line(0, 0, 0, 0, width=5, fill=highlight_color, arrow="last",
+                                                         arrowshape=(self.arrow_length, self.arrow_length, 1.5),
+                                                         smooth=True)
+            self._set_color(self.color)
+
+        # Increments cover the first half of the line, decrements the second one
+        circle_radius = self.connector.circle_radius
+        max_length = (length - circle_radius) / 2 - self.arrow_length
+        current_length = max_length * progress + circle_radius + self.arrow_length
+        if self.decrement:
+            current_length += max_length
+
+        direction_x = (x2 - x1) / length
+        direction_y = (y2 - y1) / length
+        Configuration.canvas.coords(self.line,
+                                    x1 + (current_length - 10) * direction_x,
+                                    y1 + (current_length - 10) * direction_y,
+                                    x1 + current_length * direction_x,
+                                    y1 + current_length * direction_y)
+        return True
+
+    def stop(self):
+        """Remove the pulse and restore the connector colours."""
+        if self.line is None:
+            return
+
+        Configuration.canvas.delete(self.line)
+        self.line = None
+        self.connector.update_visuals()
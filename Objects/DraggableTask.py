@@ -1,330 +1,545 @@
-# -*- coding: utf-8 -*-
-# Import necessary modules
-from General.Configuration import Configuration, SystemFunctions
-
-
-class DraggableTask:
-    """
-    A class representing a draggable task visualization.
-
-    This class creates an oval shape on a canvas that can be dragged around
-    to represent a task. It displays the task name, activity name, and current
-    cycle. The task can be connected to other tasks and participate in mutexes.
-    """
-
-    def __init__(self, task_name, activity_name, x, y, radius, task_max_cycles, priority):
-        """
-        Initialize a new DraggableTask instance.
-
-        Args:
-            task_name (str): The name of the task.
-            activity_name (str): The name of the activity.
-            x (int): The x-coordinate of the center of the task oval.
-            y (int): The y-coordinate of the center of the task oval.
-            radius (int): The radius of the task oval.
-            task_max_cycles (int): The maximum number of cycles for the task.
-            priority (int): The priority of the task.
-        """
-        # Create the oval shape representing the task
-        self.oval = Configuration.canvas.create_oval(
-            x - radius, y - radius, x + radius, y + radius,
-            fill=Configuration.root['bg'], outline=Configuration.task_color, width=2
-        )
-
-        self.connectors = {}
-        self.task_name = task_name
-        self.activity_name = activity_name
-        self.selected = False
-
-        self.mutexes = []
-        self.granted_mutexes = 0
-        self.priority = priority
-        self.original_priority = priority
-
-        # Initialize task cycle attributes
-        self.task_current_cycle = 0
-        self.task_max_cycles = task_max_cycles
-
-        # Create labels for task name, activity name, and cycle
-        self.name_label = Configuration.canvas.create_text(
-            x, y - 20, text="Task " + self.task_name, fill="white",
-            font=("Montserrat Black", 12)
-        )
-        self.activity_label = Configuration.canvas.create_text(
-            x, y, text="Activity " + (self.activity_name if self.activity_name != "" else self.task_name),
-            fill="white", font=("Montserrat Black", 10)
-        )
-        self.cycle_label = Configuration.canvas.create_text(
-            x, y + 20,
-            text="Cycle " + str(self.task_current_cycle) + "/" + str(self.task_max_cycles),
-            fill="white", font=("Montserrat Light", 8)
-        )
-
-        self.selection_text = Configuration.canvas.create_text(
-            x, y - radius - 20, text="", fill="#00335c", font=("Arial", 12)
-        )
-
-        # Bind mouse events to the task elements
-        Configuration.canvas.tag_bind(self.oval, "<Button-1>", lambda event: self.clicked(task_name, activity_name))
-        Configuration.canvas.tag_bind(self.name_label, "<Button-1>",
-                                      lambda event: self.clicked(task_name, activity_name))
-        Configuration.canvas.tag_bind(self.activity_label, "<Button-1>",
-                                      lambda event: self.clicked(task_name, activity_name))
-        Configuration.canvas.tag_bind(self.cycle_label, "<Button-1>",
-                                      lambda event: self.clicked(task_name, activity_name))
-
-        Configuration.canvas.tag_bind(self.oval, "<B1-Motion>", lambda event: self.on_drag(event))
-        Configuration.canvas.tag_bind(self.name_label, "<B1-Motion>", lambda event: self.on_drag(event))
-        Configuration.canvas.tag_bind(self.activity_label, "<B1-Motion>", lambda event: self.on_drag(event))
-        Configuration.canvas.tag_bind(self.cycle_label, "<B1-Motion>", lambda event: self.on_drag(event))
-
-    def delete(self):
-        """Delete the task and its associated elements from the canvas."""
-        Configuration.canvas.delete(self.oval)
-        Configuration.canvas.delete(self.name_label)
-        Configuration.canvas.delete(self.activity_label)
-        Configuration.canvas.delete(self.cycle_label)
-        Configuration.canvas.delete(self.selection_text)
-
-        for connector in self.connectors:
-            connector.delete()
-
-        print("DELETING TASK")
-
-    def try_step(self):
-        """
-        Attempt to perform a step of the task.
-
-        This method checks if the task can start a new cycle based on its
-        connections and mutexes. If the conditions are met, it starts a new
-        cycle or ends the current cycle.
-        """
-        # Increment the current cycle if not at the maximum
-        if self.task_max_cycles > self.task_current_cycle > 0:
-            self.task_current_cycle += 1
-
-        # Check if the task can start a new cycle based on connections
-        amount_of_needed_connections_to_start = 0
-        amount_of_ready_connections_to_start = 0
-        for connection in self.connectors:
-            if self.connectors[connection] == "end":
-                amount_of_needed_connections_to_start += 1
-                if connection.semaphore_value > 0 and self.task_current_cycle == 0 and connection.last_change != Configuration.step_number:
-                    amount_of_ready_connections_to_start += 1
-
-        self.attend(amount_of_needed_connections_to_start, amount_of_ready_connections_to_start)
-
-        self._end_cycle()
-
-        self.update_status_text()
-
-    def _start_cycle(self):
-        """Start a new cycle for the task."""
-        for connection in self.connectors:
-            if self.connectors[connection] == "end" and connection.semaphore_value > 0:
-                self.task_current_cycle = 1
-                connection.decrement_semaphore(Configuration.step_number)
-
-        self.update_status_text()
-        self.granted_mutexes = 0
-
-        Configuration.canvas.itemconfig(self.oval, outline=Configuration.task_color_running)
-
-    def attend(self, amount_of_needed_connections_to_start, amount_of_ready_connections_to_start):
-        """
-        Attend to the task based on the number of needed and ready connections.
-
-        If the task has the required number of ready connections and is not
-        currently in a cycle, it will attempt to acquire mutexes (if any) and
-        start a new cycle.
-        """
-        if amount_of_needed_connections_to_start == amount_of_ready_connections_to_start and self.task_current_cycle == 0 and amount_of_needed_connections_to_start > 0:
-            if len(self.mutexes) > 0:
-                for mutex in self.mutexes:
-                    mutex.attend(self)
-            else:
-                self._start_cycle()
-
-    def grant_access(self):
-        """
-        Grant mutex access to the task.
-
-        This method is called when the task acquires a mutex. If all required
-        mutexes are granted, the task starts a new cycle.
-        """
-        print("Access granted to", self.task_name, self.activity_name)
-        self.granted_mutexes += 1
-        if len(self.mutexes) == self.granted_mutexes:
-            self._start_cycle()
-
-    def add_mutex(self, mutex):
-        """
-        Add a mutex to the task.
-
-        Args:
-            mutex (Mutex): The mutex to add.
-        """
-        print("Added mutex " + mutex.name + " to task " + self.task_name + self.activity_name)
-        self.mutexes.append(mutex)
-
-    def _end_cycle(self):
-        """
-        End the current cycle of the task.
-
-        This method is called when the task completes its maximum number of
-        cycles. It increments the semaphores of connected tasks, releases
-        mutexes, and resets the task's cycle count and visual appearance.
-        """
-        # If the task is done with the current cycle, increment semaphores of connected tasks
-        if self.task_current_cycle == self.task_max_cycles:
-            print(
-                "ENDING CYCLE " + self.task_name + self.activity_name + " " + str(self.task_current_cycle) + "/" + str(
-                    self.task_max_cycles))
-            for connection in self.connectors:
-                if self.connectors[connection] == "start" or self.connectors[connection] == "or":
-                    connection.increment_semaphore(Configuration.step_number)
-            self.task_current_cycle = 0
-            if len(self.mutexes) > 0:
-                for mutex in self.mutexes:
-                    mutex.release(self)
-
-            Configuration.canvas.itemconfig(self.oval, outline=Configuration.task_color)
-
-    def on_drag(self, event):
-        """
-        Handle the drag event when the task is being dragged on the canvas.
-
-        Args:
-            event (Event): The drag event.
-        """
-        if Configuration.edit_mode:
-            return
-
-        # Update the position of the task elements based on the drag event
-        x = event.x - 50
-        y = event.y - 50
-        Configuration.canvas.coords(self.oval, x, y, x + 100, y + 100)
-        Configuration.canvas.coords(self.name_label, x + 50, y + 50 - 20)
-        Configuration.canvas.coords(self.activity_label, x + 50, y + 50)
-        Configuration.canvas.coords(self.cycle_label, x + 50, y + 50 + 20)
-
-        Configuration.canvas.coords(self.selection_text, x + 50, y - 20)
-        self.update_connections()
-
-        for mutex in self.mutexes:
-            mutex.update_visuals()
-
-    def update_status_text(self):
-        """Update the status text displaying the current cycle of the task."""
-        Configuration.canvas.itemconfig(self.cycle_label,
-                                        text="Cycle " + str(self.task_current_cycle) + "/" + str(self.task_max_cycles))
-
-    def update_visuals(self):
-        """Update the visual elements of the task with the current task information."""
-        Configuration.canvas.itemconfig(self.name_label, text="Task " + self.task_name)
-        Configuration.canvas.itemconfig(self.activity_label,
-                                        text="Activity " + self.activity_name if self.activity_name != "" else self.task_name)
-        self.update_status_text()
-
-    def update_connections(self):
-        """Update the positions of the task's connections."""
-        for connection in self.connectors:
-            Configuration.canvas.tag_raise(self.oval, connection.line)
-            Configuration.canvas.tag_raise(self.name_label, self.oval)
-            Configuration.canvas.tag_raise(self.activity_label, self.oval)
-            Configuration.canvas.tag_raise(self.cycle_label)
-            if self.connectors[connection] == "start":
-                connection.update_start(self.get_position()[0] + 50, self.get_position()[1] + 50)
-                connection.update_end(0, 0, True)
-
-            elif self.connectors[connection] == "end":
-                end_x = self.get_position()[0] + 50
-                end_y = self.get_position()[1] + 50
-                connection.update_end(end_x, end_y)
-
-            elif self.connectors[connection] == "or":
-                connection.update_single_or_connection(self)
-
-                for or_con in connection.or_connections:
-                    line = connection.or_connections[or_con]
-                    Configuration.canvas.tag_raise(self.oval, line)
-                    Configuration.canvas.tag_raise(self.name_label, self.oval)
-                    Configuration.canvas.tag_raise(self.activity_label, self.oval)
-                    Configuration.canvas.tag_raise(self.cycle_label)
-
-    def get_position(self):
-        """
-        Get the current position of the task on the canvas.
-
-        Returns:
-            tuple: The coordinates of the task oval.
-        """
-        return Configuration.canvas.coords(self.oval)
-
-    def set_connectors(self, connectors):
-        """
-        Set the connectors of the task.
-
-        Args:
-            connectors (dict): A dictionary mapping connectors to their positions.
-        """
-        self.connectors = connectors
-
-    def add_connector(self, connector, position):
-        """
-        Add a connector to the task.
-
-        Args:
-            connector (Connector): The connector to add.
-            position (str): The position of the connector (e.g., "start", "end").
-        """
-        self.connectors[connector] = position
-
-    def clicked(self, task_name, activity_name):
-        """
-        Handle the click event when the task is clicked.
-
-        Args:
-            task_name (str): The name of the task.
-            activity_name (str): The name of the activity.
-        """
-        if not Configuration.edit_mode:
-            return
-
-        print("Clicked on task: " + task_name + activity_name)
-        self.selected = not self.selected
-        if self.selected:
-            selection_number = SystemFunctions.select_new_task(self)
-            Configuration.canvas.itemconfig(self.selection_text, text=str(selection_number))
-            Configuration.canvas.itemconfig(self.oval, outline=Configuration.task_color_selected)
-        else:
-            Configuration.canvas.itemconfig(self.selection_text, text="")
-            if self.task_current_cycle > 0:
-                Configuration.canvas.itemconfig(self.oval, outline=Configuration.task_color_running)
-            else:
-                Configuration.canvas.itemconfig(self.oval, outline=Configuration.task_color)
-            SystemFunctions.remove_selected_task(self)
-
-    @staticmethod
-    def switch_selection():
-        """Switch the selection mode of the tasks."""
-        print("change")
-        if Configuration.show_simulation_container:
-            return
-
-        Configuration.edit_mode = not Configuration.edit_mode
-
-        for task in Configuration.selected_tasks:
-            Configuration.canvas.itemconfig(task.selection_text, text="")
-            Configuration.canvas.itemconfig(task.oval, outline=Configuration.task_color)
-            task.selected = False
-
-        Configuration.selected_tasks.clear()
-
-        if Configuration.selected_connection is not None:
-            Configuration.selected_connection.selected = False
-            Configuration.selected_connection.update_visuals()
-
-        Configuration.selected_connection = None
-
+# -*- coding: utf-8 -*-
+# Import necessary modules
+from General.Configuration import Configuration, SystemFunctions
+from General.Viewport import Viewport
+from General.Log import RENDER_LOG, Debug
+
+
+class DraggableTask:
+    """
+    A class representing a draggable task visualization.
+
+    This class creates an oval shape on a canvas that can be dragged around
+    to represent a task. It displays the task name, activity name, and current
+    cycle. The task can be connected to other tasks and participate in mutexes.
+    The simulation state lives in a TaskModel, which this class observes.
+
+    Mouse input is handled once for the whole canvas (see install()): the
+    task under the pointer is looked up in the position index of the Viewport
+    rather than through bindings on the canvas items of every task.
+    """
+
+    # Left mouse button state shared by all tasks: the task pressed for
+    # dragging, and the start point and canvas item of the selection rectangle
+    pressed_task = None
+    band_start = None
+    band = None
+
+    def __init__(self, model, radius=50):
+        """
+        Initialize a new DraggableTask instance.
+
+        The canvas items are created by show() once the task is near the
+        visible area (see General.Viewport).
+
+        Args:
+            model (TaskModel): The task model to visualise. Its x and y give the
+                centre of the task oval.
+            radius (int, optional): The radius of the task oval. Defaults to 50.
+        """
+        self.model = model
+        self.radius = radius
+
+        self.connectors = {}
+        self.selected = False
+
+        self.mutexes = []
+
+        # Canvas items, None while the task is not shown or shown as a glyph
+        self.shown = False
+        self.oval = None
+        self.name_label = None
+        self.activity_label = None
+        self.cycle_label = None
+        self.selection_text = None
+        self.tag = None
+        self.glyph = None
+
+        # Drag state: the latest pointer position not drawn yet, whether a
+        # redraw is scheduled and whether the stacking order is set for this drag
+        self.drag_target = None
+        self.drag_scheduled = False
+        self.dragging = False
+
+        # Observe the model for state changes
+        model.observers.append(self)
+
+        Viewport.add_task(self)
+
+    def show(self):
+        """Create the canvas items of the task, in full or as a glyph depending on the zoom factor."""
+        self.shown = True
+        x = self.model.x
+        y = self.model.y
+        radius = self.radius
+
+        if not Viewport.shows_details():
+            zoom = Configuration.zoom
+            glyph_radius = max(radius * zoom, 2)
+            self.glyph = Configuration.canvas.create_oval(
+                x * zoom - glyph_radius, y * zoom - glyph_radius, x * zoom + glyph_radius, y * zoom + glyph_radius,
+                fill=self._outline_color(), outline=""
+            )
+            return
+
+        # Create the oval shape representing the task
+        self.oval = Configuration.canvas.create_oval(
+            x - radius, y - radius, x + radius, y + radius,
+            fill=Configuration.root['bg'], outline=Configuration.task_color, width=2
+        )
+
+        # Create labels for task name, activity name, and cycle
+        self.name_label = Configuration.canvas.create_text(
+            x, y - 20, text="Task " + self.task_name, fill="white",
+            font=("Montserrat Black", 12)
+        )
+        self.activity_label = Configuration.canvas.create_text(
+            x, y, text="Activity " + (self.activity_name if self.activity_name != "" else self.task_name),
+            fill="white", font=("Montserrat Black", 10)
+        )
+        self.cycle_label = Configuration.canvas.create_text(
+            x, y + 20,
+            text="Cycle " + str(self.task_current_cycle) + "/" + str(self.task_max_cycles),
+            fill="white", font=("Montserrat Light", 8)
+        )
+
+        self.selection_text = Configuration.canvas.create_text(
+            x, y - radius - 20, text="", fill="#00335c", font=("Arial", 12)
+        )
+
+        # Tag all items of the task so a drag moves them with a single call
+        self.tag = "task" + str(self.oval)
+        for item in (self.oval, self.name_label, self.activity_label, self.cycle_label, self.selection_text):
+            Configuration.canvas.addtag_withtag(self.tag, item)
+
+        # Show the state the model reached while the task was not shown
+        if self.selected or self.task_current_cycle > 0:
+            self.refresh()
+
+    def hide(self):
+        """Delete the canvas items of the task."""
+        self.shown = False
+        if self.glyph is not None:
+            Configuration.canvas.delete(self.glyph)
+            self.glyph = None
+
+        if self.oval is not None:
+            Configuration.canvas.delete(self.tag)
+            self.oval = None
+            self.name_label = None
+            self.activity_label = None
+            self.cycle_label = None
+            self.selection_text = None
+            self.tag = None
+            self.drag_target = None
+            self.dragging = False
+
+    # Model attributes, forwarded so existing callers keep working
+    @property
+    def task_name(self):
+        return self.model.task_name
+
+    @task_name.setter
+    def task_name(self, value):
+        self.model.task_name = value
+
+    @property
+    def activity_name(self):
+        return self.model.activity_name
+
+    @activity_name.setter
+    def activity_name(self, value):
+        self.model.activity_name = value
+
+    @property
+    def task_max_cycles(self):
+        return self.model.task_max_cycles
+
+    @task_max_cycles.setter
+    def task_max_cycles(self, value):
+        self.model.task_max_cycles = value
+
+    @property
+    def original_priority(self):
+        return self.model.original_priority
+
+    @original_priority.setter
+    def original_priority(self, value):
+        self.model.original_priority = value
+
+    @property
+    def priority(self):
+        return self.model.priority
+
+    @property
+    def task_current_cycle(self):
+        return self.model.task_current_cycle
+
+    def delete(self):
+        """Delete the task and its associated elements from the canvas."""
+        self.hide()
+        Viewport.remove_task(self)
+
+        for connector in self.connectors:
+            connector.delete()
+
+        for mutex in self.mutexes:
+            mutex.remove_task(self)
+
+        if self in self.model.observers:
+            self.model.observers.remove(self)
+
+        if Debug.render:
+            RENDER_LOG.debug("Deleting task %s", self.model.full_name)
+
+    def model_changed(self, subject, kind, old_value, new_value):
+        """
+        Observe the task model and redraw the affected canvas items.
+
+        Args:
+            subject (TaskModel): The model that changed.
+            kind (str): The kind of change ("cycle", "started" or "ended").
+            old_value: The value before the change.
+            new_value: The value after the change.
+        """
+        if Configuration.render_suspended or not self.shown:
+            return
+
+        if self.glyph is not None:
+            if kind in ("started", "ended"):
+                Configuration.canvas.itemconfig(self.glyph, fill=Configuration.task_color_running
+                                                if kind == "started" else Configuration.task_color)
+        elif kind == "cycle":
+            self.update_status_text()
+        elif kind == "started":
+            Configuration.canvas.itemconfig(self.oval, outline=Configuration.task_color_running)
+        elif kind == "ended":
+            Configuration.canvas.itemconfig(self.oval, outline=Configuration.task_color)
+
+    def add_mutex(self, mutex):
+        """
+        Add a mutex to the task.
+
+        Args:
+            mutex (MutexView): The mutex to add.
+        """
+        self.mutexes.append(mutex)
+        self.model.add_mutex(mutex.model)
+
+    @staticmethod
+    def install(canvas):
+        """
+        Bind the left mouse button on the canvas: clicking a task selects it in
+        edit mode and drags it otherwise, and dragging over empty space in edit
+        mode selects all tasks inside the rectangle.
+
+        Args:
+            canvas (Canvas): The chart canvas.
+        """
+        canvas.bind("<ButtonPress-1>", DraggableTask._press)
+        canvas.bind("<B1-Motion>", DraggableTask._motion)
+        canvas.bind("<ButtonRelease-1>", DraggableTask._release)
+
+    @staticmethod
+    def _press(event):
+        """Find the pressed task, or start a selection rectangle on empty space."""
+        # Zoomed out tasks are glyphs only
+        if not Viewport.shows_details():
+            return
+
+        x = Configuration.canvas.canvasx(event.x)
+        y = Configuration.canvas.canvasy(event.y)
+        task = Viewport.task_at(x, y)
+
+        # Pressing a collapsed task expands it
+        if task in Viewport.groups:
+            SystemFunctions.expand_activities(task)
+            return
+
+        if task is not None:
+            if Configuration.edit_mode:
+                task.clicked(task.task_name, task.activity_name)
+            else:
+                DraggableTask.pressed_task = task
+        elif Configuration.edit_mode:
+            DraggableTask.band_start = (x, y)
+
+    @staticmethod
+    def _motion(event):
+        """Drag the pressed task, or resize the selection rectangle."""
+        if DraggableTask.pressed_task is not None:
+            DraggableTask.pressed_task.on_drag(event)
+            return
+
+        if DraggableTask.band_start is None:
+            return
+
+        x1, y1 = DraggableTask.band_start
+        x2 = Configuration.canvas.canvasx(event.x)
+        y2 = Configuration.canvas.canvasy(event.y)
+        if DraggableTask.band is None:
+            DraggableTask.band = Configuration.canvas.create_rectangle(x1, y1, x2, y2, dash=(4, 4),
+                                                                       outline=Configuration.task_color_selected)
+        else:
+            Configuration.canvas.coords(DraggableTask.band, x1, y1, x2, y2)
+
+    @staticmethod
+    def _release(event):
+        """End the drag, or select the tasks inside the selection rectangle."""
+        if DraggableTask.pressed_task is not None:
+            DraggableTask.pressed_task.end_drag()
+            DraggableTask.pressed_task = None
+            return
+
+        if DraggableTask.band is not None:
+            Configuration.canvas.delete(DraggableTask.band)
+            DraggableTask.band = None
+
+            x1, y1 = DraggableTask.band_start
+            tasks = [task for task in Viewport.tasks_in(x1, y1, Configuration.canvas.canvasx(event.x),
+                                                        Configuration.canvas.canvasy(event.y))
+                     if not task.selected]
+            if tasks:
+                SystemFunctions.select_tasks(tasks)
+                for task in tasks:
+                    task.selected = True
+                    task.refresh()
+
+        DraggableTask.band_start = None
+
+    def on_drag(self, event):
+        """
+        Handle the drag event when the task is being dragged on the canvas.
+
+        Args:
+            event (Event): The drag event.
+        """
+        if Configuration.edit_mode:
+            return
+
+        # Motion events arrive faster than the canvas redraws, so only the
+        # latest position is kept and drawn once per frame
+        self.drag_target = (Configuration.canvas.canvasx(event.x), Configuration.canvas.canvasy(event.y))
+        if not self.drag_scheduled:
+            self.drag_scheduled = True
+            Configuration.root.after(Configuration.animation_frame_interval, self.apply_drag)
+
+    def apply_drag(self):
+        """Move the task to the latest dragged position and redraw what depends on it."""
+        self.drag_scheduled = False
+        if self.drag_target is None or self.oval is None:
+            return
+
+        x, y = self.drag_target
+        self.drag_target = None
+
+        # The stacking order does not change while dragging, so set it once per drag
+        if not self.dragging:
+            self.dragging = True
+            self.raise_over_connections()
+        self.move_to(x, y)
+
+    def move_to(self, x, y):
+        """
+        Move the task centre to a chart point and redraw what depends on it.
+
+        Args:
+            x (float): The x-coordinate of the new centre.
+            y (float): The y-coordinate of the new centre.
+        """
+        old_x = self.model.x
+        old_y = self.model.y
+        self.model.x = x
+        self.model.y = y
+        Viewport.task_moved(self)
+
+        if self.oval is not None:
+            Configuration.canvas.move(self.tag, x - old_x, y - old_y)
+        elif self.glyph is not None:
+            # Glyphs are cheap, so they are created again at the new position
+            Viewport.hide(self)
+            Viewport.show(self)
+
+        # Connectors and mutexes may be shown for another task even if this one is not
+        self.follow_connections(x, y)
+        for connector in self.connectors:
+            if connector.glyph is not None:
+                Viewport.hide(connector)
+                Viewport.show(connector)
+
+        for mutex in self.mutexes:
+            mutex.task_moved(self)
+
+        for connection in Viewport.group_connections_of.get(self, ()):
+            connection.redraw()
+
+    def end_drag(self):
+        """Draw the last dragged position and end the drag."""
+        if self.drag_target is not None:
+            self.apply_drag()
+        self.dragging = False
+
+    def _outline_color(self):
+        """
+        Get the outline colour for the current selection and model state.
+
+        Returns:
+            str: The colour.
+        """
+        if self.selected:
+            return Configuration.task_color_selected
+        elif self.task_current_cycle > 0:
+            return Configuration.task_color_running
+        return Configuration.task_color
+
+    def refresh(self):
+        """Redraw the cycle label, selection number and outline from the current model state."""
+        if self.glyph is not None:
+            Configuration.canvas.itemconfig(self.glyph, fill=self._outline_color())
+        if self.oval is None:
+            return
+
+        self.update_status_text()
+        Configuration.canvas.itemconfig(self.selection_text,
+                                        text=str(Configuration.selected_tasks.get(self, "")) if self.selected else "")
+        Configuration.canvas.itemconfig(self.oval, outline=self._outline_color())
+
+    def update_status_text(self):
+        """Update the status text displaying the current cycle of the task."""
+        if self.cycle_label is None:
+            return
+
+        Configuration.canvas.itemconfig(self.cycle_label,
+                                        text="Cycle " + str(self.task_current_cycle) + "/" + str(self.task_max_cycles))
+
+    def update_visuals(self):
+        """Update the visual elements of the task with the current task information."""
+        if self.oval is None:
+            return
+
+        Configuration.canvas.itemconfig(self.name_label, text="Task " + self.task_name)
+        Configuration.canvas.itemconfig(self.activity_label,
+                                        text="Activity " + self.activity_name if self.activity_name != "" else self.task_name)
+        self.update_status_text()
+
+    def update_connections(self):
+        """Update the positions and stacking order of the task's connections."""
+        if self.oval is None:
+            return
+
+        self.raise_over_connections()
+        self.follow_connections(self.model.x, self.model.y)
+
+    def raise_over_connections(self):
+        """Stack the task above its connection lines and their semaphores below the labels."""
+        for connection in self.connectors:
+            if connection.line is None:
+                continue
+
+            Configuration.canvas.tag_raise(self.oval, connection.line)
+            Configuration.canvas.tag_raise(self.name_label, self.oval)
+            Configuration.canvas.tag_raise(self.activity_label, self.oval)
+            Configuration.canvas.tag_raise(self.cycle_label)
+
+            if self.connectors[connection] == "or":
+                for or_con in connection.or_connections:
+                    line = connection.or_connections[or_con]
+                    if line is None:
+                        continue
+                    Configuration.canvas.tag_raise(self.oval, line)
+                    Configuration.canvas.tag_raise(self.name_label, self.oval)
+                    Configuration.canvas.tag_raise(self.activity_label, self.oval)
+                    Configuration.canvas.tag_raise(self.cycle_label)
+            else:
+                Configuration.canvas.tag_raise(connection.semaphore_text)
+
+    def follow_connections(self, x, y):
+        """
+        Move the ends of the task's connections to the task.
+
+        Args:
+            x (float): The x-coordinate of the task centre.
+            y (float): The y-coordinate of the task centre.
+        """
+        for connection in self.connectors:
+            connection.follow_task(self, self.connectors[connection], x, y)
+
+    def get_position(self):
+        """
+        Get the current position of the task on the canvas.
+
+        Returns:
+            tuple: The coordinates of the task oval.
+        """
+        x = self.model.x
+        y = self.model.y
+        return x - self.radius, y - self.radius, x + self.radius, y + self.radius
+
+    def add_connector(self, connector, position):
+        """
+        Add a connector to the task.
+
+        Args:
+            connector (ConnectionBase): The connector to add.
+            position (str): The position of the connector (e.g., "start", "end").
+        """
+        self.connectors[connector] = position
+        self.model.add_connector(connector.model, position)
+
+        # A connector of a shown task is in the visible area as well
+        if self.shown:
+            Viewport.show(connector)
+
+    def remove_connector(self, connector):
+        """
+        Remove a connector from the task.
+
+        Args:
+            connector (ConnectionBase): The connector to remove.
+        """
+        self.connectors.pop(connector)
+        self.model.remove_connector(connector.model)
+
+    def clicked(self, task_name, activity_name):
+        """
+        Handle the click event when the task is clicked.
+
+        Args:
+            task_name (str): The name of the task.
+            activity_name (str): The name of the activity.
+        """
+        if not Configuration.edit_mode:
+            return
+
+        if Debug.render:
+            RENDER_LOG.debug("Clicked on task %s%s", task_name, activity_name)
+        self.selected = not self.selected
+        if self.selected:
+            SystemFunctions.select_new_task(self)
+        else:
+            SystemFunctions.remove_selected_task(self)
+        self.refresh()
+
+    @staticmethod
+    def switch_selection():
+        """Switch the selection mode of the tasks."""
+        if Debug.render:
+            RENDER_LOG.debug("Switching edit mode")
+        if Configuration.show_simulation_container:
+            return
+
+        Configuration.edit_mode = not Configuration.edit_mode
+
+        for task in Configuration.selected_tasks:
+            task.selected = False
+            task.refresh()
+
+        Configuration.selected_tasks.clear()
+
+        if Configuration.selected_connection is not None:
+            Configuration.selected_connection.selected = False
+            Configuration.selected_connection.update_visuals()
+
+        Configuration.selected_connection = None
+
         SystemFunctions.toggle_sidebar(show=False)
\ No newline at end of file
@@ -1,27 +1,28 @@
 from abc import ABC, abstractmethod
-from General.Configuration import Configuration
 
 
 class MutexBase(ABC):
+    # Every field is declared, protocols add their own in their __slots__
+    __slots__ = ("name", "algorithm_type", "lock", "connected_tasks", "holder", "attendees", "engine",
+                 "observers")
+
     def __init__(self):
         self.name = "unnamed"
         self.algorithm_type = "No description"
         self.lock = False
         self.connected_tasks = []
-        self.lines = []
 
         self.holder = None
+
+        # The waiting tasks in the order they will be served. The protocols keep
+        # them in their own queue structure and build this list on access.
         self.attendees = []
 
-        self.mutex_text = Configuration.canvas.create_text(0, 0, text=self.name, fill="white",
-                                                           font=("Montserrat Black", 12, "bold"))
-        self.locked_text = Configuration.canvas.create_text(0, 0, text=("Locked" if self.lock else "Unlocked"),
-                                                            fill="white",
-                                                            font=("Montserrat Light", 8, "bold"))
+        # The engine owning the mutex, set by SimulationEngine.create_mutex
+        self.engine = None
 
-        self.mutex_bg = Configuration.canvas.create_polygon([0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                                                            fill=Configuration.mutex_color,
-                                                            outline=Configuration.mutex_color)
+        # Views and other listeners, notified through model_changed()
+        self.observers = []
 
     def add_task(self, task):
         """
@@ -30,8 +31,79 @@ class MutexBase(ABC):
         :param task:
         :return:
         """
-        self.connected_tasks.append(task)
-        self.lines.append(Configuration.canvas.create_line(0, 0, 0, 0, fill=Configuration.mutex_color, width=5))
+        if task not in self.connected_tasks:
+            self.connected_tasks.append(task)
+
+    def remove_task(self, task):
+        """
+        Remove a task from the mutex lock.
+
+        :param task:
+        :return:
+        """
+        if task in self.connected_tasks:
+            self.connected_tasks.remove(task)
+
+    def priority_changed(self, task):
+        """
+        Called by a task of the mutex after its priority changed.
+
+        :param task:
+        :return:
+        """
+        pass
+
+    def _record(self, *change):
+        """
+        Add a change to the undo log of the running step, if the engine keeps one.
+
+        :param change: The kind of change and the values undo() needs to revert it.
+        :return:
+        """
+        if self.engine is not None and self.engine.current_delta is not None:
+            self.engine.current_delta.append(("mutex", self) + change)
+
+    def _record_task(self, task, attribute):
+        """
+        Add the current value of a task field to the undo log before the mutex changes it.
+
+        :param task:
+        :param attribute: "priority", "elevated_priority", ...
+        :return:
+        """
+        if self.engine is not None and self.engine.current_delta is not None:
+            self.engine.current_delta.append(("task", task, attribute, getattr(task, attribute)))
+
+    def undo(self, kind, *values):
+        """
+        Revert a change recorded by _record(), called by SimulationEngine.step_back().
+
+        Changes are reverted in reverse order, so the mutex is in the state
+        right after the change. Protocols revert the changes of their queues.
+
+        :param kind: "holder" or a protocol specific kind.
+        :param values: The values recorded with the change.
+        :return:
+        """
+        if kind == "holder":
+            self._set_holder(values[0])
+
+    def _set_holder(self, task):
+        """
+        Hand the lock to a task (or release it if task is None) and notify the observers.
+
+        :param task:
+        :return:
+        """
+        old_holder = self.holder
+        self._record("holder", old_holder)
+        self.lock = task is not None
+        self.holder = task
+        if self.engine is not None:
+            self.engine.change_count += 1
+
+        for observer in self.observers:
+            observer.model_changed(self, "holder", old_holder, task)
 
     @abstractmethod
     def attend(self, task):
@@ -61,67 +133,3 @@ class MutexBase(ABC):
         :return:
         """
         pass
-
-    def update_visuals(self):
-        """
-        Update the visuals of the mutex object.
-
-        :return:
-        """
-
-        # iterate over connected tasks name
-        mutex_name = "m" + "".join([task.task_name for task in self.connected_tasks])
-        if mutex_name != self.name:
-            print(Configuration.mutex_objects.keys())
-            Configuration.mutex_objects.pop(self.name)
-            self.name = mutex_name
-            Configuration.mutex_objects.update({self.name: self})
-
-        Configuration.canvas.itemconfig(self.mutex_text, text=self.name)
-        Configuration.canvas.itemconfig(self.locked_text, text=("Locked" if self.lock else "Unlocked"))
-
-        sx1, sy1, sx2, sy2 = Configuration.canvas.bbox(self.mutex_text)
-        text_width = sx2 - sx1
-        text_height = sy2 - sy1
-
-        if text_width < 100:
-            text_width = 100
-
-        new_x = 0
-        new_y = 0
-        for task in self.connected_tasks:
-            new_x += Configuration.canvas.coords(task.oval)[0] + 50
-            new_y += Configuration.canvas.coords(task.oval)[1] + 50
-
-        new_x /= len(self.connected_tasks)
-        new_y /= len(self.connected_tasks)
-
-        Configuration.canvas.coords(self.mutex_text, new_x, new_y - 10)
-        Configuration.canvas.coords(self.locked_text, new_x, new_y + 10)
-        padding = 20
-        edge_padding = -5
-
-        Configuration.canvas.coords(self.mutex_bg, [
-                                            new_x - text_width / 2 - padding, new_y,
-                                            new_x - text_width / 2 + edge_padding,  new_y + text_height / 2 + padding,
-                                            new_x + text_width / 2 - edge_padding,  new_y + text_height / 2 + padding,
-                                            new_x + text_width / 2 + padding, new_y,
-                                            new_x + text_width / 2 - edge_padding,  new_y - text_height / 2 - padding,
-                                            new_x - text_width / 2 + edge_padding,  new_y - text_height / 2 - padding
-                                        ])
-
-        Configuration.canvas.tag_raise(self.mutex_text, self.mutex_bg)
-        Configuration.canvas.tag_raise(self.locked_text)
-
-        task_index = 0
-        for line in self.lines:
-            Configuration.canvas.coords(line,
-                                        new_x,
-                                        new_y,
-                                        Configuration.canvas.bbox(self.connected_tasks[task_index].oval)[0] + 50,
-                                        Configuration.canvas.bbox(self.connected_tasks[task_index].oval)[1] + 50
-                                        )
-
-            Configuration.canvas.tag_lower(line)
-            task_index += 1
-
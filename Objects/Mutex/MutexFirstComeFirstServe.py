@@ -1,22 +1,36 @@
+from collections import deque
 from Objects.Mutex.MutexBase import MutexBase
+from General.Log import MUTEX_LOG, Debug
 
 
 class MutexFirstComeFirstServe(MutexBase):
+    __slots__ = ("queue",)
+
     def __init__(self):
         super().__init__()
         self.algorithm_type = "First Come First Serve"
 
+    @property
+    def attendees(self):
+        return list(self.queue)
+
+    @attendees.setter
+    def attendees(self, tasks):
+        self.queue = deque(tasks)
+
     def attend(self, task):
-        self.attendees.append(task)
+        self._record("attend")
+        self.queue.append(task)
 
     def evaluate(self):
-        if self.lock or not self.attendees:
+        if self.lock or not self.queue:
             return
 
-        first_priority_task = self.attendees.pop(0)
-        self.lock = True
-        self.holder = first_priority_task
-        print(f"Mutex locked by {first_priority_task.task_name}")
+        first_priority_task = self.queue.popleft()
+        self._record("serve", first_priority_task)
+        self._set_holder(first_priority_task)
+        if Debug.mutex:
+            MUTEX_LOG.debug("Mutex %s locked by %s", self.name, first_priority_task.full_name)
 
         first_priority_task.grant_access()
 
@@ -24,6 +38,14 @@ class MutexFirstComeFirstServe(MutexBase):
         if task != self.holder:
             return
 
-        print(f"Mutex released by {task.task_name}")
-        self.lock = False
-        self.holder = None
+        if Debug.mutex:
+            MUTEX_LOG.debug("Mutex %s released by %s", self.name, task.full_name)
+        self._set_holder(None)
+
+    def undo(self, kind, *values):
+        if kind == "attend":
+            self.queue.pop()
+        elif kind == "serve":
+            self.queue.appendleft(values[0])
+        else:
+            super().undo(kind, *values)
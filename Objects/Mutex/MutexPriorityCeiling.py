@@ -1,36 +1,64 @@
 from Objects.Mutex.MutexBase import MutexBase
+from General.Log import MUTEX_LOG, Debug
+from Objects.Mutex.MutexPriorityQueue import MutexPriorityQueue
 
 
 class MutexPriorityCeiling(MutexBase):
+    __slots__ = ("queue", "ceiling_priority", "highest_priority", "highest_priority_dirty")
+
     def __init__(self):
         super().__init__()
         self.algorithm_type = "Priority Ceiling"
         self.ceiling_priority = None  # Initialize ceiling priority
 
+        # Highest priority of the connected tasks, recomputed after they change
+        self.highest_priority = None
+        self.highest_priority_dirty = True
+
+    @property
+    def attendees(self):
+        return list(self.queue)
+
+    @attendees.setter
+    def attendees(self, tasks):
+        self.queue = MutexPriorityQueue(tasks)
+
+    def add_task(self, task):
+        super().add_task(task)
+        self.highest_priority_dirty = True
+
+    def remove_task(self, task):
+        super().remove_task(task)
+        self.highest_priority_dirty = True
+
     def update_ceiling_priority(self):
-        if self.connected_tasks:
-            self.ceiling_priority = max(task.priority for task in self.connected_tasks)
-        else:
-            self.ceiling_priority = None
+        if self.highest_priority_dirty:
+            self.highest_priority = max((task.priority for task in self.connected_tasks), default=None)
+            self.highest_priority_dirty = False
+        if self.ceiling_priority != self.highest_priority:
+            self._record("ceiling", self.ceiling_priority)
+            self.ceiling_priority = self.highest_priority
 
     def attend(self, task):
         # Update ceiling priority when a new task attends
         self.update_ceiling_priority()
 
-        self.attendees.append(task)
-        self.attendees.sort(key=lambda x: x.priority, reverse=True)
+        self._record("attend", task)
+        self.queue.push(task)
 
         if self.lock and self.holder.priority < task.priority and self.ceiling_priority < task.priority:
-            print(f"Task {task.task_name} blocked due to priority ceiling protocol")
+            if Debug.mutex:
+                MUTEX_LOG.debug("Task %s blocked due to priority ceiling protocol", task.full_name)
 
     def evaluate(self):
-        if self.lock or not self.attendees or (self.ceiling_priority is not None and self.attendees[0].priority > self.ceiling_priority):
+        if self.lock or not self.queue or (self.ceiling_priority is not None and self.queue.peek().priority > self.ceiling_priority):
             return
 
-        highest_priority_task = self.attendees.pop(0)
-        self.lock = True
-        self.holder = highest_priority_task
-        print(f"Mutex locked by {highest_priority_task.task_name}")
+        highest_priority_task, arrival = self.queue.pop()
+        self._record("serve", highest_priority_task, arrival)
+        self._set_holder(highest_priority_task)
+        if Debug.mutex:
+            MUTEX_LOG.debug("Mutex %s locked by %s", self.name, highest_priority_task.full_name)
 
         highest_priority_task.grant_access()
 
@@ -38,15 +66,29 @@ class MutexPriorityCeiling(MutexBase):
         if task != self.holder:
             return
 
-        print(f"Mutex released by {task.task_name}")
-        self.lock = False
-        self.holder = None
+        if Debug.mutex:
+            MUTEX_LOG.debug("Mutex %s released by %s", self.name, task.full_name)
+        self._set_holder(None)
 
         # Restore original priority back if elevated
-        if hasattr(task, 'elevated_priority'):
+        if task.elevated_priority is not None:
             task.priority = task.original_priority
-            del task.elevated_priority
+            self._record_task(task, "elevated_priority")
+            task.elevated_priority = None
 
         # Update ceiling priority after a task is released
         self.update_ceiling_priority()
 
+    def priority_changed(self, task):
+        self.queue.update(task)
+        self.highest_priority_dirty = True
+
+    def undo(self, kind, *values):
+        if kind == "attend":
+            self.queue.unpush(values[0])
+        elif kind == "serve":
+            self.queue.unpop(*values)
+        elif kind == "ceiling":
+            self.ceiling_priority = values[0]
+        else:
+            super().undo(kind, *values)
@@ -1,41 +1,68 @@
 from Objects.Mutex.MutexBase import MutexBase
+from General.Log import MUTEX_LOG, Debug
+from Objects.Mutex.MutexPriorityQueue import MutexPriorityQueue
 
 
 class MutexPriorityInversion(MutexBase):
+    __slots__ = ("queue",)
+
     def __init__(self):
         super().__init__()
         self.algorithm_type = "Priority Inversion"
 
+    @property
+    def attendees(self):
+        return list(self.queue)
+
+    @attendees.setter
+    def attendees(self, tasks):
+        self.queue = MutexPriorityQueue(tasks)
+
     def attend(self, task):
-        # Add a task to the attendees list and sort descending by priority
-        self.attendees.append(task)
-        self.attendees.sort(key=lambda x: x.priority, reverse=True)
+        # Queue the task by descending priority
+        self._record("attend", task)
+        self.queue.push(task)
 
         # Check for the priority inversion
-        if self.lock and self.holder.priority < self.attendees[0].priority:
-            self.holder.elevated_priority = self.attendees[0].priority
-            print(
-                f"Priority inheritance: {self.holder.task_name}'s priority elevated to {self.holder.elevated_priority}")
+        first_task = self.queue.peek()
+        if self.lock and self.holder.priority < first_task.priority:
+            self._record_task(self.holder, "elevated_priority")
+            self.holder.elevated_priority = first_task.priority
+            if Debug.mutex:
+                MUTEX_LOG.debug("Priority inheritance: %s's priority elevated to %s", self.holder.full_name,
+                                self.holder.elevated_priority)
 
     def evaluate(self):
-        if self.lock or not self.attendees:
+        if self.lock or not self.queue:
             return
-        highest_priority_task = self.attendees.pop(0)
-        self.lock = True
-        self.holder = highest_priority_task
-        print("Mutex locked by " + highest_priority_task.task_name + highest_priority_task.activity_name)
+        highest_priority_task, arrival = self.queue.pop()
+        self._record("serve", highest_priority_task, arrival)
+        self._set_holder(highest_priority_task)
+        if Debug.mutex:
+            MUTEX_LOG.debug("Mutex %s locked by %s", self.name, highest_priority_task.full_name)
         highest_priority_task.grant_access()
 
     def release(self, task):
-        print("Mutex released")
         if task != self.holder:
             return
 
-        print("Mutex released by " + task.task_name + task.activity_name)
-        self.lock = False
-        self.holder = None
+        if Debug.mutex:
+            MUTEX_LOG.debug("Mutex %s released by %s", self.name, task.full_name)
+        self._set_holder(None)
 
         # Restore original priority back if elevated
-        if hasattr(task, 'elevated_priority'):
+        if task.elevated_priority is not None:
             task.priority = task.original_priority
-            del task.elevated_priority
+            self._record_task(task, "elevated_priority")
+            task.elevated_priority = None
+
+    def priority_changed(self, task):
+        self.queue.update(task)
+
+    def undo(self, kind, *values):
+        if kind == "attend":
+            self.queue.unpush(values[0])
+        elif kind == "serve":
+            self.queue.unpop(*values)
+        else:
+            super().undo(kind, *values)
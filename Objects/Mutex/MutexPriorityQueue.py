@@ -0,0 +1,130 @@
+import heapq
+import itertools
+
+
+class MutexPriorityQueue:
+    """
+    Queue of tasks waiting for a mutex, served by descending priority and in
+    arrival order among equal priorities.
+
+    A task may be queued more than once. Entries are heap items
+    [-priority, arrival, task, valid]; when the priority of a task changes,
+    its entries are invalidated and pushed again with the new priority and
+    their original arrival, so no entry is ever searched for.
+    """
+
+    def __init__(self, tasks=()):
+        """
+        Build a queue holding tasks in service order.
+
+        :param tasks: The tasks, first served first.
+        """
+        self.heap = []
+        self.entries = {}  # STRUCTURE: {task: [valid heap items of the task]}
+        self.arrivals = itertools.count()
+        self.size = 0
+        for task in tasks:
+            self.push(task)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """
+        Iterate over the queued tasks in service order.
+
+        :return:
+        """
+        return (item[2] for item in sorted(item for items in self.entries.values() for item in items))
+
+    def push(self, task):
+        """
+        Queue a task.
+
+        :param task:
+        :return:
+        """
+        item = [-task.priority, next(self.arrivals), task, True]
+        heapq.heappush(self.heap, item)
+        self.entries.setdefault(task, []).append(item)
+        self.size += 1
+
+    def _drop_invalid(self):
+        while self.heap and not self.heap[0][3]:
+            heapq.heappop(self.heap)
+
+    def peek(self):
+        """
+        Get the task served next without removing it.
+
+        :return: The task, or None if the queue is empty.
+        """
+        self._drop_invalid()
+        return self.heap[0][2] if self.heap else None
+
+    def pop(self):
+        """
+        Remove and return the task served next.
+
+        :return: The task and its arrival number, to put it back with unpop().
+        """
+        self._drop_invalid()
+        item = heapq.heappop(self.heap)
+        items = self.entries[item[2]]
+        items.remove(item)
+        if not items:
+            del self.entries[item[2]]
+        self.size -= 1
+        return item[2], item[1]
+
+    def unpush(self, task):
+        """
+        Remove the entry of a task queued last, undoing push().
+
+        :param task:
+        :return:
+        """
+        items = self.entries[task]
+        item = max(items, key=lambda queued_item: queued_item[1])
+        item[3] = False
+        items.remove(item)
+        if not items:
+            del self.entries[task]
+        self.size -= 1
+
+    def unpop(self, task, arrival):
+        """
+        Queue a task served by pop() again at its original place, undoing pop().
+
+        :param task:
+        :param arrival: The arrival number returned by pop().
+        :return:
+        """
+        item = [-task.priority, arrival, task, True]
+        heapq.heappush(self.heap, item)
+        self.entries.setdefault(task, []).append(item)
+        self.size += 1
+
+    def update(self, task):
+        """
+        Move the entries of a task to its current priority.
+
+        :param task:
+        :return:
+        """
+        items = self.entries.get(task)
+        if not items or items[0][0] == -task.priority:
+            return
+
+        updated = []
+        for item in items:
+            item[3] = False
+            new_item = [-task.priority, item[1], task, True]
+            heapq.heappush(self.heap, new_item)
+            updated.append(new_item)
+        self.entries[task] = updated
+
+        # Invalid items are only dropped from the top; rebuild once they dominate
+        if len(self.heap) > 2 * self.size + 64:
+            self.heap = [item for item in self.heap if item[3]]
+            heapq.heapify(self.heap)
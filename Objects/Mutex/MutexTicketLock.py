@@ -1,41 +1,145 @@
+import itertools
+from collections import deque
 from Objects.Mutex.MutexBase import MutexBase
+from General.Log import MUTEX_LOG, Debug
+
 
 class MutexTicketLock(MutexBase):
+    __slots__ = ("ticket_counter", "current_ticket", "entries", "arrivals_of", "tasks_by_ticket", "indexed_ticket",
+                 "arrivals")
+
     def __init__(self):
         super().__init__()
         self.algorithm_type = "Ticket Lock"
         self.ticket_counter = 0  # Initialize the ticket counter
         self.current_ticket = 0  # The ticket currently being served
 
+    @property
+    def attendees(self):
+        # Undone steps put tasks back out of arrival order, so the entries are sorted here
+        return [self.entries[arrival] for arrival in sorted(self.entries)]
+
+    @attendees.setter
+    def attendees(self, tasks):
+        # The queue in arrival order (a task may attend more than once) and
+        # the queued tasks by the ticket they hold
+        self.entries = {}  # STRUCTURE: {arrival: task}
+        self.arrivals_of = {}  # STRUCTURE: {task: deque([arrivals, oldest first])}
+        self.tasks_by_ticket = {}  # STRUCTURE: {ticket: {task: None}}
+        self.indexed_ticket = {}  # STRUCTURE: {task: ticket it is listed under in tasks_by_ticket}
+        self.arrivals = itertools.count()
+        for task in tasks:
+            self._enqueue(task)
+
+    def _enqueue(self, task):
+        arrival = next(self.arrivals)
+        self.entries[arrival] = task
+        self.arrivals_of.setdefault(task, deque()).append(arrival)
+        self.ticket_changed(task)
+
+    def _dequeue(self, task):
+        arrivals = self.arrivals_of[task]
+        del self.entries[arrivals.popleft()]
+        if not arrivals:
+            del self.arrivals_of[task]
+            self._unindex(task)
+
+    def _unindex(self, task):
+        ticket = self.indexed_ticket.pop(task, None)
+        tasks = self.tasks_by_ticket.get(ticket)
+        if tasks is not None:
+            tasks.pop(task, None)
+            if not tasks:
+                del self.tasks_by_ticket[ticket]
+
+    def ticket_changed(self, task):
+        """
+        List a queued task under the ticket it holds now.
+
+        Tasks share one ticket attribute across all their ticket locks, so
+        every ticket lock of the task is told when another one issues a ticket.
+
+        :param task:
+        :return:
+        """
+        if task not in self.arrivals_of:
+            return
+
+        ticket = task.ticket
+        if task in self.indexed_ticket:
+            if self.indexed_ticket[task] == ticket:
+                return
+            self._unindex(task)
+        self.indexed_ticket[task] = ticket
+        self.tasks_by_ticket.setdefault(ticket, {})[task] = None
+
+    def _tell_other_locks(self, task):
+        """
+        Tell the other ticket locks of a task about its current ticket.
+
+        :param task:
+        :return:
+        """
+        for mutex in task.mutexes:
+            if mutex is not self and isinstance(mutex, MutexTicketLock):
+                mutex.ticket_changed(task)
+
     def attend(self, task):
+        self._record("attend", task, task.ticket)
         task.ticket = self.ticket_counter
         self.ticket_counter += 1
-        self.attendees.append(task)
+        self._enqueue(task)
+        self._tell_other_locks(task)
 
-        print(f"Task {task.task_name} received ticket {task.ticket}")
+        if Debug.mutex:
+            MUTEX_LOG.debug("Task %s received ticket %s", task.full_name, task.ticket)
 
     def evaluate(self):
-        if self.lock or not self.attendees:
+        if self.lock or not self.entries:
             return
 
-        # Find the task with the current ticket
-        for task in self.attendees:
-            if task.ticket == self.current_ticket:
-                self.attendees.remove(task)
-                self.lock = True
-                self.holder = task
-                print(f"Mutex locked by {task.task_name} with ticket {task.ticket}")
-                self.current_ticket += 1
-                task.grant_access()
-                break
+        # Find the task with the current ticket, the first queued one if several hold it
+        tasks = self.tasks_by_ticket.get(self.current_ticket)
+        if tasks:
+            task = min(tasks, key=lambda queued_task: self.arrivals_of[queued_task][0])
+            self._record("serve", task, self.arrivals_of[task][0])
+            self._dequeue(task)
+            self._set_holder(task)
+            if Debug.mutex:
+                MUTEX_LOG.debug("Mutex %s locked by %s with ticket %s", self.name, task.full_name, task.ticket)
+            self.current_ticket += 1
+            task.grant_access()
 
     def release(self, task):
         if task != self.holder:
             return
 
-        print(f"Mutex released by {task.task_name} with ticket {task.ticket}")
-        self.lock = False
-        self.holder = None
+        if Debug.mutex:
+            MUTEX_LOG.debug("Mutex %s released by %s with ticket %s", self.name, task.full_name, task.ticket)
+        self._set_holder(None)
 
         # Continue with the next ticket
-        self.evaluate()
\ No newline at end of file
+        self.evaluate()
+
+    def undo(self, kind, *values):
+        if kind == "attend":
+            # Take back the newest arrival of the task and the ticket it was given
+            task, ticket = values
+            self.ticket_counter -= 1
+            arrivals = self.arrivals_of[task]
+            del self.entries[arrivals.pop()]
+            if not arrivals:
+                del self.arrivals_of[task]
+                self._unindex(task)
+            task.ticket = ticket
+            self.ticket_changed(task)
+            self._tell_other_locks(task)
+        elif kind == "serve":
+            # Queue the task again under its arrival
+            task, arrival = values
+            self.current_ticket -= 1
+            self.entries[arrival] = task
+            self.arrivals_of.setdefault(task, deque()).appendleft(arrival)
+            self.ticket_changed(task)
+        else:
+            super().undo(kind, *values)
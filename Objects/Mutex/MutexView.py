@@ -0,0 +1,249 @@
+from General.Configuration import Configuration
+from General.Viewport import Viewport
+from General.Log import RENDER_LOG, Debug
+
+
+class MutexView:
+    """
+    Canvas representation of a mutex: a badge with the mutex name and lock state
+    placed at the centroid of the connected tasks, plus one line per task.
+    """
+
+    def __init__(self, model):
+        """
+        Create the view for a mutex model. The canvas items are created by show()
+        once a connected task is shown (see General.Viewport).
+
+        :param model: The mutex model (a MutexBase subclass) to visualise.
+        """
+        self.model = model
+        self.connected_tasks = []
+        self.lines = []
+
+        # Cached layout, recomputed only when its inputs change (see invalidate() and task_moved())
+        self.shown_lock = self.model.lock
+        self.text_size = (100, 0)
+        self.points = []  # STRUCTURE: [(centre x, centre y)] per connected task
+        self.center_sum = [0, 0]
+        self.name_dirty = True
+        self.points_dirty = True
+        self.geometry_dirty = True
+
+        self.shown = False
+        self.mutex_text = None
+        self.locked_text = None
+        self.mutex_bg = None
+
+        model.observers.append(self)
+
+    def show(self):
+        """
+        Create the canvas items, drawn in full only; zoomed out mutexes are left out.
+
+        :return:
+        """
+        self.shown = True
+        if not Viewport.shows_details():
+            return
+
+        self.shown_lock = self.model.lock
+        self.mutex_text = Configuration.canvas.create_text(0, 0, text=self.name, fill="white",
+                                                           font=("Montserrat Black", 12, "bold"), tags="mutex")
+        self.locked_text = Configuration.canvas.create_text(0, 0, text=("Locked" if self.model.lock else "Unlocked"),
+                                                            fill="white",
+                                                            font=("Montserrat Light", 8, "bold"))
+
+        self.mutex_bg = Configuration.canvas.create_polygon([0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                                                            fill=Configuration.mutex_color,
+                                                            outline=Configuration.mutex_color, tags="mutex")
+
+        self.lines = [self._create_line() for task in self.connected_tasks]
+        self.name_dirty = True
+        self.points_dirty = True
+        self.update_visuals()
+
+    def hide(self):
+        """
+        Delete the canvas items.
+
+        :return:
+        """
+        self.shown = False
+        for item in [self.mutex_text, self.locked_text, self.mutex_bg] + self.lines:
+            if item is not None:
+                Configuration.canvas.delete(item)
+
+        self.mutex_text = None
+        self.locked_text = None
+        self.mutex_bg = None
+        self.lines = []
+
+    @staticmethod
+    def _create_line():
+        return Configuration.canvas.create_line(0, 0, 0, 0, fill=Configuration.mutex_color, width=5, tags="mutex_line")
+
+    @property
+    def name(self):
+        return self.model.name
+
+    def add_task(self, task):
+        """
+        Add a task view to the mutex lock.
+
+        :param task:
+        :return:
+        """
+        self.connected_tasks.append(task)
+        if self.mutex_text is not None:
+            self.lines.append(self._create_line())
+        self.model.add_task(task.model)
+        self.invalidate()
+
+    def remove_task(self, task):
+        """
+        Remove a deleted task view from the mutex lock. The model is updated by the engine.
+
+        :param task:
+        :return:
+        """
+        index = self.connected_tasks.index(task)
+        self.connected_tasks.pop(index)
+        if self.mutex_text is not None:
+            Configuration.canvas.delete(self.lines.pop(index))
+        self.invalidate()
+        self.update_visuals()
+
+    def invalidate(self):
+        """
+        Mark the name, text size and task positions for recomputation, e.g.
+        after the connected tasks or their names changed.
+
+        :return:
+        """
+        self.name_dirty = True
+        self.points_dirty = True
+
+    def model_changed(self, subject, kind, old_value, new_value):
+        """
+        Observe the mutex model and refresh the lock state text.
+
+        :param subject: The mutex model.
+        :param kind: The kind of change.
+        :param old_value: The previous holder.
+        :param new_value: The new holder.
+        :return:
+        """
+        if kind == "holder" and not Configuration.render_suspended:
+            self._update_lock_text()
+
+    def _update_lock_text(self):
+        """
+        Show the lock state of the model if it differs from the one shown.
+
+        :return:
+        """
+        if self.mutex_text is not None and self.shown_lock != self.model.lock:
+            self.shown_lock = self.model.lock
+            Configuration.canvas.itemconfig(self.locked_text, text=("Locked" if self.model.lock else "Unlocked"))
+
+    @staticmethod
+    def _task_point(task):
+        """
+        Get the centre of a task view, where its line ends, from the position index.
+
+        :param task: The task view.
+        :return: The centre.
+        """
+        return Viewport.position(task)
+
+    def task_moved(self, task):
+        """
+        Move the badge and lines after a connected task moved, measuring only that task.
+
+        :param task: The task view that moved.
+        :return:
+        """
+        if self.mutex_text is None:
+            return
+
+        if not self.points_dirty:
+            for index, connected_task in enumerate(self.connected_tasks):
+                if connected_task is task:
+                    old_x, old_y = self.points[index][:2]
+                    self.points[index] = self._task_point(task)
+                    self.center_sum[0] += self.points[index][0] - old_x
+                    self.center_sum[1] += self.points[index][1] - old_y
+            self.geometry_dirty = True
+
+        self.update_visuals()
+
+    def update_visuals(self):
+        """
+        Redraw the parts of the mutex object whose inputs changed.
+
+        :return:
+        """
+        self._update_lock_text()
+
+        if self.name_dirty:
+            # iterate over connected tasks name
+            mutex_name = "m" + "".join([task.task_name for task in self.connected_tasks])
+            if mutex_name != self.name:
+                if Debug.render:
+                    RENDER_LOG.debug("Renaming mutex %s to %s", self.name, mutex_name)
+                Configuration.mutex_objects.pop(self.name)
+                self.model.name = mutex_name
+                Configuration.mutex_objects.update({self.name: self})
+
+        # The rest is drawn once the mutex is shown
+        if self.mutex_text is None:
+            return
+
+        if self.name_dirty:
+            Configuration.canvas.itemconfig(self.mutex_text, text=self.name)
+
+            sx1, sy1, sx2, sy2 = Configuration.canvas.bbox(self.mutex_text)
+            self.text_size = (max(sx2 - sx1, 100), sy2 - sy1)
+            self.name_dirty = False
+            self.geometry_dirty = True
+
+        if self.points_dirty:
+            self.points = [self._task_point(task) for task in self.connected_tasks]
+            self.center_sum = [sum(point[0] for point in self.points), sum(point[1] for point in self.points)]
+            self.points_dirty = False
+            self.geometry_dirty = True
+
+        if self.geometry_dirty and self.connected_tasks:
+            self._draw_geometry()
+            self.geometry_dirty = False
+
+    def _draw_geometry(self):
+        """
+        Place the badge at the centroid of the connected tasks and draw the lines to them.
+
+        :return:
+        """
+        text_width, text_height = self.text_size
+        new_x = self.center_sum[0] / len(self.connected_tasks)
+        new_y = self.center_sum[1] / len(self.connected_tasks)
+
+        Configuration.canvas.coords(self.mutex_text, new_x, new_y - 10)
+        Configuration.canvas.coords(self.locked_text, new_x, new_y + 10)
+        padding = 20
+        edge_padding = -5
+
+        Configuration.canvas.coords(self.mutex_bg, [
+                                            new_x - text_width / 2 - padding, new_y,
+                                            new_x - text_width / 2 + edge_padding,  new_y + text_height / 2 + padding,
+                                            new_x + text_width / 2 - edge_padding,  new_y + text_height / 2 + padding,
+                                            new_x + text_width / 2 + padding, new_y,
+                                            new_x + text_width / 2 - edge_padding,  new_y - text_height / 2 - padding,
+                                            new_x - text_width / 2 + edge_padding,  new_y - text_height / 2 - padding
+                                        ])
+
+        Configuration.canvas.tag_raise(self.mutex_text, self.mutex_bg)
+        Configuration.canvas.tag_raise(self.locked_text)
+
+        for line, point in zip(self.lines, self.points):
+            Configuration.canvas.coords(line, new_x, new_y, point[0], point[1])
+            Configuration.canvas.tag_lower(line)
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# Import necessary modules
+from General.Configuration import Configuration
+from General.Viewport import Viewport
+
+
+class TaskGroup:
+    """
+    A class representing a collapsed task: a single compound node in place of
+    the views of all its activities.
+
+    The node sits at the centroid of the activities and shows the task name,
+    the number of activities and which of them are running. The activity
+    views keep observing their models while collapsed, so expanding the
+    task shows the current state. Connectors to and from the activities are
+    drawn as GroupConnections (see SystemFunctions.update_group_connections()).
+    """
+
+    # Radius of the compound node, larger than that of a task oval
+    radius = 70
+
+    def __init__(self, members):
+        """
+        Initialize a new TaskGroup instance.
+
+        Args:
+            members (list): The task views of the activities of one task.
+        """
+        self.members = members
+        self.task_name = members[0].task_name
+        self.x = 0
+        self.y = 0
+        self.place()
+
+        # Canvas items, None while the group is not shown or shown as a glyph
+        self.shown = False
+        self.oval = None
+        self.name_label = None
+        self.count_label = None
+        self.status_label = None
+        self.glyph = None
+
+        # Observe the activity models for state changes
+        for member in members:
+            member.model.observers.append(self)
+
+    def place(self):
+        """Move the node to the centroid of its activities, e.g. after they were arranged."""
+        self.x = sum(member.model.x for member in self.members) / len(self.members)
+        self.y = sum(member.model.y for member in self.members) / len(self.members)
+
+    def detach(self):
+        """Stop observing the activity models, e.g. when the task is expanded."""
+        for member in self.members:
+            if self in member.model.observers:
+                member.model.observers.remove(self)
+
+    def show(self):
+        """Create the canvas items of the group, in full or as a glyph depending on the zoom factor."""
+        self.shown = True
+        x = self.x
+        y = self.y
+        radius = self.radius
+
+        if not Viewport.shows_details():
+            zoom = Configuration.zoom
+            glyph_radius = max(radius * zoom, 2)
+            self.glyph = Configuration.canvas.create_oval(
+                x * zoom - glyph_radius, y * zoom - glyph_radius, x * zoom + glyph_radius, y * zoom + glyph_radius,
+                fill=self._outline_color(), outline=""
+            )
+            return
+
+        self.oval = Configuration.canvas.create_oval(
+            x - radius, y - radius, x + radius, y + radius,
+            fill=Configuration.root['bg'], outline=self._outline_color(), width=4
+        )
+        self.name_label = Configuration.canvas.create_text(
+            x, y - 25, text="Task " + self.task_name, fill="white", font=("Montserrat Black", 12)
+        )
+        self.count_label = Configuration.canvas.create_text(
+            x, y, text=str(len(self.members)) + " activities", fill="white", font=("Montserrat Black", 10)
+        )
+        self.status_label = Configuration.canvas.create_text(
+            x, y + 25, text=self.status_text(), fill="white", font=("Montserrat Light", 8)
+        )
+
+    def hide(self):
+        """Delete the canvas items of the group."""
+        self.shown = False
+        for item in (self.oval, self.name_label, self.count_label, self.status_label, self.glyph):
+            if item is not None:
+                Configuration.canvas.delete(item)
+
+        self.oval = None
+        self.name_label = None
+        self.count_label = None
+        self.status_label = None
+        self.glyph = None
+
+    def status_text(self):
+        """
+        Summarise the state of the activities.
+
+        Returns:
+            str: The cycle of the running activity, the number of running activities or "Idle".
+        """
+        running = [member for member in self.members if member.task_current_cycle > 0]
+        if len(running) == 1:
+            member = running[0]
+            return ("Activity " + member.activity_name + " " + str(member.task_current_cycle) + "/"
+                    + str(member.task_max_cycles))
+        elif running:
+            return str(len(running)) + " running"
+        return "Idle"
+
+    def _outline_color(self):
+        """
+        Get the outline colour for the state of the activities.
+
+        Returns:
+            str: The colour.
+        """
+        if any(member.task_current_cycle > 0 for member in self.members):
+            return Configuration.task_color_running
+        return Configuration.task_color
+
+    def refresh(self):
+        """Redraw the status and outline from the current model state."""
+        if self.glyph is not None:
+            Configuration.canvas.itemconfig(self.glyph, fill=self._outline_color())
+        if self.oval is None:
+            return
+
+        Configuration.canvas.itemconfig(self.status_label, text=self.status_text())
+        Configuration.canvas.itemconfig(self.oval, outline=self._outline_color())
+
+    def model_changed(self, subject, kind, old_value, new_value):
+        """
+        Observe the activity models and redraw the summary.
+
+        Args:
+            subject (TaskModel): The model that changed.
+            kind (str): The kind of change ("cycle", "started" or "ended").
+            old_value: The value before the change.
+            new_value: The value after the change.
+        """
+        if Configuration.render_suspended or not self.shown:
+            return
+
+        self.refresh()
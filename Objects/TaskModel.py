@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+This module defines the TaskModel class, which holds the simulation state of a
+single task activity. It does not reference the canvas, so charts can be
+stepped without a running Tk window. Views register themselves in the
+observers list and are notified about every state change.
+"""
+
+# Import necessary modules
+from General.Log import ENGINE_LOG, Debug
+
+
+class TaskModel:
+    """
+    A class representing the simulation state of a task activity.
+
+    The task waits until all of its incoming ("end") connectors carry a token,
+    acquires its mutexes (if any), runs for task_max_cycles steps and then
+    increments its outgoing ("start" and "or") connectors.
+
+    All fields are declared in __slots__, so a task carries no per-instance
+    dict; charts with a million activities stay small and the step loop reads
+    the fields through slot descriptors.
+    """
+
+    __slots__ = ("engine", "task_name", "activity_name", "x", "y", "connectors", "mutexes", "granted_mutexes",
+                 "_priority", "original_priority", "ticket", "elevated_priority", "task_current_cycle",
+                 "task_max_cycles", "index", "needed_inputs", "satisfied_inputs", "observers")
+
+    def __init__(self, engine, task_name, activity_name, task_max_cycles, priority, x=50, y=50):
+        """
+        Initialize a new TaskModel instance.
+
+        Args:
+            engine (SimulationEngine): The engine the task belongs to.
+            task_name (str): The name of the task.
+            activity_name (str): The name of the activity.
+            task_max_cycles (int): The maximum number of cycles for the task.
+            priority (int): The priority of the task.
+            x (int, optional): The x-coordinate of the task centre. Defaults to 50.
+            y (int, optional): The y-coordinate of the task centre. Defaults to 50.
+        """
+        self.engine = engine
+        self.task_name = task_name
+        self.activity_name = activity_name
+        self.x = x
+        self.y = y
+
+        self.connectors = {}  # STRUCTURE: {ConnectionModel: "start" | "end" | "or"}
+
+        self.mutexes = []
+        self.granted_mutexes = 0
+        self.priority = priority
+        self.original_priority = priority
+
+        # Mutex protocol state: the ticket of the last ticket lock attended and
+        # the priority inherited from a waiting task (None while not elevated)
+        self.ticket = None
+        self.elevated_priority = None
+
+        # Initialize task cycle attributes
+        self.task_current_cycle = 0
+        self.task_max_cycles = task_max_cycles
+
+        # Readiness tracking, maintained by the engine and the connectors
+        self.index = 0
+        self.needed_inputs = 0
+        self.satisfied_inputs = 0
+
+        # Views and other listeners, notified through model_changed()
+        self.observers = list(engine.observers) if engine is not None else []
+
+    @property
+    def priority(self):
+        """The current priority; the mutexes of the task keep their queues ordered by it."""
+        return self._priority
+
+    @priority.setter
+    def priority(self, priority):
+        self._record("priority")
+        self._priority = priority
+        for mutex in self.mutexes:
+            mutex.priority_changed(self)
+
+    @property
+    def full_name(self):
+        """The identifier used in chart files, e.g. "1a"."""
+        return self.task_name + self.activity_name
+
+    def _record(self, attribute):
+        """
+        Add the current value of a field to the undo log of the running step, if the engine keeps one.
+
+        Args:
+            attribute (str): The field about to change, e.g. "granted_mutexes".
+        """
+        if self.engine is not None and self.engine.current_delta is not None:
+            self.engine.current_delta.append(("task", self, attribute, getattr(self, attribute)))
+
+    def _notify(self, kind, old_value=None, new_value=None):
+        """
+        Notify all observers about a state change.
+
+        Args:
+            kind (str): The kind of change ("cycle", "started" or "ended").
+            old_value: The value before the change.
+            new_value: The value after the change.
+        """
+        for observer in self.observers:
+            observer.model_changed(self, kind, old_value, new_value)
+
+    def _set_cycle(self, new_cycle):
+        """
+        Set the current cycle and notify the observers.
+
+        Args:
+            new_cycle (int): The new current cycle.
+        """
+        old_cycle = self.task_current_cycle
+        if old_cycle == new_cycle:
+            return
+
+        if self.engine.current_delta is not None:
+            self.engine.current_delta.append(("cycle", self, old_cycle))
+        self.task_current_cycle = new_cycle
+        self.engine.change_count += 1
+        self.engine.update_activity(self)
+        self._notify("cycle", old_cycle, new_cycle)
+
+    def is_active(self):
+        """
+        Check whether the task may change in the next step.
+
+        Returns:
+            bool: True if the task is running, ends every step (no cycles) or
+            all of its incoming semaphores are non-zero.
+        """
+        return (self.task_current_cycle > 0 or self.task_current_cycle == self.task_max_cycles
+                or 0 < self.needed_inputs == self.satisfied_inputs)
+
+    def try_step(self):
+        """
+        Attempt to perform a step of the task.
+
+        This method checks if the task can start a new cycle based on its
+        connections and mutexes. If the conditions are met, it starts a new
+        cycle or ends the current cycle.
+        """
+        # Increment the current cycle if not at the maximum
+        if self.task_max_cycles > self.task_current_cycle > 0:
+            self._set_cycle(self.task_current_cycle + 1)
+
+        # Check if the task can start a new cycle based on connections. Only an
+        # idle task with all incoming semaphores non-zero needs to look at them;
+        # tokens produced in this step are not ready yet.
+        amount_of_needed_connections_to_start = self.needed_inputs
+        amount_of_ready_connections_to_start = 0
+        if self.task_current_cycle == 0 and 0 < self.needed_inputs == self.satisfied_inputs:
+            step_number = self.engine.step_number
+            for connection, position in self.connectors.items():
+                if position == "end" and connection.last_change != step_number:
+                    amount_of_ready_connections_to_start += 1
+
+        self.attend(amount_of_needed_connections_to_start, amount_of_ready_connections_to_start)
+
+        self._end_cycle()
+
+    def _start_cycle(self):
+        """Start a new cycle for the task."""
+        for connection, position in self.connectors.items():
+            if position == "end" and connection.semaphore_value > 0:
+                self._set_cycle(1)
+                connection.decrement_semaphore(self.engine.step_number)
+
+        if self.granted_mutexes:
+            self._record("granted_mutexes")
+            self.granted_mutexes = 0
+        self._notify("started")
+
+    def attend(self, amount_of_needed_connections_to_start, amount_of_ready_connections_to_start):
+        """
+        Attend to the task based on the number of needed and ready connections.
+
+        If the task has the required number of ready connections and is not
+        currently in a cycle, it will attempt to acquire mutexes (if any) and
+        start a new cycle.
+        """
+        if amount_of_needed_connections_to_start == amount_of_ready_connections_to_start and self.task_current_cycle == 0 and amount_of_needed_connections_to_start > 0:
+            if len(self.mutexes) > 0:
+                for mutex in self.mutexes:
+                    mutex.attend(self)
+            else:
+                self._start_cycle()
+
+    def grant_access(self):
+        """
+        Grant mutex access to the task.
+
+        This method is called when the task acquires a mutex. If all required
+        mutexes are granted, the task starts a new cycle.
+        """
+        if Debug.engine:
+            ENGINE_LOG.debug("Access granted to %s", self.full_name)
+        self._record("granted_mutexes")
+        self.granted_mutexes += 1
+        if len(self.mutexes) == self.granted_mutexes:
+            self._start_cycle()
+
+    def add_mutex(self, mutex):
+        """
+        Add a mutex to the task.
+
+        Args:
+            mutex (MutexBase): The mutex to add.
+        """
+        if mutex in self.mutexes:
+            return
+
+        if Debug.engine:
+            ENGINE_LOG.debug("Added mutex %s to task %s", mutex.name, self.full_name)
+        self.mutexes.append(mutex)
+
+    def add_connector(self, connector, position):
+        """
+        Add a connector to the task.
+
+        Args:
+            connector (ConnectionModel): The connector to add.
+            position (str): The position of the connector ("start", "end" or "or").
+        """
+        self.connectors[connector] = position
+        connector.tasks[self] = position
+        self.engine.invalidate_ready()
+
+    def remove_connector(self, connector):
+        """
+        Remove a connector from the task.
+
+        Args:
+            connector (ConnectionModel): The connector to remove.
+        """
+        self.connectors.pop(connector, None)
+        connector.tasks.pop(self, None)
+        self.engine.invalidate_ready()
+
+    def _end_cycle(self):
+        """
+        End the current cycle of the task.
+
+        This method is called when the task completes its maximum number of
+        cycles. It increments the semaphores of connected tasks, releases
+        mutexes, and resets the task's cycle count.
+        """
+        # If the task is done with the current cycle, increment semaphores of connected tasks
+        if self.task_current_cycle == self.task_max_cycles:
+            if Debug.engine:
+                ENGINE_LOG.debug("Ending cycle %s %d/%d", self.full_name, self.task_current_cycle,
+                                 self.task_max_cycles)
+            for connection, position in self.connectors.items():
+                if position == "start" or position == "or":
+                    connection.increment_semaphore(self.engine.step_number)
+            self._set_cycle(0)
+            if len(self.mutexes) > 0:
+                for mutex in self.mutexes:
+                    mutex.release(self)
+
+            self._notify("ended")
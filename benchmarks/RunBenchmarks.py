@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+"""
+Module for running the benchmark suite and writing the results as JSON.
+
+Every case is a chart: a synthetic chart of one of the shapes of
+benchmarks.SyntheticCharts at one of the sizes, or one of the .xlsx charts
+bundled with the repository. For every case the suite measures:
+
+- load_seconds: reading the .xlsx file with General.ChartLoader.read_chart
+- save_xlsx_seconds: writing the chart in the Excel schema with pandas
+- save_project_seconds / load_project_seconds: the .fcproj project format
+- steps: headless steps per second for every mutex protocol, together with
+  the average number of changes per step and whether the chart became
+  quiescent, since steps of a quiescent chart are cheaper
+- peak_memory_bytes: the peak of Python allocations while loading and while
+  stepping, measured with tracemalloc in a separate untimed pass
+- render (with --render only): building the canvas views and stepping with
+  them on a Tk window; skipped without a display
+
+Times are the best of --repeat runs. The generated charts are kept in
+--chart-dir, so repeated runs read the same files. The JSON file also holds
+the commit, the Python version and the versions of the libraries, so the
+results of two runs can be compared.
+
+The main functions are:
+
+benchmark_chart(file_path, steps, max_seconds, repeat):
+    Measures one chart and returns its results.
+
+run_suite(shapes, sizes, ...):
+    Generates the synthetic charts, measures them and the bundled charts and returns the report.
+
+Usage from the command line:
+    python -m benchmarks.RunBenchmarks --sizes 10,100,1000 --output benchmark_results.json
+"""
+
+# Import necessary modules
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import openpyxl
+import pandas as pd
+from General.ChartLoader import read_chart
+from General.ProjectFile import read_project, write_project
+from General.SimulationEngine import MUTEX_CLASSES
+from benchmarks.SyntheticCharts import SHAPES, write_chart
+
+# Directory of the repository and its bundled charts
+REPOSITORY_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default sizes of the synthetic charts, in tasks
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+# Steps simulated per chunk, between two checks of the time limit
+STEP_CHUNK = 100
+
+# Steps simulated while the peak memory of stepping is measured
+MEMORY_STEPS = 100
+
+
+def _best_time(function, repeat):
+    """
+    Time a function.
+
+    Args:
+        function (callable): The function to time, called without arguments.
+        repeat (int): The number of runs.
+
+    Returns:
+        float: The shortest run in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def chart_frame(engine):
+    """
+    Build the sheet of a chart in the schema written by FileOperations.save_file, from the models alone.
+
+    Args:
+        engine (SimulationEngine): The chart.
+
+    Returns:
+        DataFrame: The task block, an empty column and the connection block.
+    """
+    tasks = pd.DataFrame({
+        "TASK": [task.task_name for task in engine.tasks],
+        "ACTIVITY": [task.activity_name for task in engine.tasks],
+        "CYCLES": [task.task_max_cycles for task in engine.tasks],
+        "PRIORITY": [task.original_priority for task in engine.tasks],
+        "MUTEX_LIST": [",".join(mutex.name for mutex in task.mutexes) for task in engine.tasks],
+        "POSX": [task.x for task in engine.tasks],
+        "POSY": [task.y for task in engine.tasks],
+    })
+
+    rows = []
+    for connection in engine.connections:
+        start_tasks = connection.tasks_at("start")
+        end_tasks = connection.tasks_at("end")
+        rows.append((start_tasks[0].full_name if start_tasks else "", connection.name,
+                     end_tasks[0].full_name if end_tasks else "", connection.initial_value))
+    connections = pd.DataFrame(rows, columns=["START", "CON_NAME", "END", "INITIAL_VALUE"])
+
+    frame = pd.concat([tasks, pd.DataFrame({"": []}), connections], axis=1)
+    return frame[list(tasks.columns) + [""] + list(connections.columns)]
+
+
+def measure_steps(file_path, mutex_type, steps, max_seconds):
+    """
+    Measure the headless step rate of a chart with one mutex protocol.
+
+    Args:
+        file_path (str): Path of the .xlsx chart.
+        mutex_type (str): The mutex protocol.
+        steps (int): The number of steps to simulate at most.
+        max_seconds (float): Stop after the chunk that exceeds this time.
+
+    Returns:
+        dict: The steps simulated, their time, steps per second, changes per step and
+        whether the chart was quiescent at the end.
+    """
+    engine = read_chart(file_path, mutex_type)
+    done = 0
+    start = time.perf_counter()
+    while done < steps and time.perf_counter() - start < max_seconds:
+        chunk = min(STEP_CHUNK, steps - done)
+        engine.run(chunk)
+        done += chunk
+    seconds = time.perf_counter() - start
+
+    return {
+        "steps": done,
+        "seconds": seconds,
+        "steps_per_second": done / seconds if seconds > 0 else None,
+        "changes_per_step": engine.change_count / done if done else 0,
+        "quiescent": engine.is_quiescent(),
+    }
+
+
+def measure_memory(file_path):
+    """
+    Measure the peak of Python allocations while a chart is loaded and stepped.
+
+    Args:
+        file_path (str): Path of the .xlsx chart.
+
+    Returns:
+        dict: The peaks in bytes while loading and while simulating MEMORY_STEPS steps.
+    """
+    tracemalloc.start()
+    try:
+        engine = read_chart(file_path)
+        load_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        engine.run(MEMORY_STEPS)
+        steps_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {"load": load_peak, "steps": steps_peak}
+
+
+def measure_render(file_path, steps):
+    """
+    Measure building the canvas views of a chart and stepping with them on a Tk window.
+
+    Args:
+        file_path (str): Path of the .xlsx chart.
+        steps (int): The number of steps to simulate.
+
+    Returns:
+        dict: The time to show the chart and the steps per second with views, or the
+        reason the measurement was skipped.
+    """
+    try:
+        import tkinter
+        from General.Configuration import Configuration, SystemFunctions
+        from General.FileOperations import show_engine
+        from General.Viewport import Viewport
+        from Objects.DraggableTask import DraggableTask
+    except ImportError as error:
+        return {"skipped": str(error)}
+
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError as error:
+        return {"skipped": str(error)}
+
+    try:
+        root.geometry("1280x800")
+        canvas = tkinter.Canvas(root, bd=0, highlightthickness=0, background=root["bg"])
+        canvas.pack(fill=tkinter.BOTH, expand=True)
+        Configuration.root = root
+        Configuration.canvas = canvas
+        Viewport.install(canvas)
+        DraggableTask.install(canvas)
+        root.update()
+
+        engine = read_chart(file_path)
+        start = time.perf_counter()
+        show_engine(engine)
+        root.update()
+        show_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(steps):
+            SystemFunctions.step()
+            root.update()
+        step_seconds = time.perf_counter() - start
+
+        return {
+            "show_seconds": show_seconds,
+            "canvas_items": len(canvas.find_all()),
+            "steps": steps,
+            "steps_per_second": steps / step_seconds if step_seconds > 0 else None,
+        }
+    finally:
+        SystemFunctions.clear_general_variables()
+        root.destroy()
+
+
+def benchmark_chart(file_path, steps, max_seconds, repeat, render_steps=0):
+    """
+    Measure one chart.
+
+    Args:
+        file_path (str): Path of the .xlsx chart.
+        steps (int): The number of steps to simulate per mutex protocol at most.
+        max_seconds (float): The time limit of the steps per mutex protocol.
+        repeat (int): The number of runs of the load and save measurements.
+        render_steps (int, optional): Steps simulated with canvas views. Defaults to 0, no rendering.
+
+    Returns:
+        dict: The results of the chart.
+    """
+    engine = read_chart(file_path)
+    result = {
+        "tasks": len(engine.tasks),
+        "connectors": len(engine.connections),
+        "mutexes": len(engine.mutexes),
+        "load_seconds": _best_time(lambda: read_chart(file_path), repeat),
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        xlsx_path = os.path.join(directory, "chart.xlsx")
+        project_path = os.path.join(directory, "chart.fcproj")
+        result["save_xlsx_seconds"] = _best_time(lambda: chart_frame(engine).to_excel(xlsx_path, index=False), repeat)
+        result["save_project_seconds"] = _best_time(lambda: write_project(engine, project_path), repeat)
+        result["load_project_seconds"] = _best_time(lambda: read_project(project_path), repeat)
+
+    result["steps"] = {mutex_type: measure_steps(file_path, mutex_type, steps, max_seconds)
+                       for mutex_type in MUTEX_CLASSES}
+    result["peak_memory_bytes"] = measure_memory(file_path)
+    if render_steps:
+        result["render"] = measure_render(file_path, render_steps)
+    return result
+
+
+def _environment():
+    """
+    Describe the machine and the code the benchmarks ran with.
+
+    Returns:
+        dict: The commit, time, Python version, platform and library versions.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPOSITORY_PATH, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "time": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "openpyxl": openpyxl.__version__,
+    }
+
+
+def run_suite(shapes, sizes, chart_dir, seed=0, steps=1000, max_seconds=10, repeat=3, bundled=True,
+              render_steps=0):
+    """
+    Measure the synthetic charts of all shapes and sizes and the bundled charts.
+
+    Args:
+        shapes (list): The shapes of the synthetic charts, see benchmarks.SyntheticCharts.SHAPES.
+        sizes (list): The sizes of the synthetic charts, in tasks.
+        chart_dir (str): The directory the synthetic charts are written to, or read from if present.
+        seed (int, optional): The seed of the synthetic charts.
+        steps (int, optional): The number of steps per mutex protocol at most.
+        max_seconds (float, optional): The time limit of the steps per mutex protocol.
+        repeat (int, optional): The number of runs of the load and save measurements.
+        bundled (bool, optional): Whether to measure the .xlsx charts of the repository too.
+        render_steps (int, optional): Steps simulated with canvas views, 0 to skip rendering.
+
+    Returns:
+        dict: The environment, the settings and the results of every chart.
+    """
+    os.makedirs(chart_dir, exist_ok=True)
+    cases = []
+    for shape in shapes:
+        for size in sizes:
+            file_path = os.path.join(chart_dir, f"{shape}-{size}-{seed}.xlsx")
+            if not os.path.exists(file_path):
+                write_chart(shape, size, file_path, seed)
+            cases.append(({"chart": shape, "size": size}, file_path))
+    if bundled:
+        for file_path in sorted(glob.glob(os.path.join(REPOSITORY_PATH, "*.xlsx"))):
+            cases.append(({"chart": os.path.basename(file_path), "size": None}, file_path))
+
+    results = []
+    for case, file_path in cases:
+        print(f"{case['chart']} {case['size'] or ''}".strip(), flush=True)
+        try:
+            case.update(benchmark_chart(file_path, steps, max_seconds, repeat, render_steps))
+        except Exception as error:
+            # A broken chart must not stop the other measurements
+            case["error"] = repr(error)
+        results.append(case)
+
+    return {
+        "environment": _environment(),
+        "settings": {"seed": seed, "steps": steps, "max_seconds": max_seconds, "repeat": repeat,
+                     "memory_steps": MEMORY_STEPS, "render_steps": render_steps},
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark loading, saving and simulating charts.")
+    parser.add_argument("--shapes", default=",".join(SHAPES), help="Comma-separated shapes of the synthetic charts")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated sizes of the synthetic charts, in tasks")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic charts")
+    parser.add_argument("--steps", type=int, default=1000, help="Steps per mutex protocol at most")
+    parser.add_argument("--max-seconds", type=float, default=10, help="Time limit of the steps per mutex protocol")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of the load and save measurements")
+    parser.add_argument("--no-bundled", action="store_true", help="Skip the .xlsx charts of the repository")
+    parser.add_argument("--render", type=int, default=0, metavar="STEPS",
+                        help="Also step this many times with canvas views (needs a display)")
+    parser.add_argument("--chart-dir", default=os.path.join(tempfile.gettempdir(), "flowchart-benchmarks"),
+                        help="Directory of the generated charts")
+    parser.add_argument("--output", default="benchmark_results.json", help="Path of the JSON results")
+    arguments = parser.parse_args()
+
+    report = run_suite(arguments.shapes.split(","), [int(size) for size in arguments.sizes.split(",")],
+                       arguments.chart_dir, arguments.seed, arguments.steps, arguments.max_seconds,
+                       arguments.repeat, not arguments.no_bundled, arguments.render)
+    with open(arguments.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+    print(f"{'chart':<16} {'tasks':>7} {'load s':>8} {'save s':>8} {'steps/s (FCFS)':>15}")
+    for case in report["results"]:
+        if "error" in case:
+            print(f"{case['chart']:<16} {case['error']}")
+            continue
+        rate = case["steps"]["First Come First Serve"]["steps_per_second"]
+        print(f"{case['chart']:<16} {case['tasks']:>7} {case['load_seconds']:>8.3f} {case['save_xlsx_seconds']:>8.3f} "
+              f"{rate or 0:>15.0f}")
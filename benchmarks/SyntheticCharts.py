@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Module for generating synthetic charts of any size for the benchmarks.
+
+The charts are written in the Excel schema read by General.ChartLoader: the
+task block (TASK, ACTIVITY, CYCLES, PRIORITY, MUTEX_LIST, POSX, POSY), an
+empty column and the connection block (START, CON_NAME, END, INITIAL_VALUE).
+Every chart keeps running, so the step rate is measured under load. The same
+shape, size and seed always give the same file.
+
+The shapes are:
+
+chain:
+    One long cycle of tasks with a token on every tenth connector, so a few
+    tasks run at a time and most are idle.
+
+ring:
+    Copies of ring.xlsx: three tasks in a cycle with one token, sharing a mutex.
+
+fan:
+    A hub task feeding eight workers, which report to a collector through one
+    connector: the first worker is its start task and the others are OR
+    connections. The collector feeds the hub again.
+
+mutex:
+    Rings of three tasks with one token, where every task needs one mutex
+    from a pool of one mutex per ten tasks, so tasks of different rings
+    contend for the same mutexes.
+
+The main function is:
+
+write_chart(shape, task_count, file_path, seed=0):
+    Writes a chart of about task_count tasks and returns its row counts.
+
+Usage from the command line:
+    python -m benchmarks.SyntheticCharts ring 1000 ring1000.xlsx
+"""
+
+# Import necessary modules
+import argparse
+import random
+import openpyxl
+
+# Columns of the chart sheet, the empty column separates the two blocks
+HEADER = ["TASK", "ACTIVITY", "CYCLES", "PRIORITY", "MUTEX_LIST", "POSX", "POSY", "",
+          "START", "CON_NAME", "END", "INITIAL_VALUE"]
+
+# Available shapes
+SHAPES = ["chain", "ring", "fan", "mutex"]
+
+# Distance of the tasks on the generated grid
+GRID_SPACING = 150
+
+# Token spacing of chains and number of workers per hub of fan charts
+CHAIN_TOKEN_SPACING = 10
+FAN_WORKERS = 8
+
+
+def _chain(task_count, rng):
+    """
+    Build a single cycle with a token on every CHAIN_TOKEN_SPACING-th connector.
+
+    Args:
+        task_count (int): The number of tasks.
+        rng (Random): The random generator.
+
+    Returns:
+        tuple: The task rows, STRUCTURE: [(task, cycles, priority, mutexes), ...],
+        and the connector rows, STRUCTURE: [(start, name, end, initial value), ...].
+    """
+    count = max(task_count, 2)
+    tasks = [(i, rng.randint(1, 3), rng.randint(0, 9), "") for i in range(1, count + 1)]
+    connectors = [(i, f"c{i}", i % count + 1, 1 if i % CHAIN_TOKEN_SPACING == 1 else 0)
+                  for i in range(1, count + 1)]
+    return tasks, connectors
+
+
+def _rings(task_count, rng, mutex_pool=None):
+    """
+    Build rings of three tasks with one token each.
+
+    Args:
+        task_count (int): The number of tasks, rounded up to a multiple of three.
+        rng (Random): The random generator.
+        mutex_pool (int, optional): Draw the mutex of every task from this many shared mutexes.
+            Defaults to one mutex per ring, as in ring.xlsx.
+
+    Returns:
+        tuple: The task rows and the connector rows, as returned by _chain().
+    """
+    tasks = []
+    connectors = []
+    for ring in range(max((task_count + 2) // 3, 1)):
+        first = ring * 3 + 1
+        for i in range(first, first + 3):
+            if mutex_pool is None:
+                mutexes = f"m{ring}"
+            else:
+                mutexes = f"m{rng.randrange(mutex_pool)}"
+            tasks.append((i, rng.randint(1, 3), rng.randint(0, 9), mutexes))
+            connectors.append((i, f"c{i}", first + (i - first + 1) % 3, 1 if i == first else 0))
+    return tasks, connectors
+
+
+def _fans(task_count, rng):
+    """
+    Build hubs with FAN_WORKERS workers each, joined again through OR connections.
+
+    Args:
+        task_count (int): The number of tasks, rounded up to whole hubs.
+        rng (Random): The random generator.
+
+    Returns:
+        tuple: The task rows and the connector rows, as returned by _chain().
+            OR connections are rows without an END.
+    """
+    group_size = FAN_WORKERS + 2
+    tasks = []
+    connectors = []
+    for group in range(max((task_count + group_size - 1) // group_size, 1)):
+        hub = group * group_size + 1
+        workers = range(hub + 1, hub + 1 + FAN_WORKERS)
+        collector = hub + group_size - 1
+        for i in range(hub, collector + 1):
+            tasks.append((i, rng.randint(1, 3), rng.randint(0, 9), ""))
+
+        for worker in workers:
+            connectors.append((hub, f"f{worker}", worker, 0))
+        connectors.append((workers[0], f"j{hub}", collector, 0))
+        for worker in workers[1:]:
+            connectors.append((worker, f"j{hub}", None, None))
+        connectors.append((collector, f"h{hub}", hub, 1))
+    return tasks, connectors
+
+
+def build_chart(shape, task_count, seed=0):
+    """
+    Build the rows of a synthetic chart.
+
+    Args:
+        shape (str): One of SHAPES.
+        task_count (int): The approximate number of tasks.
+        seed (int, optional): Seed of the cycle counts, priorities and mutex choices.
+
+    Returns:
+        tuple: The task rows and the connector rows, as returned by _chain().
+    """
+    rng = random.Random(seed)
+    if shape == "chain":
+        return _chain(task_count, rng)
+    elif shape == "ring":
+        return _rings(task_count, rng)
+    elif shape == "fan":
+        return _fans(task_count, rng)
+    elif shape == "mutex":
+        return _rings(task_count, rng, mutex_pool=max(task_count // 10, 2))
+    raise ValueError(f"Unknown chart shape {shape}, expected one of {', '.join(SHAPES)}")
+
+
+def write_chart(shape, task_count, file_path, seed=0):
+    """
+    Write a synthetic chart to an Excel file.
+
+    Tasks are placed on a square grid, so loading does not run the automatic layout.
+
+    Args:
+        shape (str): One of SHAPES.
+        task_count (int): The approximate number of tasks.
+        file_path (str): Path of the .xlsx file.
+        seed (int, optional): Seed of the cycle counts, priorities and mutex choices.
+
+    Returns:
+        tuple: The number of task rows and of connector rows.
+    """
+    tasks, connectors = build_chart(shape, task_count, seed)
+    columns = max(int(len(tasks) ** 0.5), 1)
+
+    # A write-only workbook streams the rows, which keeps large charts fast to write
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(HEADER)
+    for row in range(max(len(tasks), len(connectors))):
+        if row < len(tasks):
+            task, cycles, priority, mutexes = tasks[row]
+            task_cells = [task, None, cycles, priority, mutexes or None,
+                          50 + (row % columns) * GRID_SPACING, 50 + (row // columns) * GRID_SPACING]
+        else:
+            task_cells = [None] * 7
+        connector_cells = list(connectors[row]) if row < len(connectors) else [None] * 4
+        sheet.append(task_cells + [None] + connector_cells)
+    workbook.save(file_path)
+
+    return len(tasks), len(connectors)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic chart for the benchmarks.")
+    parser.add_argument("shape", choices=SHAPES, help="Shape of the chart")
+    parser.add_argument("task_count", type=int, help="Approximate number of tasks")
+    parser.add_argument("file_path", help="Path of the .xlsx file to write")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of cycle counts, priorities and mutexes")
+    arguments = parser.parse_args()
+
+    task_rows, connector_rows = write_chart(arguments.shape, arguments.task_count, arguments.file_path,
+                                            arguments.seed)
+    print(f"{task_rows} tasks, {connector_rows} connector rows")
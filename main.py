@@ -1,101 +1,139 @@
-# -*- coding: utf-8 -*-
-"""
-A graphical user interface (GUI) application for creating, editing, and simulating flowcharts.
-
-The application allows users to:
-- Create and edit tasks with customizable names, activities, and cycle counts
-- Connect tasks using connectors and OR connections
-- Simulate the execution of the flowchart with adjustable speed
-- Save and load flowcharts from XLSX files
-- Clear the canvas and delete selected tasks
-
-The main class `App` sets up the GUI window, menus, sidebars, and canvas using the Tkinter and customtkinter libraries.
-The `DraggableTask` class represents a task in the flowchart, which can be dragged and edited on the canvas.
-The `TaskConnector` class represents a connection between tasks in the flowchart.
-The `Configuration` class holds general variables and objects used throughout the application.
-
-Additional features include:
-- Editing task properties in the sidebar
-- Adding mutexes and OR connections between tasks
-- Controlling the simulation speed with a slider
-- Showing/hiding the simulation sidebar
-
-This module provides a comprehensive GUI for creating, editing, and simulating flowcharts with various features
-for task management, connections, mutexes, and simulation control.
-"""
-
-# Import necessary modules
-from tkinter import *
-import customtkinter
-from General.FileOperations import load_files, save_file
-from Objects.DraggableTask import DraggableTask
-from CTkMenuBar import *
-from General.Configuration import Configuration, SystemFunctions
-
-
-class App(customtkinter.CTk):
-    """Main application class."""
-    sidebar = None
-    show_sim_sidebar = False
-
-    def __init__(self):
-        super().__init__()
-
-        Configuration.root = self
-
-        customtkinter.set_appearance_mode("system")
-        customtkinter.set_default_color_theme("blue")
-        self.geometry("800x800")
-
-        # Configure window
-        self.title("Flowchart Editor")
-
-        # Load custom fonts
-        from tkextrafont import Font
-        Configuration.font_black = Font(file="fonts/Montserrat-Black.ttf", family="Montserrat")
-        Configuration.font_light_normal = Font(file="fonts/Montserrat-Light.ttf", family="Montserrat")
-
-        # Create a canvas object
-        canvas = Canvas(self, bd=0, highlightthickness=0, background=self['bg'])
-        canvas.pack(fill=BOTH, expand=True)
-        Configuration.canvas = canvas
-
-        # Create menu bar
-        menubar = CTkTitleMenu(master=self)
-        button_file_menu = menubar.add_cascade("File")
-        button_edit_menu = menubar.add_cascade("Edit")
-        button_run_menu = menubar.add_cascade("Run")
-        button_mutex_menu = menubar.add_cascade("Mutex")
-
-        # Create file menu
-        filemenu = CustomDropdownMenu(widget=button_file_menu, border_color="")
-        filemenu.add_option(option="Save as xslx", command=lambda: save_file())
-        filemenu.add_option(option="Load from xslx", command=lambda: load_files(show_file_dialog=True) or SystemFunctions.stop_simulation())
-        filemenu.add_option(option="Reload file", command=lambda: load_files(show_file_dialog=False) or SystemFunctions.stop_simulation())
-        filemenu.add_separator()
-        filemenu.add_option(option="Clear chart", command=lambda: SystemFunctions.clear_canvas() or SystemFunctions.stop_simulation())
-        filemenu.add_option(option="Exit to desktop", command=self.quit)
-
-        # Create edit menu
-        editmenu = CustomDropdownMenu(widget=button_edit_menu, border_color="")
-        editmenu.add_option(option="Edit mode", command=lambda: DraggableTask.switch_selection())
-        editmenu.add_option(option="Add new task", command=lambda: SystemFunctions.add_task())
-        editmenu.add_option(option="Delete selected task", command=lambda: SystemFunctions.delete_selection())
-
-        # Create run menu
-        runmenu = CustomDropdownMenu(widget=button_run_menu, border_color="")
-        runmenu.add_option(option="Next step", command=SystemFunctions.step)
-        runmenu.add_option(option="Hide/Show Simulation Sidebar", command=SystemFunctions.toggle_simulation_sidebar)
-
-        # Create mutex selection menu
-        mutexmenu = CustomDropdownMenu(widget=button_mutex_menu, border_color="")
-        for available_mutex_type_name in Configuration.available_mutex_types:
-            mutexmenu.add_option(option="Load using " + available_mutex_type_name, command=lambda: SystemFunctions.set_mutex_type(available_mutex_type_name))
-
-        # Create sidebars
-        SystemFunctions.create_sidebar()
-
-
-if __name__ == "__main__":
-    app = App()
-    app.mainloop()
+# -*- coding: utf-8 -*-
+"""
+A graphical user interface (GUI) application for creating, editing, and simulating flowcharts.
+
+The application allows users to:
+- Create and edit tasks with customizable names, activities, and cycle counts
+- Connect tasks using connectors and OR connections
+- Simulate the execution of the flowchart with adjustable speed
+- Save and load flowcharts from XLSX files
+- Clear the canvas and delete selected tasks
+
+The main class `App` sets up the GUI window, menus, sidebars, and canvas using the Tkinter and customtkinter libraries.
+The `DraggableTask` class represents a task in the flowchart, which can be dragged and edited on the canvas.
+The `TaskConnector` class represents a connection between tasks in the flowchart.
+The `Configuration` class holds general variables and objects used throughout the application.
+
+Additional features include:
+- Editing task properties in the sidebar
+- Adding mutexes and OR connections between tasks
+- Controlling the simulation speed with a slider
+- Panning and zooming large charts
+- Showing/hiding the simulation sidebar
+
+This module provides a comprehensive GUI for creating, editing, and simulating flowcharts with various features
+for task management, connections, mutexes, and simulation control.
+"""
+
+# Import necessary modules
+from tkinter import *
+import customtkinter
+from General.FileOperations import load_files, load_trace, save_file, save_project, save_event_trace, load_event_trace, PROJECT_FILE_TYPES
+from Objects.DraggableTask import DraggableTask
+from CTkMenuBar import *
+from General.Configuration import Configuration, SystemFunctions
+from General.Viewport import Viewport
+from General.Log import configure
+
+
+class App(customtkinter.CTk):
+    """Main application class."""
+    sidebar = None
+    show_sim_sidebar = False
+
+    def __init__(self):
+        super().__init__()
+
+        Configuration.root = self
+
+        customtkinter.set_appearance_mode("system")
+        customtkinter.set_default_color_theme("blue")
+        self.geometry("800x800")
+
+        # Configure window
+        self.title("Flowchart Editor")
+
+        # Load custom fonts
+        from tkextrafont import Font
+        Configuration.font_black = Font(file="fonts/Montserrat-Black.ttf", family="Montserrat")
+        Configuration.font_light_normal = Font(file="fonts/Montserrat-Light.ttf", family="Montserrat")
+
+        # Create a canvas object
+        canvas = Canvas(self, bd=0, highlightthickness=0, background=self['bg'])
+        canvas.pack(fill=BOTH, expand=True)
+        Configuration.canvas = canvas
+        Viewport.install(canvas)
+        DraggableTask.install(canvas)
+
+        # Create menu bar
+        menubar = CTkTitleMenu(master=self)
+        button_file_menu = menubar.add_cascade("File")
+        button_edit_menu = menubar.add_cascade("Edit")
+        button_run_menu = menubar.add_cascade("Run")
+        button_view_menu = menubar.add_cascade("View")
+        button_mutex_menu = menubar.add_cascade("Mutex")
+
+        # Create file menu
+        filemenu = CustomDropdownMenu(widget=button_file_menu, border_color="")
+        filemenu.add_option(option="Save as xslx", command=lambda: save_file())
+        filemenu.add_option(option="Load from xslx", command=lambda: load_files(show_file_dialog=True) or SystemFunctions.stop_simulation())
+        filemenu.add_option(option="Save project", command=lambda: save_project())
+        filemenu.add_option(option="Load project", command=lambda: load_files(show_file_dialog=True, file_types=PROJECT_FILE_TYPES) or SystemFunctions.stop_simulation())
+        filemenu.add_option(option="Reload file", command=lambda: load_files(show_file_dialog=False) or SystemFunctions.stop_simulation())
+        filemenu.add_option(option="Load trace", command=lambda: load_trace() or SystemFunctions.stop_simulation())
+        filemenu.add_option(option="Save event trace", command=lambda: save_event_trace())
+        filemenu.add_option(option="Load event trace", command=lambda: load_event_trace())
+        filemenu.add_separator()
+        filemenu.add_option(option="Clear chart", command=lambda: SystemFunctions.clear_canvas() or SystemFunctions.stop_simulation())
+        filemenu.add_option(option="Exit to desktop", command=self.quit)
+
+        # Create edit menu
+        editmenu = CustomDropdownMenu(widget=button_edit_menu, border_color="")
+        editmenu.add_option(option="Edit mode", command=lambda: DraggableTask.switch_selection())
+        editmenu.add_option(option="Add new task", command=lambda: SystemFunctions.add_task())
+        editmenu.add_option(option="Delete selected task", command=lambda: SystemFunctions.delete_selection())
+        editmenu.add_option(option="Arrange in layers", command=lambda: SystemFunctions.arrange_tasks("layered"))
+        editmenu.add_option(option="Arrange by forces", command=lambda: SystemFunctions.arrange_tasks("force"))
+
+        # Create run menu
+        runmenu = CustomDropdownMenu(widget=button_run_menu, border_color="")
+        runmenu.add_option(option="Next step", command=SystemFunctions.step)
+        runmenu.add_option(option="Previous step", command=SystemFunctions.step_back)
+        runmenu.add_option(option="Run " + str(Configuration.batch_run_steps) + " steps", command=lambda: SystemFunctions.run())
+        runmenu.add_option(option="Run until quiescent", command=SystemFunctions.run_until_quiescent)
+        runmenu.add_option(option="Rewind " + str(Configuration.rewind_steps) + " steps", command=lambda: SystemFunctions.rewind())
+        runmenu.add_option(option="Take snapshot", command=SystemFunctions.take_snapshot)
+        runmenu.add_option(option="Restore snapshot", command=SystemFunctions.restore_snapshot)
+        runmenu.add_option(option="Analyze chart", command=SystemFunctions.analyze_chart)
+        runmenu.add_option(option="Explore schedules", command=SystemFunctions.explore_schedules)
+        runmenu.add_option(option="Replay counterexample", command=lambda: SystemFunctions.replay_counterexample() or SystemFunctions.stop_simulation())
+        runmenu.add_option(option="Record event trace", command=SystemFunctions.record_event_trace)
+        runmenu.add_option(option="Profile steps", command=SystemFunctions.toggle_profiler)
+        runmenu.add_option(option="Hide/Show Simulation Sidebar", command=SystemFunctions.toggle_simulation_sidebar)
+
+        # Create view menu
+        viewmenu = CustomDropdownMenu(widget=button_view_menu, border_color="")
+        viewmenu.add_option(option="Zoom in", command=lambda: Viewport.zoom_by(Configuration.zoom_step))
+        viewmenu.add_option(option="Zoom out", command=lambda: Viewport.zoom_by(1 / Configuration.zoom_step))
+        viewmenu.add_option(option="Actual size", command=lambda: Viewport.zoom_to(1))
+        viewmenu.add_option(option="Whole chart", command=lambda: Viewport.show_chart())
+        viewmenu.add_option(option="Collapse activities", command=lambda: SystemFunctions.collapse_activities())
+        viewmenu.add_option(option="Expand activities", command=lambda: SystemFunctions.expand_activities())
+        viewmenu.add_option(option="Timeline", command=lambda: SystemFunctions.show_timeline())
+
+        # Create mutex selection menu
+        mutexmenu = CustomDropdownMenu(widget=button_mutex_menu, border_color="")
+        for available_mutex_type_name in Configuration.available_mutex_types:
+            mutexmenu.add_option(option="Load using " + available_mutex_type_name, command=lambda: SystemFunctions.set_mutex_type(available_mutex_type_name))
+
+        # Create sidebars
+        SystemFunctions.create_sidebar()
+
+
+if __name__ == "__main__":
+    configure(Configuration.log_level, Configuration.log_levels)
+    app = App()
+    app.mainloop()
+
+    # Keep the step profile of the session
+    SystemFunctions.stop_profiler()
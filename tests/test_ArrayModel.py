@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for General.ArrayModel against the object model of SimulationEngine.
+
+Usage from the command line (from the repository root):
+    python -m unittest discover tests
+"""
+
+# Import necessary modules
+import os
+import unittest
+from General.ArrayModel import ArrayModel
+from General.ChartLoader import read_chart
+from General.Log import quiet
+from General.SimulationEngine import SimulationEngine
+
+# The bundled charts are in the repository root
+CHART_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Protocols supported by the array model
+ARRAY_MUTEX_TYPES = ["First Come First Serve", "Priority Inversion", "Priority Ceiling"]
+
+# Number of steps compared
+STEPS = 60
+
+
+def _load(file_name, mutex_type):
+    """
+    Load a bundled chart.
+
+    Args:
+        file_name (str): The file name, e.g. "ring.xlsx".
+        mutex_type (str): The mutex protocol.
+
+    Returns:
+        SimulationEngine: The engine holding the chart.
+    """
+    with quiet():
+        return read_chart(os.path.join(CHART_DIR, file_name), mutex_type)
+
+
+class ArrayModelTest(unittest.TestCase):
+    """
+    Stepping the array model must give the same cycles, semaphores and mutex holders as the engine.
+    """
+
+    def assert_same_state(self, engine, model, message):
+        """
+        Compare the state of an engine and an array model.
+
+        Args:
+            engine (SimulationEngine): The object model.
+            model (ArrayModel): The array model built from it.
+            message (str): Describes the compared step.
+        """
+        self.assertEqual(model.step_number, engine.step_number, message)
+        self.assertEqual(model.task_current_cycle.tolist(), [task.task_current_cycle for task in engine.tasks],
+                         message)
+        self.assertEqual(model.semaphore_value.tolist(),
+                         [connection.semaphore_value for connection in engine.connections], message)
+        self.assertEqual([mutex.holder.index if mutex.holder is not None else None for mutex in model.mutexes],
+                         [mutex.holder.index if mutex.holder is not None else None for mutex in engine.mutexes],
+                         message)
+
+    def compare_steps(self, engine):
+        """
+        Step an engine and an array model built from it side by side.
+
+        Args:
+            engine (SimulationEngine): The engine, which is stepped as well.
+        """
+        model = ArrayModel.from_engine(engine)
+        self.assert_same_state(engine, model, "initial state")
+        for _ in range(STEPS):
+            engine.step()
+            model.step()
+            self.assert_same_state(engine, model, f"step {engine.step_number}")
+
+    def test_bundled_charts(self):
+        for file_name in ["ring.xlsx", "data2.xlsx", "datatest.xlsx"]:
+            for mutex_type in ARRAY_MUTEX_TYPES:
+                with self.subTest(file_name=file_name, mutex_type=mutex_type):
+                    self.compare_steps(_load(file_name, mutex_type))
+
+    def test_from_running_chart(self):
+        engine = _load("ring.xlsx", "Priority Inversion")
+        engine.run(4)
+        self.compare_steps(engine)
+
+    def test_one_cycle_ring(self):
+        # Every task starts and ends in the same step, so blocking ripples along the ring
+        engine = SimulationEngine()
+        tasks = [engine.create_task(str(index), "a", 1, 0) for index in range(50)]
+        connections = [engine.create_connection(f"c{index}", index % 2) for index in range(50)]
+        for index, task in enumerate(tasks):
+            task.add_connector(connections[index], "end")
+            task.add_connector(connections[(index + 1) % 50], "start")
+        self.compare_steps(engine)
+
+    def test_write_back(self):
+        engine = _load("ring.xlsx", "Priority Ceiling")
+        model = ArrayModel.from_engine(engine)
+        model.run(7)
+        model.write_back(engine)
+        reference = _load("ring.xlsx", "Priority Ceiling")
+        reference.run(7)
+
+        engine.run(20)
+        reference.run(20)
+        self.assertEqual([task.task_current_cycle for task in engine.tasks],
+                         [task.task_current_cycle for task in reference.tasks])
+        self.assertEqual([connection.semaphore_value for connection in engine.connections],
+                         [connection.semaphore_value for connection in reference.connections])
+
+    def test_ticket_lock_is_rejected(self):
+        with self.assertRaises(ValueError):
+            ArrayModel.from_engine(_load("ring.xlsx", "Ticket Lock"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for General.ChartAnalyzer on the bundled charts.
+
+Usage from the command line (from the repository root):
+    python -m unittest discover tests
+"""
+
+# Import necessary modules
+import os
+import unittest
+from General.ChartAnalyzer import analyze_chart
+from General.ChartLoader import read_chart
+from General.Log import quiet
+
+# The bundled charts are in the repository root
+CHART_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load(file_name, mutex_type):
+    """
+    Load a bundled chart.
+
+    Args:
+        file_name (str): The file name, e.g. "ring.xlsx".
+        mutex_type (str): The mutex protocol.
+
+    Returns:
+        SimulationEngine: The engine holding the chart.
+    """
+    with quiet():
+        return read_chart(os.path.join(CHART_DIR, file_name), mutex_type)
+
+
+class AnalyzeSteppedChartTest(unittest.TestCase):
+    """
+    The verdict must not depend on whether the engine was stepped before the analysis.
+    """
+
+    def test_periodic_chart_after_steps(self):
+        engine = _load("ring.xlsx", "Ticket Lock")
+        engine.run(3)
+
+        report = analyze_chart(engine)
+
+        self.assertEqual(report.verdict, "periodic")
+        self.assertEqual(report.period, 6)
+        self.assertEqual(report.never_started, [])
+        self.assertEqual(engine.step_number, 3)
+
+    def test_deadlocking_chart_after_steps(self):
+        fresh = analyze_chart(_load("data2.xlsx", "First Come First Serve"))
+        engine = _load("data2.xlsx", "First Come First Serve")
+        engine.run(3)
+
+        report = analyze_chart(engine)
+
+        self.assertEqual(report.verdict, "deadlock")
+        self.assertEqual(report.steps, fresh.steps - 3)
+        self.assertEqual(report.blocked_tasks, fresh.blocked_tasks)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for reading charts with General.ChartLoader.
+
+Usage from the command line (from the repository root):
+    python -m unittest discover tests
+"""
+
+# Import necessary modules
+import os
+import tempfile
+import unittest
+import openpyxl
+from General.ChartLoader import CONNECTION_COLUMNS, TASK_COLUMNS, read_chart
+from General.Log import LOADER_LOG, quiet
+
+
+def _write_chart(file_path, tasks, connections):
+    """
+    Write a chart sheet with the task block and the connection block side by side.
+
+    Args:
+        file_path (str): Path of the .xlsx file.
+        tasks (list): The task rows, STRUCTURE: [[task, activity, cycles, priority], ...]
+        connections (list): The connection rows, STRUCTURE: [[start, name, end, initial value], ...]
+    """
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(TASK_COLUMNS + CONNECTION_COLUMNS)
+    for index in range(max(len(tasks), len(connections))):
+        task = tasks[index] if index < len(tasks) else [None] * 4
+        connection = connections[index] if index < len(connections) else [None] * 4
+        sheet.append(task + [None] * (len(TASK_COLUMNS) - 4) + connection)
+    workbook.save(file_path)
+
+
+class OrRowTest(unittest.TestCase):
+    """
+    An OR row must be bound wherever its connector row is in the sheet.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "chart.xlsx")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self, connections):
+        """
+        Write a chart of three tasks with the given connection rows and read it back.
+
+        Args:
+            connections (list): The connection rows.
+
+        Returns:
+            SimulationEngine: The engine holding the chart.
+        """
+        _write_chart(self.file_path, [[1, "a", 1, 0], [2, "b", 1, 0], [3, "c", 1, 0]], connections)
+        with quiet():
+            return read_chart(self.file_path)
+
+    def positions(self, engine, connector_name):
+        """
+        Get the links of a connector by task name.
+
+        Args:
+            engine (SimulationEngine): The engine.
+            connector_name (str): The connector name.
+
+        Returns:
+            dict: STRUCTURE: {task full name: position}
+        """
+        connection = next(connection for connection in engine.connections if connection.name == connector_name)
+        return {task.full_name: position for task, position in connection.tasks.items()}
+
+    def test_or_row_before_its_connector(self):
+        engine = self.read([["3c", "r1", None, None], ["1a", "r1", "2b", 1]])
+        self.assertEqual(self.positions(engine, "r1"), {"1a": "start", "2b": "end", "3c": "or"})
+
+    def test_or_row_after_its_connector(self):
+        engine = self.read([["1a", "r1", "2b", 1], ["3c", "r1", None, None]])
+        self.assertEqual(self.positions(engine, "r1"), {"1a": "start", "2b": "end", "3c": "or"})
+
+    def test_unknown_connector_is_logged(self):
+        with self.assertLogs(LOADER_LOG, "WARNING") as logs:
+            engine = self.read([["1a", "r1", "2b", 1], ["3c", "r9", None, None]])
+        self.assertEqual(self.positions(engine, "r1"), {"1a": "start", "2b": "end"})
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("OR row 3", logs.output[0])
+        self.assertIn("r9", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the project file format of General.ProjectFile.
+
+Usage from the command line (from the repository root):
+    python -m unittest discover tests
+"""
+
+# Import necessary modules
+import os
+import tempfile
+import unittest
+from General.ChartLoader import read_chart
+from General.Log import quiet
+from General.ProjectFile import PROJECT_EXTENSION, copy_engine, read_project, write_project
+from General.SimulationEngine import MUTEX_CLASSES
+
+# The bundled charts are in the repository root
+CHART_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Charts with mutexes: ring2.xlsx runs forever, data2.xlsx deadlocks after 21 steps
+CHARTS = ["ring2.xlsx", "data2.xlsx", "datatest.xlsx"]
+
+
+def _load(file_name, mutex_type):
+    """
+    Load a bundled chart.
+
+    Args:
+        file_name (str): The file name, e.g. "ring.xlsx".
+        mutex_type (str): The mutex protocol.
+
+    Returns:
+        SimulationEngine: The engine holding the chart.
+    """
+    with quiet():
+        return read_chart(os.path.join(CHART_DIR, file_name), mutex_type)
+
+
+def _state(engine):
+    """
+    Describe the chart and runtime state of an engine by indices, so different engines can be compared.
+
+    Args:
+        engine (SimulationEngine): The engine.
+
+    Returns:
+        tuple: The state, compared by value.
+    """
+    snapshot = engine.snapshot()
+    indices = {task: index for index, task in enumerate(engine.tasks)}
+    tasks = [(task.full_name, task.task_max_cycles, task.original_priority, task.x, task.y,
+              [engine.mutexes.index(mutex) for mutex in task.mutexes]) for task in engine.tasks]
+    connections = [(connection.name, connection.initial_value,
+                    sorted((indices[task], position) for task, position in connection.tasks.items()))
+                   for connection in engine.connections]
+    mutexes = [(mutex.name, mutex.algorithm_type, lock, indices.get(holder), [indices[task] for task in attendees],
+                attributes)
+               for mutex, lock, holder, attendees, attributes in snapshot["mutexes"]]
+    return (tasks, connections, snapshot["step_number"], snapshot["last_step_changes"], engine.is_quiescent(),
+            snapshot["task_current_cycle"], snapshot["priority"], snapshot["granted_mutexes"],
+            snapshot["task_attributes"], snapshot["semaphore_value"], snapshot["last_change"], mutexes)
+
+
+class ProjectFileTest(unittest.TestCase):
+    """
+    A project written mid-run must load with the same state and take the same next steps.
+    """
+
+    def assert_same_run(self, engine, copy, steps=30):
+        """
+        Compare two engines, then step both and compare them after every step.
+
+        Args:
+            engine (SimulationEngine): The original engine.
+            copy (SimulationEngine): The engine read back.
+            steps (int, optional): The number of steps compared. Defaults to 30.
+        """
+        self.assertEqual(_state(copy), _state(engine), "loaded state")
+        for _ in range(steps):
+            engine.step()
+            copy.step()
+            self.assertEqual(_state(copy), _state(engine), f"step {engine.step_number}")
+
+    def test_round_trip_mid_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for file_name in CHARTS:
+                for mutex_type in MUTEX_CLASSES:
+                    for steps in [0, 3, 25]:
+                        with self.subTest(file_name=file_name, mutex_type=mutex_type, steps=steps):
+                            engine = _load(file_name, mutex_type)
+                            engine.run(steps)
+
+                            file_path = os.path.join(directory, "chart" + PROJECT_EXTENSION)
+                            write_project(engine, file_path)
+                            self.assert_same_run(engine, read_project(file_path))
+
+    def test_quiescence_is_kept(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "chart" + PROJECT_EXTENSION)
+
+            engine = _load("ring2.xlsx", "Ticket Lock")
+            engine.run(3)
+            write_project(engine, file_path)
+            self.assertFalse(read_project(file_path).is_quiescent())
+
+            engine = _load("data2.xlsx", "First Come First Serve")
+            engine.run_until_quiescent(1000)
+            write_project(engine, file_path)
+            self.assertTrue(read_project(file_path).is_quiescent())
+
+    def test_copy_engine(self):
+        engine = _load("ring2.xlsx", "Priority Inversion")
+        engine.run(5)
+        self.assert_same_run(engine, copy_engine(engine))
+
+
+if __name__ == "__main__":
+    unittest.main()
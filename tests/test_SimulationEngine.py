@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the history of General.SimulationEngine: the delta log behind
+step_back() and the snapshots behind checkpoints and rewind().
+
+Usage from the command line (from the repository root):
+    python -m unittest discover tests
+"""
+
+# Import necessary modules
+import os
+import random
+import unittest
+from General.ChartLoader import read_chart
+from General.Log import quiet
+from General.SimulationEngine import MUTEX_CLASSES, MUTEX_STATE_ATTRIBUTES, SimulationEngine
+
+# The bundled charts are in the repository root
+CHART_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Charts with a shared mutex: ring2.xlsx runs forever, data2.xlsx deadlocks after 21 steps
+CHARTS = ["ring2.xlsx", "data2.xlsx"]
+
+# Number of steps taken and undone
+STEPS = 40
+
+
+def _load(file_name, mutex_type):
+    """
+    Load a bundled chart.
+
+    Args:
+        file_name (str): The file name, e.g. "ring.xlsx".
+        mutex_type (str): The mutex protocol.
+
+    Returns:
+        SimulationEngine: The engine holding the chart.
+    """
+    with quiet():
+        return read_chart(os.path.join(CHART_DIR, file_name), mutex_type)
+
+
+def _contended(mutex_type, ring_count=20, mutex_count=6):
+    """
+    Build rings of three tasks with one token each, whose tasks draw their mutex from a small pool.
+
+    Queues grow long and hold tasks of different priorities, unlike in the bundled charts.
+
+    Args:
+        mutex_type (str): The mutex protocol.
+        ring_count (int, optional): The number of rings. Defaults to 20.
+        mutex_count (int, optional): The number of shared mutexes. Defaults to 6.
+
+    Returns:
+        SimulationEngine: The engine holding the chart.
+    """
+    rng = random.Random(0)
+    engine = SimulationEngine()
+    mutexes = [engine.create_mutex(mutex_type, f"m{index}") for index in range(mutex_count)]
+    for ring in range(ring_count):
+        tasks = [engine.create_task(str(ring * 3 + index), "a", rng.randint(1, 3), rng.randint(0, 9))
+                 for index in range(3)]
+        connections = [engine.create_connection(f"c{ring}_{index}", 1 if index == 0 else 0) for index in range(3)]
+        for index, task in enumerate(tasks):
+            task.add_connector(connections[index], "end")
+            task.add_connector(connections[(index + 1) % 3], "start")
+            mutex = rng.choice(mutexes)
+            task.add_mutex(mutex)
+            mutex.add_task(task)
+    return engine
+
+
+def _state(engine):
+    """
+    Describe the runtime state of an engine by task indices, so states of different engines can be compared.
+
+    Args:
+        engine (SimulationEngine): The engine.
+
+    Returns:
+        tuple: The state, compared by value.
+    """
+    snapshot = engine.snapshot()
+    indices = {task: index for index, task in enumerate(engine.tasks)}
+    mutexes = [(lock, indices.get(holder), [indices[task] for task in attendees], attributes)
+               for _, lock, holder, attendees, attributes in snapshot["mutexes"]]
+    return (snapshot["step_number"], snapshot["last_step_changes"], snapshot["task_current_cycle"],
+            snapshot["priority"], snapshot["granted_mutexes"], snapshot["task_attributes"],
+            snapshot["semaphore_value"], snapshot["last_change"], mutexes)
+
+
+class StepBackTest(unittest.TestCase):
+    """
+    step_back() must return to the state before every step, for every mutex protocol.
+    """
+
+    def assert_steps_undone(self, engine):
+        """
+        Step an engine, undo all steps and compare every restored state with the one recorded before the step.
+
+        Args:
+            engine (SimulationEngine): The engine at step 0.
+        """
+        engine.set_delta_log(1000000)
+
+        snapshots = []
+        for _ in range(STEPS):
+            snapshots.append(engine.snapshot())
+            engine.step()
+
+        for snapshot in reversed(snapshots):
+            self.assertTrue(engine.step_back())
+            self.assertEqual(engine.snapshot(), snapshot, f"step {engine.step_number}")
+        self.assertFalse(engine.step_back())
+
+    def test_step_back_restores_every_step(self):
+        for file_name in CHARTS:
+            for mutex_type in MUTEX_CLASSES:
+                with self.subTest(file_name=file_name, mutex_type=mutex_type):
+                    self.assert_steps_undone(_load(file_name, mutex_type))
+
+    def test_step_back_with_contended_mutexes(self):
+        for mutex_type in MUTEX_CLASSES:
+            with self.subTest(mutex_type=mutex_type):
+                self.assert_steps_undone(_contended(mutex_type))
+
+    def test_steps_after_step_back_repeat(self):
+        for mutex_type in MUTEX_CLASSES:
+            with self.subTest(mutex_type=mutex_type):
+                engine = _load("ring2.xlsx", mutex_type)
+                engine.set_delta_log(1000000)
+                engine.run(10)
+
+                snapshots = []
+                for _ in range(10):
+                    engine.step()
+                    snapshots.append(engine.snapshot())
+                for _ in range(10):
+                    engine.step_back()
+                for snapshot in snapshots:
+                    engine.step()
+                    self.assertEqual(engine.snapshot(), snapshot, f"step {engine.step_number}")
+
+    def test_oldest_steps_are_dropped_beyond_the_cap(self):
+        for mutex_type in MUTEX_CLASSES:
+            with self.subTest(mutex_type=mutex_type):
+                engine = _load("ring2.xlsx", mutex_type)
+                engine.set_delta_log(30)
+
+                snapshots = []
+                for _ in range(STEPS):
+                    snapshots.append(engine.snapshot())
+                    engine.step()
+
+                undone = 0
+                while engine.step_back():
+                    undone += 1
+                    self.assertEqual(engine.snapshot(), snapshots[engine.step_number])
+
+                # Only the newest steps fit, the oldest one is no longer undoable
+                self.assertGreater(undone, 0)
+                self.assertLess(undone, STEPS)
+                self.assertEqual(engine.step_number, STEPS - undone)
+                self.assertLessEqual(engine.delta_log_size, 30)
+
+
+class CheckpointTest(unittest.TestCase):
+    """
+    rewind() must reach the same state as stepping a fresh engine to the target step.
+    """
+
+    def test_rewind_between_checkpoints(self):
+        for file_name in CHARTS:
+            for mutex_type in MUTEX_CLASSES:
+                with self.subTest(file_name=file_name, mutex_type=mutex_type):
+                    engine = _load(file_name, mutex_type)
+                    engine.set_checkpoints(5, 10)
+                    engine.run(STEPS)
+
+                    for target in [33, 17, 11, 2]:
+                        self.assertTrue(engine.rewind(target))
+                        reference = _load(file_name, mutex_type)
+                        reference.run(target)
+                        self.assertEqual(_state(engine), _state(reference), f"step {target}")
+
+    def test_rewind_with_contended_mutexes(self):
+        for mutex_type in MUTEX_CLASSES:
+            with self.subTest(mutex_type=mutex_type):
+                engine = _contended(mutex_type)
+                engine.set_checkpoints(7, 10)
+                engine.run(STEPS)
+                self.assertTrue(engine.rewind(24))
+
+                reference = _contended(mutex_type)
+                reference.run(24)
+                self.assertEqual(_state(engine), _state(reference))
+
+                # The protocol counters are part of the compared state
+                for mutex, (_, _, _, attributes) in zip(engine.mutexes, _state(engine)[-1]):
+                    self.assertEqual(set(attributes),
+                                     {attribute for attribute in MUTEX_STATE_ATTRIBUTES if hasattr(mutex, attribute)})
+
+    def test_rewind_before_the_oldest_checkpoint(self):
+        engine = _load("ring2.xlsx", "Ticket Lock")
+        engine.set_checkpoints(5, 3)
+        engine.run(STEPS)
+
+        state = _state(engine)
+        self.assertFalse(engine.rewind(10))
+        self.assertTrue(engine.rewind(STEPS - 7))
+        self.assertEqual(engine.step_number, STEPS - 7)
+        engine.run(7)
+        self.assertEqual(_state(engine), state)
+
+    def test_restore_snapshot(self):
+        for mutex_type in MUTEX_CLASSES:
+            with self.subTest(mutex_type=mutex_type):
+                engine = _contended(mutex_type)
+                engine.run(9)
+                snapshot = engine.snapshot()
+                state = _state(engine)
+
+                engine.run(13)
+                engine.restore(snapshot)
+                self.assertEqual(_state(engine), state)
+
+
+if __name__ == "__main__":
+    unittest.main()